@@ -0,0 +1,403 @@
+"""Offline benchmarks for the stock media tools' hot paths.
+
+Every measurement runs against a local
+:class:`~clawdcut.tools.standin.StandInServer`, so no network or API keys
+are needed, and caches are disabled so each call does the full work. The
+results are one JSON document, meant to be kept per release and compared:
+
+- ``search_latency``: p50/p95/p99 of sequential searches per provider
+- ``download_throughput``: MB/s against file size
+- ``peak_rss``: resident memory growth while downloading a large file,
+  measured in a child process
+- ``formatters``: cost of formatting and normalizing 15-result payloads
+- ``concurrency``: async search throughput from 1 to 32 parallel calls
+
+Usage::
+
+    python benchmarks/stock_tools.py --output bench.json
+    python benchmarks/stock_tools.py --quick --output -
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import click
+
+import clawdcut
+from clawdcut.tools.candidates import (
+    compact_candidates,
+    freesound_candidates,
+    pexels_photo_candidates,
+    pexels_video_candidates,
+    pixabay_image_candidates,
+    pixabay_video_candidates,
+)
+from clawdcut.tools.http_clients import ProviderClients
+from clawdcut.tools.standin import Faults, StandInServer, synthesize
+from clawdcut.tools.stock_tools import (
+    _format_freesound_audio,
+    _format_pexels_photos,
+    _format_pexels_videos,
+    _format_pixabay_images,
+    _format_pixabay_videos,
+    create_async_stock_tools,
+    create_stock_tools,
+)
+
+MIB = 1024**2
+SEARCH_PROVIDERS = ("pexels", "pixabay", "freesound")
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """Sizes and repetitions of one benchmark run.
+
+    Attributes:
+        latency: Seconds the stand-in adds to every response.
+        searches: Sequential searches timed per provider.
+        download_sizes: File sizes timed for download throughput.
+        download_repeats: Downloads per size.
+        rss_size: File size downloaded while tracking peak RSS.
+        formatter_iterations: Calls timed per formatter.
+        concurrency: Parallel call counts measured.
+        calls_per_level: Searches issued at each concurrency level.
+        seed: Seed for the stand-in's random draws.
+    """
+
+    latency: float = 0.02
+    searches: int = 100
+    download_sizes: tuple[int, ...] = (256 * 1024, 4 * MIB, 32 * MIB, 128 * MIB)
+    download_repeats: int = 3
+    rss_size: int = 256 * MIB
+    formatter_iterations: int = 2000
+    concurrency: tuple[int, ...] = (1, 2, 4, 8, 16, 32)
+    calls_per_level: int = 64
+    seed: int = 0
+
+
+QUICK = BenchConfig(
+    searches=10,
+    download_sizes=(256 * 1024, 4 * MIB),
+    download_repeats=1,
+    rss_size=16 * MIB,
+    formatter_iterations=100,
+    concurrency=(1, 4, 16),
+    calls_per_level=16,
+)
+
+
+@contextlib.contextmanager
+def _environment(overrides: dict[str, str]) -> Iterator[None]:
+    """Temporarily apply environment variables."""
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _isolated(server: StandInServer, cache_dir: Path) -> dict[str, str]:
+    """Environment pointing the tools at ``server`` with every cache off."""
+    return {
+        **server.environ(),
+        "PEXELS_API_KEY": "bench",
+        "PIXABAY_API_KEY": "bench",
+        "FREESOUND_API_KEY": "bench",
+        "CLAWDCUT_CACHE_DIR": str(cache_dir),
+        "CLAWDCUT_SEARCH_CACHE": "0",
+        "CLAWDCUT_ASSET_CACHE": "0",
+        "CLAWDCUT_RATE_LIMIT": "0",
+        "CLAWDCUT_NEAR_DUPLICATES": "0",
+        "CLAWDCUT_HTTP_MAX_CONNECTIONS": "64",
+        "CLAWDCUT_HTTP_MAX_KEEPALIVE": "64",
+    }
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Summarize latencies in milliseconds."""
+    if len(samples) < 2:
+        samples = samples * 2 or [0.0, 0.0]
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def _search(tools: dict[str, Callable[..., Any]], provider: str, query: str) -> Any:
+    if provider == "freesound":
+        return tools["freesound_search"](query)
+    return tools[f"{provider}_search"](query, per_page=15)
+
+
+def _check(payload: str) -> None:
+    data = json.loads(payload)
+    if not data.get("success"):
+        raise RuntimeError(f"Benchmark call failed: {data.get('error')}")
+
+
+def bench_search_latency(config: BenchConfig, root: Path) -> dict[str, Any]:
+    """Sequential search latency per provider, with the stand-in's latency."""
+    faults = Faults(latency=config.latency, seed=config.seed)
+    with (
+        StandInServer(faults=faults) as server,
+        _environment(_isolated(server, root / "cache")),
+        ProviderClients() as clients,
+    ):
+        tools = {t.__name__: t for t in create_stock_tools(root / "search", clients)}
+        results = {}
+        for provider in SEARCH_PROVIDERS:
+            samples = []
+            for index in range(config.searches):
+                started = time.perf_counter()
+                _check(_search(tools, provider, f"bench {provider} {index}"))
+                samples.append(time.perf_counter() - started)
+            results[provider] = percentiles(samples)
+    return {"server_latency_ms": config.latency * 1000, "providers": results}
+
+
+def bench_download_throughput(config: BenchConfig, root: Path) -> list[dict[str, Any]]:
+    """Download time and throughput for each configured file size."""
+    results = []
+    for size in config.download_sizes:
+        with (
+            StandInServer(media_bytes=size) as server,
+            _environment(_isolated(server, root / "cache")),
+            ProviderClients() as clients,
+        ):
+            tools = {
+                t.__name__: t for t in create_stock_tools(root / "download", clients)
+            }
+            samples = []
+            for repeat in range(config.download_repeats):
+                url = f"{server.url}/media/videos.pexels.com/bench/{size}-{repeat}.mp4"
+                save_path = f".clawdcut/assets/videos/bench-{repeat}.mp4"
+                started = time.perf_counter()
+                _check(tools["pexels_download"](url, save_path))
+                samples.append(time.perf_counter() - started)
+                (root / "download" / save_path).unlink()
+        best = min(samples)
+        results.append(
+            {
+                "bytes": size,
+                "seconds": [round(s, 4) for s in samples],
+                "best_mb_per_s": round(size / MIB / best, 2),
+                "mean_mb_per_s": round(size / MIB / statistics.fmean(samples), 2),
+            }
+        )
+    return results
+
+
+def _max_rss_bytes() -> int:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _rss_child(url: str, workdir: Path) -> dict[str, int]:
+    """Download ``url`` in this process and report its peak RSS."""
+    with ProviderClients() as clients:
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        baseline = _max_rss_bytes()
+        _check(tools["pexels_download"](url, ".clawdcut/assets/videos/rss.mp4"))
+        return {"baseline_rss_bytes": baseline, "peak_rss_bytes": _max_rss_bytes()}
+
+
+def bench_peak_rss(config: BenchConfig, root: Path) -> dict[str, Any]:
+    """Peak resident memory of a process downloading one large file."""
+    try:
+        import resource  # noqa: F401
+    except ImportError:
+        return {"supported": False}
+    with (
+        StandInServer(media_bytes=config.rss_size) as server,
+        _environment(_isolated(server, root / "cache")),
+    ):
+        url = f"{server.url}/media/videos.pexels.com/bench/rss.mp4"
+        child = subprocess.run(
+            [sys.executable, __file__, "--rss-child", url, "--workdir", str(root)],
+            env={**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parents[1])},
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    report = json.loads(child.stdout)
+    growth = report["peak_rss_bytes"] - report["baseline_rss_bytes"]
+    return {
+        "supported": True,
+        "file_bytes": config.rss_size,
+        **report,
+        "growth_bytes": growth,
+        "growth_per_file_byte": round(growth / config.rss_size, 4),
+    }
+
+
+def bench_formatters(config: BenchConfig) -> dict[str, dict[str, float]]:
+    """Microseconds per call to format or normalize a 15-result response."""
+    params = {"query": "bench", "per_page": "15", "page_size": "15"}
+    pexels_photos = synthesize("pexels", "/v1/search", params) or {}
+    pexels_videos = synthesize("pexels", "/videos/search", params) or {}
+    pixabay_images = synthesize("pixabay", "/api/", params) or {}
+    pixabay_videos = synthesize("pixabay", "/api/videos/", params) or {}
+    freesound = synthesize("freesound", "/apiv2/search/text/", params) or {}
+    candidates = pexels_video_candidates(pexels_videos)
+    cases: dict[str, Callable[[], Any]] = {
+        "format_pexels_photos": lambda: _format_pexels_photos(pexels_photos),
+        "format_pexels_videos": lambda: _format_pexels_videos(pexels_videos),
+        "format_pixabay_images": lambda: _format_pixabay_images(pixabay_images),
+        "format_pixabay_videos": lambda: _format_pixabay_videos(pixabay_videos),
+        "format_freesound_audio": lambda: _format_freesound_audio(freesound),
+        "normalize_pexels_photos": lambda: pexels_photo_candidates(pexels_photos),
+        "normalize_pexels_videos": lambda: pexels_video_candidates(pexels_videos),
+        "normalize_pixabay_images": lambda: pixabay_image_candidates(pixabay_images),
+        "normalize_pixabay_videos": lambda: pixabay_video_candidates(pixabay_videos),
+        "normalize_freesound": lambda: freesound_candidates(freesound),
+        "compact_candidates": lambda: compact_candidates(candidates, 0),
+    }
+    results = {}
+    for name, case in cases.items():
+        runs = timeit.repeat(case, number=config.formatter_iterations, repeat=3)
+        per_call = min(runs) / config.formatter_iterations
+        results[name] = {
+            "us_per_call": round(per_call * 1e6, 3),
+            "output_chars": len(json.dumps(case(), default=str)),
+        }
+    return results
+
+
+async def _concurrent_level(
+    tools: dict[str, Callable[..., Any]], level: int, calls: int
+) -> dict[str, Any]:
+    semaphore = asyncio.Semaphore(level)
+    samples: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            _check(await tools["pexels_search"](f"bench {level} {index}", per_page=15))
+            samples.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(calls)))
+    wall = time.perf_counter() - started
+    return {
+        "parallel": level,
+        "calls": calls,
+        "wall_seconds": round(wall, 4),
+        "calls_per_second": round(calls / wall, 2),
+        "latency": percentiles(samples),
+    }
+
+
+def bench_concurrency(config: BenchConfig, root: Path) -> list[dict[str, Any]]:
+    """Async search throughput at each parallelism level."""
+    faults = Faults(latency=config.latency, seed=config.seed)
+
+    async def run() -> list[dict[str, Any]]:
+        clients = ProviderClients()
+        try:
+            tools = {
+                t.__name__: t
+                for t in create_async_stock_tools(root / "concurrency", clients)
+            }
+            return [
+                await _concurrent_level(tools, level, config.calls_per_level)
+                for level in config.concurrency
+            ]
+        finally:
+            await clients.aclose()
+
+    with (
+        StandInServer(faults=faults) as server,
+        _environment(_isolated(server, root / "cache")),
+    ):
+        results = asyncio.run(run())
+    base = results[0]["calls_per_second"] if results else 0
+    for result in results:
+        result["speedup"] = round(result["calls_per_second"] / base, 2) if base else 0
+    return results
+
+
+def run_suite(config: BenchConfig, root: Path) -> dict[str, Any]:
+    """Run every benchmark with scratch files under ``root``."""
+    return {
+        "meta": {
+            "clawdcut_version": clawdcut.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "config": asdict(config),
+        },
+        "search_latency": bench_search_latency(config, root),
+        "download_throughput": bench_download_throughput(config, root),
+        "peak_rss": bench_peak_rss(config, root),
+        "formatters": bench_formatters(config),
+        "concurrency": bench_concurrency(config, root),
+    }
+
+
+@click.command()
+@click.option(
+    "--output",
+    default="stock-tools-bench.json",
+    show_default=True,
+    help="Where to write the JSON results; '-' for stdout.",
+)
+@click.option("--quick", is_flag=True, help="Small sizes for a smoke run.")
+@click.option("--latency", type=float, help="Stand-in latency in seconds.")
+@click.option("--seed", type=int, help="Seed for the stand-in's random draws.")
+@click.option("--rss-child", hidden=True)
+@click.option("--workdir", hidden=True, type=click.Path(path_type=Path))
+def main(
+    output: str,
+    quick: bool,
+    latency: float | None,
+    seed: int | None,
+    rss_child: str | None,
+    workdir: Path | None,
+) -> None:
+    """Benchmark the stock tools offline and write JSON results."""
+    if rss_child:
+        click.echo(json.dumps(_rss_child(rss_child, workdir or Path.cwd())))
+        return
+    config = QUICK if quick else BenchConfig()
+    if latency is not None:
+        config = replace(config, latency=latency)
+    if seed is not None:
+        config = replace(config, seed=seed)
+    with tempfile.TemporaryDirectory(prefix="clawdcut-bench-") as scratch:
+        results = run_suite(config, Path(scratch))
+    text = json.dumps(results, indent=2)
+    if output == "-":
+        click.echo(text)
+    else:
+        Path(output).write_text(text + "\n")
+        click.echo(f"Wrote {output}", err=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,8 @@ from clawdcut.agents.prompt_fragments import (
     WRITE_FILE_STRING_RULE,
 )
 from clawdcut.agents.remotion_developer import create_remotion_developer_subagent
+from clawdcut.tools.http_clients import ProviderClients
+from clawdcut.tracing import Tracer
 
 SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
@@ -294,6 +296,8 @@ Use task tool to call remotion-developer, providing:
 - Script: `.clawdcut/script.md`
 - Storyboard: `.clawdcut/storyboard.md`
 - Asset directory: `.clawdcut/assets/{images,videos,audio/music,audio/sfx}/`
+- Asset manifest: `.clawdcut/assets/manifest.jsonl` (one JSON record per
+  downloaded asset: path, provider, license, creator, dimensions, duration)
 - Style brief: `.clawdcut/style_brief.json`
 
 **Rules**:
@@ -514,17 +518,26 @@ def _resolve_model() -> BaseChatModel | None:
     return None
 
 
-def create_director_agent(workdir: Path) -> CompiledStateGraph:
+def create_director_agent(
+    workdir: Path,
+    clients: ProviderClients | None = None,
+    tracer: Tracer | None = None,
+) -> CompiledStateGraph:
     """Create the Director Agent.
 
     Args:
         workdir: Working directory where .clawdcut/ will be created.
+        clients: Pooled provider HTTP clients for the session. The caller
+            owns closing them when the session ends.
+        tracer: Optional session tracer. Its callback handler is bound to
+            the graph and reaches the subagents through ``task``; the
+            subagent specs name the spans of their runs.
 
     Returns:
         A compiled LangGraph agent ready for use with run_textual_app.
     """
     backend = FilesystemBackend(root_dir=workdir, virtual_mode=False)
-    asset_manager = create_asset_manager_subagent(workdir)
+    asset_manager = create_asset_manager_subagent(workdir, clients)
     remotion_developer = create_remotion_developer_subagent(workdir)
     model = _resolve_model()
 
@@ -539,5 +552,8 @@ def create_director_agent(workdir: Path) -> CompiledStateGraph:
         checkpointer=MemorySaver(),
         memory=[memory_file],
     )
+    if tracer is not None:
+        tracer.register_agents([asset_manager["name"], remotion_developer["name"]])
+        agent = agent.with_config({"callbacks": [tracer.handler]})
 
     return agent
@@ -195,7 +195,9 @@ You must generate:
    - MUST run pre-generation scoring gate:
      `%s`
      If overall score < 75, revise aesthetic decisions before code generation.
-   - Scan assets/ directory to map available media
+   - Map available media from `.clawdcut/assets/manifest.jsonl` (one JSON
+     record per downloaded asset with path, dimensions and duration); scan
+     the assets/ directory only for files missing from it
 
 2. **Plan Architecture**
    - Map storyboard shots to Remotion Sequences
@@ -7,9 +7,12 @@ from pathlib import Path
 import click
 from deepagents_cli.app import run_textual_app
 from dotenv import load_dotenv
+from langgraph.graph.state import CompiledStateGraph
 
 from clawdcut import __version__
 from clawdcut.agents.director import create_director_agent
+from clawdcut.tools.http_clients import ProviderClients
+from clawdcut.tracing import Tracer
 
 load_dotenv(override=True)
 
@@ -97,6 +100,16 @@ def _ensure_workdir(workdir: Path) -> None:
         aesthetic_report_file.write_text(_DEFAULT_AESTHETIC_REPORT)
 
 
+async def _run_session(
+    agent: CompiledStateGraph, workdir: Path, clients: ProviderClients
+) -> None:
+    """Run the Textual app and release async provider clients on exit."""
+    try:
+        await run_textual_app(agent=agent, cwd=workdir)
+    finally:
+        await clients.aclose()
+
+
 @click.command()
 @click.version_option(version=__version__, prog_name="clawdcut")
 def main() -> None:
@@ -104,8 +117,15 @@ def main() -> None:
     workdir = Path.cwd()
     _ensure_workdir(workdir)
 
-    agent = create_director_agent(workdir)
-    asyncio.run(run_textual_app(agent=agent, cwd=workdir))
+    tracer = Tracer.from_env(workdir)
+    with ProviderClients() as clients:
+        agent = create_director_agent(workdir, clients=clients, tracer=tracer)
+        try:
+            asyncio.run(_run_session(agent, workdir, clients))
+        finally:
+            if tracer is not None:
+                tracer.close()
+                click.echo(f"Trace timeline: {tracer.timeline_path}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 """Tools for clawdcut."""
 
-from clawdcut.tools.stock_tools import create_stock_tools
+from clawdcut.tools.http_clients import PoolConfig, ProviderClients
+from clawdcut.tools.stock_tools import create_async_stock_tools, create_stock_tools
 
 __all__ = [
+    "PoolConfig",
+    "ProviderClients",
+    "create_async_stock_tools",
     "create_stock_tools",
 ]
@@ -0,0 +1,236 @@
+"""User-level, content-addressed asset store shared across projects.
+
+Downloaded media is kept once under ``~/.cache/clawdcut/blobs/`` keyed by
+its SHA-256 and indexed by source URL and by provider + asset ID +
+rendition. Download tools materialize a hit into the project with a
+reflink, hardlink or copy instead of fetching it again. The store has a
+size cap and evicts least-recently-used blobs.
+"""
+
+import contextlib
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 5 * 1024**3
+_HASH_CHUNK = 1024 * 1024
+_FICLONE = 0x40049409
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keys (
+    key TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_last_used ON blobs (last_used);
+CREATE INDEX IF NOT EXISTS keys_sha256 ON keys (sha256);
+"""
+
+
+def cache_root() -> Path:
+    """Return the user-level clawdcut cache directory.
+
+    ``CLAWDCUT_CACHE_DIR`` wins, then ``$XDG_CACHE_HOME/clawdcut``, then
+    ``~/.cache/clawdcut``.
+    """
+    if explicit := os.environ.get("CLAWDCUT_CACHE_DIR"):
+        return Path(explicit).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "clawdcut"
+
+
+def url_key(url: str) -> str:
+    """Index key for a source URL."""
+    return f"url:{url}"
+
+
+def asset_key(provider: str, asset_id: str, rendition: str) -> str:
+    """Index key for a provider asset rendition."""
+    return f"asset:{provider}:{asset_id}:{rendition}"
+
+
+def sha256_file(path: Path) -> str:
+    """Hash a file in constant memory."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Try a copy-on-write clone (Linux ``FICLONE``); return success."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    with src.open("rb") as s, dst.open("wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            return True
+        except OSError:
+            return False
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Place ``src`` at ``dst`` sharing storage where the filesystem allows."""
+    if _reflink(src, dst):
+        return
+    with contextlib.suppress(FileNotFoundError):
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _place(src: Path, dst: Path) -> None:
+    """Atomically place a copy/link of ``src`` at ``dst``."""
+    fd, name = tempfile.mkstemp(dir=dst.parent, prefix=f".{dst.name}.", suffix=".tmp")
+    os.close(fd)
+    temp = Path(name)
+    try:
+        _link_or_copy(src, temp)
+        os.replace(temp, dst)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            temp.unlink()
+        raise
+
+
+class AssetStore:
+    """Content-addressed blob store with an SQLite index and LRU eviction.
+
+    Args:
+        root: Store directory (blobs and index live underneath).
+        max_bytes: Total blob size cap; oldest-used blobs are evicted first.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.blobs_dir = root / "blobs"
+        self.index_path = root / "assets.sqlite3"
+
+    @classmethod
+    def from_env(cls) -> "AssetStore | None":
+        """Build the default store, or ``None`` when disabled.
+
+        Set ``CLAWDCUT_ASSET_CACHE=0`` to disable it and
+        ``CLAWDCUT_ASSET_CACHE_MAX_BYTES`` to change the size cap.
+        """
+        if os.environ.get("CLAWDCUT_ASSET_CACHE", "1").lower() in ("0", "false"):
+            return None
+        try:
+            max_bytes = int(
+                os.environ.get("CLAWDCUT_ASSET_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+            )
+        except ValueError:
+            max_bytes = DEFAULT_MAX_BYTES
+        return cls(cache_root(), max_bytes)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=10.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def blob_path(self, sha256: str) -> Path:
+        """Return where the blob for ``sha256`` is stored."""
+        return self.blobs_dir / sha256[:2] / sha256
+
+    def lookup(self, keys: list[str]) -> Path | None:
+        """Return the blob for the first indexed key, refreshing its LRU slot."""
+        with contextlib.closing(self._connect()) as conn, conn:
+            for key in keys:
+                row = conn.execute(
+                    "SELECT b.sha256, b.size FROM keys k "
+                    "JOIN blobs b ON b.sha256 = k.sha256 WHERE k.key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    continue
+                sha, size = row
+                blob = self.blob_path(sha)
+                if not blob.is_file() or blob.stat().st_size != size:
+                    self._forget(conn, sha)
+                    continue
+                conn.execute(
+                    "UPDATE blobs SET last_used = ? WHERE sha256 = ?",
+                    (time.time(), sha),
+                )
+                return blob
+        return None
+
+    def materialize(self, keys: list[str], target: Path) -> bool:
+        """Place a cached copy at ``target``; return whether it was a hit."""
+        blob = self.lookup(keys)
+        if blob is None:
+            return False
+        _place(blob, target)
+        return True
+
+    def ingest(self, path: Path, keys: list[str]) -> str:
+        """Add a downloaded file to the store under ``keys``.
+
+        Returns:
+            The file's SHA-256.
+        """
+        sha = sha256_file(path)
+        size = path.stat().st_size
+        blob = self.blob_path(sha)
+        if not blob.is_file():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            _place(path, blob)
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO blobs (sha256, size, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET last_used = excluded.last_used",
+                (sha, size, time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO keys (key, sha256) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET sha256 = excluded.sha256",
+                [(key, sha) for key in keys],
+            )
+            self._evict(conn)
+        return sha
+
+    def total_bytes(self) -> int:
+        """Return the summed size of all indexed blobs."""
+        with contextlib.closing(self._connect()) as conn:
+            return self._sum_sizes(conn)
+
+    @staticmethod
+    def _sum_sizes(conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return int(row[0])
+
+    def _forget(self, conn: sqlite3.Connection, sha: str) -> None:
+        conn.execute("DELETE FROM keys WHERE sha256 = ?", (sha,))
+        conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+        with contextlib.suppress(FileNotFoundError):
+            self.blob_path(sha).unlink()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least-recently-used blobs until the store fits its cap."""
+        total = self._sum_sizes(conn)
+        if total <= self.max_bytes:
+            return
+        for sha, size in conn.execute(
+            "SELECT sha256, size FROM blobs ORDER BY last_used ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._forget(conn, sha)
+            total -= size
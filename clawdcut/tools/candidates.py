@@ -0,0 +1,506 @@
+"""Provider-neutral search candidates.
+
+Each provider returns a differently shaped JSON payload. The normalizers
+here map Pexels, Pixabay and Freesound hits onto one :class:`Candidate`
+schema so results from several providers can be merged, deduplicated and
+ranked together. :func:`style_rank` re-orders them by fit with the
+project style brief, and :func:`compact_candidates` renders them in the
+terse form the search tools return with ``output="compact"``.
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from clawdcut.tools.filters import SearchFilters
+from clawdcut.tools.renditions import RenditionTarget, select_rendition
+from clawdcut.tools.style_brief import StyleMatcher
+
+PEXELS_LICENSE = "Pexels License"
+PIXABAY_LICENSE = "Pixabay Content License"
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Handle prefixes: provider code, plus "v" for videos so ids cannot collide.
+_HANDLE_CODES = {"pexels": "px", "pixabay": "pb", "freesound": "fs"}
+_COMPACT_TITLE_CHARS = 40
+_COMPACT_TAGS = 3
+
+# Pixabay caps these image tiers' longest side.
+_LARGE_SIDE = 1280
+_FULLHD_SIDE = 1920
+_PIXABAY_VIDEO_TIERS = ("tiny", "small", "medium", "large")
+# Style score deducted per forbidden term found on a candidate.
+_FORBIDDEN_PENALTY = 0.5
+
+
+@dataclass
+class Candidate:
+    """One search hit in a provider-neutral shape."""
+
+    provider: str
+    id: str
+    media_type: str
+    title: str
+    creator: str
+    download_url: str
+    preview_url: str = ""
+    page_url: str = ""
+    width: int = 0
+    height: int = 0
+    duration: float = 0.0
+    bytes: int = 0
+    tags: list[str] = field(default_factory=list)
+    # Provider's finer image type when it is not a photo, e.g. Pixabay
+    # "illustration" or "vector/svg"; ``media_type`` stays "photo".
+    kind: str = ""
+    license: str = ""
+    score: float = 0.0
+    style_score: float = 0.0
+    style_matches: list[str] = field(default_factory=list)
+    style_flags: list[str] = field(default_factory=list)
+    # Earlier candidate or downloaded file this hit looks like, if any.
+    duplicate_of: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable dict."""
+        return asdict(self)
+
+    @property
+    def handle(self) -> str:
+        """Short session handle, e.g. ``px:2014422`` or ``pbv:125``."""
+        code = _HANDLE_CODES.get(self.provider, self.provider)
+        suffix = "v" if self.media_type == "video" else ""
+        return f"{code}{suffix}:{self.id}"
+
+    def to_compact(self) -> dict[str, Any]:
+        """Return the token-lean dict used by compact search output.
+
+        Empty fields are omitted and a title that merely repeats the tags
+        is dropped.
+        """
+        item: dict[str, Any] = {"id": self.handle, "type": self.media_type}
+        if self.kind:
+            item["kind"] = self.kind
+        if self.width and self.height:
+            item["size"] = f"{self.width}x{self.height}"
+        if self.duration:
+            item["dur"] = round(self.duration, 1)
+        if self.bytes:
+            item["bytes"] = self.bytes
+        if self.title and self.title != ", ".join(self.tags):
+            item["title"] = self.title
+        if self.tags:
+            item["tags"] = self.tags
+        if self.creator:
+            item["by"] = self.creator
+        if self.score:
+            item["score"] = self.score
+        if self.style_score:
+            item["style"] = self.style_score
+        if self.style_flags:
+            item["avoid"] = self.style_flags
+        if self.duplicate_of:
+            item["dup"] = self.duplicate_of
+        return item
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _split_tags(tags: Any) -> list[str]:
+    if isinstance(tags, list):
+        return [str(t).strip() for t in tags if str(t).strip()]
+    return [t.strip() for t in str(tags or "").split(",") if t.strip()]
+
+
+def pexels_photo_candidates(data: dict[str, Any]) -> list[Candidate]:
+    """Normalize a Pexels photo search response."""
+    candidates = []
+    for photo in data.get("photos", []):
+        src = photo.get("src", {})
+        candidates.append(
+            Candidate(
+                provider="pexels",
+                id=str(photo.get("id", "")),
+                media_type="photo",
+                title=str(photo.get("alt") or ""),
+                creator=str(photo.get("photographer") or ""),
+                download_url=str(src.get("original") or ""),
+                preview_url=str(src.get("medium") or ""),
+                page_url=str(photo.get("url") or ""),
+                width=_int(photo.get("width")),
+                height=_int(photo.get("height")),
+                license=PEXELS_LICENSE,
+            )
+        )
+    return candidates
+
+
+def best_pexels_video_file(
+    video: dict[str, Any], target: RenditionTarget | None = None
+) -> dict[str, Any]:
+    """Return the rendition of a Pexels video to download, or ``{}``.
+
+    Without a ``target`` this is the widest rendition.
+    """
+    video_files = video.get("video_files", [])
+    if target is not None:
+        return select_rendition(video_files, target)
+    return max(video_files, key=lambda f: f.get("width", 0)) if video_files else {}
+
+
+def pexels_video_candidates(
+    data: dict[str, Any],
+    target: RenditionTarget | None = None,
+    filters: SearchFilters | None = None,
+) -> list[Candidate]:
+    """Normalize a Pexels video search response.
+
+    Videos outside the size and duration ``filters`` are dropped.
+    """
+    candidates = []
+    for video in data.get("videos", []):
+        if filters is not None and not filters.keeps_pexels_video(video):
+            continue
+        best = best_pexels_video_file(video, target)
+        user = video.get("user", {})
+        candidates.append(
+            Candidate(
+                provider="pexels",
+                id=str(video.get("id", "")),
+                media_type="video",
+                title=str(video.get("url") or "").rstrip("/").rsplit("/", 1)[-1],
+                creator=str(user.get("name") or "") if isinstance(user, dict) else "",
+                download_url=str(best.get("link") or ""),
+                preview_url=str(video.get("image") or ""),
+                page_url=str(video.get("url") or ""),
+                width=_int(best.get("width")),
+                height=_int(best.get("height")),
+                duration=_float(video.get("duration")),
+                bytes=_int(best.get("size")),
+                license=PEXELS_LICENSE,
+            )
+        )
+    return candidates
+
+
+def _scaled(width: int, height: int, max_side: int) -> tuple[int, int]:
+    """Dimensions after fitting the longest side into ``max_side``."""
+    longest = max(width, height)
+    if longest <= max_side:
+        return width, height
+    return round(width * max_side / longest), round(height * max_side / longest)
+
+
+def pixabay_image_renditions(hit: dict[str, Any]) -> list[dict[str, Any]]:
+    """List the sizes Pixabay publishes for one image, smallest first.
+
+    ``fullHDURL`` and ``imageURL`` only appear for accounts with full API
+    access.
+    """
+    width, height = _int(hit.get("imageWidth")), _int(hit.get("imageHeight"))
+    tiers = [
+        (
+            "preview",
+            hit.get("previewURL"),
+            _int(hit.get("previewWidth")),
+            _int(hit.get("previewHeight")),
+        ),
+        (
+            "webformat",
+            hit.get("webformatURL"),
+            _int(hit.get("webformatWidth")),
+            _int(hit.get("webformatHeight")),
+        ),
+        ("large", hit.get("largeImageURL"), *_scaled(width, height, _LARGE_SIDE)),
+        ("fullhd", hit.get("fullHDURL"), *_scaled(width, height, _FULLHD_SIDE)),
+        ("original", hit.get("imageURL"), width, height),
+    ]
+    renditions = [
+        {"tier": tier, "link": str(url), "width": w, "height": h}
+        for tier, url, w, h in tiers
+        if url
+    ]
+    if hit.get("imageURL") and hit.get("imageSize"):
+        renditions[-1]["size"] = _int(hit.get("imageSize"))
+    return renditions
+
+
+def pixabay_video_renditions(hit: dict[str, Any]) -> list[dict[str, Any]]:
+    """List the tiers Pixabay publishes for one video, smallest first."""
+    videos = hit.get("videos") or {}
+    renditions = []
+    for tier in _PIXABAY_VIDEO_TIERS:
+        file = videos.get(tier) or {}
+        if file.get("url"):
+            renditions.append(
+                {
+                    "tier": tier,
+                    "link": str(file["url"]),
+                    "width": _int(file.get("width")),
+                    "height": _int(file.get("height")),
+                    "size": _int(file.get("size")),
+                    "thumbnail": str(file.get("thumbnail") or ""),
+                }
+            )
+    return renditions
+
+
+def pixabay_rendition(
+    hit: dict[str, Any], target: RenditionTarget | None = None
+) -> dict[str, Any]:
+    """Return the Pixabay image or video tier to download, or ``{}``.
+
+    Without a ``target`` this is the ``large`` tier (or the biggest one
+    published), matching what Pixabay labels as the download size.
+    """
+    is_video = "videos" in hit
+    renditions = (
+        pixabay_video_renditions(hit) if is_video else pixabay_image_renditions(hit)
+    )
+    if target is not None:
+        return select_rendition(renditions, target)
+    large = [r for r in renditions if r["tier"] == "large"]
+    return (large or renditions or [{}])[-1]
+
+
+def pixabay_image_candidates(
+    data: dict[str, Any], target: RenditionTarget | None = None
+) -> list[Candidate]:
+    """Normalize a Pixabay image search response.
+
+    With a ``target`` the download URL and size describe the chosen tier;
+    otherwise the size is the original image's. Illustrations and vectors
+    are "photo" hits whose Pixabay type is kept as ``kind``.
+    """
+    candidates = []
+    for hit in data.get("hits", []):
+        chosen = pixabay_rendition(hit, target) if target else {}
+        kind = str(hit.get("type") or "")
+        candidates.append(
+            Candidate(
+                provider="pixabay",
+                id=str(hit.get("id", "")),
+                media_type="photo",
+                kind="" if kind == "photo" else kind,
+                title=str(hit.get("tags") or ""),
+                creator=str(hit.get("user") or ""),
+                download_url=str(chosen.get("link") or hit.get("largeImageURL") or ""),
+                preview_url=str(hit.get("webformatURL") or ""),
+                page_url=str(hit.get("pageURL") or ""),
+                width=_int(chosen.get("width") or hit.get("imageWidth")),
+                height=_int(chosen.get("height") or hit.get("imageHeight")),
+                bytes=_int(chosen.get("size")),
+                tags=_split_tags(hit.get("tags")),
+                license=PIXABAY_LICENSE,
+            )
+        )
+    return candidates
+
+
+def pixabay_video_candidates(
+    data: dict[str, Any], target: RenditionTarget | None = None
+) -> list[Candidate]:
+    """Normalize a Pixabay video search response."""
+    candidates = []
+    for hit in data.get("hits", []):
+        chosen = pixabay_rendition(hit, target)
+        candidates.append(
+            Candidate(
+                provider="pixabay",
+                id=str(hit.get("id", "")),
+                media_type="video",
+                title=str(hit.get("tags") or ""),
+                creator=str(hit.get("user") or ""),
+                download_url=str(chosen.get("link") or ""),
+                preview_url=str(chosen.get("thumbnail") or ""),
+                page_url=str(hit.get("pageURL") or ""),
+                width=_int(chosen.get("width")),
+                height=_int(chosen.get("height")),
+                duration=_float(hit.get("duration")),
+                bytes=_int(chosen.get("size")),
+                tags=_split_tags(hit.get("tags")),
+                license=PIXABAY_LICENSE,
+            )
+        )
+    return candidates
+
+
+def freesound_candidates(data: dict[str, Any]) -> list[Candidate]:
+    """Normalize a Freesound text search response."""
+    candidates = []
+    for item in data.get("results", []):
+        preview = str(item.get("previews", {}).get("preview-hq-mp3") or "")
+        candidates.append(
+            Candidate(
+                provider="freesound",
+                id=str(item.get("id", "")),
+                media_type="audio",
+                title=str(item.get("name") or ""),
+                creator=str(item.get("username") or ""),
+                download_url=preview,
+                preview_url=preview,
+                duration=_float(item.get("duration")),
+                tags=_split_tags(item.get("tags")),
+                license=str(item.get("license") or ""),
+            )
+        )
+    return candidates
+
+
+def query_tokens(text: str) -> set[str]:
+    """Lowercase alphanumeric tokens of ``text``."""
+    return set(_TOKEN.findall(text.lower()))
+
+
+def _dedupe_key(candidate: Candidate) -> tuple[Any, ...] | None:
+    """Cross-provider identity guess: same creator, size and duration."""
+    creator = " ".join(query_tokens(candidate.creator))
+    if not creator or not (candidate.width or candidate.duration):
+        return None
+    return (
+        candidate.media_type == "video",
+        creator,
+        candidate.width,
+        candidate.height,
+        round(candidate.duration),
+    )
+
+
+def merge_candidates(
+    query: str, ranked_lists: list[list[Candidate]], limit: int, rrf_k: int = 10
+) -> list[Candidate]:
+    """Merge per-provider result lists into one deduplicated ranking.
+
+    Scores combine reciprocal-rank fusion of each provider's own ordering
+    with the fraction of query terms found in the title and tags.
+    """
+    terms = query_tokens(query)
+    best_rrf = 1.0 / (rrf_k + 1)
+    merged: list[Candidate] = []
+    for candidates in ranked_lists:
+        for rank, candidate in enumerate(candidates, 1):
+            text = " ".join([candidate.title, *candidate.tags])
+            overlap = len(terms & query_tokens(text)) / len(terms) if terms else 0.0
+            fused = (1.0 / (rrf_k + rank)) / best_rrf
+            candidate.score = round(0.5 * fused + 0.5 * overlap, 4)
+            merged.append(candidate)
+
+    merged.sort(key=lambda c: (-c.score, -(c.width * c.height)))
+    seen_urls: set[str] = set()
+    seen_keys: set[tuple[Any, ...]] = set()
+    unique: list[Candidate] = []
+    for candidate in merged:
+        key = _dedupe_key(candidate)
+        if candidate.download_url in seen_urls or (key and key in seen_keys):
+            continue
+        seen_urls.add(candidate.download_url)
+        if key:
+            seen_keys.add(key)
+        unique.append(candidate)
+    return unique[:limit]
+
+
+def _resolution_fit(candidate: Candidate, target: RenditionTarget) -> float:
+    """How much of the target's long and short side ``candidate`` covers."""
+    long_side = max(candidate.width, candidate.height)
+    short_side = min(candidate.width, candidate.height)
+    fit = 1.0
+    if target.width:
+        fit *= min(1.0, long_side / target.width)
+    if target.height:
+        fit *= min(1.0, short_side / target.height)
+    return fit
+
+
+def _duration_fit(duration: float, min_duration: float, max_duration: float) -> float:
+    """1.0 inside the wanted range, shrinking with the distance outside it."""
+    if min_duration and duration < min_duration:
+        return duration / min_duration
+    if max_duration and duration > max_duration:
+        return max_duration / duration
+    return 1.0
+
+
+def style_rank(
+    candidates: list[Candidate],
+    matcher: StyleMatcher,
+    target: RenditionTarget | None = None,
+    min_duration: float = 0.0,
+    max_duration: float = 0.0,
+) -> list[Candidate]:
+    """Score candidates against the style brief and sort best first.
+
+    ``style_score`` averages the share of palette keywords found in the
+    title and tags with, where known, resolution fit against ``target`` and
+    duration fit against the wanted range. Each forbidden term found costs
+    0.5. Candidates are sorted by ``score + style_score``, so merged
+    rankings keep their relevance; ties keep their incoming order.
+    """
+    keywords = len(matcher.preferred.terms)
+    for candidate in candidates:
+        text = " ".join([candidate.title, *candidate.tags])
+        matches = matcher.preferred.find(text)
+        flags = matcher.forbidden.find(text)
+        parts = [len(matches) / keywords] if keywords else []
+        if target is not None and (target.width or target.height):
+            if candidate.width and candidate.height:
+                parts.append(_resolution_fit(candidate, target))
+        if (min_duration or max_duration) and candidate.duration:
+            parts.append(_duration_fit(candidate.duration, min_duration, max_duration))
+        base = sum(parts) / len(parts) if parts else 0.0
+        candidate.style_score = round(
+            max(0.0, base - _FORBIDDEN_PENALTY * len(flags)), 3
+        )
+        candidate.style_matches = sorted(matches)
+        candidate.style_flags = sorted(flags)
+    return sorted(candidates, key=lambda c: -(c.score + c.style_score))
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough LLM token count of ``value`` serialized as JSON (~4 chars each)."""
+    return len(json.dumps(value, ensure_ascii=False)) // 4 + 1
+
+
+def _shorten(item: dict[str, Any]) -> dict[str, Any]:
+    short = dict(item)
+    if "title" in short and len(short["title"]) > _COMPACT_TITLE_CHARS:
+        short["title"] = short["title"][: _COMPACT_TITLE_CHARS - 1] + "\u2026"
+    if "tags" in short:
+        short["tags"] = short["tags"][:_COMPACT_TAGS]
+    short.pop("by", None)
+    return short
+
+
+def compact_candidates(
+    candidates: list[Candidate], max_tokens: int = 0
+) -> tuple[list[dict[str, Any]], bool]:
+    """Render ``candidates`` compactly, fitting an optional token budget.
+
+    Over budget, titles and tag lists are shortened and creators dropped
+    first; trailing (lowest ranked) candidates are removed only if that is
+    not enough. At least one candidate is always kept.
+
+    Returns:
+        The compact dicts and whether anything was truncated.
+    """
+    items = [c.to_compact() for c in candidates]
+    if max_tokens <= 0 or estimate_tokens(items) <= max_tokens:
+        return items, False
+    items = [_shorten(item) for item in items]
+    while len(items) > 1 and estimate_tokens(items) > max_tokens:
+        items.pop()
+    return items, True
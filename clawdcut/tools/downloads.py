@@ -0,0 +1,446 @@
+"""Constant-memory, resumable download helpers for the stock media tools.
+
+Bodies are streamed chunk by chunk, as the transport delivers them, into a
+hidden ``.part`` file next to the target, fsynced, and atomically renamed
+into place. Peak memory does
+not grow with the asset size, and an interrupted transfer never leaves a
+truncated file at the final path.
+
+When the server supports byte ranges, an interrupted ``.part`` file is kept
+together with a small JSON sidecar recording the source URL, validators
+(``ETag``/``Last-Modified``) and bytes received. The next attempt - a retry
+or a later session - resumes with ``Range``/``If-Range`` headers instead of
+starting again from byte zero.
+
+A :class:`DownloadBudget` checks ``Content-Type`` and ``Content-Length``
+from the response headers before any body bytes are written, so HTML error
+pages and oversized masters are rejected instead of landing in the assets
+tree. It can optionally send a ``HEAD`` request first.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+import httpx
+
+from clawdcut.tools.http_clients import _env_int
+
+_CONTENT_RANGE_START = re.compile(r"bytes\s+(\d+)-")
+_CONTENT_RANGE_TOTAL = re.compile(r"/\s*(\d+)\s*$")
+
+PREFLIGHT_MODES = ("get", "head")
+DEFAULT_MAX_BYTES = {
+    "image": 50 * 1024**2,
+    "video": 1024**3,
+    "audio": 200 * 1024**2,
+}
+_MEDIA_SUFFIXES = {
+    "image": {".jpg", ".jpeg", ".png", ".webp", ".gif", ".svg", ".avif"},
+    "video": {".mp4", ".mov", ".webm", ".m4v", ".mkv"},
+    "audio": {".mp3", ".wav", ".ogg", ".oga", ".m4a", ".flac", ".aac"},
+}
+# Types CDNs send for any binary file, plus container types outside the
+# image/video/audio trees.
+_GENERIC_TYPES = frozenset({"", "application/octet-stream", "binary/octet-stream"})
+_EXTRA_TYPES = {"audio": {"application/ogg"}, "video": {"application/mp4"}}
+
+
+class DownloadRejectedError(httpx.HTTPError):
+    """A download refused from its headers, before any body was written."""
+
+
+def media_kind(target: Path) -> str:
+    """Return ``"image"``, ``"video"``, ``"audio"`` or ``""`` for ``target``."""
+    suffix = target.suffix.lower()
+    for kind, suffixes in _MEDIA_SUFFIXES.items():
+        if suffix in suffixes:
+            return kind
+    return ""
+
+
+def _announced_size(response: httpx.Response, offset: int) -> int | None:
+    """Total file size announced by the response headers, if any."""
+    match = _CONTENT_RANGE_TOTAL.search(response.headers.get("Content-Range", ""))
+    if match:
+        return int(match.group(1))
+    try:
+        return offset + int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class DownloadBudget:
+    """Accepted content types and size caps per media kind.
+
+    The media kind comes from the target's file extension; targets with an
+    unknown extension accept any image, video or audio type under the
+    largest cap.
+
+    Attributes:
+        max_bytes: Size cap per media kind.
+        mode: ``"get"`` checks the download's own response headers;
+            ``"head"`` additionally sends a ``HEAD`` request first.
+    """
+
+    max_bytes: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MAX_BYTES))
+    mode: str = "get"
+
+    @classmethod
+    def from_env(cls) -> "DownloadBudget | None":
+        """Build the default budget, or ``None`` when checks are disabled.
+
+        Honours ``CLAWDCUT_DOWNLOAD_PREFLIGHT`` (``get``, ``head`` or ``0``)
+        and ``CLAWDCUT_MAX_IMAGE_BYTES`` / ``_VIDEO_`` / ``_AUDIO_``.
+        """
+        mode = os.environ.get("CLAWDCUT_DOWNLOAD_PREFLIGHT", "get").lower()
+        if mode in ("0", "false", "off"):
+            return None
+        return cls(
+            max_bytes={
+                kind: _env_int(f"CLAWDCUT_MAX_{kind.upper()}_BYTES", default)
+                for kind, default in DEFAULT_MAX_BYTES.items()
+            },
+            mode=mode if mode in PREFLIGHT_MODES else "get",
+        )
+
+    def limit(self, target: Path) -> int:
+        """Size cap in bytes for ``target``."""
+        kind = media_kind(target)
+        return self.max_bytes.get(kind) or max(self.max_bytes.values())
+
+    def check(self, response: httpx.Response, target: Path, offset: int = 0) -> None:
+        """Validate a response's headers for ``target``.
+
+        Raises:
+            DownloadRejectedError: On a non-media content type, or an
+                announced size above the budget.
+        """
+        kind = media_kind(target)
+        content_type = (
+            response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        )
+        prefixes = (f"{kind}/",) if kind else ("image/", "video/", "audio/")
+        if not (
+            content_type in _GENERIC_TYPES
+            or content_type.startswith(prefixes)
+            or content_type in _EXTRA_TYPES.get(kind, ())
+        ):
+            raise DownloadRejectedError(
+                f"Rejected {response.url}: Content-Type {content_type!r} is not "
+                f"{kind or 'media'}."
+            )
+        size = _announced_size(response, offset)
+        if size is not None and size > self.limit(target):
+            raise DownloadRejectedError(
+                f"Rejected {response.url}: {size / 1024**2:.1f} MiB exceeds the "
+                f"{self.limit(target) / 1024**2:.1f} MiB {kind or 'download'} "
+                "budget."
+            )
+
+
+def partial_paths(target: Path) -> tuple[Path, Path]:
+    """Return the ``.part`` data file and JSON sidecar paths for ``target``."""
+    return (
+        target.with_name(f".{target.name}.part"),
+        target.with_name(f".{target.name}.part.json"),
+    )
+
+
+def _discard_partial(target: Path) -> None:
+    """Remove any partial data and sidecar for ``target``."""
+    for path in partial_paths(target):
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+def _strong_validator(etag: str, last_modified: str) -> str:
+    """Pick a validator usable with ``If-Range`` (weak ETags are not)."""
+    if etag and not etag.startswith("W/"):
+        return etag
+    return last_modified
+
+
+def _resume_headers(target: Path, url: str) -> tuple[int, dict[str, str]]:
+    """Return the resume offset and extra request headers for ``target``.
+
+    Partial data is only reused when its sidecar matches ``url`` and carries
+    a strong validator; anything else is discarded.
+    """
+    part, sidecar = partial_paths(target)
+    if not part.exists():
+        _discard_partial(target)
+        return 0, {}
+    try:
+        state = json.loads(sidecar.read_text())
+    except (OSError, json.JSONDecodeError):
+        state = {}
+    validator = _strong_validator(
+        str(state.get("etag", "")), str(state.get("last_modified", ""))
+    )
+    offset = part.stat().st_size
+    if state.get("url") != url or not validator or offset == 0:
+        _discard_partial(target)
+        return 0, {}
+    return offset, {"Range": f"bytes={offset}-", "If-Range": validator}
+
+
+def _is_resumable(response: httpx.Response) -> bool:
+    """Return whether a later request could resume this response's body."""
+    validator = _strong_validator(
+        response.headers.get("ETag", ""), response.headers.get("Last-Modified", "")
+    )
+    if not validator:
+        return False
+    return response.status_code == 206 or (
+        response.headers.get("Accept-Ranges", "").lower() == "bytes"
+    )
+
+
+def _save_sidecar(target: Path, url: str, response: httpx.Response) -> None:
+    """Record what a later attempt needs to resume ``target``."""
+    part, sidecar = partial_paths(target)
+    sidecar.write_text(
+        json.dumps(
+            {
+                "url": url,
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+                "bytes_received": part.stat().st_size if part.exists() else 0,
+            }
+        )
+    )
+
+
+def _body_offset(response: httpx.Response, requested: int) -> int:
+    """Return where the response body starts, validating partial content.
+
+    Raises:
+        httpx.RemoteProtocolError: When the server cannot honour the range;
+            the partial data is discarded so the retry starts afresh.
+    """
+    if response.status_code == 416:
+        raise httpx.RemoteProtocolError(
+            "Requested range not satisfiable; restarting download.",
+            request=response.request,
+        )
+    if response.status_code != 206:
+        return 0
+    match = _CONTENT_RANGE_START.match(response.headers.get("Content-Range", ""))
+    if match is None or int(match.group(1)) != requested:
+        raise httpx.RemoteProtocolError(
+            "Unexpected Content-Range in partial response; restarting download.",
+            request=response.request,
+        )
+    return requested
+
+
+def _prepare(
+    target: Path, url: str, kwargs: dict[str, Any]
+) -> tuple[int, dict[str, Any]]:
+    """Merge resume headers into the request keyword arguments."""
+    offset, extra = _resume_headers(target, url)
+    headers = {**dict(kwargs.pop("headers", None) or {}), **extra}
+    return offset, {**kwargs, "headers": headers}
+
+
+def _open_part(target: Path, offset: int) -> IO[bytes]:
+    """Open the ``.part`` file for appending at ``offset`` or from scratch."""
+    part, _ = partial_paths(target)
+    return part.open("ab" if offset else "wb")
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename by syncing its directory entry (POSIX only)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _finalize(handle: IO[bytes], target: Path) -> None:
+    """Flush, fsync and atomically move a finished ``.part`` into place."""
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+    part, sidecar = partial_paths(target)
+    os.replace(part, target)
+    with contextlib.suppress(FileNotFoundError):
+        sidecar.unlink()
+    _fsync_dir(target.parent)
+
+
+def _interrupted(
+    handle: IO[bytes], target: Path, url: str, response: httpx.Response
+) -> None:
+    """Keep resumable partial data for a later attempt, or drop it."""
+    handle.close()
+    if _is_resumable(response):
+        _save_sidecar(target, url, response)
+    else:
+        _discard_partial(target)
+
+
+def _check_headers(
+    response: httpx.Response,
+    target: Path,
+    offset: int,
+    budget: DownloadBudget | None,
+) -> int:
+    """Validate a response before its body is read; return the body offset.
+
+    Partial data survives status errors, so a retry can resume, but is
+    discarded for an unusable range or a response failing ``budget``.
+    """
+    try:
+        offset = _body_offset(response, offset)
+    except httpx.HTTPError:
+        _discard_partial(target)
+        raise
+    response.raise_for_status()
+    if budget is not None:
+        try:
+            budget.check(response, target, offset)
+        except DownloadRejectedError:
+            _discard_partial(target)
+            raise
+    return offset
+
+
+def _check_written(
+    written: int, limit: int, response: httpx.Response, handle: IO[bytes]
+) -> None:
+    """Stop a body that outgrows the budget despite its headers."""
+    if limit and written > limit:
+        handle.close()
+        raise DownloadRejectedError(
+            f"Rejected {response.url}: body exceeds the "
+            f"{limit / 1024**2:.1f} MiB budget."
+        )
+
+
+def preflight(
+    client: httpx.Client,
+    url: str,
+    target: Path,
+    budget: DownloadBudget,
+    **kwargs: Any,
+) -> None:
+    """Check ``url`` with a ``HEAD`` request when ``budget.mode`` is "head".
+
+    Servers that refuse or fail ``HEAD`` are let through; the download's own
+    response headers are checked anyway.
+
+    Raises:
+        DownloadRejectedError: When the headers fail the budget.
+    """
+    if budget.mode != "head":
+        return
+    try:
+        response = client.head(url, **kwargs)
+    except httpx.HTTPError:
+        return
+    if response.is_success:
+        budget.check(response, target)
+
+
+async def apreflight(
+    client: httpx.AsyncClient,
+    url: str,
+    target: Path,
+    budget: DownloadBudget,
+    **kwargs: Any,
+) -> None:
+    """Async twin of :func:`preflight`."""
+    if budget.mode != "head":
+        return
+    try:
+        response = await client.head(url, **kwargs)
+    except httpx.HTTPError:
+        return
+    if response.is_success:
+        budget.check(response, target)
+
+
+def stream_to_file(
+    client: httpx.Client,
+    url: str,
+    target: Path,
+    budget: DownloadBudget | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Stream a GET response body to ``target`` atomically, resuming if possible.
+
+    Args:
+        client: Pooled client used for the request.
+        url: Source URL.
+        target: Final destination; its parent directory must exist.
+        budget: Optional content-type and size checks, applied to the
+            response headers before any body bytes are written and to the
+            running byte count.
+        **kwargs: Extra arguments forwarded to ``client.stream``.
+
+    Returns:
+        The (already consumed) response, for status and header inspection.
+
+    Raises:
+        DownloadRejectedError: When the response fails ``budget``.
+        httpx.HTTPError: On transport failures or non-2xx status codes.
+    """
+    offset, kwargs = _prepare(target, url, kwargs)
+    limit = budget.limit(target) if budget else 0
+    with client.stream("GET", url, **kwargs) as response:
+        offset = _check_headers(response, target, offset, budget)
+        handle = _open_part(target, offset)
+        written = offset
+        try:
+            for chunk in response.iter_bytes():
+                handle.write(chunk)
+                written += len(chunk)
+                _check_written(written, limit, response, handle)
+        except DownloadRejectedError:
+            _discard_partial(target)
+            raise
+        except BaseException:
+            _interrupted(handle, target, url, response)
+            raise
+        _finalize(handle, target)
+    return response
+
+
+async def astream_to_file(
+    client: httpx.AsyncClient,
+    url: str,
+    target: Path,
+    budget: DownloadBudget | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Async twin of :func:`stream_to_file`."""
+    offset, kwargs = _prepare(target, url, kwargs)
+    limit = budget.limit(target) if budget else 0
+    async with client.stream("GET", url, **kwargs) as response:
+        offset = _check_headers(response, target, offset, budget)
+        handle = _open_part(target, offset)
+        written = offset
+        try:
+            async for chunk in response.aiter_bytes():
+                handle.write(chunk)
+                written += len(chunk)
+                _check_written(written, limit, response, handle)
+        except DownloadRejectedError:
+            _discard_partial(target)
+            raise
+        except BaseException:
+            _interrupted(handle, target, url, response)
+            raise
+        await asyncio.to_thread(_finalize, handle, target)
+    return response
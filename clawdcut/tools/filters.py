@@ -0,0 +1,179 @@
+"""Search filters pushed down to each provider's native API parameters.
+
+Filtering by orientation, size, colour or duration server-side means every
+returned hit is usable, so the agent needs fewer pages and re-searches.
+:class:`SearchFilters` holds one provider-neutral set of filters and maps it
+onto Pexels, Pixabay and Freesound parameters. Pexels video search has no
+size or duration parameters, so those filters are checked against the
+returned videos instead. Filters a provider (or media type) cannot apply
+are reported back instead of being silently dropped.
+"""
+
+import re
+from dataclasses import dataclass, fields
+from typing import Any
+
+ORIENTATIONS = {
+    "landscape": "landscape",
+    "horizontal": "landscape",
+    "portrait": "portrait",
+    "vertical": "portrait",
+    "square": "square",
+}
+PEXELS_SIZES = ("small", "medium", "large")
+PEXELS_COLORS = frozenset(
+    "red orange yellow green turquoise blue violet pink brown black gray white".split()
+)
+PIXABAY_COLORS = frozenset(
+    "grayscale transparent red orange yellow green turquoise blue lilac pink "
+    "white gray black brown".split()
+)
+_COLOR_ALIASES = {"grey": "gray", "purple": "violet", "lilac": "violet"}
+_HEX_COLOR = re.compile(r"^#?[0-9a-f]{6}$")
+
+
+def _duration_bound(value: float) -> str:
+    return f"{value:g}" if value else "*"
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Provider-neutral search filters; empty or zero values are unset.
+
+    Attributes:
+        orientation: "landscape", "portrait" or "square".
+        size: Pexels minimum size class: "small", "medium" or "large".
+        color: Colour name (e.g. "blue") or hex code (e.g. "#ffaa00").
+        min_width: Minimum width in pixels.
+        min_height: Minimum height in pixels.
+        min_duration: Minimum clip length in seconds.
+        max_duration: Maximum clip length in seconds.
+        editors_choice: Only Pixabay "Editor's Choice" hits.
+    """
+
+    orientation: str = ""
+    size: str = ""
+    color: str = ""
+    min_width: int = 0
+    min_height: int = 0
+    min_duration: float = 0.0
+    max_duration: float = 0.0
+    editors_choice: bool = False
+
+    @classmethod
+    def parse(cls, **values: Any) -> "SearchFilters":
+        """Validate and normalize raw tool arguments.
+
+        Raises:
+            ValueError: If a value is outside the supported vocabulary.
+        """
+        orientation = str(values.get("orientation") or "").strip().lower()
+        if orientation and orientation not in ORIENTATIONS:
+            raise ValueError("orientation must be landscape, portrait or square.")
+        size = str(values.get("size") or "").strip().lower()
+        if size and size not in PEXELS_SIZES:
+            raise ValueError("size must be small, medium or large.")
+        color = str(values.get("color") or "").strip().lower()
+        color = _COLOR_ALIASES.get(color, color)
+        if (
+            color
+            and color not in PEXELS_COLORS | PIXABAY_COLORS
+            and not _HEX_COLOR.match(color)
+        ):
+            raise ValueError(f"Unsupported color {color!r}.")
+        filters = cls(
+            orientation=ORIENTATIONS.get(orientation, ""),
+            size=size,
+            color=color,
+            min_width=max(0, int(values.get("min_width") or 0)),
+            min_height=max(0, int(values.get("min_height") or 0)),
+            min_duration=max(0.0, float(values.get("min_duration") or 0)),
+            max_duration=max(0.0, float(values.get("max_duration") or 0)),
+            editors_choice=bool(values.get("editors_choice")),
+        )
+        if filters.max_duration and filters.min_duration > filters.max_duration:
+            raise ValueError("min_duration must not exceed max_duration.")
+        return filters
+
+    def _set(self) -> list[str]:
+        """Names of the filters that have a value."""
+        return [f.name for f in fields(self) if getattr(self, f.name)]
+
+    def pexels_params(self, is_video: bool) -> tuple[dict[str, str | int], list[str]]:
+        """Map onto Pexels photo/video search parameters.
+
+        Returns:
+            The parameters to send and the names of unsupported filters.
+        """
+        params: dict[str, str | int] = {}
+        if self.orientation:
+            params["orientation"] = self.orientation
+        if self.size:
+            params["size"] = self.size
+        if self.color and not is_video:
+            if self.color in PEXELS_COLORS or _HEX_COLOR.match(self.color):
+                params["color"] = self.color.lstrip("#")
+        applied = {"orientation", "size", *params}
+        if is_video:
+            # Applied to the returned videos by keeps_pexels_video.
+            applied |= {"min_width", "min_height", "min_duration", "max_duration"}
+        return params, [name for name in self._set() if name not in applied]
+
+    def keeps_pexels_video(self, video: dict[str, Any]) -> bool:
+        """Whether a Pexels video hit meets the size and duration filters."""
+        try:
+            width = int(video.get("width") or 0)
+            height = int(video.get("height") or 0)
+            duration = float(video.get("duration") or 0)
+        except (TypeError, ValueError):
+            return False
+        return (
+            width >= self.min_width
+            and height >= self.min_height
+            and duration >= self.min_duration
+            and (not self.max_duration or duration <= self.max_duration)
+        )
+
+    def pixabay_params(self, is_video: bool) -> tuple[dict[str, str | int], list[str]]:
+        """Map onto Pixabay image/video search parameters.
+
+        Returns:
+            The parameters to send and the names of unsupported filters.
+        """
+        params: dict[str, str | int] = {}
+        applied: set[str] = set()
+        if self.min_width:
+            params["min_width"] = self.min_width
+            applied.add("min_width")
+        if self.min_height:
+            params["min_height"] = self.min_height
+            applied.add("min_height")
+        if self.editors_choice:
+            params["editors_choice"] = "true"
+            applied.add("editors_choice")
+        if not is_video:
+            if self.orientation in ("landscape", "portrait"):
+                params["orientation"] = (
+                    "horizontal" if self.orientation == "landscape" else "vertical"
+                )
+                applied.add("orientation")
+            color = "lilac" if self.color == "violet" else self.color
+            if color in PIXABAY_COLORS:
+                params["colors"] = color
+                applied.add("color")
+        return params, [name for name in self._set() if name not in applied]
+
+    def freesound_filter(self) -> tuple[str, list[str]]:
+        """Map onto a Freesound ``filter`` clause.
+
+        Returns:
+            The clause (possibly empty) and the names of unsupported filters.
+        """
+        clause = ""
+        if self.min_duration or self.max_duration:
+            clause = (
+                f"duration:[{_duration_bound(self.min_duration)} TO "
+                f"{_duration_bound(self.max_duration)}]"
+            )
+        applied = {"min_duration", "max_duration"}
+        return clause, [name for name in self._set() if name not in applied]
@@ -0,0 +1,197 @@
+"""Pooled HTTP clients shared by the stock media tools.
+
+Each provider (Pexels, Pixabay, Freesound) gets one long-lived
+``httpx.Client`` (and, for the async tools, one ``httpx.AsyncClient``) so
+repeated searches and downloads reuse keep-alive connections instead of
+paying a fresh TCP+TLS handshake per call. The pool also owns each
+provider's rate limiter, so every tool sharing it shares one API budget.
+"""
+
+import importlib.util
+import os
+import threading
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Mapping
+
+import httpx
+
+from clawdcut.tools.rate_limit import TokenBucket, quotas_from_env
+
+PROVIDERS = ("pexels", "pixabay", "freesound")
+# Live API roots; ``CLAWDCUT_<PROVIDER>_BASE_URL`` points a provider at a
+# stand-in server instead (see :mod:`clawdcut.tools.standin`).
+DEFAULT_BASE_URLS = {
+    "pexels": "https://api.pexels.com",
+    "pixabay": "https://pixabay.com",
+    "freesound": "https://freesound.org",
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment."""
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a non-negative float from the environment."""
+    try:
+        return max(0.0, float(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def base_url_env(provider: str) -> str:
+    """Name of the environment variable overriding ``provider``'s API root."""
+    return f"CLAWDCUT_{provider.upper()}_BASE_URL"
+
+
+def endpoint(provider: str, path: str) -> str:
+    """Absolute URL of API ``path`` under ``provider``'s configured root."""
+    base = os.environ.get(base_url_env(provider)) or DEFAULT_BASE_URLS[provider]
+    return base.rstrip("/") + path
+
+
+def _http2_available() -> bool:
+    """Return whether the optional ``h2`` package is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection pool settings applied to every provider client.
+
+    Attributes:
+        max_connections: Upper bound on concurrent connections per provider.
+        max_keepalive_connections: Idle connections kept open for reuse.
+        keepalive_expiry: Seconds an idle connection stays in the pool.
+        http2: Negotiate HTTP/2 when the ``h2`` package is installed.
+    """
+
+    max_connections: int = 10
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Build a config from ``CLAWDCUT_HTTP_*`` environment variables."""
+        return cls(
+            max_connections=_env_int("CLAWDCUT_HTTP_MAX_CONNECTIONS", 10),
+            max_keepalive_connections=_env_int("CLAWDCUT_HTTP_MAX_KEEPALIVE", 10),
+            keepalive_expiry=_env_float("CLAWDCUT_HTTP_KEEPALIVE_EXPIRY", 30.0),
+            http2=os.environ.get("CLAWDCUT_HTTP2", "").lower() in ("1", "true"),
+        )
+
+    def limits(self) -> httpx.Limits:
+        """Return the equivalent ``httpx.Limits``."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class ProviderClients:
+    """Lazily created, pooled HTTP clients per stock media provider.
+
+    One instance is meant to live for a whole Director session and be
+    shared by every stock tool closure. Call :meth:`close` (or use it as a
+    context manager) when the session ends; async clients must be closed
+    with :meth:`aclose` from the event loop that used them.
+
+    Args:
+        config: Pool settings; defaults to :meth:`PoolConfig.from_env`.
+        transport: Optional sync transport override, mainly for tests.
+        async_transport: Optional async transport override, mainly for tests.
+        quotas: Per-provider ``(requests, window_seconds)`` API quotas used
+            to pace calls; defaults to :func:`quotas_from_env`. Providers
+            without a quota are not paced.
+    """
+
+    def __init__(
+        self,
+        config: PoolConfig | None = None,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+        quotas: Mapping[str, tuple[int, float]] | None = None,
+    ) -> None:
+        self.config = config or PoolConfig.from_env()
+        self._transport = transport
+        self._async_transport = async_transport
+        self._clients: dict[str, httpx.Client] = {}
+        self._async_clients: dict[str, httpx.AsyncClient] = {}
+        self._limiters = {
+            provider: TokenBucket.for_quota(*quota)
+            for provider, quota in (
+                quotas_from_env() if quotas is None else quotas
+            ).items()
+        }
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def get(self, provider: str) -> httpx.Client:
+        """Return the shared client for ``provider``, creating it on demand."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ProviderClients has been closed.")
+            client = self._clients.get(provider)
+            if client is None:
+                client = httpx.Client(
+                    limits=self.config.limits(),
+                    http2=self.config.http2 and _http2_available(),
+                    transport=self._transport,
+                )
+                self._clients[provider] = client
+            return client
+
+    def get_async(self, provider: str) -> httpx.AsyncClient:
+        """Return the shared async client for ``provider``."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ProviderClients has been closed.")
+            client = self._async_clients.get(provider)
+            if client is None:
+                client = httpx.AsyncClient(
+                    limits=self.config.limits(),
+                    http2=self.config.http2 and _http2_available(),
+                    transport=self._async_transport,
+                )
+                self._async_clients[provider] = client
+            return client
+
+    def limiter(self, provider: str) -> TokenBucket | None:
+        """Return the session-wide rate limiter for ``provider``, if paced."""
+        return self._limiters.get(provider)
+
+    def close(self) -> None:
+        """Close every open sync client. Safe to call more than once."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._closed = True
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close every open async and sync client."""
+        with self._lock:
+            async_clients = list(self._async_clients.values())
+            self._async_clients.clear()
+        for client in async_clients:
+            await client.aclose()
+        self.close()
+
+    def __enter__(self) -> "ProviderClients":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,224 @@
+"""Per-project index of downloaded media.
+
+Every successful download upserts one :class:`ManifestRecord` into
+``.clawdcut/assets/manifest.jsonl``: provenance (provider, asset ID, source
+URL, license, creator), the file's path, size and SHA-256, and its
+dimensions or duration, and for visual media a perceptual hash used to spot
+near-duplicates of new search hits. Agents query it through the ``asset_lookup`` tool,
+or read the file directly, instead of re-listing asset directories.
+
+The file is append-only JSON lines, one record per line, and later lines
+win for the same path. :class:`AssetManifest` keeps an in-memory index that
+is reloaded only when the file changes on disk, and rewrites the file
+compactly once superseded lines outnumber live ones. Tool factories share
+one instance per project through :meth:`AssetManifest.shared`, so a
+compaction never races an append from the same process.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+from clawdcut.tools.phash import BKTree
+
+MANIFEST_PATH = ".clawdcut/assets/manifest.jsonl"
+# Superseded lines tolerated before the file is rewritten.
+_COMPACT_SLACK = 32
+
+
+@dataclass
+class ManifestRecord:
+    """One downloaded asset."""
+
+    path: str
+    provider: str
+    asset_id: str = ""
+    source_url: str = ""
+    media_type: str = ""
+    bytes: int = 0
+    sha256: str = ""
+    width: int = 0
+    height: int = 0
+    duration: float = 0.0
+    license: str = ""
+    creator: str = ""
+    title: str = ""
+    downloaded_at: float = 0.0
+    # 64-bit difference hash as hex; empty when the asset was not hashed.
+    dhash: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ManifestRecord":
+        """Build a record, ignoring unknown keys from newer versions."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def matches(self, query: str) -> bool:
+        """Whether every word of ``query`` occurs in the descriptive fields."""
+        haystack = " ".join(
+            (self.path, self.provider, self.asset_id, self.title, self.creator)
+        ).lower()
+        return all(word in haystack for word in query.lower().split())
+
+
+class AssetManifest:
+    """Thread-safe JSONL manifest of one project's downloaded assets.
+
+    Args:
+        workdir: Project directory; record paths are relative to it.
+    """
+
+    _instances: "weakref.WeakValueDictionary[Path, AssetManifest]" = (
+        weakref.WeakValueDictionary()
+    )
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, workdir: Path) -> "AssetManifest":
+        """Return the process-wide manifest for ``workdir``, creating it once."""
+        key = workdir.resolve()
+        with cls._instances_lock:
+            manifest = cls._instances.get(key)
+            if manifest is None:
+                manifest = cls._instances[key] = cls(workdir)
+            return manifest
+
+    def __init__(self, workdir: Path) -> None:
+        self.workdir = workdir
+        self.path = workdir / MANIFEST_PATH
+        self._records: dict[str, ManifestRecord] = {}
+        self._lines = 0
+        self._stamp: tuple[int, int] | None = None
+        self._hashes: BKTree | None = None
+        self._lock = threading.Lock()
+
+    def _file_stamp(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        """Reload the index if another writer changed the file."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        records: dict[str, ManifestRecord] = {}
+        lines = 0
+        if stamp is not None:
+            with self.path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    lines += 1
+                    with contextlib.suppress(ValueError, TypeError):
+                        data = json.loads(line)
+                        if isinstance(data, dict):
+                            record = ManifestRecord.from_dict(data)
+                            records[record.path] = record
+        self._records, self._lines, self._stamp = records, lines, stamp
+        self._hashes = None
+
+    def _compact(self) -> None:
+        """Rewrite the file with one line per live record."""
+        fd, name = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                for record in self._records.values():
+                    handle.write(json.dumps(record.to_dict()) + "\n")
+            os.replace(name, self.path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(name)
+            raise
+        self._lines = len(self._records)
+
+    def relative(self, target: Path) -> str:
+        """Return ``target`` as a manifest path (POSIX, relative to workdir)."""
+        try:
+            return target.resolve().relative_to(self.workdir.resolve()).as_posix()
+        except ValueError:
+            return target.as_posix()
+
+    def upsert(self, record: ManifestRecord) -> None:
+        """Add or replace the record for ``record.path``."""
+        if not record.downloaded_at:
+            record.downloaded_at = round(time.time(), 3)
+        with self._lock:
+            self._refresh()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record.to_dict()) + "\n")
+            self._records.pop(record.path, None)
+            self._records[record.path] = record
+            self._hashes = None
+            self._lines += 1
+            if self._lines > 2 * len(self._records) + _COMPACT_SLACK:
+                self._compact()
+            self._stamp = self._file_stamp()
+
+    def lookup(
+        self,
+        query: str = "",
+        provider: str = "",
+        media_type: str = "",
+        path: str = "",
+    ) -> list[ManifestRecord]:
+        """Return records matching every given filter, newest first.
+
+        Records whose file has since been deleted are left out.
+
+        Args:
+            query: Words matched against path, asset ID, title and creator.
+            provider: Exact provider name.
+            media_type: "photo", "video" or "audio".
+            path: Prefix of the record path, e.g. ".clawdcut/assets/videos".
+        """
+        with self._lock:
+            self._refresh()
+            records = list(self._records.values())
+        matched = [
+            record
+            for record in records
+            if (not provider or record.provider == provider)
+            and (not media_type or record.media_type == media_type)
+            and (not path or record.path.startswith(path.removeprefix("./")))
+            and (not query or record.matches(query))
+            and (self.workdir / record.path).is_file()
+        ]
+        # Later upserts win ties within the timestamp resolution.
+        matched.reverse()
+        return sorted(matched, key=lambda r: r.downloaded_at, reverse=True)
+
+    def near(self, value: int, radius: int) -> list[tuple[int, ManifestRecord]]:
+        """Return ``(distance, record)`` for hashed assets within ``radius``.
+
+        The BK-tree over record hashes is rebuilt only after the manifest
+        changes. Records whose file has since been deleted are left out.
+        """
+        with self._lock:
+            self._refresh()
+            if self._hashes is None:
+                self._hashes = BKTree()
+                for record in self._records.values():
+                    with contextlib.suppress(ValueError):
+                        self._hashes.add(int(record.dhash, 16), record.path)
+            found = self._hashes.search(value, radius)
+            records = self._records
+        return [
+            (distance, records[path])
+            for distance, path in found
+            if path in records and (self.workdir / path).is_file()
+        ]
@@ -0,0 +1,322 @@
+"""Per-tool-call performance telemetry for the stock tools.
+
+Every stock tool call runs inside a :class:`ToolCall` that collects its
+wall time, the bytes and HTTP status of the provider responses it read,
+and, from the finished payload, its retries, backoff wait and cache status.
+The numbers are added to the tool's JSON payload under ``metrics`` and
+appended to ``.clawdcut/metrics/tools.jsonl``, which rolls over to
+``tools.jsonl.1`` once it outgrows its size cap. ``clawdcut-metrics``
+summarizes the log as p50/p95 per provider and operation.
+"""
+
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import statistics
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Iterator
+
+import click
+import httpx
+
+from clawdcut.tools.http_clients import _env_int
+
+METRICS_PATH = ".clawdcut/metrics/tools.jsonl"
+DEFAULT_MAX_BYTES = 5 * 1024**2
+
+_current: ContextVar["ToolCall | None"] = ContextVar("clawdcut_tool_call", default=None)
+
+
+@dataclass
+class ToolCall:
+    """Measurements of one tool call in progress.
+
+    Provider requests made while the call is current report into it
+    through :func:`record_response` and :func:`record_error`, including
+    requests made on worker threads that run in a copy of its context.
+    """
+
+    tool: str
+    started: float = field(default_factory=time.monotonic)
+    bytes: int = 0
+    http_status: int | None = None
+    record: dict[str, Any] | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, status: int, size: int) -> None:
+        """Count one provider response."""
+        with self._lock:
+            self.http_status = status
+            self.bytes += size
+
+    def finish(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Return the ``metrics`` block for ``payload`` and keep its log line.
+
+        A call may build nested payloads (a batch builds one per item); the
+        outermost one is built last, so it is the one logged.
+        """
+        wall = time.monotonic() - self.started
+        retries = [r for r in _retry_blocks(payload) if isinstance(r, dict)]
+        metrics: dict[str, Any] = {
+            "wall_seconds": round(wall, 4),
+            "retries": sum(max(0, r.get("attempts", 0) - 1) for r in retries),
+            "backoff_seconds": round(
+                sum(r.get("wait_seconds", 0.0) for r in retries), 3
+            ),
+            "bytes": self.bytes,
+            "bytes_per_second": round(self.bytes / wall) if wall > 0 else 0,
+            "cache": _cache_status(payload),
+            "http_status": self.http_status,
+        }
+        self.record = {
+            "ts": round(time.time(), 3),
+            "tool": self.tool,
+            "provider": payload.get("provider", ""),
+            "operation": payload.get("operation", ""),
+            "success": payload.get("success", False),
+            **metrics,
+        }
+        return metrics
+
+    def log_record(self) -> dict[str, Any]:
+        """The line to log, even if the tool never built a payload."""
+        if self.record is not None:
+            return self.record
+        return {
+            "ts": round(time.time(), 3),
+            "tool": self.tool,
+            "provider": "",
+            "operation": "",
+            "success": False,
+            "wall_seconds": round(time.monotonic() - self.started, 4),
+            "bytes": self.bytes,
+            "http_status": self.http_status,
+        }
+
+
+def _retry_blocks(payload: dict[str, Any]) -> Iterator[Any]:
+    """Retry stats of a payload and of its per-provider or per-item parts."""
+    yield payload.get("retry")
+    for status in (payload.get("providers") or {}).values():
+        yield status.get("retry")
+    for item in payload.get("items") or []:
+        yield item.get("retry")
+
+
+def _cache_status(payload: dict[str, Any]) -> str | None:
+    """One cache status for the call; ``"mixed"`` when its parts differ."""
+    if "cache" in payload:
+        cache = payload["cache"]
+        return cache if isinstance(cache, str) else None
+    parts = [
+        *(payload.get("providers") or {}).values(),
+        *(payload.get("items") or []),
+    ]
+    statuses = {part["cache"] for part in parts if "cache" in part}
+    if not statuses:
+        return None
+    return statuses.pop() if len(statuses) == 1 else "mixed"
+
+
+def current_call() -> ToolCall | None:
+    """The tool call being measured in this context, if any."""
+    return _current.get()
+
+
+def record_response(response: httpx.Response) -> httpx.Response:
+    """Count a consumed provider response against the current call.
+
+    Bytes are those read off the wire, falling back to ``Content-Length``
+    for bodies that arrived preloaded.
+    """
+    if call := _current.get():
+        size = response.num_bytes_downloaded or response.headers.get(
+            "Content-Length", 0
+        )
+        call.observe(int(response.status_code), int(size))
+    return response
+
+
+def record_error(error: Exception) -> None:
+    """Note the HTTP status of a failed provider request, if it has one."""
+    if isinstance(error, httpx.HTTPStatusError):
+        record_response(error.response)
+
+
+class MetricsLog:
+    """Rolling JSON-lines log of tool-call metrics for one project."""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, workdir: Path) -> "MetricsLog | None":
+        """Build the log under ``workdir``, or ``None`` when disabled.
+
+        Set ``CLAWDCUT_METRICS=0`` to stop logging (payloads still carry
+        their metrics) and ``CLAWDCUT_METRICS_MAX_BYTES`` to change the size
+        at which the log rolls over.
+        """
+        if os.environ.get("CLAWDCUT_METRICS", "1").lower() in ("0", "false"):
+            return None
+        return cls(
+            workdir / METRICS_PATH,
+            _env_int("CLAWDCUT_METRICS_MAX_BYTES", DEFAULT_MAX_BYTES),
+        )
+
+    @property
+    def rolled_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".1")
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Append one record; never raises on disk trouble."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock, contextlib.suppress(OSError):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with contextlib.suppress(FileNotFoundError):
+                if self.path.stat().st_size + len(line) > self.max_bytes:
+                    os.replace(self.path, self.rolled_path)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    def records(self) -> list[dict[str, Any]]:
+        """Every readable record, oldest first, including the rolled file."""
+        records = []
+        for path in (self.rolled_path, self.path):
+            with contextlib.suppress(FileNotFoundError):
+                with path.open(encoding="utf-8") as handle:
+                    for line in handle:
+                        with contextlib.suppress(json.JSONDecodeError):
+                            records.append(json.loads(line))
+        return records
+
+
+def instrument(tool: Callable[..., str], log: MetricsLog | None) -> Callable[..., str]:
+    """Wrap a sync tool so each call is measured and logged."""
+
+    @functools.wraps(tool)
+    def measured(*args: Any, **kwargs: Any) -> str:
+        call = ToolCall(tool.__name__)
+        token = _current.set(call)
+        try:
+            return tool(*args, **kwargs)
+        finally:
+            _current.reset(token)
+            if log is not None:
+                log.append(call.log_record())
+
+    return measured
+
+
+def ainstrument(
+    tool: Callable[..., Awaitable[str]], log: MetricsLog | None
+) -> Callable[..., Awaitable[str]]:
+    """Async twin of :func:`instrument`; the log is written off the loop."""
+
+    @functools.wraps(tool)
+    async def measured(*args: Any, **kwargs: Any) -> str:
+        call = ToolCall(tool.__name__)
+        token = _current.set(call)
+        try:
+            return await tool(*args, **kwargs)
+        finally:
+            _current.reset(token)
+            if log is not None:
+                await asyncio.to_thread(log.append, call.log_record())
+
+    return measured
+
+
+def _percentile(values: list[float], q: int) -> float:
+    """The ``q``-th percentile of ``values``, interpolated."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def summarize(records: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Aggregate log records per provider and operation."""
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for record in records:
+        key = (record.get("provider") or "-", record.get("operation") or "-")
+        groups.setdefault(key, []).append(record)
+    rows = []
+    for (provider, operation), group in sorted(groups.items()):
+        walls = [float(r.get("wall_seconds", 0.0)) for r in group]
+        rates = [
+            float(r["bytes_per_second"])
+            for r in group
+            if r.get("bytes_per_second") and r.get("cache") not in ("hit", "memory")
+        ]
+        rows.append(
+            {
+                "provider": provider,
+                "operation": operation,
+                "calls": len(group),
+                "errors": sum(1 for r in group if not r.get("success")),
+                "retries": sum(int(r.get("retries", 0)) for r in group),
+                "backoff_seconds": round(
+                    sum(float(r.get("backoff_seconds", 0.0)) for r in group), 3
+                ),
+                "cache_hits": sum(
+                    1 for r in group if r.get("cache") in ("hit", "memory")
+                ),
+                "bytes": sum(int(r.get("bytes", 0)) for r in group),
+                "p50_seconds": round(_percentile(walls, 50), 4),
+                "p95_seconds": round(_percentile(walls, 95), 4),
+                "p50_bytes_per_second": (
+                    round(_percentile(rates, 50)) if rates else None
+                ),
+            }
+        )
+    return rows
+
+
+def format_summary(rows: list[dict[str, Any]]) -> str:
+    """Render :func:`summarize` rows as a fixed-width table."""
+    if not rows:
+        return "No tool calls recorded."
+    header = (
+        f"{'provider':<10} {'operation':<15} {'calls':>6} {'errors':>6} "
+        f"{'retries':>7} {'cached':>6} {'p50 s':>8} {'p95 s':>8} {'MB/s':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        rate = row["p50_bytes_per_second"]
+        lines.append(
+            f"{row['provider']:<10} {row['operation']:<15} {row['calls']:>6} "
+            f"{row['errors']:>6} {row['retries']:>7} {row['cache_hits']:>6} "
+            f"{row['p50_seconds']:>8.3f} {row['p95_seconds']:>8.3f} "
+            f"{(f'{rate / 1e6:.2f}' if rate else '-'):>8}"
+        )
+    return "\n".join(lines)
+
+
+@click.command()
+@click.option(
+    "--workdir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path.cwd,
+    help="Project directory holding .clawdcut/metrics.",
+)
+@click.option("--tool", help="Only calls to this tool, e.g. pexels_download.")
+@click.option("--json", "as_json", is_flag=True, help="Print JSON instead.")
+def main(workdir: Path, tool: str | None, as_json: bool) -> None:
+    """Summarize stock tool-call metrics per provider and operation."""
+    records = MetricsLog(workdir / METRICS_PATH).records()
+    if tool:
+        records = [r for r in records if r.get("tool") == tool]
+    rows = summarize(records)
+    click.echo(json.dumps(rows, indent=2) if as_json else format_summary(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Perceptual hashes for spotting near-duplicate stock images.
+
+Pexels and Pixabay often carry the same photographer's shots, so searches
+return visually identical frames under different ids. A 64-bit difference
+hash (dHash) of the small preview each API already returns identifies them
+before anything large is downloaded: near-duplicates differ in only a few
+bits. Hashes are cached on disk by preview URL, and :class:`BKTree` finds
+every hash within a Hamming radius without comparing against all of them,
+so lookups stay fast with tens of thousands of known assets.
+
+Decoding images needs the optional Pillow dependency
+(``pip install clawdcut[images]``); without it detection is disabled.
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from clawdcut.tools.asset_cache import cache_root
+from clawdcut.tools.http_clients import _env_int
+
+HASH_SIZE = 8
+DEFAULT_MAX_DISTANCE = 6
+DEFAULT_MAX_ENTRIES = 200_000
+# Largest preview body that is hashed; anything bigger is not a preview.
+MAX_PREVIEW_BYTES = 2 * 1024**2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    key TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hashes_created ON hashes (created);
+"""
+
+
+def pillow_available() -> bool:
+    """Return whether the optional Pillow package is installed."""
+    return importlib.util.find_spec("PIL") is not None
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def to_hex(value: int) -> str:
+    """Fixed-width hex form used in payloads and the manifest."""
+    return f"{value:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def _dhash_image(image: Any) -> int:
+    """Compare adjacent pixels of a 9x8 grayscale thumbnail, row by row."""
+    from PIL import Image
+
+    small = image.convert("L").resize(
+        (HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS
+    )
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def dhash(data: bytes | Path) -> int:
+    """Return the 64-bit difference hash of an encoded image.
+
+    JPEGs are decoded at reduced scale, so hashing a full-size file costs
+    little more than hashing its preview.
+
+    Raises:
+        ValueError: If the data is not a decodable image.
+    """
+    from PIL import Image
+
+    source = data if isinstance(data, Path) else io.BytesIO(data)
+    try:
+        with Image.open(source) as image:
+            image.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+            return _dhash_image(image)
+    except (OSError, Image.DecompressionBombError) as error:
+        raise ValueError(f"Cannot hash image: {error}") from error
+
+
+@dataclass
+class _Node:
+    value: int
+    keys: list[str]
+    children: dict[int, "_Node"] = field(default_factory=dict)
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes with Hamming distance.
+
+    Each child edge is labelled with its distance to the parent, so a
+    radius search only descends into edges within ``radius`` of the query's
+    own distance (triangle inequality).
+    """
+
+    def __init__(self) -> None:
+        self._root: _Node | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, key: str) -> None:
+        """Index ``key`` under hash ``value``."""
+        self._size += 1
+        if self._root is None:
+            self._root = _Node(value, [key])
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node.value)
+            if distance == 0:
+                node.keys.append(key)
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _Node(value, [key])
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> list[tuple[int, str]]:
+        """Return ``(distance, key)`` pairs within ``radius``, nearest first."""
+        found: list[tuple[int, str]] = []
+        pending = [self._root] if self._root is not None else []
+        while pending:
+            node = pending.pop()
+            distance = hamming(value, node.value)
+            if distance <= radius:
+                found.extend((distance, key) for key in node.keys)
+            for edge, child in node.children.items():
+                if distance - radius <= edge <= distance + radius:
+                    pending.append(child)
+        return sorted(found)
+
+
+class HashCache:
+    """SQLite cache of perceptual hashes keyed by preview URL.
+
+    Args:
+        path: SQLite database file.
+        max_entries: Oldest hashes are dropped beyond this many.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def get_many(self, keys: list[str]) -> dict[str, int]:
+        """Return the cached hashes among ``keys``."""
+        if not keys:
+            return {}
+        found: dict[str, int] = {}
+        with contextlib.closing(self._connect()) as conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                rows = conn.execute(
+                    "SELECT key, hash FROM hashes WHERE key IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((key, int(value, 16)) for key, value in rows)
+        return found
+
+    def put_many(self, hashes: dict[str, int]) -> None:
+        """Store hashes, trimming the oldest beyond ``max_entries``."""
+        if not hashes:
+            return
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO hashes (key, hash, created) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET hash = excluded.hash",
+                [(key, to_hex(value), now) for key, value in hashes.items()],
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM hashes").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM hashes WHERE key IN (SELECT key FROM hashes "
+                    "ORDER BY created ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+
+@dataclass(frozen=True)
+class NearDuplicates:
+    """Settings and hash cache for near-duplicate detection.
+
+    Attributes:
+        cache: On-disk hash cache.
+        max_distance: Largest Hamming distance treated as a duplicate.
+    """
+
+    cache: HashCache
+    max_distance: int = DEFAULT_MAX_DISTANCE
+
+    @classmethod
+    def from_env(cls) -> "NearDuplicates | None":
+        """Build the default detector, or ``None`` when unavailable.
+
+        Detection needs Pillow and is disabled by
+        ``CLAWDCUT_NEAR_DUPLICATES=0``; ``CLAWDCUT_NEAR_DUPLICATE_DISTANCE``
+        sets the Hamming radius.
+        """
+        if os.environ.get("CLAWDCUT_NEAR_DUPLICATES", "1").lower() in ("0", "false"):
+            return None
+        if not pillow_available():
+            return None
+        return cls(
+            cache=HashCache(cache_root() / "phash.sqlite3"),
+            max_distance=_env_int(
+                "CLAWDCUT_NEAR_DUPLICATE_DISTANCE", DEFAULT_MAX_DISTANCE
+            ),
+        )
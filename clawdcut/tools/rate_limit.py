@@ -0,0 +1,188 @@
+"""Client-side request pacing for the stock provider APIs.
+
+Every provider gets one token bucket per session, held by
+:class:`~clawdcut.tools.http_clients.ProviderClients`, so all tool closures
+and concurrently running subagent tasks draw from the same budget. Buckets
+start from the documented quota and adjust themselves to the
+``X-Ratelimit-*`` headers the APIs return, pacing calls before the server
+has to answer with 429 and speeding up while the server reports budget to
+spare. A caller with a deadline gives up instead of waiting past it.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Mapping
+
+import httpx
+
+# Documented default quotas as (requests, window seconds).
+DEFAULT_QUOTAS: dict[str, tuple[int, float]] = {
+    "pexels": (200, 3600.0),
+    "pixabay": (100, 60.0),
+    "freesound": (60, 60.0),
+}
+MAX_BURST = 10
+
+# Reset values above this are UNIX timestamps (Pexels), below it a delta in
+# seconds (Pixabay).
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimitedError(httpx.HTTPError):
+    """Raised instead of waiting for a token past the caller's deadline."""
+
+    def __init__(self, wait: float) -> None:
+        super().__init__(
+            f"Rate limit needs a {wait:.1f}s wait, longer than the time left."
+        )
+        self.wait = wait
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from threads and event loops alike.
+
+    Callers reserve a token and then sleep for the returned delay outside
+    the lock, so concurrent callers are staggered instead of released in a
+    burst.
+
+    Args:
+        rate: Steady-state tokens added per second.
+        capacity: Maximum burst size.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_quota(cls, requests: int, window: float) -> "TokenBucket":
+        """Build a bucket spreading ``requests`` evenly over ``window`` seconds."""
+        return cls(requests / window, min(requests, MAX_BURST))
+
+    def _refill(self, now: float) -> None:
+        start = max(self._updated, self._blocked_until)
+        if now > start:
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated = max(self._updated, now)
+
+    def reserve(self, deadline: float | None = None) -> float:
+        """Take one token and return how long the caller must wait first.
+
+        Args:
+            deadline: Instant on the bucket's clock by which the wait must
+                end; no token is taken when it would end later.
+
+        Raises:
+            RateLimitedError: When the wait would run past ``deadline``.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(0.0, -self._tokens) / self.rate
+            delay += max(0.0, self._blocked_until - now)
+            if deadline is not None and now + delay > deadline:
+                self._tokens += 1
+                raise RateLimitedError(delay)
+            return delay
+
+    def acquire(self, deadline: float | None = None) -> float:
+        """Block until a token is available; return the seconds waited.
+
+        Raises:
+            RateLimitedError: When the wait would run past ``deadline``.
+        """
+        delay = self.reserve(deadline)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self, deadline: float | None = None) -> float:
+        """Async twin of :meth:`acquire`."""
+        delay = self.reserve(deadline)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Learn the remaining server-side budget from a response.
+
+        ``X-Ratelimit-Remaining`` caps the local tokens, and the remaining
+        budget is spread evenly until ``X-Ratelimit-Reset``. A budget
+        smaller than a burst can slow pacing below the documented quota; a
+        larger one can only speed it up. Once the budget is exhausted, calls
+        wait for the reset. A 429 drains the bucket so queued callers back
+        off immediately.
+        """
+        remaining = _header_float(headers, "X-Ratelimit-Remaining")
+        reset = _header_float(headers, "X-Ratelimit-Reset")
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if status_code == 429:
+                self._tokens = min(self._tokens, 0.0)
+            if remaining is None:
+                return
+            self._tokens = min(self._tokens, remaining)
+            window = None
+            if reset is not None:
+                window = reset - time.time() if reset > _EPOCH_THRESHOLD else reset
+            if not window or window <= 0:
+                self.rate = self.base_rate
+                return
+            if remaining < 1:
+                # The quota is fresh again after the reset.
+                self._blocked_until = now + window
+                self.rate = self.base_rate
+            elif remaining < self.capacity:
+                self.rate = min(self.base_rate, remaining / window)
+            else:
+                self.rate = max(self.base_rate, remaining / window)
+
+
+def _parse_quota(value: str) -> tuple[int, float] | None:
+    """Parse ``"<requests>/<seconds>"``."""
+    try:
+        requests, window = value.split("/", 1)
+        parsed = int(requests), float(window)
+    except ValueError:
+        return None
+    return parsed if parsed[0] > 0 and parsed[1] > 0 else None
+
+
+def quotas_from_env() -> dict[str, tuple[int, float]]:
+    """Return per-provider quotas, honouring environment overrides.
+
+    ``CLAWDCUT_RATE_LIMIT=0`` disables pacing entirely, and
+    ``CLAWDCUT_RATE_LIMIT_<PROVIDER>="<requests>/<seconds>"`` overrides a
+    provider's quota (e.g. for a Pexels plan with a raised limit).
+    """
+    if os.environ.get("CLAWDCUT_RATE_LIMIT", "1").lower() in ("0", "false"):
+        return {}
+    quotas = dict(DEFAULT_QUOTAS)
+    for provider in quotas:
+        override = os.environ.get(f"CLAWDCUT_RATE_LIMIT_{provider.upper()}", "")
+        if parsed := _parse_quota(override):
+            quotas[provider] = parsed
+    return quotas
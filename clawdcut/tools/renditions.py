@@ -0,0 +1,140 @@
+"""Choosing which rendition of a stock asset to download.
+
+Providers publish each clip in several renditions, from previews to 4K
+masters. Downloading the largest one for a 1080p composition wastes
+bandwidth and disk, so callers describe what the composition needs with a
+:class:`RenditionTarget` and :func:`select_rendition` picks the smallest
+file that satisfies it.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any
+
+# Named resolutions as (long side, short side).
+_NAMED_RESOLUTIONS = {
+    "4k": (3840, 2160),
+    "uhd": (3840, 2160),
+    "2160p": (3840, 2160),
+    "1440p": (2560, 1440),
+    "2k": (2560, 1440),
+    "1080p": (1920, 1080),
+    "fhd": (1920, 1080),
+    "720p": (1280, 720),
+    "hd": (1280, 720),
+    "540p": (960, 540),
+    "480p": (854, 480),
+    "360p": (640, 360),
+}
+_SPEC = re.compile(
+    r"^\s*(?:(?P<w>\d+)\s*x\s*(?P<h>\d+)|(?P<name>[a-z0-9]+))?"
+    r"\s*(?:@\s*(?P<fps>\d+(?:\.\d+)?))?\s*$"
+)
+
+
+def _number(file: dict[str, Any], key: str) -> float:
+    try:
+        return float(file.get(key) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _area(file: dict[str, Any]) -> float:
+    return _number(file, "width") * _number(file, "height")
+
+
+@dataclass(frozen=True)
+class RenditionTarget:
+    """What a composition needs from a downloaded rendition.
+
+    Sizes are orientation independent: a 1920x1080 target is met by a
+    1080x1920 portrait clip. Zero means "no requirement".
+
+    Attributes:
+        width: Required long side in pixels.
+        height: Required short side in pixels.
+        fps: Minimum frame rate.
+        max_bytes: Largest acceptable file size, when the provider reports it.
+    """
+
+    width: int = 0
+    height: int = 0
+    fps: float = 0.0
+    max_bytes: int = 0
+
+    @classmethod
+    def parse(cls, spec: str, max_bytes: int = 0) -> "RenditionTarget | None":
+        """Parse ``"1080p"``, ``"4k"``, ``"1920x1080"``, optionally ``"@30"``.
+
+        Returns:
+            The target, or ``None`` when neither a spec nor a byte budget
+            is given.
+
+        Raises:
+            ValueError: If ``spec`` is not a recognised resolution.
+        """
+        max_bytes = max(0, int(max_bytes or 0))
+        if not spec.strip():
+            return cls(max_bytes=max_bytes) if max_bytes else None
+        match = _SPEC.match(spec.lower())
+        if match is None:
+            raise ValueError(f"Unrecognised target resolution {spec!r}.")
+        if match["name"]:
+            if match["name"] not in _NAMED_RESOLUTIONS:
+                raise ValueError(f"Unrecognised target resolution {spec!r}.")
+            width, height = _NAMED_RESOLUTIONS[match["name"]]
+        else:
+            width, height = int(match["w"] or 0), int(match["h"] or 0)
+        return cls(
+            width=max(width, height),
+            height=min(width, height),
+            fps=float(match["fps"] or 0),
+            max_bytes=max_bytes,
+        )
+
+    def meets_size(self, file: dict[str, Any]) -> bool:
+        """Whether ``file`` is at least as large as the target."""
+        sides = sorted((_number(file, "width"), _number(file, "height")))
+        return sides[1] >= self.width and sides[0] >= self.height
+
+    def meets(self, file: dict[str, Any]) -> bool:
+        """Whether ``file`` satisfies both size and frame rate."""
+        fps = _number(file, "fps")
+        return self.meets_size(file) and (not fps or fps >= self.fps - 0.5)
+
+    def affordable(self, file: dict[str, Any]) -> bool:
+        """Whether ``file`` fits the byte budget (unknown sizes pass)."""
+        size = _number(file, "size")
+        return not self.max_bytes or not size or size <= self.max_bytes
+
+
+def select_rendition(
+    files: list[dict[str, Any]], target: RenditionTarget
+) -> dict[str, Any]:
+    """Pick the rendition of one asset that best serves ``target``.
+
+    Among files within the byte budget, the smallest one meeting size and
+    frame rate wins, then the smallest meeting size alone. When nothing is
+    large enough the largest affordable file is used, and when nothing is
+    affordable the smallest file overall.
+
+    Args:
+        files: Rendition dicts with ``width``/``height`` and optional
+            ``fps``/``size`` (bytes).
+        target: What the composition needs.
+
+    Returns:
+        The chosen rendition, or ``{}`` when ``files`` is empty.
+    """
+    files = [f for f in files if isinstance(f, dict)]
+    if not files:
+        return {}
+    affordable = [f for f in files if target.affordable(f)] or [
+        min(files, key=lambda f: (_number(f, "size") or math.inf, _area(f)))
+    ]
+    if target.width or target.height:
+        for check in (target.meets, target.meets_size):
+            if meeting := [f for f in affordable if check(f)]:
+                return min(meeting, key=lambda f: (_area(f), _number(f, "size")))
+    return max(affordable, key=_area)
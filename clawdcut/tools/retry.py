@@ -0,0 +1,213 @@
+"""Retry policy for stock provider HTTP calls.
+
+Transient failures (transport errors, 5xx and 429) are retried with
+decorrelated jitter so concurrent subagents drift apart instead of retrying
+in lockstep. A server-supplied ``Retry-After`` is honoured, and a total
+deadline bounds how long one tool call may spend retrying: no attempt
+starts after it, and each attempt's ``timeout`` is clamped to the time left
+before it. Streaming downloads get a longer deadline of their own, so a
+large transfer that drops late is still resumed. Each call records its
+attempts and time spent waiting in a :class:`RetryStats`, which the tools
+surface in their JSON payloads.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Mapping
+
+import httpx
+
+from clawdcut.tools.http_clients import _env_float, _env_int
+
+_RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the ``Retry-After`` delay in seconds, if present and valid.
+
+    Accepts both the delta-seconds and the HTTP-date forms.
+    """
+    value = headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _clamp_timeout(timeout: Any, limit: float) -> Any:
+    """Return ``timeout`` with every phase capped at ``limit`` seconds.
+
+    Accepts the forms httpx does: seconds, ``None`` (no timeout) or an
+    :class:`httpx.Timeout`.
+    """
+    if isinstance(timeout, httpx.Timeout):
+        return httpx.Timeout(
+            connect=_clamp_timeout(timeout.connect, limit),
+            read=_clamp_timeout(timeout.read, limit),
+            write=_clamp_timeout(timeout.write, limit),
+            pool=_clamp_timeout(timeout.pool, limit),
+        )
+    return limit if timeout is None else min(float(timeout), limit)
+
+
+@dataclass
+class RetryStats:
+    """Attempts made and seconds slept by one retried call."""
+
+    attempts: int = 0
+    wait_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the payload representation."""
+        return {"attempts": self.attempts, "wait_seconds": round(self.wait_seconds, 3)}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How transient HTTP failures are retried.
+
+    Attributes:
+        max_attempts: Total attempts, including the first request.
+        base_delay: Minimum backoff in seconds.
+        max_delay: Maximum jittered backoff in seconds.
+        deadline: Seconds after which no further attempt is started; each
+            attempt's ``timeout`` is clamped to the time left.
+        download_deadline: :attr:`deadline` for streaming downloads, whose
+            transfers can legitimately run for minutes.
+        respect_retry_after: Wait at least ``Retry-After`` on 429/503.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 10.0
+    deadline: float = 60.0
+    download_deadline: float = 600.0
+    respect_retry_after: bool = True
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Build a policy from ``CLAWDCUT_RETRY_*`` environment variables."""
+        return cls(
+            max_attempts=_env_int("CLAWDCUT_RETRY_MAX_ATTEMPTS", 3),
+            base_delay=_env_float("CLAWDCUT_RETRY_BASE_DELAY", 0.2),
+            max_delay=_env_float("CLAWDCUT_RETRY_MAX_DELAY", 10.0),
+            deadline=_env_float("CLAWDCUT_RETRY_DEADLINE", 60.0),
+            download_deadline=_env_float("CLAWDCUT_RETRY_DOWNLOAD_DEADLINE", 600.0),
+        )
+
+    def for_downloads(self) -> "RetryPolicy":
+        """Return this policy bounded by :attr:`download_deadline`."""
+        return replace(self, deadline=self.download_deadline)
+
+    @staticmethod
+    def is_retryable(error: httpx.HTTPError) -> bool:
+        """Return whether the HTTP error should be retried."""
+        if isinstance(error, httpx.HTTPStatusError):
+            code = error.response.status_code
+            return code >= 500 or code == 429
+        return isinstance(error, httpx.RequestError)
+
+    def next_delay(self, previous: float, error: httpx.HTTPError) -> float:
+        """Return the decorrelated-jitter backoff after ``error``.
+
+        The delay is drawn from ``[base_delay, 3 * previous]`` and capped at
+        ``max_delay``; a longer ``Retry-After`` from the server wins.
+        """
+        upper = max(self.base_delay, previous * 3)
+        delay = min(self.max_delay, random.uniform(self.base_delay, upper))
+        if (
+            self.respect_retry_after
+            and isinstance(error, httpx.HTTPStatusError)
+            and error.response.status_code in _RETRY_AFTER_STATUSES
+        ):
+            retry_after = parse_retry_after(error.response.headers)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        return delay
+
+    def _backoff(
+        self, error: httpx.HTTPError, started: float, previous: float
+    ) -> float:
+        """Return the next delay, or re-raise when retrying must stop."""
+        if not self.is_retryable(error):
+            raise error
+        delay = self.next_delay(previous, error)
+        if time.monotonic() - started + delay >= self.deadline:
+            raise error
+        return delay
+
+    def _bounded(self, kwargs: dict[str, Any], started: float) -> dict[str, Any]:
+        """``kwargs`` with any ``timeout`` clamped to the deadline's remainder."""
+        if "timeout" not in kwargs:
+            return kwargs
+        left = max(0.0, self.deadline - (time.monotonic() - started))
+        return {**kwargs, "timeout": _clamp_timeout(kwargs["timeout"], left)}
+
+    def call(
+        self,
+        request_fn: Callable[..., httpx.Response],
+        url: str,
+        stats: RetryStats | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Issue ``request_fn(url, **kwargs)``, retrying transient failures.
+
+        A ``timeout`` in ``kwargs`` is clamped per attempt so the last
+        attempt cannot run past :attr:`deadline`.
+
+        Raises:
+            httpx.HTTPError: The last error once retries are exhausted, the
+                error is not retryable, or the deadline would be exceeded.
+        """
+        stats = stats if stats is not None else RetryStats()
+        started = time.monotonic()
+        delay = 0.0
+        while True:
+            stats.attempts += 1
+            try:
+                response = request_fn(url, **self._bounded(kwargs, started))
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as error:
+                if stats.attempts >= self.max_attempts:
+                    raise
+                delay = self._backoff(error, started, delay)
+            time.sleep(delay)
+            stats.wait_seconds += delay
+
+    async def acall(
+        self,
+        request_fn: Callable[..., Awaitable[httpx.Response]],
+        url: str,
+        stats: RetryStats | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Async twin of :meth:`call` that never blocks the event loop."""
+        stats = stats if stats is not None else RetryStats()
+        started = time.monotonic()
+        delay = 0.0
+        while True:
+            stats.attempts += 1
+            try:
+                response = await request_fn(url, **self._bounded(kwargs, started))
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as error:
+                if stats.attempts >= self.max_attempts:
+                    raise
+                delay = self._backoff(error, started, delay)
+            await asyncio.sleep(delay)
+            stats.wait_seconds += delay
@@ -0,0 +1,235 @@
+"""Persistent, user-level cache for stock provider search responses.
+
+Responses are stored zlib-compressed in SQLite under the clawdcut cache
+directory, keyed on provider, endpoint and normalized query parameters.
+API keys are never part of the key. Entries expire after a TTL and the
+cache is trimmed least-recently-used first once it exceeds its size cap.
+:class:`PageCache` keeps the pages seen in the current session in memory.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Mapping
+
+from clawdcut.tools.asset_cache import cache_root
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 64 * 1024**2
+
+_SECRET_PARAMS = frozenset({"key", "token"})
+_QUERY_PARAMS = frozenset({"q", "query"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def normalize_params(params: Mapping[str, Any]) -> dict[str, str]:
+    """Drop credentials and canonicalize free-text queries."""
+    normalized: dict[str, str] = {}
+    for name, value in params.items():
+        if name in _SECRET_PARAMS:
+            continue
+        text = str(value)
+        if name in _QUERY_PARAMS:
+            text = " ".join(text.lower().split())
+        normalized[name] = text
+    return normalized
+
+
+def cache_key(provider: str, url: str, params: Mapping[str, Any]) -> str:
+    """Return the stable cache key for one provider request."""
+    raw = json.dumps(
+        {"provider": provider, "url": url, "params": normalize_params(params)},
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class SearchCache:
+    """SQLite-backed TTL + LRU cache of decoded JSON search responses.
+
+    Args:
+        path: SQLite database file.
+        ttl_seconds: Maximum age of a served entry.
+        max_bytes: Cap on the summed compressed payload size.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls) -> "SearchCache | None":
+        """Build the default cache, or ``None`` when disabled.
+
+        Honours ``CLAWDCUT_SEARCH_CACHE=0``, ``CLAWDCUT_SEARCH_CACHE_TTL``
+        (seconds) and ``CLAWDCUT_SEARCH_CACHE_MAX_BYTES``.
+        """
+        if os.environ.get("CLAWDCUT_SEARCH_CACHE", "1").lower() in ("0", "false"):
+            return None
+        try:
+            ttl = float(
+                os.environ.get("CLAWDCUT_SEARCH_CACHE_TTL", DEFAULT_TTL_SECONDS)
+            )
+        except ValueError:
+            ttl = DEFAULT_TTL_SECONDS
+        try:
+            max_bytes = int(
+                os.environ.get("CLAWDCUT_SEARCH_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+            )
+        except ValueError:
+            max_bytes = DEFAULT_MAX_BYTES
+        return cls(cache_root() / "search.sqlite3", ttl, max_bytes)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def get(
+        self, provider: str, url: str, params: Mapping[str, Any]
+    ) -> tuple[dict[str, Any], float] | None:
+        """Return a fresh cached response and its age in seconds, if any."""
+        key = cache_key(provider, url, params)
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT created, payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            created, payload = row
+            if now - created > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        try:
+            data = json.loads(zlib.decompress(payload))
+        except (zlib.error, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        return data, now - created
+
+    def put(
+        self,
+        provider: str,
+        url: str,
+        params: Mapping[str, Any],
+        data: dict[str, Any],
+    ) -> None:
+        """Store a decoded response and trim the cache to its caps."""
+        key = cache_key(provider, url, params)
+        payload = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+        now = time.time()
+        with contextlib.closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, provider, created, last_used, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, now, now, len(payload), payload),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE created < ?",
+                (now - self.ttl_seconds,),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least-recently-used entries until under ``max_bytes``."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[
+            0
+        ]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+
+class PageCache:
+    """Session-scoped, in-memory LRU of decoded search pages.
+
+    Pages fetched earlier in the session, including ones prefetched in the
+    background, are served without touching SQLite or the network. A key
+    can be marked pending while a prefetch is in flight so a concurrent
+    request waits for it instead of issuing a duplicate call.
+
+    Args:
+        max_entries: Number of pages kept before the oldest-used is dropped.
+    """
+
+    def __init__(self, max_entries: int = 128) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._pending: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, timeout: float = 0.0) -> dict[str, Any] | None:
+        """Return a cached page, waiting up to ``timeout`` if it is pending."""
+        with self._lock:
+            event = self._pending.get(key)
+        if event is not None and timeout > 0:
+            event.wait(timeout)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def is_pending(self, key: str) -> bool:
+        """Return whether a prefetch for ``key`` is in flight."""
+        with self._lock:
+            return key in self._pending
+
+    def put(self, key: str, data: dict[str, Any]) -> None:
+        """Store a page, evicting the least-recently-used beyond the cap."""
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def begin(self, key: str) -> bool:
+        """Mark ``key`` pending; ``False`` if it is cached or already pending."""
+        with self._lock:
+            if key in self._entries or key in self._pending:
+                return False
+            self._pending[key] = threading.Event()
+            return True
+
+    def end(self, key: str) -> None:
+        """Clear the pending mark and wake any waiters."""
+        with self._lock:
+            event = self._pending.pop(key, None)
+        if event is not None:
+            event.set()
@@ -0,0 +1,751 @@
+"""Local stand-in for the stock media APIs, for offline runs and load tests.
+
+:class:`StandInServer` answers the Pexels, Pixabay and Freesound API paths
+and serves media, so the stock tools run with no network: export the
+variables from :meth:`StandInServer.environ` (``CLAWDCUT_PEXELS_BASE_URL``
+and friends) and every search and download goes to it.
+
+Responses come from a recordings directory. In record mode a missing
+response is fetched from the live API once and saved; otherwise it is
+synthesized in the provider's shape. Absolute URLs in JSON bodies are
+rewritten to ``/media/<host>/<path>`` on the stand-in, so the media they
+link to is replayed (or synthesized) too. :class:`Faults` adds latency,
+random 503s, periodic 429 bursts and a media throughput cap, all drawn
+from a seeded generator so load tests are reproducible.
+
+Run ``python -m clawdcut.tools.standin --help`` for the command line.
+"""
+
+import contextlib
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import parse_qsl, urlsplit
+
+import click
+import httpx
+
+from clawdcut.tools.http_clients import DEFAULT_BASE_URLS, PROVIDERS, base_url_env
+
+DEFAULT_PORT = 8765
+DEFAULT_MEDIA_BYTES = 256 * 1024
+SYNTHETIC_TOTAL = 500
+_CHUNK = 64 * 1024
+# Query parameters carrying credentials: forwarded upstream, never recorded.
+_SECRET_PARAMS = frozenset({"key", "token"})
+_ABSOLUTE_URL = re.compile(r"https://([A-Za-z0-9.-]+)/")
+_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".mp4": "video/mp4",
+    ".mp3": "audio/mpeg",
+}
+_RANGE = re.compile(r"bytes=(\d+)-$")
+
+
+@dataclass(frozen=True)
+class Faults:
+    """Degradations applied to the stand-in's responses.
+
+    Attributes:
+        latency: Seconds added before every response.
+        jitter: Up to this many seconds randomly added to or removed from
+            ``latency``.
+        error_rate: Share of requests answered with 503.
+        burst_every: API requests per cycle; each cycle ends in a 429 burst.
+        burst_length: API requests per burst answered with 429.
+        retry_after: ``Retry-After`` seconds sent with each 429.
+        throughput: Media bytes per second per response; 0 is unthrottled.
+        seed: Seed for the error and jitter draws.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    burst_every: int = 0
+    burst_length: int = 0
+    retry_after: float = 1.0
+    throughput: int = 0
+    seed: int = 0
+
+    def throttled(self, api_request: int) -> bool:
+        """Whether the ``api_request``-th API request (from 1) gets a 429."""
+        if not self.burst_every or not self.burst_length:
+            return False
+        position = (api_request - 1) % self.burst_every
+        return position >= self.burst_every - self.burst_length
+
+
+class Recordings:
+    """Recorded responses: ``<key>.json`` metadata plus ``<key>.body`` each.
+
+    Keys hash the request path and query without credentials, so recordings
+    can be shared without leaking API keys.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @staticmethod
+    def key(path: str, query: str) -> str:
+        """Recording key for a stand-in request path and query string."""
+        params = sorted(
+            (name, value)
+            for name, value in parse_qsl(query, keep_blank_values=True)
+            if name not in _SECRET_PARAMS
+        )
+        raw = path + "?" + "&".join(f"{name}={value}" for name, value in params)
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def load(self, key: str) -> tuple[int, str, Path] | None:
+        """Return ``(status, content type, body path)``, or ``None``."""
+        try:
+            meta = json.loads((self.root / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            return None
+        body = self.root / f"{key}.body"
+        if not body.is_file():
+            return None
+        return int(meta["status"]), str(meta["content_type"]), body
+
+    def body_path(self, key: str) -> Path:
+        """Where the body for ``key`` is (or will be) stored."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f"{key}.body"
+
+    def save(self, key: str, request: str, status: int, content_type: str) -> None:
+        """Write the metadata once the body is in place at :meth:`body_path`."""
+        (self.root / f"{key}.json").write_text(
+            json.dumps(
+                {"request": request, "status": status, "content_type": content_type},
+                indent=2,
+            )
+        )
+
+
+def _ident(*parts: Any) -> int:
+    """Stable pseudo-random asset id for synthetic responses."""
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+    return 100_000 + int(digest[:8], 16) % 9_000_000
+
+
+def _slug(query: str) -> str:
+    return "-".join(re.findall(r"[a-z0-9]+", query.lower())) or "stock"
+
+
+def _pexels_photo(asset_id: int, query: str) -> dict[str, Any]:
+    src = f"https://images.pexels.com/photos/{asset_id}/pexels-photo-{asset_id}.jpeg"
+    return {
+        "id": asset_id,
+        "width": 1920,
+        "height": 1080,
+        "url": f"https://www.pexels.com/photo/{_slug(query)}-{asset_id}/",
+        "photographer": f"Photographer {asset_id % 97}",
+        "alt": f"{query} {asset_id}",
+        "src": {
+            "original": src,
+            "large": f"{src}?h=650",
+            "medium": f"{src}?h=350",
+            "small": f"{src}?h=130",
+        },
+    }
+
+
+def _pexels_video(asset_id: int, query: str, size: int) -> dict[str, Any]:
+    files = [
+        ("uhd", 3840, 2160),
+        ("hd", 1920, 1080),
+        ("hd", 1280, 720),
+        ("sd", 960, 540),
+    ]
+    return {
+        "id": asset_id,
+        "width": 3840,
+        "height": 2160,
+        "url": f"https://www.pexels.com/video/{_slug(query)}-{asset_id}/",
+        "image": f"https://images.pexels.com/videos/{asset_id}/preview.jpeg",
+        "duration": 5 + asset_id % 26,
+        "user": {"name": f"Videographer {asset_id % 89}"},
+        "video_files": [
+            {
+                "id": asset_id * 10 + index,
+                "quality": quality,
+                "file_type": "video/mp4",
+                "width": width,
+                "height": height,
+                "fps": 30.0,
+                "link": (
+                    f"https://videos.pexels.com/video-files/{asset_id}/"
+                    f"{asset_id}-{quality}_{width}_{height}_30fps.mp4"
+                ),
+                "size": size,
+            }
+            for index, (quality, width, height) in enumerate(files)
+        ],
+    }
+
+
+def _pixabay_image(asset_id: int, query: str, size: int) -> dict[str, Any]:
+    return {
+        "id": asset_id,
+        "pageURL": f"https://pixabay.com/photos/{_slug(query)}-{asset_id}/",
+        "type": "photo",
+        "tags": f"{query}, stock, sample",
+        "previewURL": f"https://cdn.pixabay.com/photo/{asset_id}_150.jpg",
+        "previewWidth": 150,
+        "previewHeight": 100,
+        "webformatURL": f"https://pixabay.com/get/{asset_id}_640.jpg",
+        "webformatWidth": 640,
+        "webformatHeight": 427,
+        "largeImageURL": f"https://pixabay.com/get/{asset_id}_1280.jpg",
+        "imageWidth": 4000,
+        "imageHeight": 2667,
+        "imageSize": size,
+        "user": f"user{asset_id % 83}",
+    }
+
+
+def _pixabay_video(asset_id: int, query: str, size: int) -> dict[str, Any]:
+    tiers = {
+        "large": (1920, 1080),
+        "medium": (1280, 720),
+        "small": (960, 540),
+        "tiny": (640, 360),
+    }
+    return {
+        "id": asset_id,
+        "pageURL": f"https://pixabay.com/videos/{_slug(query)}-{asset_id}/",
+        "type": "film",
+        "tags": f"{query}, stock, sample",
+        "duration": 5 + asset_id % 26,
+        "videos": {
+            tier: {
+                "url": f"https://cdn.pixabay.com/video/{asset_id}/{tier}.mp4",
+                "width": width,
+                "height": height,
+                "size": size,
+                "thumbnail": f"https://cdn.pixabay.com/video/{asset_id}/{tier}.jpg",
+            }
+            for tier, (width, height) in tiers.items()
+        },
+        "user": f"user{asset_id % 83}",
+    }
+
+
+def _freesound_sound(asset_id: int, query: str) -> dict[str, Any]:
+    folder = f"https://cdn.freesound.org/previews/{asset_id // 1000}/{asset_id}"
+    return {
+        "id": asset_id,
+        "name": f"{query} {asset_id}.wav",
+        "username": f"recordist{asset_id % 71}",
+        "duration": round(1 + (asset_id % 600) / 10, 1),
+        "license": "http://creativecommons.org/publicdomain/zero/1.0/",
+        "tags": [*_slug(query).split("-"), "sample"],
+        "previews": {
+            "preview-hq-mp3": f"{folder}_hq.mp3",
+            "preview-lq-mp3": f"{folder}_lq.mp3",
+        },
+    }
+
+
+def _page(params: dict[str, str], size_param: str, total: int) -> tuple[int, int]:
+    """``(page, items on it)`` for a paginated synthetic response."""
+    try:
+        page = max(1, int(params.get("page", 1)))
+        per_page = min(max(1, int(params.get(size_param, 15))), 200)
+    except ValueError:
+        page, per_page = 1, 15
+    return page, max(0, min(per_page, total - (page - 1) * per_page))
+
+
+def synthesize(
+    provider: str,
+    path: str,
+    params: dict[str, str],
+    media_bytes: int = DEFAULT_MEDIA_BYTES,
+    total: int = SYNTHETIC_TOTAL,
+) -> dict[str, Any] | None:
+    """Build a deterministic API response in the provider's shape.
+
+    Args:
+        provider: "pexels", "pixabay" or "freesound".
+        path: API path below the provider's base URL.
+        params: Query parameters of the request.
+        media_bytes: File size announced for every rendition.
+        total: Results the query pretends to have.
+
+    Returns:
+        The response body, or ``None`` for an unknown path.
+    """
+    query = params.get("query") or params.get("q") or "stock"
+    if provider == "pexels" and path.startswith("/videos/videos/"):
+        asset_id = int(path.rsplit("/", 1)[-1] or 0)
+        return _pexels_video(asset_id, query, media_bytes)
+    if provider == "pexels" and path in ("/v1/search", "/videos/search"):
+        page, count = _page(params, "per_page", total)
+        ids = [_ident(provider, path, query, page, i) for i in range(count)]
+        is_video = path == "/videos/search"
+        return {
+            "page": page,
+            "per_page": int(params.get("per_page", 15)),
+            "total_results": total,
+            ("videos" if is_video else "photos"): [
+                (
+                    _pexels_video(i, query, media_bytes)
+                    if is_video
+                    else _pexels_photo(i, query)
+                )
+                for i in ids
+            ],
+        }
+    if provider == "pixabay" and path in ("/api/", "/api/videos/"):
+        build = _pixabay_video if path == "/api/videos/" else _pixabay_image
+        if params.get("id"):
+            hit = build(int(params["id"]), query, media_bytes)
+            return {"total": 1, "totalHits": 1, "hits": [hit]}
+        page, count = _page(params, "per_page", total)
+        return {
+            "total": total,
+            "totalHits": total,
+            "hits": [
+                build(_ident(provider, path, query, page, i), query, media_bytes)
+                for i in range(count)
+            ],
+        }
+    if provider == "freesound" and path == "/apiv2/search/text/":
+        page, count = _page(params, "page_size", total)
+        return {
+            "count": total,
+            "results": [
+                _freesound_sound(_ident(provider, query, page, i), query)
+                for i in range(count)
+            ],
+        }
+    return None
+
+
+def _synthetic_chunks(size: int, offset: int) -> Iterator[bytes]:
+    """Deterministic filler bytes ``offset``..``size`` of a synthetic file."""
+    block = bytes(range(256)) * (_CHUNK // 256)
+    position = offset
+    while position < size:
+        start = position % len(block)
+        chunk = block[start : start + min(len(block) - start, size - position)]
+        position += len(chunk)
+        yield chunk
+
+
+def _file_chunks(path: Path, offset: int) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        while chunk := handle.read(_CHUNK):
+            yield chunk
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Parallel clients connect at once; the default backlog of 5 drops SYNs
+    # and adds second-long retransmit stalls to load tests.
+    request_queue_size = 128
+    standin: "StandInServer"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _HTTPServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # client's delayed ACK holds every keep-alive response back ~40 ms.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        self.server.standin._serve(self, head=False)
+
+    def do_HEAD(self) -> None:  # noqa: N802 - http.server naming
+        self.server.standin._serve(self, head=True)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep load tests quiet; :attr:`StandInServer.stats` counts requests."""
+
+
+class StandInServer:
+    """Threaded HTTP server replaying or synthesizing provider traffic.
+
+    Use it as a context manager, or call :meth:`start` and :meth:`close`.
+
+    Args:
+        recordings: Directory of recorded responses; without one every
+            response is synthesized.
+        faults: Degradations to inject; defaults to none.
+        record: Fetch responses missing from ``recordings`` from the live
+            provider and save them.
+        media_bytes: Size of synthesized media files.
+        host: Interface to listen on.
+        port: Port to listen on; 0 picks a free one.
+        upstreams: Provider API roots used when recording; defaults to the
+            live APIs.
+        upstream_transport: Optional transport for recording, mainly for
+            tests.
+    """
+
+    def __init__(
+        self,
+        recordings: Path | None = None,
+        faults: Faults | None = None,
+        record: bool = False,
+        media_bytes: int = DEFAULT_MEDIA_BYTES,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        upstreams: dict[str, str] | None = None,
+        upstream_transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        if record and recordings is None:
+            raise ValueError("Recording needs a recordings directory.")
+        self.recordings = Recordings(recordings) if recordings else None
+        self.faults = faults or Faults()
+        self.record = record
+        self.media_bytes = media_bytes
+        self.upstreams = {**DEFAULT_BASE_URLS, **(upstreams or {})}
+        self._upstream_transport = upstream_transport
+        self._upstream: httpx.Client | None = None
+        self._address = (host, port)
+        self._httpd: _HTTPServer | None = None
+        self._url = ""
+        self._thread: threading.Thread | None = None
+        self._random = random.Random(self.faults.seed)
+        self._stats: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Root URL of the server, once started."""
+        if not self._url:
+            raise RuntimeError("StandInServer has not been started.")
+        return self._url
+
+    def environ(self) -> dict[str, str]:
+        """Environment variables pointing every provider at this server."""
+        return {base_url_env(p): f"{self.url}/{p}" for p in PROVIDERS}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Requests served, faults injected and body bytes sent so far."""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self) -> "StandInServer":
+        """Start serving on a background thread."""
+        self._httpd = _HTTPServer(self._address, _Handler)
+        self._httpd.standin = self
+        host, port = self._httpd.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        self._url = f"http://{host}:{port}"
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="clawdcut-standin",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop serving and release the upstream client."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._upstream is not None:
+            self._upstream.close()
+            self._upstream = None
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def _delay(self) -> None:
+        with self._lock:
+            jitter = self._random.uniform(-self.faults.jitter, self.faults.jitter)
+        if (delay := self.faults.latency + jitter) > 0:
+            time.sleep(delay)
+
+    def _fault(self, api: bool) -> int | None:
+        """Status to answer with instead of the real response, if any."""
+        with self._lock:
+            self._stats["requests"] += 1
+            if api:
+                self._stats["api_requests"] += 1
+                if self.faults.throttled(self._stats["api_requests"]):
+                    self._stats["throttled"] += 1
+                    return 429
+            if self._random.random() < self.faults.error_rate:
+                self._stats["errors"] += 1
+                return 503
+        return None
+
+    def _serve(self, handler: BaseHTTPRequestHandler, head: bool) -> None:
+        split = urlsplit(handler.path)
+        root, _, rest = split.path.lstrip("/").partition("/")
+        rest = "/" + rest
+        self._delay()
+        if root not in PROVIDERS and root != "media":
+            body = b'{"error": "Not found"}'
+            self._send(handler, 404, "application/json", body, head)
+            return
+        if status := self._fault(api=root != "media"):
+            headers = {"Retry-After": f"{self.faults.retry_after:g}"}
+            body = b'{"error": "Stand-in fault"}'
+            self._send(handler, status, "application/json", body, head, headers)
+            return
+        try:
+            if root == "media":
+                self._media(handler, rest, split.query, head)
+            else:
+                self._api(handler, root, rest, split.query, head)
+        except httpx.HTTPError as error:
+            body = json.dumps({"error": f"Upstream failed: {error}"}).encode()
+            self._send(handler, 502, "application/json", body, head)
+
+    def _client(self) -> httpx.Client:
+        with self._lock:
+            if self._upstream is None:
+                self._upstream = httpx.Client(
+                    transport=self._upstream_transport,
+                    follow_redirects=True,
+                    timeout=60.0,
+                )
+            return self._upstream
+
+    def _fetch(self, key: str, request: str, url: str, headers: dict[str, str]) -> None:
+        """Stream an upstream response into the recordings."""
+        assert self.recordings is not None
+        body = self.recordings.body_path(key)
+        with self._client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 429 or response.status_code >= 500:
+                response.raise_for_status()
+            with body.open("wb") as handle:
+                for chunk in response.iter_bytes():
+                    handle.write(chunk)
+            content_type = response.headers.get("Content-Type", "")
+        self.recordings.save(key, request, response.status_code, content_type)
+
+    def _recorded(
+        self, key: str, request: str, url: str, headers: dict[str, str]
+    ) -> tuple[int, str, Path] | None:
+        """Load a recording, recording it first in record mode."""
+        if self.recordings is None:
+            return None
+        hit = self.recordings.load(key)
+        if hit is None and self.record:
+            self._fetch(key, request, url, headers)
+            hit = self.recordings.load(key)
+        return hit
+
+    def _api(
+        self,
+        handler: BaseHTTPRequestHandler,
+        provider: str,
+        path: str,
+        query: str,
+        head: bool,
+    ) -> None:
+        key = Recordings.key(f"/{provider}{path}", query)
+        upstream = self.upstreams[provider].rstrip("/") + path
+        headers = {}
+        if auth := handler.headers.get("Authorization"):
+            headers["Authorization"] = auth
+        hit = self._recorded(
+            key,
+            f"/{provider}{path}",
+            f"{upstream}?{query}" if query else upstream,
+            headers,
+        )
+        if hit is not None:
+            status, content_type, body_path = hit
+            body = body_path.read_bytes()
+        else:
+            data = synthesize(provider, path, dict(parse_qsl(query)), self.media_bytes)
+            status = 200 if data is not None else 404
+            content_type = "application/json"
+            body = json.dumps(data or {"error": "Not found"}).encode()
+        if "json" in content_type:
+            body = _ABSOLUTE_URL.sub(
+                lambda m: f"{self.url}/media/{m[1]}/", body.decode()
+            ).encode()
+        self._send(handler, status, content_type, body, head)
+
+    def _media(
+        self, handler: BaseHTTPRequestHandler, path: str, query: str, head: bool
+    ) -> None:
+        key = Recordings.key(f"/media{path}", query)
+        upstream = f"https://{path.lstrip('/')}"
+        hit = self._recorded(
+            key, f"/media{path}", f"{upstream}?{query}" if query else upstream, {}
+        )
+        content_type = _CONTENT_TYPES.get(Path(path).suffix.lower(), "")
+        if hit is not None:
+            status, content_type, body_path = hit
+            if status >= 400:
+                self._send(handler, status, content_type, body_path.read_bytes(), head)
+                return
+            size = body_path.stat().st_size
+
+            def chunks(offset: int) -> Iterator[bytes]:
+                return _file_chunks(body_path, offset)
+
+        elif not content_type:
+            self._send(handler, 404, "text/plain", b"Not found", head)
+            return
+        else:
+            size = self.media_bytes
+
+            def chunks(offset: int) -> Iterator[bytes]:
+                return _synthetic_chunks(size, offset)
+
+        offset = 0
+        headers = {"Accept-Ranges": "bytes", "ETag": f'"{key}"'}
+        if match := _RANGE.match(handler.headers.get("Range", "")):
+            offset = int(match.group(1))
+            if offset >= size:
+                headers["Content-Range"] = f"bytes */{size}"
+                self._send(handler, 416, "text/plain", b"", head, headers)
+                return
+            headers["Content-Range"] = f"bytes {offset}-{size - 1}/{size}"
+        self._stream(
+            handler,
+            206 if offset else 200,
+            content_type or "application/octet-stream",
+            size - offset,
+            chunks(offset),
+            head,
+            headers,
+        )
+
+    def _send(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        content_type: str,
+        body: bytes,
+        head: bool,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self._stream(
+            handler, status, content_type, len(body), iter([body]), head, headers
+        )
+
+    def _stream(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        content_type: str,
+        length: int,
+        chunks: Iterator[bytes],
+        head: bool,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Write a response, pacing bodies to the configured throughput."""
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(length))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        if head:
+            return
+        rate = self.faults.throughput if content_type != "application/json" else 0
+        started, sent = time.monotonic(), 0
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            for chunk in chunks:
+                # Small writes keep throttled transfers smooth.
+                step = max(1024, rate // 20) if rate else len(chunk)
+                for start in range(0, len(chunk), step):
+                    handler.wfile.write(chunk[start : start + step])
+                    sent += min(step, len(chunk) - start)
+                    ahead = sent / rate - (time.monotonic() - started) if rate else 0
+                    if ahead > 0:
+                        time.sleep(ahead)
+        self._count("bytes_sent", sent)
+
+
+def _burst(value: str) -> tuple[int, int]:
+    if not value:
+        return 0, 0
+    every, _, length = value.partition(":")
+    try:
+        return int(every), int(length or 1)
+    except ValueError as error:
+        raise click.BadParameter("use EVERY:LENGTH, e.g. 50:5") from error
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=DEFAULT_PORT, show_default=True)
+@click.option(
+    "--recordings",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory of recorded responses to replay.",
+)
+@click.option("--record", is_flag=True, help="Record missing responses live.")
+@click.option("--latency", default=0.0, help="Seconds added to every response.")
+@click.option("--jitter", default=0.0, help="Random +/- seconds on the latency.")
+@click.option("--error-rate", default=0.0, help="Share of requests failing with 503.")
+@click.option("--burst", default="", help="429 bursts as EVERY:LENGTH requests.")
+@click.option("--retry-after", default=1.0, help="Retry-After seconds on 429s.")
+@click.option("--throughput", default=0, help="Media bytes per second (0: no cap).")
+@click.option("--media-bytes", default=DEFAULT_MEDIA_BYTES, show_default=True)
+@click.option("--seed", default=0, help="Seed for injected faults.")
+def main(
+    host: str,
+    port: int,
+    recordings: Path | None,
+    record: bool,
+    latency: float,
+    jitter: float,
+    error_rate: float,
+    burst: str,
+    retry_after: float,
+    throughput: int,
+    media_bytes: int,
+    seed: int,
+) -> None:
+    """Serve recorded or synthetic stock provider traffic locally."""
+    if record and recordings is None:
+        raise click.UsageError("--record needs --recordings.")
+    burst_every, burst_length = _burst(burst)
+    faults = Faults(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        burst_every=burst_every,
+        burst_length=burst_length,
+        retry_after=retry_after,
+        throughput=throughput,
+        seed=seed,
+    )
+    server = StandInServer(recordings, faults, record, media_bytes, host, port)
+    with server:
+        click.echo(f"Stand-in provider server on {server.url}")
+        for name, value in server.environ().items():
+            click.echo(f"export {name}={value}")
+        with contextlib.suppress(KeyboardInterrupt):
+            threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,80 +1,342 @@
 """Stock media API tools for searching and downloading free assets.
 
 Supports Pexels and Pixabay for searching and downloading
-free stock photos, videos, and other media.
+free stock photos, videos, and other media. ``stock_search`` queries every
+configured provider concurrently and merges the hits into one ranking.
 """
 
+import asyncio
+import contextlib
+import contextvars
 import json
 import os
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable, cast
+from typing import Any, Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
 
 import httpx
 
-PEXELS_PHOTO_URL = "https://api.pexels.com/v1/search"
-PEXELS_VIDEO_URL = "https://api.pexels.com/videos/search"
-PIXABAY_IMAGE_URL = "https://pixabay.com/api/"
-PIXABAY_VIDEO_URL = "https://pixabay.com/api/videos/"
-FREESOUND_SEARCH_URL = "https://freesound.org/apiv2/search/text/"
-MAX_RETRIES = 3
-RETRY_BACKOFF_SECONDS = 0.2
+from clawdcut.tools.asset_cache import AssetStore, asset_key, sha256_file, url_key
+from clawdcut.tools.candidates import (
+    PEXELS_LICENSE,
+    PIXABAY_LICENSE,
+    Candidate,
+    best_pexels_video_file,
+    compact_candidates,
+    freesound_candidates,
+    merge_candidates,
+    pexels_photo_candidates,
+    pexels_video_candidates,
+    pixabay_image_candidates,
+    pixabay_rendition,
+    pixabay_video_candidates,
+    style_rank,
+)
+from clawdcut.tools.downloads import (
+    DownloadBudget,
+    DownloadRejectedError,
+    apreflight,
+    astream_to_file,
+    media_kind,
+    preflight,
+    stream_to_file,
+)
+from clawdcut.tools.filters import SearchFilters
+from clawdcut.tools.http_clients import (
+    PROVIDERS,
+    ProviderClients,
+    _env_float,
+    _env_int,
+    endpoint,
+)
+from clawdcut.tools.manifest import AssetManifest, ManifestRecord
+from clawdcut.tools.metrics import (
+    MetricsLog,
+    ainstrument,
+    current_call,
+    instrument,
+    record_error,
+    record_response,
+)
+from clawdcut.tools.phash import (
+    MAX_PREVIEW_BYTES,
+    BKTree,
+    NearDuplicates,
+    dhash,
+    to_hex,
+)
+from clawdcut.tools.rate_limit import RateLimitedError, TokenBucket
+from clawdcut.tools.renditions import RenditionTarget
+from clawdcut.tools.retry import RetryPolicy, RetryStats
+from clawdcut.tools.search_cache import PageCache, SearchCache, cache_key
+from clawdcut.tools.style_brief import StyleBriefCache, StyleMatcher
+
+# API paths, resolved against each provider's base URL by ``endpoint``.
+PEXELS_PHOTO_PATH = "/v1/search"
+PEXELS_VIDEO_PATH = "/videos/search"
+PEXELS_VIDEO_DETAIL_PATH = "/videos/videos/"
+PIXABAY_IMAGE_PATH = "/api/"
+PIXABAY_VIDEO_PATH = "/api/videos/"
+FREESOUND_SEARCH_PATH = "/apiv2/search/text/"
+STOCK_SEARCH_DEADLINE_SECONDS = 8.0
+PREFETCH_WAIT_SECONDS = 30.0
+BATCH_DOWNLOAD_CONCURRENCY = 4
+MAX_BATCH_DOWNLOAD_CONCURRENCY = 16
+OUTPUT_MODES = ("text", "compact")
+# Previews hashed per compact search, how many are fetched at once, and how
+# long a single-provider search waits for them.
+MAX_PREVIEW_HASHES = 40
+PREVIEW_CONCURRENCY = 8
+PREVIEW_TIMEOUT_SECONDS = 10.0
+# Search hits and compact handles remembered per session for downloads.
+MAX_REMEMBERED_HITS = 5000
+
+_PROVIDER_LABELS = {
+    "pexels": "Pexels",
+    "pixabay": "Pixabay",
+    "freesound": "Freesound",
+}
+_API_KEY_ENV = {
+    "pexels": "PEXELS_API_KEY",
+    "pixabay": "PIXABAY_API_KEY",
+    "freesound": "FREESOUND_API_KEY",
+}
+
+
+def _with_metrics(payload: dict[str, Any]) -> str:
+    """Serialize ``payload``, adding the current tool call's metrics."""
+    if call := current_call():
+        payload["metrics"] = call.finish(payload)
+    return json.dumps(payload, ensure_ascii=False)
 
 
 def _json_success(summary: str, **extra: Any) -> str:
     """Build a structured success payload."""
-    return json.dumps(
+    return _with_metrics(
         {
             "success": True,
             "summary": summary,
             **extra,
-        },
-        ensure_ascii=False,
+        }
     )
 
 
 def _json_error(error: str, **extra: Any) -> str:
     """Build a structured error payload."""
-    return json.dumps(
+    return _with_metrics(
         {
             "success": False,
             "error": error,
             **extra,
-        },
-        ensure_ascii=False,
+        }
     )
 
 
-def _is_retryable_http_error(error: httpx.HTTPError) -> bool:
-    """Return whether the HTTP error should be retried."""
-    if isinstance(error, httpx.HTTPStatusError):
-        code = error.response.status_code
-        return code >= 500 or code == 429
-    return isinstance(error, httpx.RequestError)
+def _paced(
+    request_fn: Callable[..., httpx.Response],
+    limiter: TokenBucket | None,
+    deadline: float | None = None,
+) -> Callable[..., httpx.Response]:
+    """Wrap ``request_fn`` so each attempt waits for and feeds ``limiter``.
+
+    An attempt that would wait for a token past ``deadline`` (a
+    :func:`time.monotonic` instant) raises :class:`RateLimitedError`
+    instead of spending quota on an answer nobody will read.
+    """
+    if limiter is None:
+        return request_fn
+
+    def paced(url: str, **kwargs: Any) -> httpx.Response:
+        limiter.acquire(deadline)
+        response = request_fn(url, **kwargs)
+        limiter.observe(response.status_code, response.headers)
+        return response
+
+    return paced
 
 
-def _request_with_retry(
-    request_fn: Callable[..., httpx.Response],
-    url: str,
-    **kwargs: Any,
-) -> httpx.Response:
-    """Issue an HTTP request with bounded retries for transient failures."""
-    last_error: httpx.HTTPError | None = None
+def _apaced(
+    request_fn: Callable[..., Awaitable[httpx.Response]],
+    limiter: TokenBucket | None,
+    deadline: float | None = None,
+) -> Callable[..., Awaitable[httpx.Response]]:
+    """Async twin of :func:`_paced`."""
+    if limiter is None:
+        return request_fn
+
+    async def paced(url: str, **kwargs: Any) -> httpx.Response:
+        await limiter.aacquire(deadline)
+        response = await request_fn(url, **kwargs)
+        limiter.observe(response.status_code, response.headers)
+        return response
+
+    return paced
+
+
+class ProviderUnavailableError(httpx.HTTPError):
+    """Raised instead of a request while a provider's circuit is open."""
+
+    def __init__(self, provider: str, retry_in: float) -> None:
+        super().__init__(
+            f"{_PROVIDER_LABELS[provider]} is temporarily unavailable after "
+            f"repeated failures; retry in {retry_in:.0f}s."
+        )
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker shared by every call to that provider.
 
-    for attempt in range(MAX_RETRIES):
+    After ``failure_threshold`` consecutive failed requests (transport
+    errors or 5xx) the circuit opens and calls fail immediately. Once
+    ``reset_timeout`` has passed, a single half-open probe is let through;
+    its success closes the circuit and its failure re-opens it.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_timeout: Seconds to stay open before probing.
+        clock: Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Build a breaker from ``CLAWDCUT_BREAKER_*`` environment variables."""
+        return cls(
+            failure_threshold=_env_int("CLAWDCUT_BREAKER_THRESHOLD", 5),
+            reset_timeout=_env_float("CLAWDCUT_BREAKER_RESET_SECONDS", 30.0),
+        )
+
+    @property
+    def state(self) -> str:
+        """``"closed"``, ``"open"`` or ``"half_open"``."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or self._retry_in() == 0:
+                return "half_open"
+            return "open"
+
+    def _retry_in(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self._clock())
+
+    def before_request(self, provider: str) -> None:
+        """Admit a request or raise :class:`ProviderUnavailableError`."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            retry_in = self._retry_in()
+            if retry_in > 0 or self._probing:
+                raise ProviderUnavailableError(provider, retry_in)
+            self._probing = True
+
+    def record(self, ok: bool) -> None:
+        """Record the outcome of an admitted request."""
+        with self._lock:
+            self._probing = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or (
+                self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self._clock()
+
+
+def _default_breakers() -> dict[str, CircuitBreaker]:
+    return {provider: CircuitBreaker.from_env() for provider in PROVIDERS}
+
+
+def _guarded(
+    request_fn: Callable[..., httpx.Response],
+    provider: str,
+    breaker: CircuitBreaker | None,
+) -> Callable[..., httpx.Response]:
+    """Wrap ``request_fn`` so each attempt passes through ``breaker``."""
+    if breaker is None:
+        return request_fn
+
+    def guarded(url: str, **kwargs: Any) -> httpx.Response:
+        breaker.before_request(provider)
+        ok = False
         try:
             response = request_fn(url, **kwargs)
-            response.raise_for_status()
+            ok = response.status_code < 500
             return response
-        except httpx.HTTPError as error:
-            last_error = error
-            if not _is_retryable_http_error(error) or attempt == MAX_RETRIES - 1:
-                raise
-            time.sleep(RETRY_BACKOFF_SECONDS * (2**attempt))
-
-    if last_error is not None:
-        raise last_error
-    raise RuntimeError("Unexpected retry loop exit without response.")
+        except httpx.HTTPStatusError as error:
+            ok = error.response.status_code < 500
+            raise
+        except (OSError, DownloadRejectedError, RateLimitedError):
+            ok = True  # Local disk, budget or pacing trouble says nothing.
+            raise
+        finally:
+            breaker.record(ok)
+
+    return guarded
+
+
+def _aguarded(
+    request_fn: Callable[..., Awaitable[httpx.Response]],
+    provider: str,
+    breaker: CircuitBreaker | None,
+) -> Callable[..., Awaitable[httpx.Response]]:
+    """Async twin of :func:`_guarded`; a cancelled attempt counts as failed."""
+    if breaker is None:
+        return request_fn
+
+    async def guarded(url: str, **kwargs: Any) -> httpx.Response:
+        breaker.before_request(provider)
+        ok = False
+        try:
+            response = await request_fn(url, **kwargs)
+            ok = response.status_code < 500
+            return response
+        except httpx.HTTPStatusError as error:
+            ok = error.response.status_code < 500
+            raise
+        except (OSError, DownloadRejectedError, RateLimitedError):
+            ok = True
+            raise
+        finally:
+            breaker.record(ok)
+
+    return guarded
+
+
+def _unavailable_error(error: ProviderUnavailableError, operation: str) -> str:
+    """Build the fast-fail payload for a provider whose circuit is open."""
+    return _json_error(
+        f"Error: {error}",
+        provider=error.provider,
+        operation=operation,
+        error_code="provider_unavailable",
+        retry_in_seconds=round(error.retry_in, 1),
+    )
 
 
 def _safe_target_path(workdir: Path, save_path: str) -> Path:
@@ -90,35 +352,6 @@ def _safe_target_path(workdir: Path, save_path: str) -> Path:
     return target
 
 
-def _load_style_brief(workdir: Path, style_brief_path: str) -> dict[str, Any] | None:
-    """Load style brief JSON from a project-relative path."""
-    target = (workdir / style_brief_path).resolve()
-    if not target.exists():
-        return None
-    try:
-        data = json.loads(target.read_text())
-        if isinstance(data, dict):
-            return cast(dict[str, Any], data)
-        return None
-    except (json.JSONDecodeError, OSError):
-        return None
-
-
-def _compute_style_match_score(query: str, style_brief: dict[str, Any]) -> float:
-    """Compute query/style alignment score in [0, 1]."""
-    keywords = set()
-    palette = style_brief.get("palette", {})
-    for kw in palette.get("keywords", []):
-        keywords.add(str(kw).lower())
-    for kw in style_brief.get("hard_constraints", []):
-        keywords.add(str(kw).lower())
-    if not keywords:
-        return 0.0
-    lowered = query.lower()
-    hits = sum(1 for kw in keywords if kw and kw in lowered)
-    return round(min(hits / max(1, len(keywords)), 1.0), 3)
-
-
 def _format_pexels_photos(data: dict[str, Any]) -> str:
     """Format Pexels photo search results into readable text."""
     photos = data.get("photos", [])
@@ -141,9 +374,21 @@ def _format_pexels_photos(data: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def _format_pexels_videos(data: dict[str, Any]) -> str:
-    """Format Pexels video search results into readable text."""
-    videos = data.get("videos", [])
+def _format_pexels_videos(
+    data: dict[str, Any],
+    target: RenditionTarget | None = None,
+    filters: SearchFilters | None = None,
+) -> str:
+    """Format Pexels video search results into readable text.
+
+    Each video lists the rendition chosen for ``target``, or the widest one.
+    Videos outside the size and duration ``filters`` are left out.
+    """
+    videos = [
+        video
+        for video in data.get("videos", [])
+        if filters is None or filters.keeps_pexels_video(video)
+    ]
     if not videos:
         return "No videos found."
 
@@ -151,22 +396,30 @@ def _format_pexels_videos(data: dict[str, Any]) -> str:
     lines = [f"Found {total} videos on Pexels (showing {len(videos)}):\n"]
 
     for i, video in enumerate(videos, 1):
-        video_files = video.get("video_files", [])
-        best = (
-            max(video_files, key=lambda f: f.get("width", 0)) if video_files else {}
-        )
+        best = best_pexels_video_file(video, target)
+        details = f"   Quality: {best.get('quality', '?')}"
+        if best.get("fps"):
+            details += f", {float(best['fps']):g} fps"
+        if best.get("size"):
+            details += f", {int(best['size']) / 1024**2:.1f} MiB"
         lines.append(
             f"{i}. [ID: {video['id']}] Duration: {video.get('duration', '?')}s\n"
             f"   Resolution: {best.get('width', '?')}x{best.get('height', '?')}\n"
-            f"   Quality: {best.get('quality', '?')}\n"
+            f"{details}\n"
             f"   Download URL: {best.get('link', 'N/A')}"
         )
 
     return "\n".join(lines)
 
 
-def _format_pixabay_images(data: dict[str, Any]) -> str:
-    """Format Pixabay image search results into readable text."""
+def _format_pixabay_images(
+    data: dict[str, Any], target: RenditionTarget | None = None
+) -> str:
+    """Format Pixabay image search results into readable text.
+
+    With a ``target`` each hit links the smallest size tier meeting it
+    instead of ``largeImageURL``.
+    """
     hits = data.get("hits", [])
     if not hits:
         return "No images found."
@@ -175,21 +428,35 @@ def _format_pixabay_images(data: dict[str, Any]) -> str:
     lines = [f"Found {total} images on Pixabay (showing {len(hits)}):\n"]
 
     for i, hit in enumerate(hits, 1):
+        download = hit.get("largeImageURL", "N/A")
+        rendition = ""
+        if target is not None and (chosen := pixabay_rendition(hit, target)):
+            download = chosen["link"]
+            rendition = (
+                f"   Rendition: {chosen['tier']} "
+                f"{chosen['width'] or '?'}x{chosen['height'] or '?'}\n"
+            )
         lines.append(
             f"{i}. [ID: {hit['id']}] Tags: {hit.get('tags', 'N/A')}\n"
             f"   User: {hit.get('user', 'Unknown')}\n"
             f"   Resolution: {hit.get('imageWidth', '?')}x"
             f"{hit.get('imageHeight', '?')}\n"
+            f"{rendition}"
             f"   Downloads: {hit.get('downloads', 0)}\n"
             f"   Preview: {hit.get('webformatURL', 'N/A')}\n"
-            f"   Download URL: {hit.get('largeImageURL', 'N/A')}"
+            f"   Download URL: {download}"
         )
 
     return "\n".join(lines)
 
 
-def _format_pixabay_videos(data: dict[str, Any]) -> str:
-    """Format Pixabay video search results into readable text."""
+def _format_pixabay_videos(
+    data: dict[str, Any], target: RenditionTarget | None = None
+) -> str:
+    """Format Pixabay video search results into readable text.
+
+    Each video lists the tier chosen for ``target``, or ``large``.
+    """
     hits = data.get("hits", [])
     if not hits:
         return "No videos found."
@@ -198,14 +465,15 @@ def _format_pixabay_videos(data: dict[str, Any]) -> str:
     lines = [f"Found {total} videos on Pixabay (showing {len(hits)}):\n"]
 
     for i, hit in enumerate(hits, 1):
-        videos = hit.get("videos", {})
-        large = videos.get("large", {})
+        chosen = pixabay_rendition(hit, target)
+        size = f", {chosen['size'] / 1024**2:.1f} MiB" if chosen.get("size") else ""
         lines.append(
             f"{i}. [ID: {hit['id']}] Tags: {hit.get('tags', 'N/A')}\n"
             f"   User: {hit.get('user', 'Unknown')}\n"
             f"   Duration: {hit.get('duration', '?')}s\n"
-            f"   Resolution: {large.get('width', '?')}x{large.get('height', '?')}\n"
-            f"   Download URL: {large.get('url', 'N/A')}"
+            f"   Resolution: {chosen.get('width') or '?'}x"
+            f"{chosen.get('height') or '?'} ({chosen.get('tier', '?')}{size})\n"
+            f"   Download URL: {chosen.get('link', 'N/A')}"
         )
 
     return "\n".join(lines)
@@ -235,363 +503,2790 @@ def _format_freesound_audio(data: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def create_stock_tools(workdir: Path) -> list[Callable[..., str]]:
-    """Create stock media API tools bound to a working directory.
+_V = TypeVar("_V")
 
-    Returns a list of tool callables:
-    [
-        pexels_search, pexels_download,
-        pixabay_search, pixabay_download,
-        freesound_search, freesound_download
-    ]
 
-    Args:
-        workdir: Working directory for resolving relative save paths.
-    """
+class _BoundedDict(OrderedDict[str, _V]):
+    """Dict that forgets the least recently written keys beyond a cap.
 
-    def pexels_search(
-        query: str,
-        media_type: str = "photo",
-        per_page: int = 5,
-        style_brief_path: str = "",
-    ) -> str:
-        """Search Pexels for free stock photos or videos.
+    Keeps the session's memory of search hits bounded however many searches
+    an agent runs; forgotten entries only cost metadata on a late download.
+    """
 
-        Args:
-            query: Search keywords (English recommended for broader results).
-            media_type: Type of media - "photo" or "video".
-            per_page: Number of results to return (1-15).
+    def __init__(self, max_entries: int = MAX_REMEMBERED_HITS) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def __setitem__(self, key: str, value: _V) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+
+
+@dataclass(frozen=True)
+class _ToolContext:
+    """Session-scoped state shared by every tool closure of one factory."""
+
+    workdir: Path
+    clients: ProviderClients
+    asset_store: AssetStore | None = None
+    search_cache: SearchCache | None = None
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    breakers: dict[str, CircuitBreaker] = field(default_factory=_default_breakers)
+    page_cache: PageCache | None = field(default_factory=PageCache)
+    style_briefs: StyleBriefCache = field(default_factory=StyleBriefCache)
+    download_budget: DownloadBudget | None = field(
+        default_factory=DownloadBudget.from_env
+    )
+    background: set["asyncio.Task[None]"] = field(default_factory=set)
+    # Compact-output handle -> (provider, download URL, asset id).
+    handles: dict[str, tuple[str, str, str]] = field(default_factory=_BoundedDict)
+    manifest: AssetManifest | None = None
+    # Candidates seen in searches, by "provider:id" and by download URL.
+    seen: dict[str, Candidate] = field(
+        default_factory=lambda: _BoundedDict(2 * MAX_REMEMBERED_HITS)
+    )
+    near_duplicates: NearDuplicates | None = field(
+        default_factory=NearDuplicates.from_env
+    )
+    metrics: MetricsLog | None = None
+
+
+@dataclass(frozen=True)
+class _SearchRequest:
+    """Everything needed to run one provider search and format its result."""
+
+    provider: str
+    url: str
+    params: dict[str, str | int]
+    media_type: str
+    query: str
+    style_brief_path: str
+    formatter: Callable[[dict[str, Any]], str]
+    normalizer: Callable[[dict[str, Any]], list[Candidate]]
+    results_key: str
+    total_key: str
+    per_page: int
+    page: int = 1
+    headers: dict[str, str] = field(default_factory=dict)
+    ignored_filters: tuple[str, ...] = ()
+    # What style ranking measures resolution and duration fit against.
+    fit_target: RenditionTarget | None = None
+    durations: tuple[float, float] = (0.0, 0.0)
+
+
+def _with_page(params: dict[str, str | int], page: int) -> dict[str, str | int]:
+    """Return ``params`` asking for ``page``; page 1 sends no page parameter."""
+    paged = {name: value for name, value in params.items() if name != "page"}
+    if page > 1:
+        paged["page"] = page
+    return paged
+
+
+def _page_request(request: _SearchRequest, page: int) -> _SearchRequest:
+    """Return ``request`` moved to another result page."""
+    return replace(request, page=page, params=_with_page(request.params, page))
+
+
+def _next_page(request: _SearchRequest, data: dict[str, Any]) -> int | None:
+    """Return the following page number if the provider has more results."""
+    try:
+        total = int(data.get(request.total_key) or 0)
+    except (TypeError, ValueError):
+        return None
+    if not data.get(request.results_key) or request.page * request.per_page >= total:
+        return None
+    return request.page + 1
 
-        Returns:
-            Formatted search results with id, description, preview URL,
-            download URL, and resolution.
-        """
-        api_key = os.environ.get("PEXELS_API_KEY", "")
-        if not api_key:
-            return _json_error(
-                "Error: PEXELS_API_KEY environment variable is not set.",
-                provider="pexels",
-                operation="search",
-            )
 
-        headers = {"Authorization": api_key}
-        url = PEXELS_VIDEO_URL if media_type == "video" else PEXELS_PHOTO_URL
-        params: dict[str, str | int] = {
-            "query": query,
-            "per_page": min(max(per_page, 1), 15),
-        }
+def _parse_filters(provider: str, **values: Any) -> SearchFilters | str:
+    """Validate filter arguments, or return an error payload."""
+    try:
+        return SearchFilters.parse(**values)
+    except ValueError as error:
+        return _json_error(
+            f"Error: {error}",
+            provider=provider,
+            operation="search",
+        )
 
-        try:
-            data = _request_with_retry(
-                httpx.get, url, headers=headers, params=params, timeout=30.0
-            ).json()
-        except httpx.HTTPError as e:
-            return _json_error(
-                f"Error searching Pexels: {e}",
-                provider="pexels",
-                operation="search",
-            )
 
-        summary = (
-            _format_pexels_videos(data)
-            if media_type == "video"
-            else _format_pexels_photos(data)
-        )
-        return _json_success(
-            summary,
-            provider="pexels",
-            operation="search",
-            media_type=media_type,
-            raw_count=(
-                len(data.get("videos", []))
-                if media_type == "video"
-                else len(data.get("photos", []))
-            ),
-            style_match_score=(
-                _compute_style_match_score(
-                    query,
-                    _load_style_brief(workdir, style_brief_path) or {},
-                )
-                if style_brief_path
-                else 0.0
-            ),
+def _parse_target(
+    target_resolution: str, max_bytes: int, provider: str, operation: str
+) -> RenditionTarget | None | str:
+    """Parse rendition arguments, or return an error payload."""
+    try:
+        return RenditionTarget.parse(target_resolution, max_bytes)
+    except ValueError as error:
+        return _json_error(
+            f"Error: {error} Use e.g. 1080p, 4k, 1920x1080 or 1920x1080@30.",
+            provider=provider,
+            operation=operation,
         )
 
-    def pexels_download(url: str, save_path: str) -> str:
-        """Download a media file from Pexels to the local filesystem.
 
-        Args:
-            url: Download URL from pexels_search results.
-            save_path: Relative path to save the file
-                (e.g. .clawdcut/assets/images/sunset.jpg).
+def _fit_target(
+    target: RenditionTarget | None, filters: SearchFilters | None
+) -> RenditionTarget | None:
+    """Size that style ranking scores resolution against, if any."""
+    if target is not None or filters is None:
+        return target
+    if not (filters.min_width or filters.min_height):
+        return None
+    return RenditionTarget(
+        width=max(filters.min_width, filters.min_height),
+        height=min(filters.min_width, filters.min_height),
+    )
 
-        Returns:
-            The local file path where the file was saved.
-        """
-        try:
-            target = _safe_target_path(workdir, save_path)
-        except ValueError as error:
-            return _json_error(
-                str(error),
-                provider="pexels",
-                operation="download",
-            )
-        target.parent.mkdir(parents=True, exist_ok=True)
 
-        api_key = os.environ.get("PEXELS_API_KEY", "")
-        headers = {"Authorization": api_key} if api_key else {}
+def _durations(filters: SearchFilters | None) -> tuple[float, float]:
+    if filters is None:
+        return 0.0, 0.0
+    return filters.min_duration, filters.max_duration
 
-        try:
-            resp = _request_with_retry(
-                httpx.get,
-                url,
-                headers=headers,
-                follow_redirects=True,
-                timeout=60.0,
-            )
-            target.write_bytes(resp.content)
-        except httpx.HTTPError as e:
-            return _json_error(
-                f"Error downloading from Pexels: {e}",
-                provider="pexels",
-                operation="download",
-            )
 
-        return _json_success(
-            f"Downloaded to: {target}",
-            provider="pexels",
-            operation="download",
-            path=str(target),
-        )
+def _missing_api_key_error(provider: str) -> str:
+    """Build the error payload for an unset provider API key."""
+    return _json_error(
+        f"Error: {_API_KEY_ENV[provider]} environment variable is not set.",
+        provider=provider,
+        operation="search",
+    )
 
-    def pixabay_search(
-        query: str,
-        media_type: str = "photo",
-        per_page: int = 5,
-        style_brief_path: str = "",
-    ) -> str:
-        """Search Pixabay for free stock images or videos.
 
-        Args:
-            query: Search keywords (English recommended for broader results).
-            media_type: Type of media - "photo", "illustration",
-                "vector", or "video".
-            per_page: Number of results to return (3-15).
+def _pexels_search_request(
+    api_key: str,
+    query: str,
+    media_type: str,
+    per_page: int,
+    style_brief_path: str,
+    page: int = 1,
+    target: RenditionTarget | None = None,
+    filters: SearchFilters | None = None,
+) -> _SearchRequest:
+    """Build a Pexels photo/video search request.
+
+    ``target`` only changes which video rendition results point at; it is
+    not sent to the API, so cached responses are shared across targets.
+    ``filters`` become native Pexels parameters; for videos the size and
+    duration bounds are applied to the returned hits instead.
+    """
+    is_video = media_type == "video"
+    per_page = min(max(per_page, 1), 15)
+    native, ignored = (filters or SearchFilters()).pexels_params(is_video)
+    return _SearchRequest(
+        provider="pexels",
+        url=endpoint("pexels", PEXELS_VIDEO_PATH if is_video else PEXELS_PHOTO_PATH),
+        params=_with_page({"query": query, "per_page": per_page, **native}, page),
+        headers={"Authorization": api_key},
+        media_type=media_type,
+        query=query,
+        style_brief_path=style_brief_path,
+        formatter=(
+            partial(_format_pexels_videos, target=target, filters=filters)
+            if is_video
+            else _format_pexels_photos
+        ),
+        normalizer=(
+            partial(pexels_video_candidates, target=target, filters=filters)
+            if is_video
+            else pexels_photo_candidates
+        ),
+        results_key="videos" if is_video else "photos",
+        total_key="total_results",
+        per_page=per_page,
+        page=max(page, 1),
+        ignored_filters=tuple(ignored),
+        fit_target=_fit_target(target, filters),
+        durations=_durations(filters),
+    )
 
-        Returns:
-            Formatted search results with id, tags, preview URL,
-            download URL, and resolution.
-        """
-        api_key = os.environ.get("PIXABAY_API_KEY", "")
-        if not api_key:
-            return _json_error(
-                "Error: PIXABAY_API_KEY environment variable is not set.",
-                provider="pixabay",
-                operation="search",
-            )
 
-        is_video = media_type == "video"
-        url = PIXABAY_VIDEO_URL if is_video else PIXABAY_IMAGE_URL
-        params: dict[str, str | int] = {
-            "key": api_key,
-            "q": query,
-            "per_page": min(max(per_page, 3), 15),
-        }
-        if not is_video and media_type in ("photo", "illustration", "vector"):
-            params["image_type"] = media_type
+def _pixabay_search_request(
+    api_key: str,
+    query: str,
+    media_type: str,
+    per_page: int,
+    style_brief_path: str,
+    page: int = 1,
+    target: RenditionTarget | None = None,
+    filters: SearchFilters | None = None,
+) -> _SearchRequest:
+    """Build a Pixabay image/video search request.
+
+    ``target`` selects which size tier results point at, as for Pexels.
+    ``filters`` become native Pixabay parameters.
+    """
+    is_video = media_type == "video"
+    per_page = min(max(per_page, 3), 15)
+    native, ignored = (filters or SearchFilters()).pixabay_params(is_video)
+    params: dict[str, str | int] = {
+        "key": api_key,
+        "q": query,
+        "per_page": per_page,
+        **native,
+    }
+    if not is_video and media_type in ("photo", "illustration", "vector"):
+        params["image_type"] = media_type
+    return _SearchRequest(
+        provider="pixabay",
+        url=endpoint(
+            "pixabay", PIXABAY_VIDEO_PATH if is_video else PIXABAY_IMAGE_PATH
+        ),
+        params=_with_page(params, page),
+        media_type=media_type,
+        query=query,
+        style_brief_path=style_brief_path,
+        formatter=partial(
+            _format_pixabay_videos if is_video else _format_pixabay_images,
+            target=target,
+        ),
+        normalizer=partial(
+            pixabay_video_candidates if is_video else pixabay_image_candidates,
+            target=target,
+        ),
+        results_key="hits",
+        total_key="totalHits",
+        per_page=per_page,
+        page=max(page, 1),
+        ignored_filters=tuple(ignored),
+        fit_target=_fit_target(target, filters),
+        durations=_durations(filters),
+    )
 
-        try:
-            data = _request_with_retry(
-                httpx.get, url, params=params, timeout=30.0
-            ).json()
-        except httpx.HTTPError as e:
-            return _json_error(
-                f"Error searching Pixabay: {e}",
-                provider="pixabay",
-                operation="search",
-            )
 
-        summary = (
-            _format_pixabay_videos(data)
-            if is_video
-            else _format_pixabay_images(data)
-        )
-        return _json_success(
-            summary,
-            provider="pixabay",
-            operation="search",
-            media_type=media_type,
-            raw_count=len(data.get("hits", [])),
-            style_match_score=(
-                _compute_style_match_score(
-                    query,
-                    _load_style_brief(workdir, style_brief_path) or {},
-                )
-                if style_brief_path
-                else 0.0
-            ),
-        )
+def _freesound_search_request(
+    api_key: str,
+    query: str,
+    category: str,
+    license_type: str,
+    per_page: int,
+    style_brief_path: str,
+    page: int = 1,
+    filters: SearchFilters | None = None,
+) -> _SearchRequest:
+    """Build a Freesound text search request.
 
-    def pixabay_download(url: str, save_path: str) -> str:
-        """Download a media file from Pixabay to the local filesystem.
+    ``filters`` add a duration range to the Freesound filter query.
+    """
+    per_page = min(max(per_page, 1), 15)
+    category_filter = "tag:sfx" if category == "sfx" else "tag:music"
+    if license_type == "cc0":
+        license_filter = 'license:"Creative Commons 0"'
+    else:
+        license_filter = 'license:"Creative Commons 0" OR license:Attribution'
+    duration_filter, ignored = (filters or SearchFilters()).freesound_filter()
+    if duration_filter:
+        category_filter += f" {duration_filter}"
+    return _SearchRequest(
+        provider="freesound",
+        url=endpoint("freesound", FREESOUND_SEARCH_PATH),
+        params=_with_page(
+            {
+                "token": api_key,
+                "q": query,
+                "page_size": per_page,
+                "fields": "id,name,username,duration,license,previews",
+                "filter": f"({license_filter}) {category_filter}",
+            },
+            page,
+        ),
+        media_type=category,
+        query=query,
+        style_brief_path=style_brief_path,
+        formatter=_format_freesound_audio,
+        normalizer=freesound_candidates,
+        results_key="results",
+        total_key="count",
+        per_page=per_page,
+        page=max(page, 1),
+        ignored_filters=tuple(ignored),
+        durations=_durations(filters),
+    )
 
-        Args:
-            url: Download URL from pixabay_search results.
-            save_path: Relative path to save the file
-                (e.g. .clawdcut/assets/videos/nature.mp4).
 
-        Returns:
-            The local file path where the file was saved.
-        """
-        try:
-            target = _safe_target_path(workdir, save_path)
-        except ValueError as error:
-            return _json_error(
-                str(error),
-                provider="pixabay",
-                operation="download",
-            )
-        target.parent.mkdir(parents=True, exist_ok=True)
+def _style_matcher(ctx: _ToolContext, style_brief_path: str) -> StyleMatcher | None:
+    """The compiled style brief at ``style_brief_path``, if it is usable."""
+    if not style_brief_path:
+        return None
+    brief, matcher = ctx.style_briefs.get(ctx.workdir / style_brief_path)
+    return matcher if brief is not None else None
 
-        try:
-            resp = _request_with_retry(
-                httpx.get,
-                url,
-                follow_redirects=True,
-                timeout=60.0,
-            )
-            target.write_bytes(resp.content)
-        except httpx.HTTPError as e:
-            return _json_error(
-                f"Error downloading from Pixabay: {e}",
-                provider="pixabay",
-                operation="download",
-            )
 
-        return _json_success(
-            f"Downloaded to: {target}",
-            provider="pixabay",
-            operation="download",
-            path=str(target),
+def _rank_results(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    data: dict[str, Any],
+    candidates: list[Candidate],
+    top_k: int,
+) -> tuple[dict[str, Any], list[Candidate], dict[str, Any]]:
+    """Re-rank hits by style brief fit and keep the best ``top_k``.
+
+    The raw response is reordered to match, without mutating the cached
+    original, so the text listing follows the ranking too.
+
+    Returns:
+        The reordered response, the ranked candidates and extra payload
+        fields describing the ranking.
+    """
+    matcher = _style_matcher(ctx, request.style_brief_path)
+    fields: dict[str, Any] = {}
+    if matcher is not None:
+        candidates = style_rank(
+            candidates, matcher, request.fit_target, *request.durations
         )
+        fields["ranking"] = [
+            {
+                "id": c.id,
+                "style_score": c.style_score,
+                "matches": c.style_matches,
+                "avoid": c.style_flags,
+            }
+            for c in candidates[: top_k or None]
+        ]
+    elif not top_k:
+        return data, candidates, fields
+    candidates = candidates[: top_k or None]
+    by_id = {
+        str(item.get("id", "")): item for item in data.get(request.results_key, [])
+    }
+    data = {
+        **data,
+        request.results_key: [by_id[c.id] for c in candidates if c.id in by_id],
+    }
+    return data, candidates, fields
+
+
+def _style_score(ctx: _ToolContext, query: str, style_brief_path: str) -> float:
+    """Score ``query`` against the style brief, or 0.0 without one."""
+    if not style_brief_path:
+        return 0.0
+    _, matcher = ctx.style_briefs.get(ctx.workdir / style_brief_path)
+    return matcher.score(query)
 
-    def freesound_search(
-        query: str,
-        category: str = "music",
-        license_type: str = "cc0+attribution",
-        per_page: int = 10,
-        style_brief_path: str = "",
-    ) -> str:
-        """Search Freesound for free music or sound effects.
 
-        Args:
-            query: Search keywords (English recommended for broader results).
-            category: Audio category - "music" or "sfx".
-            license_type: "cc0" or "cc0+attribution".
-            per_page: Number of results to return (1-15).
+def _output_error(output: str, provider: str) -> str | None:
+    """Return an error payload for an unknown ``output`` mode, else ``None``."""
+    if output in OUTPUT_MODES:
+        return None
+    return _json_error(
+        f"Error: output must be one of {', '.join(OUTPUT_MODES)}.",
+        provider=provider,
+        operation="search",
+    )
 
-        Returns:
-            Formatted search results with id, name, duration, preview URL,
-            and download URL.
-        """
-        api_key = os.environ.get("FREESOUND_API_KEY", "")
-        if not api_key:
-            return _json_error(
-                "Error: FREESOUND_API_KEY environment variable is not set.",
-                provider="freesound",
-                operation="search",
-            )
 
-        category_filter = "tag:sfx" if category == "sfx" else "tag:music"
-        if license_type == "cc0":
-            license_filter = 'license:"Creative Commons 0"'
-        else:
-            license_filter = (
-                'license:"Creative Commons 0" OR license:Attribution'
-            )
-        params: dict[str, str | int] = {
-            "token": api_key,
-            "q": query,
-            "page_size": min(max(per_page, 1), 15),
-            "fields": "id,name,username,duration,license,previews",
-            "filter": f"({license_filter}) {category_filter}",
-        }
+def _note_candidates(ctx: _ToolContext, candidates: list[Candidate]) -> None:
+    """Remember search hits so their downloads can be described in the manifest."""
+    for candidate in candidates:
+        ctx.seen[f"{candidate.provider}:{candidate.id}"] = candidate
+        if candidate.download_url:
+            ctx.seen[candidate.download_url] = candidate
 
-        try:
-            data = _request_with_retry(
-                httpx.get, FREESOUND_SEARCH_URL, params=params, timeout=30.0
-            ).json()
-        except httpx.HTTPError as e:
-            return _json_error(
-                f"Error searching Freesound: {e}",
-                provider="freesound",
-                operation="search",
-            )
 
-        return _json_success(
-            _format_freesound_audio(data),
-            provider="freesound",
-            operation="search",
-            media_type=category,
-            raw_count=len(data.get("results", [])),
-            style_match_score=(
-                _compute_style_match_score(
-                    query,
-                    _load_style_brief(workdir, style_brief_path) or {},
-                )
-                if style_brief_path
-                else 0.0
-            ),
-        )
+def _preview_urls(
+    ctx: _ToolContext, candidates: list[Candidate]
+) -> tuple[dict[str, int], dict[str, str]]:
+    """Split candidate preview URLs into cached hashes and ones to fetch.
 
-    def freesound_download(url: str, save_path: str) -> str:
-        """Download an audio file from Freesound to local filesystem.
+    Returns:
+        Hashes already on disk, and the remaining URLs mapped to the
+        provider whose client fetches them. An unreadable hash cache counts
+        as empty.
+    """
+    assert ctx.near_duplicates is not None
+    providers: dict[str, str] = {}
+    for candidate in candidates:
+        if candidate.preview_url and candidate.media_type != "audio":
+            providers.setdefault(candidate.preview_url, candidate.provider)
+        if len(providers) >= MAX_PREVIEW_HASHES:
+            break
+    try:
+        cached = ctx.near_duplicates.cache.get_many(list(providers))
+    except (OSError, sqlite3.Error):
+        cached = {}
+    return cached, {u: p for u, p in providers.items() if u not in cached}
 
-        Args:
-            url: Download URL from freesound_search results.
-            save_path: Relative save path
-                (e.g. .clawdcut/assets/audio/music/theme.mp3).
 
-        Returns:
-            The local file path where the file was saved.
-        """
+def _preview_hash(response: httpx.Response) -> int | None:
+    """Hash a fetched preview, or ``None`` if it is not a usable image."""
+    if response.is_error or len(response.content) > MAX_PREVIEW_BYTES:
+        return None
+    try:
+        return dhash(response.content)
+    except ValueError:
+        return None
+
+
+def _preview_timeout(deadline: float) -> float:
+    """Seconds one preview fetch may take before ``deadline``."""
+    return min(PREVIEW_TIMEOUT_SECONDS, deadline - time.monotonic())
+
+
+def _preview_hashes(
+    ctx: _ToolContext, candidates: list[Candidate], deadline: float
+) -> dict[str, int]:
+    """Perceptual hashes of candidate previews, by preview URL.
+
+    Uncached previews are fetched concurrently on the pooled clients and
+    the new hashes are stored on disk. Previews that fail to load, or are
+    still loading at ``deadline`` (a :func:`time.monotonic` instant), are
+    skipped.
+    """
+    if ctx.near_duplicates is None:
+        return {}
+    hashes, missing = _preview_urls(ctx, candidates)
+
+    def fetch(url: str, provider: str) -> int | None:
+        if (timeout := _preview_timeout(deadline)) <= 0:
+            return None
         try:
-            target = _safe_target_path(workdir, save_path)
-        except ValueError as error:
-            return _json_error(
-                str(error),
-                provider="freesound",
-                operation="download",
+            return _preview_hash(
+                ctx.clients.get(provider).get(
+                    url, follow_redirects=True, timeout=timeout
+                )
             )
-        target.parent.mkdir(parents=True, exist_ok=True)
+        except httpx.HTTPError:
+            return None
 
+    if missing and _preview_timeout(deadline) > 0:
+        pool = ThreadPoolExecutor(max_workers=min(PREVIEW_CONCURRENCY, len(missing)))
         try:
-            resp = _request_with_retry(
-                httpx.get,
-                url,
-                follow_redirects=True,
-                timeout=60.0,
+            futures = {
+                pool.submit(fetch, url, provider): url
+                for url, provider in missing.items()
+            }
+            done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        fetched = {futures[future]: future.result() for future in done}
+        new = {url: value for url, value in fetched.items() if value is not None}
+        with contextlib.suppress(OSError, sqlite3.Error):
+            ctx.near_duplicates.cache.put_many(new)
+        hashes.update(new)
+    return hashes
+
+
+async def _apreview_hashes(
+    ctx: _ToolContext, candidates: list[Candidate], deadline: float
+) -> dict[str, int]:
+    """Async twin of :func:`_preview_hashes`."""
+    if ctx.near_duplicates is None:
+        return {}
+    hashes, missing = await asyncio.to_thread(_preview_urls, ctx, candidates)
+    semaphore = asyncio.Semaphore(PREVIEW_CONCURRENCY)
+
+    async def fetch(url: str, provider: str) -> int | None:
+        try:
+            async with semaphore:
+                if (timeout := _preview_timeout(deadline)) <= 0:
+                    return None
+                response = await ctx.clients.get_async(provider).get(
+                    url, follow_redirects=True, timeout=timeout
+                )
+        except httpx.HTTPError:
+            return None
+        return _preview_hash(response)
+
+    if missing and _preview_timeout(deadline) > 0:
+        tasks = {
+            asyncio.create_task(fetch(url, provider)): url
+            for url, provider in missing.items()
+        }
+        done, pending = await asyncio.wait(
+            tasks, timeout=max(0.0, deadline - time.monotonic())
+        )
+        for task in pending:
+            task.cancel()
+        new = {
+            tasks[task]: value
+            for task in done
+            if (value := task.result()) is not None
+        }
+        with contextlib.suppress(OSError, sqlite3.Error):
+            await asyncio.to_thread(ctx.near_duplicates.cache.put_many, new)
+        hashes.update(new)
+    return hashes
+
+
+def _flag_near_duplicates(
+    ctx: _ToolContext,
+    candidates: list[Candidate],
+    previews: dict[str, int],
+    compact: bool,
+) -> list[dict[str, Any]]:
+    """Mark candidates that look like a downloaded asset or a better-ranked hit.
+
+    Sets ``duplicate_of`` on each flagged candidate (a manifest path or a
+    candidate id) and returns one entry per flagged candidate.
+    """
+    detector = ctx.near_duplicates
+    if detector is None or not previews:
+        return []
+    radius = detector.max_distance
+    earlier = BKTree()
+    flagged = []
+    for candidate in candidates:
+        value = previews.get(candidate.preview_url)
+        if value is None:
+            continue
+        label = (
+            candidate.handle
+            if compact
+            else f"{candidate.provider}:{candidate.id}"
+        )
+        matches: list[tuple[int, str]] = [
+            (distance, record.path)
+            for distance, record in (
+                ctx.manifest.near(value, radius) if ctx.manifest else []
             )
-            target.write_bytes(resp.content)
-        except httpx.HTTPError as e:
-            return _json_error(
-                f"Error downloading from Freesound: {e}",
-                provider="freesound",
-                operation="download",
+        ] or earlier.search(value, radius)
+        earlier.add(value, label)
+        if matches:
+            distance, candidate.duplicate_of = matches[0]
+            flagged.append(
+                {
+                    "id": label,
+                    "duplicate_of": candidate.duplicate_of,
+                    "distance": distance,
+                }
             )
+    return flagged
+
+
+def _near_duplicate_summary(flagged: list[dict[str, Any]]) -> str:
+    """Summary line naming near-duplicate candidates, or ``""``."""
+    if not flagged:
+        return ""
+    pairs = "; ".join(f"{f['id']} looks like {f['duplicate_of']}" for f in flagged)
+    return f"\nNear-duplicates: {pairs}."
+
+
+def _compact_fields(
+    ctx: _ToolContext, candidates: list[Candidate], max_tokens: int
+) -> dict[str, Any]:
+    """Register download handles and build the compact candidate fields."""
+    for candidate in candidates:
+        ctx.handles[candidate.handle] = (
+            candidate.provider,
+            candidate.download_url,
+            candidate.id,
+        )
+    items, truncated = compact_candidates(candidates, max_tokens)
+    return {"candidates": items, "truncated": truncated}
+
+
+def _compact_summary(label: str, count: int) -> str:
+    """One-line summary accompanying compact candidates."""
+    if not count:
+        return f"No results found on {label}."
+    return f"{count} {label} candidates; pass a candidate id as the download url."
+
+
+def _search_payload(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    data: dict[str, Any],
+    candidates: list[Candidate],
+    output: str = "text",
+    max_tokens: int = 0,
+    top_k: int = 0,
+    previews: dict[str, int] | None = None,
+    **extra: Any,
+) -> str:
+    """Format a provider search response as a structured success payload.
+
+    ``candidates`` are the response's hits as normalized by the request.
+
+    ``output="compact"`` replaces the prose listing with typed candidates
+    whose ids are handles the download tools resolve. With a style brief
+    the hits are re-ranked by fit, best first. ``previews`` are perceptual
+    hashes by preview URL, used to flag near-duplicates.
+    """
+    raw_count = len(data.get(request.results_key, []))
+    next_page = _next_page(request, data)
+    _note_candidates(ctx, candidates)
+    data, candidates, fields = _rank_results(ctx, request, data, candidates, top_k)
+    if flagged := _flag_near_duplicates(
+        ctx, candidates, previews or {}, output == "compact"
+    ):
+        fields["near_duplicates"] = flagged
+    if output == "compact":
+        fields.update(_compact_fields(ctx, candidates, max_tokens))
+        summary = _compact_summary(
+            _PROVIDER_LABELS[request.provider], len(fields["candidates"])
+        )
+    else:
+        summary = request.formatter(data)
+    if "ranking" in fields:
+        summary += "\nRanked by fit with the style brief, best first."
+    summary += _near_duplicate_summary(flagged)
+    if next_page is not None:
+        summary += f"\nMore results: call again with page={next_page}."
+    if request.ignored_filters:
+        fields["ignored_filters"] = list(request.ignored_filters)
+        summary += (
+            f"\nNot supported by {_PROVIDER_LABELS[request.provider]} here: "
+            f"{', '.join(request.ignored_filters)}."
+        )
+    return _json_success(
+        summary,
+        provider=request.provider,
+        operation="search",
+        media_type=request.media_type,
+        page=request.page,
+        next_page=next_page,
+        raw_count=raw_count,
+        style_match_score=_style_score(
+            ctx, request.query, request.style_brief_path
+        ),
+        **fields,
+        **extra,
+    )
 
-        return _json_success(
-            f"Downloaded to: {target}",
-            provider="freesound",
-            operation="download",
-            path=str(target),
+
+def _search_error(
+    request: _SearchRequest, error: httpx.HTTPError, stats: RetryStats
+) -> str:
+    """Build the error payload for a failed provider search."""
+    if isinstance(error, ProviderUnavailableError):
+        return _unavailable_error(error, "search")
+    record_error(error)
+    return _json_error(
+        f"Error searching {_PROVIDER_LABELS[request.provider]}: {error}",
+        provider=request.provider,
+        operation="search",
+        retry=stats.to_dict(),
+    )
+
+
+def _cached_search(
+    ctx: _ToolContext, request: _SearchRequest
+) -> tuple[dict[str, Any], float] | None:
+    """Look ``request`` up in the search cache; never raises."""
+    if ctx.search_cache is None:
+        return None
+    try:
+        return ctx.search_cache.get(request.provider, request.url, request.params)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _store_search(
+    ctx: _ToolContext, request: _SearchRequest, data: dict[str, Any]
+) -> str:
+    """Save a fresh response to the search cache and report cache status."""
+    if ctx.search_cache is None:
+        return "off"
+    with contextlib.suppress(OSError, sqlite3.Error):
+        ctx.search_cache.put(request.provider, request.url, request.params, data)
+    return "miss"
+
+
+def _page_key(request: _SearchRequest) -> str:
+    """Session page-cache key for ``request``."""
+    return cache_key(request.provider, request.url, request.params)
+
+
+def _remember(ctx: _ToolContext, request: _SearchRequest, data: dict[str, Any]) -> None:
+    """Keep a fetched page in the session page cache."""
+    if ctx.page_cache is not None:
+        ctx.page_cache.put(_page_key(request), data)
+
+
+def _load_search(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    stats: RetryStats,
+    deadline: float | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Fetch ``request`` from the disk cache or the provider.
+
+    Raises:
+        httpx.HTTPError: When the provider request fails after retries, or
+            pacing would hold it past ``deadline``.
+    """
+    if cached := _cached_search(ctx, request):
+        data, age = cached
+        _remember(ctx, request, data)
+        return data, {"cache": "hit", "cache_age_seconds": round(age, 1)}
+    response = ctx.retry_policy.call(
+        _guarded(
+            _paced(
+                ctx.clients.get(request.provider).get,
+                ctx.clients.limiter(request.provider),
+                deadline,
+            ),
+            request.provider,
+            ctx.breakers.get(request.provider),
+        ),
+        request.url,
+        stats,
+        headers=request.headers,
+        params=request.params,
+        timeout=30.0,
+    )
+    data = record_response(response).json()
+    _remember(ctx, request, data)
+    return data, {"cache": _store_search(ctx, request, data)}
+
+
+async def _aload_search(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    stats: RetryStats,
+    deadline: float | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Async twin of :func:`_load_search`."""
+    if cached := await asyncio.to_thread(_cached_search, ctx, request):
+        data, age = cached
+        _remember(ctx, request, data)
+        return data, {"cache": "hit", "cache_age_seconds": round(age, 1)}
+    response = await ctx.retry_policy.acall(
+        _aguarded(
+            _apaced(
+                ctx.clients.get_async(request.provider).get,
+                ctx.clients.limiter(request.provider),
+                deadline,
+            ),
+            request.provider,
+            ctx.breakers.get(request.provider),
+        ),
+        request.url,
+        stats,
+        headers=request.headers,
+        params=request.params,
+        timeout=30.0,
+    )
+    data = record_response(response).json()
+    _remember(ctx, request, data)
+    cache = await asyncio.to_thread(_store_search, ctx, request, data)
+    return data, {"cache": cache}
+
+
+def _fetch_search(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    stats: RetryStats,
+    deadline: float | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return the decoded response and cache fields for ``request``.
+
+    Pages already seen this session, or being prefetched, come from memory.
+    ``deadline`` (a :func:`time.monotonic` instant) bounds the wait for a
+    prefetch and for a rate-limit token.
+
+    Raises:
+        httpx.HTTPError: When the provider request fails after retries, or
+            pacing would hold it past ``deadline``.
+    """
+    if ctx.page_cache is not None:
+        wait = PREFETCH_WAIT_SECONDS
+        if deadline is not None:
+            wait = min(wait, deadline - time.monotonic())
+        data = ctx.page_cache.get(_page_key(request), wait)
+        if data is not None:
+            return data, {"cache": "memory"}
+    return _load_search(ctx, request, stats, deadline)
+
+
+async def _afetch_search(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    stats: RetryStats,
+    deadline: float | None = None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Async twin of :func:`_fetch_search`."""
+    if ctx.page_cache is not None:
+        key = _page_key(request)
+        data = ctx.page_cache.get(key)
+        if data is None and ctx.page_cache.is_pending(key):
+            wait = PREFETCH_WAIT_SECONDS
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+            data = await asyncio.to_thread(ctx.page_cache.get, key, wait)
+        if data is not None:
+            return data, {"cache": "memory"}
+    return await _aload_search(ctx, request, stats, deadline)
+
+
+def _prefetch_target(
+    ctx: _ToolContext, request: _SearchRequest, data: dict[str, Any]
+) -> tuple[_SearchRequest, str] | None:
+    """Pick the page to warm after ``request``, claiming it in the cache.
+
+    Prefetch is lazy: it starts only once the agent pages past page 1, so a
+    single search never spends extra API quota.
+    """
+    if ctx.page_cache is None or request.page < 2:
+        return None
+    next_page = _next_page(request, data)
+    if next_page is None:
+        return None
+    upcoming = _page_request(request, next_page)
+    key = _page_key(upcoming)
+    return (upcoming, key) if ctx.page_cache.begin(key) else None
+
+
+def _prefetch_next(
+    ctx: _ToolContext, request: _SearchRequest, data: dict[str, Any]
+) -> None:
+    """Warm the following page on a daemon thread."""
+    target = _prefetch_target(ctx, request, data)
+    if target is None or ctx.page_cache is None:
+        return
+    upcoming, key = target
+    page_cache = ctx.page_cache
+
+    def work() -> None:
+        try:
+            _load_search(ctx, upcoming, RetryStats())
+        except (httpx.HTTPError, RuntimeError, ValueError):
+            pass  # Best effort; the agent's own request will retry.
+        finally:
+            page_cache.end(key)
+
+    threading.Thread(target=work, name="clawdcut-prefetch", daemon=True).start()
+
+
+def _aprefetch_next(
+    ctx: _ToolContext, request: _SearchRequest, data: dict[str, Any]
+) -> None:
+    """Warm the following page in a background task on the running loop."""
+    target = _prefetch_target(ctx, request, data)
+    if target is None or ctx.page_cache is None:
+        return
+    upcoming, key = target
+    page_cache = ctx.page_cache
+
+    async def work() -> None:
+        try:
+            await _aload_search(ctx, upcoming, RetryStats())
+        except (httpx.HTTPError, RuntimeError, ValueError):
+            pass
+        finally:
+            page_cache.end(key)
+
+    # A fresh context keeps the prefetch out of the calling tool's metrics.
+    task = asyncio.get_running_loop().create_task(
+        work(), context=contextvars.Context()
+    )
+    ctx.background.add(task)
+    task.add_done_callback(ctx.background.discard)
+
+
+def _run_search(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    output: str = "text",
+    max_tokens: int = 0,
+    top_k: int = 0,
+) -> str:
+    """Execute a search request on the pooled sync client."""
+    stats = RetryStats()
+    try:
+        data, extra = _fetch_search(ctx, request, stats)
+    except httpx.HTTPError as error:
+        return _search_error(request, error, stats)
+    _prefetch_next(ctx, request, data)
+    candidates = request.normalizer(data)
+    deadline = time.monotonic() + PREVIEW_TIMEOUT_SECONDS
+    return _search_payload(
+        ctx,
+        request,
+        data,
+        candidates,
+        output,
+        max_tokens,
+        top_k,
+        previews=(
+            _preview_hashes(ctx, candidates, deadline) if output == "compact" else {}
+        ),
+        retry=stats.to_dict(),
+        **extra,
+    )
+
+
+async def _arun_search(
+    ctx: _ToolContext,
+    request: _SearchRequest,
+    output: str = "text",
+    max_tokens: int = 0,
+    top_k: int = 0,
+) -> str:
+    """Execute a search request on the pooled async client."""
+    stats = RetryStats()
+    try:
+        data, extra = await _afetch_search(ctx, request, stats)
+    except httpx.HTTPError as error:
+        return _search_error(request, error, stats)
+    _aprefetch_next(ctx, request, data)
+    candidates = request.normalizer(data)
+    deadline = time.monotonic() + PREVIEW_TIMEOUT_SECONDS
+    return _search_payload(
+        ctx,
+        request,
+        data,
+        candidates,
+        output,
+        max_tokens,
+        top_k,
+        previews=(
+            await _apreview_hashes(ctx, candidates, deadline)
+            if output == "compact"
+            else {}
+        ),
+        retry=stats.to_dict(),
+        **extra,
+    )
+
+
+def _stock_search_requests(
+    query: str,
+    media_type: str,
+    per_provider: int,
+    style_brief_path: str,
+    page: int = 1,
+    filters: SearchFilters | None = None,
+) -> tuple[list[_SearchRequest], dict[str, dict[str, Any]]]:
+    """Build one request per configured provider serving ``media_type``.
+
+    Returns:
+        The requests to fan out, plus status entries for skipped providers.
+    """
+    if media_type in ("music", "sfx"):
+        builders: dict[str, Callable[[str], _SearchRequest]] = {
+            "freesound": lambda key: _freesound_search_request(
+                key,
+                query,
+                media_type,
+                "cc0+attribution",
+                per_provider,
+                style_brief_path,
+                page,
+                filters,
+            ),
+        }
+    else:
+        builders = {
+            "pexels": lambda key: _pexels_search_request(
+                key,
+                query,
+                media_type,
+                per_provider,
+                style_brief_path,
+                page,
+                filters=filters,
+            ),
+            "pixabay": lambda key: _pixabay_search_request(
+                key,
+                query,
+                media_type,
+                per_provider,
+                style_brief_path,
+                page,
+                filters=filters,
+            ),
+        }
+    requests: list[_SearchRequest] = []
+    statuses: dict[str, dict[str, Any]] = {}
+    for provider, build in builders.items():
+        if api_key := os.environ.get(_API_KEY_ENV[provider], ""):
+            requests.append(build(api_key))
+        else:
+            statuses[provider] = {
+                "status": "skipped",
+                "error": f"{_API_KEY_ENV[provider]} is not set",
+            }
+    return requests, statuses
+
+
+def _format_candidates(query: str, candidates: list[Candidate]) -> str:
+    """Format merged candidates into readable text."""
+    if not candidates:
+        return f'No candidates found for "{query}".'
+    lines = [f'Top {len(candidates)} candidates for "{query}":\n']
+    for i, c in enumerate(candidates, 1):
+        size = f" {c.width}x{c.height}" if c.width else ""
+        duration = f" {c.duration:g}s" if c.duration else ""
+        lines.append(
+            f"{i}. [{c.provider}:{c.id}] {c.media_type}{size}{duration}"
+            f" (score {c.score})\n"
+            f'   "{c.title or "No description"}" by {c.creator or "Unknown"}\n'
+            f"   License: {c.license or 'Unknown'}\n"
+            f"   Preview: {c.preview_url or 'N/A'}\n"
+            f"   Download URL: {c.download_url or 'N/A'}"
+        )
+    return "\n".join(lines)
+
+
+def _merge_stock_results(
+    ctx: _ToolContext,
+    query: str,
+    style_brief_path: str,
+    results: list[list[Candidate]],
+    limit: int,
+    filters: SearchFilters | None = None,
+) -> list[Candidate]:
+    """Merge per-provider candidates into the best ``limit`` hits.
+
+    With a style brief the merged hits are re-ranked by fit before the cut.
+    Every hit is remembered for the manifest, kept or not.
+    """
+    for candidates in results:
+        _note_candidates(ctx, candidates)
+    matcher = _style_matcher(ctx, style_brief_path)
+    if matcher is None:
+        return merge_candidates(query, results, max(limit, 1))
+    return style_rank(
+        merge_candidates(query, results, sum(map(len, results))),
+        matcher,
+        _fit_target(None, filters),
+        *_durations(filters),
+    )[: max(limit, 1)]
+
+
+def _stock_search_payload(
+    ctx: _ToolContext,
+    query: str,
+    media_type: str,
+    style_brief_path: str,
+    results: list[list[Candidate]],
+    merged: list[Candidate],
+    statuses: dict[str, dict[str, Any]],
+    output: str = "text",
+    max_tokens: int = 0,
+    previews: dict[str, int] | None = None,
+) -> str:
+    """Build the ``stock_search`` payload from the merged candidates.
+
+    Hits whose preview hash in ``previews`` is close to a downloaded asset
+    or a better-ranked hit are flagged.
+    """
+    if not any(status["status"] == "ok" for status in statuses.values()):
+        return _json_error(
+            "Error: no stock provider returned results.",
+            provider="multi",
+            operation="search",
+            providers=statuses,
+        )
+    flagged = _flag_near_duplicates(
+        ctx, merged, previews or {}, output == "compact"
+    )
+    if output == "compact":
+        fields = _compact_fields(ctx, merged, max_tokens)
+        summary = _compact_summary("stock", len(fields["candidates"]))
+    else:
+        fields = {"candidates": [c.to_dict() for c in merged]}
+        summary = _format_candidates(query, merged)
+    if flagged:
+        fields["near_duplicates"] = flagged
+        summary += _near_duplicate_summary(flagged)
+    return _json_success(
+        summary,
+        provider="multi",
+        operation="search",
+        media_type=media_type,
+        providers=statuses,
+        raw_count=sum(len(r) for r in results),
+        style_match_score=_style_score(ctx, query, style_brief_path),
+        **fields,
+    )
+
+
+def _provider_status(
+    request: _SearchRequest,
+    stats: RetryStats,
+    outcome: tuple[dict[str, Any], dict[str, Any]] | BaseException | None,
+) -> tuple[list[Candidate] | None, dict[str, Any]]:
+    """Normalize one provider's outcome and describe how it went.
+
+    ``outcome`` is the fetched response, the error it raised, or ``None``
+    when the provider missed its deadline.
+    """
+    if outcome is None:
+        return None, {"status": "timeout", "retry": stats.to_dict()}
+    if isinstance(outcome, ProviderUnavailableError):
+        return None, {
+            "status": "unavailable",
+            "error_code": "provider_unavailable",
+            "retry_in_seconds": round(outcome.retry_in, 1),
+        }
+    if isinstance(outcome, RateLimitedError):
+        return None, {
+            "status": "rate_limited",
+            "retry_in_seconds": round(outcome.wait, 1),
+        }
+    if isinstance(outcome, httpx.HTTPError):
+        record_error(outcome)
+        return None, {
+            "status": "error",
+            "error": str(outcome),
+            "retry": stats.to_dict(),
+        }
+    if isinstance(outcome, BaseException):
+        raise outcome
+    data, extra = outcome
+    candidates = request.normalizer(data)
+    if request.ignored_filters:
+        extra = {**extra, "ignored_filters": list(request.ignored_filters)}
+    return candidates, {
+        "status": "ok",
+        "count": len(candidates),
+        "retry": stats.to_dict(),
+        **extra,
+    }
+
+
+def _collect_statuses(
+    requests: list[_SearchRequest],
+    all_stats: list[RetryStats],
+    outcomes: list[Any],
+) -> tuple[list[list[Candidate]], dict[str, dict[str, Any]]]:
+    """Split per-provider outcomes into candidate lists and statuses."""
+    results: list[list[Candidate]] = []
+    statuses: dict[str, dict[str, Any]] = {}
+    for request, stats, outcome in zip(requests, all_stats, outcomes, strict=True):
+        candidates, statuses[request.provider] = _provider_status(
+            request, stats, outcome
+        )
+        if candidates is not None:
+            results.append(candidates)
+    return results, statuses
+
+
+def _run_stock_search(
+    ctx: _ToolContext, requests: list[_SearchRequest], deadline: float
+) -> tuple[list[list[Candidate]], dict[str, dict[str, Any]]]:
+    """Fan ``requests`` out on worker threads, each bounded by ``deadline``.
+
+    A worker that would have to wait for a rate-limit token past the
+    deadline gives up instead of sending a request nobody reads.
+    """
+    if not requests:
+        return [], {}
+    all_stats = [RetryStats() for _ in requests]
+    until = time.monotonic() + deadline
+    pool = ThreadPoolExecutor(max_workers=len(requests))
+    try:
+        # Each worker reports into this call's metrics via a context copy.
+        futures = [
+            pool.submit(
+                contextvars.copy_context().run,
+                _fetch_search,
+                ctx,
+                request,
+                stats,
+                until,
+            )
+            for request, stats in zip(requests, all_stats, strict=True)
+        ]
+        done, _ = wait(futures, timeout=deadline)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    outcomes = [
+        (future.exception() or future.result()) if future in done else None
+        for future in futures
+    ]
+    return _collect_statuses(requests, all_stats, outcomes)
+
+
+async def _arun_stock_search(
+    ctx: _ToolContext, requests: list[_SearchRequest], deadline: float
+) -> tuple[list[list[Candidate]], dict[str, dict[str, Any]]]:
+    """Async twin of :func:`_run_stock_search` using ``asyncio.wait_for``."""
+    if not requests:
+        return [], {}
+    all_stats = [RetryStats() for _ in requests]
+    until = time.monotonic() + deadline
+    outcomes = await asyncio.gather(
+        *(
+            asyncio.wait_for(_afetch_search(ctx, request, stats, until), deadline)
+            for request, stats in zip(requests, all_stats, strict=True)
+        ),
+        return_exceptions=True,
+    )
+    return _collect_statuses(
+        requests,
+        all_stats,
+        [None if isinstance(o, TimeoutError) else o for o in outcomes],
+    )
+
+
+def _download_headers(provider: str) -> dict[str, str]:
+    """Return auth headers to send with a provider download, if any."""
+    if provider == "pexels":
+        api_key = os.environ.get("PEXELS_API_KEY", "")
+        return {"Authorization": api_key} if api_key else {}
+    return {}
+
+
+def _download_error(provider: str, error: Exception, stats: RetryStats) -> str:
+    """Build the error payload for a failed download."""
+    if isinstance(error, ProviderUnavailableError):
+        return _unavailable_error(error, "download")
+    record_error(error)
+    if isinstance(error, DownloadRejectedError):
+        return _json_error(
+            f"Error: {error} Nothing was saved; pick a smaller rendition or "
+            "another asset.",
+            provider=provider,
+            operation="download",
+            error_code="download_rejected",
+            retry=stats.to_dict(),
+        )
+    return _json_error(
+        f"Error downloading from {_PROVIDER_LABELS[provider]}: {error}",
+        provider=provider,
+        operation="download",
+        retry=stats.to_dict(),
+    )
+
+
+def _download_success(
+    provider: str, target: Path, cache: str, stats: RetryStats, **extra: Any
+) -> str:
+    """Build the success payload for a finished download."""
+    summary = f"Downloaded to: {target}"
+    if near := extra.get("near_duplicate_of"):
+        summary += f"\nLooks like the already downloaded {near}."
+    return _json_success(
+        summary,
+        provider=provider,
+        operation="download",
+        path=str(target),
+        bytes=target.stat().st_size,
+        cache=cache,
+        retry=stats.to_dict(),
+        **extra,
+    )
+
+
+def _plain_asset_id(ctx: _ToolContext, asset_id: str) -> str:
+    """The provider's own id for ``asset_id``, which may be a handle.
+
+    Agents often pass a candidate ``id`` such as ``px:123`` (or a
+    ``pexels:123`` label) as the asset id; cache keys, manifest rows and
+    rendition lookups need the bare ``123``.
+    """
+    asset_id = asset_id.strip()
+    if entry := ctx.handles.get(asset_id):
+        return entry[2]
+    # Provider ids never contain ":", so anything before it is a prefix.
+    return asset_id.rpartition(":")[2]
+
+
+def _resolve_handle(
+    ctx: _ToolContext, provider: str, url: str, asset_id: str
+) -> tuple[str, str] | str:
+    """Map a compact-output handle to its download URL and asset id.
+
+    Plain URLs pass through unchanged; an unknown handle, or one that
+    belongs to another provider, yields an error payload. A handle passed
+    as ``asset_id`` is reduced to the provider's id.
+    """
+    asset_id = _plain_asset_id(ctx, asset_id)
+    if "://" in url:
+        return url, asset_id
+    entry = ctx.handles.get(url.strip())
+    if entry is None:
+        return _json_error(
+            f"Error: unknown asset handle {url!r}; pass a download URL or a "
+            "candidate id from a search in this session.",
+            provider=provider,
+            operation="download",
+        )
+    owner, resolved, resolved_id = entry
+    if owner != provider:
+        return _json_error(
+            f"Error: {url} is a {_PROVIDER_LABELS[owner]} asset; "
+            f"use {owner}_download.",
+            provider=provider,
+            operation="download",
+        )
+    return resolved, asset_id or resolved_id
+
+
+def _pexels_video_request(asset_id: str) -> _SearchRequest:
+    """Look up the renditions of one Pexels video by id."""
+    return _SearchRequest(
+        provider="pexels",
+        url=endpoint("pexels", f"{PEXELS_VIDEO_DETAIL_PATH}{asset_id}"),
+        params={},
+        headers=_download_headers("pexels"),
+        media_type="video",
+        query="",
+        style_brief_path="",
+        formatter=lambda data: _format_pexels_videos({"videos": [data]}),
+        normalizer=lambda data: pexels_video_candidates({"videos": [data]}),
+        results_key="video_files",
+        total_key="",
+        per_page=1,
+    )
+
+
+def _pixabay_item_request(
+    api_key: str, asset_id: str, is_video: bool
+) -> _SearchRequest:
+    """Look up the size tiers of one Pixabay image or video by id."""
+    return _SearchRequest(
+        provider="pixabay",
+        url=endpoint(
+            "pixabay", PIXABAY_VIDEO_PATH if is_video else PIXABAY_IMAGE_PATH
+        ),
+        params={"key": api_key, "id": asset_id},
+        media_type="video" if is_video else "photo",
+        query="",
+        style_brief_path="",
+        formatter=_format_pixabay_videos if is_video else _format_pixabay_images,
+        normalizer=pixabay_video_candidates if is_video else pixabay_image_candidates,
+        results_key="hits",
+        total_key="totalHits",
+        per_page=1,
+    )
+
+
+def _download_media_type(
+    ctx: _ToolContext, provider: str, url: str, asset_id: str
+) -> str:
+    """Media type of an asset about to be downloaded, or ``""`` if unknown.
+
+    The search hit seen this session is authoritative; otherwise the file
+    extension of ``url`` tells photos from videos, whatever host serves it.
+    """
+    seen = ctx.seen.get(f"{provider}:{asset_id}") or ctx.seen.get(url)
+    if seen is not None:
+        return seen.media_type
+    kind = media_kind(Path(urlsplit(url).path))
+    return {"image": "photo", "video": "video"}.get(kind, "")
+
+
+def _rendition_lookup(
+    ctx: _ToolContext,
+    provider: str,
+    url: str,
+    asset_id: str,
+    target: RenditionTarget | None,
+) -> tuple[_SearchRequest, Callable[[dict[str, Any]], dict[str, Any]]] | None:
+    """Return the lookup and picker needed to re-pick a rendition.
+
+    Pexels videos and every Pixabay asset publish several renditions per
+    id; Pexels photos and Freesound download ``url`` as given, as does any
+    asset whose media type is unknown.
+    """
+    if target is None or not asset_id:
+        return None
+    media_type = _download_media_type(ctx, provider, url, asset_id)
+    if provider == "pexels" and media_type == "video":
+        return (
+            _pexels_video_request(asset_id),
+            lambda data: best_pexels_video_file(data, target),
+        )
+    api_key = os.environ.get("PIXABAY_API_KEY", "")
+    if provider == "pixabay" and api_key and media_type:
+        return (
+            _pixabay_item_request(api_key, asset_id, media_type == "video"),
+            lambda data: pixabay_rendition((data.get("hits") or [{}])[0], target),
+        )
+    return None
+
+
+def _rendition_fields(chosen: dict[str, Any]) -> dict[str, Any]:
+    """Describe the rendition picked by a lookup."""
+    return {
+        name: chosen[name]
+        for name in ("link", "tier", "width", "height", "fps", "size")
+        if chosen.get(name)
+    }
+
+
+def _resolve_download_target(
+    workdir: Path, provider: str, save_path: str
+) -> Path | str:
+    """Validate ``save_path`` and create its parent, or return an error payload."""
+    try:
+        target = _safe_target_path(workdir, save_path)
+    except ValueError as error:
+        return _json_error(
+            str(error),
+            provider=provider,
+            operation="download",
+        )
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return target
+
+
+def _asset_cache_keys(provider: str, url: str, asset_id: str) -> list[str]:
+    """Index keys for a download: provider asset rendition first, then URL."""
+    keys = [url_key(url)]
+    if asset_id:
+        rendition = Path(urlsplit(url).path).name or "original"
+        keys.insert(0, asset_key(provider, asset_id, rendition))
+    return keys
+
+
+def _cache_materialize(ctx: _ToolContext, keys: list[str], target: Path) -> bool:
+    """Serve ``target`` from the global asset store; never raises."""
+    if ctx.asset_store is None:
+        return False
+    try:
+        return ctx.asset_store.materialize(keys, target)
+    except (OSError, sqlite3.Error):
+        return False
+
+
+def _cache_ingest(
+    ctx: _ToolContext, keys: list[str], target: Path
+) -> tuple[str, str]:
+    """Add a fresh download to the global asset store; never raises.
+
+    Returns:
+        The cache status and the file's SHA-256 when the store hashed it.
+    """
+    if ctx.asset_store is None:
+        return "off", ""
+    with contextlib.suppress(OSError, sqlite3.Error):
+        return "miss", ctx.asset_store.ingest(target, keys)
+    return "miss", ""
+
+
+_DEFAULT_LICENSES = {"pexels": PEXELS_LICENSE, "pixabay": PIXABAY_LICENSE}
+
+
+def _asset_hash(
+    ctx: _ToolContext, seen: Candidate | None, target: Path, kind: str
+) -> int | None:
+    """Perceptual hash of a downloaded asset, if near-duplicates are tracked.
+
+    The search hit's cached preview hash is reused; images without one are
+    hashed from the file.
+    """
+    if ctx.near_duplicates is None:
+        return None
+    if seen is not None and seen.preview_url:
+        cached: dict[str, int] = {}
+        with contextlib.suppress(OSError, sqlite3.Error):
+            cached = ctx.near_duplicates.cache.get_many([seen.preview_url])
+        if seen.preview_url in cached:
+            return cached[seen.preview_url]
+    if kind != "image":
+        return None
+    try:
+        return dhash(target)
+    except ValueError:
+        return None
+
+
+def _record_download(
+    ctx: _ToolContext,
+    provider: str,
+    url: str,
+    asset_id: str,
+    target: Path,
+    sha256: str,
+    rendition: dict[str, Any],
+) -> dict[str, Any]:
+    """Upsert a finished download into the project manifest; never raises.
+
+    Metadata comes from the search hit this session saw for the asset, with
+    the picked rendition's dimensions taking precedence.
+
+    Returns:
+        Extra payload fields: the file's SHA-256 and, when it looks like an
+        asset downloaded earlier, that asset's path as ``near_duplicate_of``.
+    """
+    if ctx.manifest is None:
+        return {}
+    fields: dict[str, Any] = {}
+    try:
+        sha256 = sha256 or sha256_file(target)
+        seen = ctx.seen.get(f"{provider}:{asset_id}") or ctx.seen.get(url)
+        kind = media_kind(target)
+        value = _asset_hash(ctx, seen, target, kind)
+        path = ctx.manifest.relative(target)
+        if value is not None and ctx.near_duplicates is not None:
+            for _, other in ctx.manifest.near(
+                value, ctx.near_duplicates.max_distance
+            ):
+                if other.path != path:
+                    fields["near_duplicate_of"] = other.path
+                    break
+        record = ManifestRecord(
+            path=path,
+            provider=provider,
+            asset_id=asset_id or (seen.id if seen else ""),
+            source_url=url,
+            media_type=(
+                seen.media_type if seen else "photo" if kind == "image" else kind
+            ),
+            bytes=target.stat().st_size,
+            sha256=sha256,
+            width=int(rendition.get("width") or (seen.width if seen else 0)),
+            height=int(rendition.get("height") or (seen.height if seen else 0)),
+            duration=seen.duration if seen else 0.0,
+            license=(seen.license if seen else "")
+            or _DEFAULT_LICENSES.get(provider, ""),
+            creator=seen.creator if seen else "",
+            title=seen.title if seen else "",
+            dhash=to_hex(value) if value is not None else "",
+        )
+        ctx.manifest.upsert(record)
+    except (OSError, sqlite3.Error):
+        return {}
+    return {"sha256": sha256, **fields}
+
+
+def _run_download(
+    ctx: _ToolContext,
+    provider: str,
+    url: str,
+    save_path: str,
+    asset_id: str = "",
+    rendition: RenditionTarget | None = None,
+) -> str:
+    """Stream ``url`` into the project assets tree on the sync client.
+
+    With a ``rendition`` target, assets that publish several sizes are
+    looked up by ``asset_id`` and the best-fitting one is downloaded instead.
+    """
+    source = _resolve_handle(ctx, provider, url, asset_id)
+    if isinstance(source, str):
+        return source
+    url, asset_id = source
+    target = _resolve_download_target(ctx.workdir, provider, save_path)
+    if isinstance(target, str):
+        return target
+    stats = RetryStats()
+    extra: dict[str, Any] = {}
+    if lookup := _rendition_lookup(ctx, provider, url, asset_id, rendition):
+        request, pick = lookup
+        try:
+            data, _ = _fetch_search(ctx, request, stats)
+        except httpx.HTTPError as e:
+            return _download_error(provider, e, stats)
+        extra["rendition"] = _rendition_fields(pick(data))
+        url = extra["rendition"].pop("link", url)
+    keys = _asset_cache_keys(provider, url, asset_id)
+    chosen = extra.get("rendition", {})
+    if _cache_materialize(ctx, keys, target):
+        extra.update(
+            _record_download(ctx, provider, url, asset_id, target, "", chosen)
+        )
+        return _download_success(provider, target, "hit", stats, **extra)
+
+    client = ctx.clients.get(provider)
+    try:
+        if ctx.download_budget is not None:
+            preflight(
+                client,
+                url,
+                target,
+                ctx.download_budget,
+                headers=_download_headers(provider),
+                follow_redirects=True,
+                timeout=30.0,
+            )
+        response = ctx.retry_policy.for_downloads().call(
+            _guarded(
+                partial(
+                    stream_to_file,
+                    client,
+                    target=target,
+                    budget=ctx.download_budget,
+                ),
+                provider,
+                ctx.breakers.get(provider),
+            ),
+            url,
+            stats,
+            headers=_download_headers(provider),
+            follow_redirects=True,
+            timeout=60.0,
+        )
+    except (httpx.HTTPError, OSError) as e:
+        return _download_error(provider, e, stats)
+
+    record_response(response)
+    cache, sha256 = _cache_ingest(ctx, keys, target)
+    extra.update(
+        _record_download(ctx, provider, url, asset_id, target, sha256, chosen)
+    )
+    return _download_success(provider, target, cache, stats, **extra)
+
+
+async def _arun_download(
+    ctx: _ToolContext,
+    provider: str,
+    url: str,
+    save_path: str,
+    asset_id: str = "",
+    rendition: RenditionTarget | None = None,
+) -> str:
+    """Stream ``url`` into the project assets tree on the async client."""
+    source = _resolve_handle(ctx, provider, url, asset_id)
+    if isinstance(source, str):
+        return source
+    url, asset_id = source
+    target = _resolve_download_target(ctx.workdir, provider, save_path)
+    if isinstance(target, str):
+        return target
+    stats = RetryStats()
+    extra: dict[str, Any] = {}
+    if lookup := _rendition_lookup(ctx, provider, url, asset_id, rendition):
+        request, pick = lookup
+        try:
+            data, _ = await _afetch_search(ctx, request, stats)
+        except httpx.HTTPError as e:
+            return _download_error(provider, e, stats)
+        extra["rendition"] = _rendition_fields(pick(data))
+        url = extra["rendition"].pop("link", url)
+    keys = _asset_cache_keys(provider, url, asset_id)
+    chosen = extra.get("rendition", {})
+    if await asyncio.to_thread(_cache_materialize, ctx, keys, target):
+        extra.update(
+            await asyncio.to_thread(
+                _record_download, ctx, provider, url, asset_id, target, "", chosen
+            )
+        )
+        return _download_success(provider, target, "hit", stats, **extra)
+
+    client = ctx.clients.get_async(provider)
+    try:
+        if ctx.download_budget is not None:
+            await apreflight(
+                client,
+                url,
+                target,
+                ctx.download_budget,
+                headers=_download_headers(provider),
+                follow_redirects=True,
+                timeout=30.0,
+            )
+        response = await ctx.retry_policy.for_downloads().acall(
+            _aguarded(
+                partial(
+                    astream_to_file,
+                    client,
+                    target=target,
+                    budget=ctx.download_budget,
+                ),
+                provider,
+                ctx.breakers.get(provider),
+            ),
+            url,
+            stats,
+            headers=_download_headers(provider),
+            follow_redirects=True,
+            timeout=60.0,
+        )
+    except (httpx.HTTPError, OSError) as e:
+        return _download_error(provider, e, stats)
+
+    record_response(response)
+    cache, sha256 = await asyncio.to_thread(_cache_ingest, ctx, keys, target)
+    extra.update(
+        await asyncio.to_thread(
+            _record_download, ctx, provider, url, asset_id, target, sha256, chosen
+        )
+    )
+    return _download_success(provider, target, cache, stats, **extra)
+
+
+def _batch_item_error(index: int, item: Any, error: str) -> dict[str, Any]:
+    """Per-item result for an entry rejected before downloading."""
+    fields = item if isinstance(item, dict) else {}
+    return {
+        "index": index,
+        "success": False,
+        "error": error,
+        "provider": str(fields.get("provider", "")),
+        "url": str(fields.get("url", "")),
+        "save_path": str(fields.get("save_path", "")),
+    }
+
+
+def _validate_batch(
+    items: list[dict[str, str]],
+) -> tuple[list[tuple[int, dict[str, str]]], dict[int, dict[str, Any]]]:
+    """Split batch items into runnable entries and per-item errors.
+
+    Each ``save_path`` may appear only once so concurrent downloads never
+    share a ``.part`` file.
+    """
+    runnable: list[tuple[int, dict[str, str]]] = []
+    rejected: dict[int, dict[str, Any]] = {}
+    seen: set[str] = set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get("url"):
+            rejected[index] = _batch_item_error(index, item, "Error: missing url.")
+        elif item.get("provider") not in _PROVIDER_LABELS:
+            rejected[index] = _batch_item_error(
+                index,
+                item,
+                "Error: provider must be one of "
+                f"{', '.join(_PROVIDER_LABELS)}.",
+            )
+        elif not item.get("save_path"):
+            rejected[index] = _batch_item_error(
+                index, item, "Error: missing save_path."
+            )
+        elif os.path.normpath(item["save_path"]) in seen:
+            rejected[index] = _batch_item_error(
+                index, item, "Error: duplicate save_path in batch."
+            )
+        else:
+            seen.add(os.path.normpath(item["save_path"]))
+            runnable.append((index, item))
+    return runnable, rejected
+
+
+def _batch_item_result(
+    index: int, item: dict[str, str], payload: str, started: float
+) -> dict[str, Any]:
+    """Flatten one download payload into a batch result entry."""
+    result = json.loads(payload)
+    result.pop("operation", None)
+    result.pop("summary", None)
+    result.pop("metrics", None)
+    return {
+        "index": index,
+        "url": item["url"],
+        "save_path": item["save_path"],
+        **result,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def _batch_payload(results: list[dict[str, Any]], seconds: float) -> str:
+    """Summarize per-item batch results in input order."""
+    results.sort(key=lambda r: r["index"])
+    failed = sum(1 for r in results if not r["success"])
+    total_bytes = sum(r.get("bytes", 0) for r in results if r["success"])
+    summary = (
+        f"Downloaded {len(results) - failed}/{len(results)} files "
+        f"({total_bytes / 1024**2:.1f} MiB) in {seconds:.1f}s"
+    )
+    extra = {
+        "provider": "multi",
+        "operation": "batch_download",
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "total_bytes": total_bytes,
+        "seconds": round(seconds, 3),
+        "items": results,
+    }
+    if failed:
+        return _json_error(
+            f"Error: {failed} of {len(results)} downloads failed.",
+            summary=summary,
+            **extra,
+        )
+    return _json_success(summary, **extra)
+
+
+def _batch_workers(max_concurrency: int, count: int) -> int:
+    """Clamp the requested parallelism."""
+    return max(1, min(max_concurrency, MAX_BATCH_DOWNLOAD_CONCURRENCY, count))
+
+
+def _run_batch_download(
+    ctx: _ToolContext, items: list[dict[str, str]], max_concurrency: int
+) -> str:
+    """Download ``items`` on a bounded thread pool sharing ``ctx.clients``."""
+    started = time.monotonic()
+    runnable, rejected = _validate_batch(items)
+
+    def download(index: int, item: dict[str, str]) -> dict[str, Any]:
+        item_started = time.monotonic()
+        payload = _run_download(
+            ctx,
+            item["provider"],
+            item["url"],
+            item["save_path"],
+            item.get("asset_id", ""),
+        )
+        return _batch_item_result(index, item, payload, item_started)
+
+    results = list(rejected.values())
+    if runnable:
+        workers = _batch_workers(max_concurrency, len(runnable))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Each worker reports into this call's metrics via a context copy.
+            context = contextvars.copy_context()
+            results.extend(
+                pool.map(
+                    lambda entry: context.copy().run(download, *entry), runnable
+                )
+            )
+    return _batch_payload(results, time.monotonic() - started)
+
+
+async def _arun_batch_download(
+    ctx: _ToolContext, items: list[dict[str, str]], max_concurrency: int
+) -> str:
+    """Async twin of :func:`_run_batch_download` bounded by a semaphore."""
+    started = time.monotonic()
+    runnable, rejected = _validate_batch(items)
+    semaphore = asyncio.Semaphore(_batch_workers(max_concurrency, len(runnable)))
+
+    async def download(index: int, item: dict[str, str]) -> dict[str, Any]:
+        async with semaphore:
+            item_started = time.monotonic()
+            payload = await _arun_download(
+                ctx,
+                item["provider"],
+                item["url"],
+                item["save_path"],
+                item.get("asset_id", ""),
+            )
+        return _batch_item_result(index, item, payload, item_started)
+
+    results = list(rejected.values())
+    results.extend(await asyncio.gather(*(download(*e) for e in runnable)))
+    return _batch_payload(results, time.monotonic() - started)
+
+
+def _format_manifest_record(record: ManifestRecord) -> str:
+    """One readable line per downloaded asset."""
+    details = [f"{record.provider}:{record.asset_id or '?'}", record.media_type]
+    if record.width and record.height:
+        details.append(f"{record.width}x{record.height}")
+    if record.duration:
+        details.append(f"{record.duration:g}s")
+    details.append(f"{record.bytes / 1024**2:.1f} MiB")
+    line = f"- {record.path} ({', '.join(d for d in details if d)})"
+    if record.creator or record.license:
+        line += (
+            f"\n  by {record.creator or 'Unknown'}, "
+            f"{record.license or 'license unknown'}"
+        )
+    return line
+
+
+def _run_asset_lookup(
+    ctx: _ToolContext,
+    query: str,
+    provider: str,
+    media_type: str,
+    path: str,
+    limit: int,
+) -> str:
+    """Query the project manifest of downloaded assets."""
+    if provider and provider not in PROVIDERS:
+        return _json_error(
+            f"Error: provider must be one of {', '.join(PROVIDERS)}.",
+            provider=provider,
+            operation="lookup",
+        )
+    if ctx.manifest is None:
+        records = []
+    else:
+        try:
+            records = ctx.manifest.lookup(query, provider, media_type, path)
+        except OSError as e:
+            return _json_error(
+                f"Error reading the asset manifest: {e}",
+                provider=provider or "multi",
+                operation="lookup",
+            )
+    shown = records[: max(limit, 1)]
+    if shown:
+        summary = f"{len(records)} downloaded assets match:\n" + "\n".join(
+            _format_manifest_record(record) for record in shown
+        )
+    else:
+        summary = "No downloaded assets match."
+    return _json_success(
+        summary,
+        provider=provider or "multi",
+        operation="lookup",
+        count=len(records),
+        assets=[record.to_dict() for record in shown],
+    )
+
+
+def _pexels_search_args(
+    query: str,
+    media_type: str,
+    per_page: int,
+    style_brief_path: str,
+    page: int,
+    output: str,
+    target_resolution: str,
+    max_bytes: int,
+    **filter_values: Any,
+) -> _SearchRequest | str:
+    """Validate ``pexels_search`` arguments into a request, or an error payload."""
+    if error := _output_error(output, "pexels"):
+        return error
+    filters = _parse_filters("pexels", **filter_values)
+    if isinstance(filters, str):
+        return filters
+    target = _parse_target(target_resolution, max_bytes, "pexels", "search")
+    if isinstance(target, str):
+        return target
+    api_key = os.environ.get("PEXELS_API_KEY", "")
+    if not api_key:
+        return _missing_api_key_error("pexels")
+    return _pexels_search_request(
+        api_key, query, media_type, per_page, style_brief_path, page, target, filters
+    )
+
+
+def _pixabay_search_args(
+    query: str,
+    media_type: str,
+    per_page: int,
+    style_brief_path: str,
+    page: int,
+    output: str,
+    target_resolution: str,
+    max_bytes: int,
+    **filter_values: Any,
+) -> _SearchRequest | str:
+    """Validate ``pixabay_search`` arguments into a request, or an error payload."""
+    if error := _output_error(output, "pixabay"):
+        return error
+    filters = _parse_filters("pixabay", **filter_values)
+    if isinstance(filters, str):
+        return filters
+    target = _parse_target(target_resolution, max_bytes, "pixabay", "search")
+    if isinstance(target, str):
+        return target
+    api_key = os.environ.get("PIXABAY_API_KEY", "")
+    if not api_key:
+        return _missing_api_key_error("pixabay")
+    return _pixabay_search_request(
+        api_key, query, media_type, per_page, style_brief_path, page, target, filters
+    )
+
+
+def _freesound_search_args(
+    query: str,
+    category: str,
+    license_type: str,
+    per_page: int,
+    style_brief_path: str,
+    page: int,
+    output: str,
+    **filter_values: Any,
+) -> _SearchRequest | str:
+    """Validate ``freesound_search`` arguments into a request, or an error payload."""
+    if error := _output_error(output, "freesound"):
+        return error
+    filters = _parse_filters("freesound", **filter_values)
+    if isinstance(filters, str):
+        return filters
+    api_key = os.environ.get("FREESOUND_API_KEY", "")
+    if not api_key:
+        return _missing_api_key_error("freesound")
+    return _freesound_search_request(
+        api_key,
+        query,
+        category,
+        license_type,
+        per_page,
+        style_brief_path,
+        page,
+        filters,
+    )
+
+
+def _stock_search_args(
+    query: str,
+    media_type: str,
+    per_provider: int,
+    style_brief_path: str,
+    page: int,
+    output: str,
+    **filter_values: Any,
+) -> tuple[list[_SearchRequest], dict[str, dict[str, Any]], SearchFilters] | str:
+    """Validate ``stock_search`` arguments into per-provider requests.
+
+    Returns:
+        The requests, status entries for skipped providers and the parsed
+        filters, or an error payload.
+    """
+    if error := _output_error(output, "multi"):
+        return error
+    filters = _parse_filters("multi", **filter_values)
+    if isinstance(filters, str):
+        return filters
+    requests, statuses = _stock_search_requests(
+        query, media_type, per_provider, style_brief_path, page, filters
+    )
+    return requests, statuses, filters
+
+
+def _build_context(
+    workdir: Path,
+    clients: ProviderClients | None,
+    asset_store: AssetStore | None,
+    search_cache: SearchCache | None,
+    retry_policy: RetryPolicy | None,
+    breakers: dict[str, CircuitBreaker] | None,
+    near_duplicates: NearDuplicates | None,
+    metrics: MetricsLog | None,
+) -> _ToolContext:
+    """Session context for a tool factory, filling in defaults from the env."""
+    return _ToolContext(
+        workdir=workdir,
+        clients=clients or ProviderClients(),
+        asset_store=asset_store or AssetStore.from_env(),
+        search_cache=search_cache or SearchCache.from_env(),
+        retry_policy=retry_policy or RetryPolicy.from_env(),
+        breakers=_default_breakers() if breakers is None else breakers,
+        manifest=AssetManifest.shared(workdir),
+        near_duplicates=near_duplicates or NearDuplicates.from_env(),
+        metrics=metrics or MetricsLog.from_env(workdir),
+    )
+
+
+def create_stock_tools(
+    workdir: Path,
+    clients: ProviderClients | None = None,
+    asset_store: AssetStore | None = None,
+    search_cache: SearchCache | None = None,
+    retry_policy: RetryPolicy | None = None,
+    breakers: dict[str, CircuitBreaker] | None = None,
+    near_duplicates: NearDuplicates | None = None,
+    metrics: MetricsLog | None = None,
+) -> list[Callable[..., str]]:
+    """Create stock media API tools bound to a working directory.
+
+    Returns a list of tool callables:
+    [
+        pexels_search, pexels_download,
+        pixabay_search, pixabay_download,
+        freesound_search, freesound_download,
+        stock_search, batch_download, asset_lookup
+    ]
+
+    Args:
+        workdir: Working directory for resolving relative save paths.
+        clients: Pooled provider clients shared by every tool. A private
+            pool is created when omitted; the caller owns closing it.
+        asset_store: Global content-addressed asset store; defaults to
+            :meth:`AssetStore.from_env`.
+        search_cache: Persistent search-response cache; defaults to
+            :meth:`SearchCache.from_env`.
+        retry_policy: How transient HTTP failures are retried; defaults to
+            :meth:`RetryPolicy.from_env`.
+        breakers: Circuit breaker per provider; pass the same mapping to
+            several factories to share provider health between them.
+        near_duplicates: Perceptual-hash detector flagging near-duplicate
+            hits; defaults to :meth:`NearDuplicates.from_env`.
+        metrics: Rolling log of each call's timings, bytes and cache
+            status; defaults to :meth:`MetricsLog.from_env`. Payloads carry
+            the same numbers under ``metrics`` either way.
+    """
+    ctx = _build_context(
+        workdir,
+        clients,
+        asset_store,
+        search_cache,
+        retry_policy,
+        breakers,
+        near_duplicates,
+        metrics,
+    )
+    return [instrument(tool, ctx.metrics) for tool in _stock_tools(ctx)]
+
+
+def _stock_tools(ctx: _ToolContext) -> list[Callable[..., str]]:
+    """Build the sync tool closures over ``ctx``, uninstrumented."""
+
+    def pexels_search(
+        query: str,
+        media_type: str = "photo",
+        per_page: int = 5,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        top_k: int = 0,
+        target_resolution: str = "",
+        max_bytes: int = 0,
+        orientation: str = "",
+        size: str = "",
+        color: str = "",
+        min_width: int = 0,
+        min_height: int = 0,
+        min_duration: float = 0,
+        max_duration: float = 0,
+    ) -> str:
+        """Search Pexels for free stock photos or videos.
+
+        Args:
+            query: Search keywords (English recommended for broader results).
+            media_type: Type of media - "photo" or "video".
+            per_page: Number of results to return (1-15).
+            page: Result page to fetch (1-based); pass ``next_page`` from a
+                previous call to see deeper results.
+            output: "text" for a readable listing, or "compact" for typed
+                candidates whose ids download tools accept as ``url``,
+                with near-duplicates flagged.
+            max_tokens: Approximate token budget for compact candidates;
+                titles and tags are shortened, then the lowest ranked
+                candidates dropped, to fit. 0 means no limit.
+            style_brief_path: Project style brief (e.g.
+                ".clawdcut/style_brief.json"); hits are then re-ranked by
+                palette keywords, forbidden terms, resolution and duration fit.
+            top_k: Return only the best k hits after ranking. 0 keeps all.
+            target_resolution: Composition size for videos, e.g. "1080p",
+                "4k" or "1920x1080@30"; each video then points at the
+                smallest rendition meeting it instead of the largest master.
+            max_bytes: Optional size cap for the chosen video rendition.
+            orientation: "landscape", "portrait" or "square".
+            size: Minimum size class - "small", "medium" or "large"
+                (photos 4/12/24 MP; videos HD/Full HD/4K).
+            color: Photo colour, a name like "blue" or a hex code.
+            min_width: Minimum video width in pixels.
+            min_height: Minimum video height in pixels.
+            min_duration: Minimum video length in seconds.
+            max_duration: Maximum video length in seconds.
+
+        Returns:
+            Formatted search results with id, description, preview URL,
+            download URL, and resolution.
+        """
+        request = _pexels_search_args(
+            query,
+            media_type,
+            per_page,
+            style_brief_path,
+            page,
+            output,
+            target_resolution,
+            max_bytes,
+            orientation=orientation,
+            size=size,
+            color=color,
+            min_width=min_width,
+            min_height=min_height,
+            min_duration=min_duration,
+            max_duration=max_duration,
+        )
+        if isinstance(request, str):
+            return request
+        return _run_search(ctx, request, output, max_tokens, top_k)
+
+    def pexels_download(
+        url: str,
+        save_path: str,
+        asset_id: str = "",
+        target_resolution: str = "",
+        max_bytes: int = 0,
+    ) -> str:
+        """Download a media file from Pexels to the local filesystem.
+
+        Args:
+            url: Download URL from pexels_search results, or a candidate
+                id from compact search output.
+            save_path: Relative path to save the file
+                (e.g. .clawdcut/assets/images/sunset.jpg).
+            asset_id: Optional Pexels ID from search results; lets the
+                shared asset cache recognise the clip across projects.
+            target_resolution: For videos with an ``asset_id``, download
+                the smallest rendition meeting this size (e.g. "1080p",
+                "1920x1080@30") rather than ``url``.
+            max_bytes: Optional size cap for the chosen video rendition.
+
+        Returns:
+            The local file path where the file was saved.
+        """
+        rendition = _parse_target(target_resolution, max_bytes, "pexels", "download")
+        if isinstance(rendition, str):
+            return rendition
+        return _run_download(ctx, "pexels", url, save_path, asset_id, rendition)
+
+    def pixabay_search(
+        query: str,
+        media_type: str = "photo",
+        per_page: int = 5,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        top_k: int = 0,
+        target_resolution: str = "",
+        max_bytes: int = 0,
+        orientation: str = "",
+        color: str = "",
+        min_width: int = 0,
+        min_height: int = 0,
+        editors_choice: bool = False,
+    ) -> str:
+        """Search Pixabay for free stock images or videos.
+
+        Args:
+            query: Search keywords (English recommended for broader results).
+            media_type: Type of media - "photo", "illustration",
+                "vector", or "video".
+            per_page: Number of results to return (3-15).
+            page: Result page to fetch (1-based); pass ``next_page`` from a
+                previous call to see deeper results.
+            output: "text" for a readable listing, or "compact" for typed
+                candidates whose ids download tools accept as ``url``,
+                with near-duplicates flagged.
+            max_tokens: Approximate token budget for compact candidates;
+                titles and tags are shortened, then the lowest ranked
+                candidates dropped, to fit. 0 means no limit.
+            style_brief_path: Project style brief (e.g.
+                ".clawdcut/style_brief.json"); hits are then re-ranked by
+                palette keywords, forbidden terms, resolution and duration fit.
+            top_k: Return only the best k hits after ranking. 0 keeps all.
+            target_resolution: Size the asset must cover, e.g. "640x360"
+                for picture-in-picture or "1080p"; each hit then links the
+                smallest Pixabay tier meeting it.
+            max_bytes: Optional size cap for the chosen rendition.
+            orientation: "landscape" or "portrait" (images only).
+            color: Image colour such as "blue", "grayscale" or
+                "transparent" (images only).
+            min_width: Minimum width in pixels.
+            min_height: Minimum height in pixels.
+            editors_choice: Only return Pixabay "Editor's Choice" hits.
+
+        Returns:
+            Formatted search results with id, tags, preview URL,
+            download URL, and resolution.
+        """
+        request = _pixabay_search_args(
+            query,
+            media_type,
+            per_page,
+            style_brief_path,
+            page,
+            output,
+            target_resolution,
+            max_bytes,
+            orientation=orientation,
+            color=color,
+            min_width=min_width,
+            min_height=min_height,
+            editors_choice=editors_choice,
+        )
+        if isinstance(request, str):
+            return request
+        return _run_search(ctx, request, output, max_tokens, top_k)
+
+    def pixabay_download(
+        url: str,
+        save_path: str,
+        asset_id: str = "",
+        target_resolution: str = "",
+        max_bytes: int = 0,
+    ) -> str:
+        """Download a media file from Pixabay to the local filesystem.
+
+        Args:
+            url: Download URL from pixabay_search results, or a candidate
+                id from compact search output.
+            save_path: Relative path to save the file
+                (e.g. .clawdcut/assets/videos/nature.mp4).
+            asset_id: Optional Pixabay ID from search results; lets the
+                shared asset cache recognise the file across projects.
+            target_resolution: With ``asset_id``, download the smallest
+                size tier meeting this size (e.g. "720p") rather than
+                ``url``.
+            max_bytes: Optional size cap for the chosen rendition.
+
+        Returns:
+            The local file path where the file was saved.
+        """
+        rendition = _parse_target(target_resolution, max_bytes, "pixabay", "download")
+        if isinstance(rendition, str):
+            return rendition
+        return _run_download(ctx, "pixabay", url, save_path, asset_id, rendition)
+
+    def freesound_search(
+        query: str,
+        category: str = "music",
+        license_type: str = "cc0+attribution",
+        per_page: int = 10,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        top_k: int = 0,
+        min_duration: float = 0,
+        max_duration: float = 0,
+    ) -> str:
+        """Search Freesound for free music or sound effects.
+
+        Args:
+            query: Search keywords (English recommended for broader results).
+            category: Audio category - "music" or "sfx".
+            license_type: "cc0" or "cc0+attribution".
+            per_page: Number of results to return (1-15).
+            page: Result page to fetch (1-based); pass ``next_page`` from a
+                previous call to see deeper results.
+            output: "text" for a readable listing, or "compact" for typed
+                candidates whose ids download tools accept as ``url``,
+                with near-duplicates flagged.
+            max_tokens: Approximate token budget for compact candidates;
+                titles and tags are shortened, then the lowest ranked
+                candidates dropped, to fit. 0 means no limit.
+            style_brief_path: Project style brief (e.g.
+                ".clawdcut/style_brief.json"); hits are then re-ranked by
+                palette keywords, forbidden terms, resolution and duration fit.
+            top_k: Return only the best k hits after ranking. 0 keeps all.
+            min_duration: Minimum track length in seconds.
+            max_duration: Maximum track length in seconds.
+
+        Returns:
+            Formatted search results with id, name, duration, preview URL,
+            and download URL.
+        """
+        request = _freesound_search_args(
+            query,
+            category,
+            license_type,
+            per_page,
+            style_brief_path,
+            page,
+            output,
+            min_duration=min_duration,
+            max_duration=max_duration,
+        )
+        if isinstance(request, str):
+            return request
+        return _run_search(ctx, request, output, max_tokens, top_k)
+
+    def freesound_download(url: str, save_path: str, asset_id: str = "") -> str:
+        """Download an audio file from Freesound to local filesystem.
+
+        Args:
+            url: Download URL from freesound_search results, or a candidate
+                id from compact search output.
+            save_path: Relative save path
+                (e.g. .clawdcut/assets/audio/music/theme.mp3).
+            asset_id: Optional Freesound ID from search results; lets the
+                shared asset cache recognise the track across projects.
+
+        Returns:
+            The local file path where the file was saved.
+        """
+        return _run_download(ctx, "freesound", url, save_path, asset_id)
+
+    def stock_search(
+        query: str,
+        media_type: str = "photo",
+        per_provider: int = 5,
+        limit: int = 10,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        orientation: str = "",
+        color: str = "",
+        min_width: int = 0,
+        min_height: int = 0,
+        min_duration: float = 0,
+        max_duration: float = 0,
+    ) -> str:
+        """Search every configured stock provider at once and merge the hits.
+
+        Photos and videos come from Pexels and Pixabay, "music" and "sfx"
+        from Freesound. Providers without an API key are skipped, slow
+        ones are dropped after a per-provider deadline, and ones whose
+        rate limit would hold the request past it are reported as
+        "rate_limited" without being called. Filters are sent
+        to each provider natively; ones a provider cannot apply are listed
+        under its ``ignored_filters``.
+
+        Args:
+            query: Search keywords (English recommended for broader results).
+            media_type: Type of media - "photo", "video", "music", or "sfx".
+            per_provider: Number of results requested per provider (1-15).
+            limit: Maximum number of merged candidates to return.
+            page: Page requested from every provider (1-based).
+            output: "text" for a readable listing, or "compact" for typed
+                candidates whose ids download tools accept as ``url``,
+                with near-duplicates flagged.
+            max_tokens: Approximate token budget for compact candidates;
+                titles and tags are shortened, then the lowest ranked
+                candidates dropped, to fit. 0 means no limit.
+            style_brief_path: Project style brief; merged hits are then
+                re-ranked by palette keywords, forbidden terms, resolution
+                and duration fit.
+            orientation: "landscape", "portrait" or "square".
+            color: Colour name such as "blue", or a hex code.
+            min_width: Minimum width in pixels.
+            min_height: Minimum height in pixels.
+            min_duration: Minimum clip or track length in seconds.
+            max_duration: Maximum clip or track length in seconds.
+
+        Returns:
+            Deduplicated candidates ranked across providers, each with
+            provider, id, preview URL and download URL, plus a per-provider
+            status. Download with the matching provider's download tool.
+        """
+        prepared = _stock_search_args(
+            query,
+            media_type,
+            per_provider,
+            style_brief_path,
+            page,
+            output,
+            orientation=orientation,
+            color=color,
+            min_width=min_width,
+            min_height=min_height,
+            min_duration=min_duration,
+            max_duration=max_duration,
+        )
+        if isinstance(prepared, str):
+            return prepared
+        requests, statuses, filters = prepared
+        deadline = time.monotonic() + STOCK_SEARCH_DEADLINE_SECONDS
+        results, fetched = _run_stock_search(
+            ctx, requests, STOCK_SEARCH_DEADLINE_SECONDS
+        )
+        merged = _merge_stock_results(
+            ctx, query, style_brief_path, results, limit, filters
+        )
+        return _stock_search_payload(
+            ctx,
+            query,
+            media_type,
+            style_brief_path,
+            results,
+            merged,
+            {**statuses, **fetched},
+            output,
+            max_tokens,
+            _preview_hashes(ctx, merged, deadline) if output == "compact" else {},
+        )
+
+    def batch_download(
+        items: list[dict[str, str]],
+        max_concurrency: int = BATCH_DOWNLOAD_CONCURRENCY,
+    ) -> str:
+        """Download many selected assets concurrently in one call.
+
+        Args:
+            items: Files to fetch, each a dict with "url", "save_path"
+                (under .clawdcut/assets/), "provider" ("pexels", "pixabay"
+                or "freesound") and optionally "asset_id". "url" may be a
+                candidate id from compact search output.
+            max_concurrency: Number of simultaneous downloads (1-16).
+
+        Returns:
+            Per-item results in input order, each with success or error,
+            path, bytes and seconds, plus batch totals.
+        """
+        return _run_batch_download(ctx, items, max_concurrency)
+
+    def asset_lookup(
+        query: str = "",
+        provider: str = "",
+        media_type: str = "",
+        path: str = "",
+        limit: int = 20,
+    ) -> str:
+        """Look up assets already downloaded into this project.
+
+        Every download is recorded in .clawdcut/assets/manifest.jsonl with
+        its provider, asset ID, source URL, path, bytes, sha256, dimensions,
+        duration, license and creator. Use this instead of listing the
+        asset directories.
+
+        Args:
+            query: Words matched against path, asset ID, title and creator.
+            provider: Only "pexels", "pixabay" or "freesound" assets.
+            media_type: Only "photo", "video" or "audio" assets.
+            path: Only assets under this path, e.g. ".clawdcut/assets/videos".
+            limit: Maximum number of records returned (newest first).
+
+        Returns:
+            JSON with the matching records and a readable inventory.
+        """
+        return _run_asset_lookup(ctx, query, provider, media_type, path, limit)
+
+    tools: list[Callable[..., str]] = [
+        pexels_search,
+        pexels_download,
+        pixabay_search,
+        pixabay_download,
+        freesound_search,
+        freesound_download,
+        stock_search,
+        batch_download,
+        asset_lookup,
+    ]
+    return tools
+
+
+def create_async_stock_tools(
+    workdir: Path,
+    clients: ProviderClients | None = None,
+    asset_store: AssetStore | None = None,
+    search_cache: SearchCache | None = None,
+    retry_policy: RetryPolicy | None = None,
+    breakers: dict[str, CircuitBreaker] | None = None,
+    near_duplicates: NearDuplicates | None = None,
+    metrics: MetricsLog | None = None,
+) -> list[Callable[..., Awaitable[str]]]:
+    """Create native ``async`` twins of :func:`create_stock_tools`.
+
+    The coroutines share names, signatures and docstrings with the sync
+    tools but run on pooled ``httpx.AsyncClient`` instances and back off
+    with ``asyncio.sleep``, so the agent runtime can await several of them
+    concurrently without blocking its event loop.
+
+    Args:
+        workdir: Working directory for resolving relative save paths.
+        clients: Pooled provider clients shared by every tool. A private
+            pool is created when omitted; the caller owns closing it.
+        asset_store: Global content-addressed asset store; defaults to
+            :meth:`AssetStore.from_env`.
+        search_cache: Persistent search-response cache; defaults to
+            :meth:`SearchCache.from_env`.
+        retry_policy: How transient HTTP failures are retried; defaults to
+            :meth:`RetryPolicy.from_env`.
+        breakers: Circuit breaker per provider; pass the same mapping to
+            several factories to share provider health between them.
+        near_duplicates: Perceptual-hash detector flagging near-duplicate
+            hits; defaults to :meth:`NearDuplicates.from_env`.
+        metrics: Rolling log of each call's timings, bytes and cache
+            status; defaults to :meth:`MetricsLog.from_env`. Payloads carry
+            the same numbers under ``metrics`` either way.
+    """
+    ctx = _build_context(
+        workdir,
+        clients,
+        asset_store,
+        search_cache,
+        retry_policy,
+        breakers,
+        near_duplicates,
+        metrics,
+    )
+
+    # Docstrings are copied from the sync tools below so both stay in step.
+
+    async def pexels_search(
+        query: str,
+        media_type: str = "photo",
+        per_page: int = 5,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        top_k: int = 0,
+        target_resolution: str = "",
+        max_bytes: int = 0,
+        orientation: str = "",
+        size: str = "",
+        color: str = "",
+        min_width: int = 0,
+        min_height: int = 0,
+        min_duration: float = 0,
+        max_duration: float = 0,
+    ) -> str:
+        request = _pexels_search_args(
+            query,
+            media_type,
+            per_page,
+            style_brief_path,
+            page,
+            output,
+            target_resolution,
+            max_bytes,
+            orientation=orientation,
+            size=size,
+            color=color,
+            min_width=min_width,
+            min_height=min_height,
+            min_duration=min_duration,
+            max_duration=max_duration,
+        )
+        if isinstance(request, str):
+            return request
+        return await _arun_search(ctx, request, output, max_tokens, top_k)
+
+    async def pexels_download(
+        url: str,
+        save_path: str,
+        asset_id: str = "",
+        target_resolution: str = "",
+        max_bytes: int = 0,
+    ) -> str:
+        rendition = _parse_target(target_resolution, max_bytes, "pexels", "download")
+        if isinstance(rendition, str):
+            return rendition
+        return await _arun_download(ctx, "pexels", url, save_path, asset_id, rendition)
+
+    async def pixabay_search(
+        query: str,
+        media_type: str = "photo",
+        per_page: int = 5,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        top_k: int = 0,
+        target_resolution: str = "",
+        max_bytes: int = 0,
+        orientation: str = "",
+        color: str = "",
+        min_width: int = 0,
+        min_height: int = 0,
+        editors_choice: bool = False,
+    ) -> str:
+        request = _pixabay_search_args(
+            query,
+            media_type,
+            per_page,
+            style_brief_path,
+            page,
+            output,
+            target_resolution,
+            max_bytes,
+            orientation=orientation,
+            color=color,
+            min_width=min_width,
+            min_height=min_height,
+            editors_choice=editors_choice,
+        )
+        if isinstance(request, str):
+            return request
+        return await _arun_search(ctx, request, output, max_tokens, top_k)
+
+    async def pixabay_download(
+        url: str,
+        save_path: str,
+        asset_id: str = "",
+        target_resolution: str = "",
+        max_bytes: int = 0,
+    ) -> str:
+        rendition = _parse_target(target_resolution, max_bytes, "pixabay", "download")
+        if isinstance(rendition, str):
+            return rendition
+        return await _arun_download(ctx, "pixabay", url, save_path, asset_id, rendition)
+
+    async def freesound_search(
+        query: str,
+        category: str = "music",
+        license_type: str = "cc0+attribution",
+        per_page: int = 10,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        top_k: int = 0,
+        min_duration: float = 0,
+        max_duration: float = 0,
+    ) -> str:
+        request = _freesound_search_args(
+            query,
+            category,
+            license_type,
+            per_page,
+            style_brief_path,
+            page,
+            output,
+            min_duration=min_duration,
+            max_duration=max_duration,
+        )
+        if isinstance(request, str):
+            return request
+        return await _arun_search(ctx, request, output, max_tokens, top_k)
+
+    async def freesound_download(url: str, save_path: str, asset_id: str = "") -> str:
+        return await _arun_download(ctx, "freesound", url, save_path, asset_id)
+
+    async def stock_search(
+        query: str,
+        media_type: str = "photo",
+        per_provider: int = 5,
+        limit: int = 10,
+        style_brief_path: str = "",
+        page: int = 1,
+        output: str = "text",
+        max_tokens: int = 0,
+        orientation: str = "",
+        color: str = "",
+        min_width: int = 0,
+        min_height: int = 0,
+        min_duration: float = 0,
+        max_duration: float = 0,
+    ) -> str:
+        prepared = _stock_search_args(
+            query,
+            media_type,
+            per_provider,
+            style_brief_path,
+            page,
+            output,
+            orientation=orientation,
+            color=color,
+            min_width=min_width,
+            min_height=min_height,
+            min_duration=min_duration,
+            max_duration=max_duration,
+        )
+        if isinstance(prepared, str):
+            return prepared
+        requests, statuses, filters = prepared
+        deadline = time.monotonic() + STOCK_SEARCH_DEADLINE_SECONDS
+        results, fetched = await _arun_stock_search(
+            ctx, requests, STOCK_SEARCH_DEADLINE_SECONDS
+        )
+        merged = _merge_stock_results(
+            ctx, query, style_brief_path, results, limit, filters
+        )
+        return _stock_search_payload(
+            ctx,
+            query,
+            media_type,
+            style_brief_path,
+            results,
+            merged,
+            {**statuses, **fetched},
+            output,
+            max_tokens,
+            (
+                await _apreview_hashes(ctx, merged, deadline)
+                if output == "compact"
+                else {}
+            ),
+        )
+
+    async def batch_download(
+        items: list[dict[str, str]],
+        max_concurrency: int = BATCH_DOWNLOAD_CONCURRENCY,
+    ) -> str:
+        return await _arun_batch_download(ctx, items, max_concurrency)
+
+    async def asset_lookup(
+        query: str = "",
+        provider: str = "",
+        media_type: str = "",
+        path: str = "",
+        limit: int = 20,
+    ) -> str:
+        return await asyncio.to_thread(
+            _run_asset_lookup, ctx, query, provider, media_type, path, limit
         )
 
-    return [
+    async_tools: list[Callable[..., Awaitable[str]]] = [
         pexels_search,
         pexels_download,
         pixabay_search,
         pixabay_download,
         freesound_search,
         freesound_download,
+        stock_search,
+        batch_download,
+        asset_lookup,
     ]
+    # The sync closures over the same context only lend their docstrings.
+    docs = {tool.__name__: tool.__doc__ for tool in _stock_tools(ctx)}
+    for async_tool in async_tools:
+        async_tool.__doc__ = docs[async_tool.__name__]
+    return [ainstrument(tool, ctx.metrics) for tool in async_tools]
@@ -0,0 +1,165 @@
+"""Cached loading of the project style brief for search scoring.
+
+Search tools that take a ``style_brief_path`` score every query against
+the brief's palette keywords and hard constraints. :class:`StyleBriefCache`
+parses each brief once and keeps the compiled :class:`StyleMatcher` until
+the file's mtime or size changes, so repeated searches cost one ``stat``
+instead of a read, a JSON parse and a keyword rebuild. The matcher also
+holds precompiled patterns for the brief's preferred and forbidden terms,
+used to re-rank individual search candidates.
+"""
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+MAX_CACHED_BRIEFS = 16
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _canonical(term: Any) -> str:
+    """Lower-case ``term`` and join its words with single spaces."""
+    return " ".join(_TOKEN.findall(str(term).lower()))
+
+
+@dataclass(frozen=True)
+class TermMatcher:
+    """Finds any of a set of terms in text with one precompiled regex.
+
+    Terms match as whole words; the words of a multi-word term may be
+    separated by spaces, hyphens or other punctuation, so
+    ``"neon-purple"`` also matches "neon purple".
+
+    Attributes:
+        terms: Canonical (lower-case, space-joined) terms.
+    """
+
+    terms: frozenset[str] = frozenset()
+    _pattern: "re.Pattern[str] | None" = field(
+        init=False, repr=False, compare=False, default=None
+    )
+
+    def __post_init__(self) -> None:
+        if not self.terms:
+            return
+        # Longest first, so a term wins over a shorter term it contains.
+        alternation = "|".join(
+            r"[^a-z0-9]+".join(map(re.escape, term.split()))
+            for term in sorted(self.terms, key=len, reverse=True)
+        )
+        object.__setattr__(
+            self,
+            "_pattern",
+            re.compile(rf"(?<![a-z0-9])(?:{alternation})(?![a-z0-9])"),
+        )
+
+    @classmethod
+    def of(cls, terms: list[Any]) -> "TermMatcher":
+        """Build a matcher from raw brief terms."""
+        return cls(frozenset(filter(None, map(_canonical, terms))))
+
+    def find(self, text: str) -> set[str]:
+        """Return the terms occurring in ``text``."""
+        if self._pattern is None:
+            return set()
+        return {_canonical(m) for m in self._pattern.findall(text.lower())}
+
+
+def _forbidden_terms(brief: dict[str, Any]) -> list[Any]:
+    """Every ``forbidden`` list in the brief's sections (palette, camera...)."""
+    terms: list[Any] = []
+    for section in brief.values():
+        if isinstance(section, dict) and isinstance(section.get("forbidden"), list):
+            terms.extend(section["forbidden"])
+    return terms
+
+
+@dataclass(frozen=True)
+class StyleMatcher:
+    """Keywords compiled from one style brief.
+
+    Attributes:
+        keywords: Lower-cased palette keywords and hard constraints.
+        preferred: Palette keywords, matched on candidate titles and tags.
+        forbidden: Terms from every ``forbidden`` list of the brief.
+    """
+
+    keywords: frozenset[str] = frozenset()
+    preferred: TermMatcher = field(default_factory=TermMatcher)
+    forbidden: TermMatcher = field(default_factory=TermMatcher)
+
+    @classmethod
+    def compile(cls, brief: dict[str, Any]) -> "StyleMatcher":
+        """Collect ``palette.keywords``, ``hard_constraints`` and forbidden terms."""
+        palette = brief.get("palette")
+        palette_keywords = (
+            list(palette.get("keywords", [])) if isinstance(palette, dict) else []
+        )
+        raw = palette_keywords + list(brief.get("hard_constraints", []) or [])
+        return cls(
+            keywords=frozenset(str(kw).lower() for kw in raw),
+            preferred=TermMatcher.of(palette_keywords),
+            forbidden=TermMatcher.of(_forbidden_terms(brief)),
+        )
+
+    def score(self, text: str) -> float:
+        """Share of keywords occurring in ``text``, in [0, 1]."""
+        if not self.keywords:
+            return 0.0
+        lowered = text.lower()
+        hits = sum(1 for kw in self.keywords if kw and kw in lowered)
+        return round(min(hits / len(self.keywords), 1.0), 3)
+
+
+_EMPTY = StyleMatcher()
+
+
+class StyleBriefCache:
+    """Thread-safe per-path cache of parsed briefs and their matchers.
+
+    Entries are keyed by resolved path and invalidated when the file's
+    ``(mtime_ns, size)`` changes; the least recently used brief is evicted
+    beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_BRIEFS) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            Path, tuple[tuple[int, int], dict[str, Any] | None, StyleMatcher]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> tuple[dict[str, Any] | None, StyleMatcher]:
+        """Return the parsed brief at ``path`` (``None`` if unusable) and matcher."""
+        path = path.resolve()
+        try:
+            stat = path.stat()
+        except OSError:
+            return None, _EMPTY
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                return entry[1], entry[2]
+        brief = _parse(path)
+        matcher = StyleMatcher.compile(brief) if brief else _EMPTY
+        with self._lock:
+            self._entries[path] = (stamp, brief, matcher)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return brief, matcher
+
+
+def _parse(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text())
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
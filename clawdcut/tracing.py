@@ -0,0 +1,709 @@
+"""Optional end-to-end tracing of a Clawdcut session.
+
+With ``CLAWDCUT_TRACING=1`` a :class:`Tracer` records nested spans for one
+session: each Director turn, the graph nodes it steps through (its phases),
+every LLM call, every tool call including ``task`` delegations to the
+subagents, and shell commands such as the aesthetics scripts. Spans come
+from a LangChain callback handler bound to the Director graph. Callbacks
+propagate to the subagents, so their work nests under the ``task`` call
+that started it. Stock tool spans carry the HTTP status, bytes, retries and
+backoff from the tool's ``metrics`` payload.
+
+Finished spans are appended as OTLP/JSON lines to
+``.clawdcut/traces/<session>.otlp.jsonl``, the format the OpenTelemetry
+Collector's ``otlpjsonfile`` receiver reads. With ``CLAWDCUT_OTLP_ENDPOINT``
+they are also posted to a collector's ``/v1/traces``. When the session
+closes, a flame-style timeline is written next to the file.
+``clawdcut-trace`` renders the timeline of any trace file.
+"""
+
+import contextlib
+import json
+import os
+import re
+import secrets
+import shlex
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+from uuid import UUID
+
+import click
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+
+from clawdcut import __version__
+
+TRACES_DIR = ".clawdcut/traces"
+# Tools that run a shell command in the project.
+SHELL_TOOLS = frozenset({"execute", "shell", "bash"})
+# Pending spans that trigger an export before the current turn ends.
+FLUSH_EVERY = 256
+EXPORT_TIMEOUT_SECONDS = 5.0
+
+_OTLP_INTERNAL = 1
+_OTLP_CLIENT = 3
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+_EXIT_CODE = re.compile(r"exit code (-?\d+)")
+
+
+@dataclass
+class Span:
+    """One timed operation; times are Unix epoch nanoseconds.
+
+    ``kind`` is one of ``session``, ``turn``, ``phase``, ``agent``,
+    ``delegation``, ``llm``, ``tool`` or ``subprocess``.
+    """
+
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: str = ""
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+
+    @property
+    def seconds(self) -> float:
+        return max(0, self.end_ns - self.start_ns) / 1e9
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Encode as an OTLP/JSON span."""
+        attributes = {"clawdcut.span.kind": self.kind, **self.attributes}
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _OTLP_CLIENT if self.kind == "llm" else _OTLP_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in attributes.items()
+                if value is not None
+            ],
+            "status": (
+                {"code": _STATUS_ERROR, "message": self.error}
+                if self.error
+                else {"code": _STATUS_OK}
+            ),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+    @classmethod
+    def from_otlp(cls, data: dict[str, Any]) -> "Span":
+        """Decode an OTLP/JSON span written by :meth:`to_otlp`."""
+        attributes = {
+            item["key"]: _from_otlp_value(item.get("value", {}))
+            for item in data.get("attributes", [])
+        }
+        status = data.get("status", {})
+        return cls(
+            name=data.get("name", ""),
+            kind=str(attributes.pop("clawdcut.span.kind", "span")),
+            trace_id=data.get("traceId", ""),
+            span_id=data.get("spanId", ""),
+            parent_id=data.get("parentSpanId", ""),
+            start_ns=int(data.get("startTimeUnixNano", 0)),
+            end_ns=int(data.get("endTimeUnixNano", 0)),
+            attributes=attributes,
+            error=(
+                status.get("message", "error")
+                if status.get("code") == _STATUS_ERROR
+                else ""
+            ),
+        )
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _from_otlp_value(value: dict[str, Any]) -> Any:
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("boolValue", "doubleValue", "stringValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+def _otlp_request(spans: list[Span], session_id: str) -> dict[str, Any]:
+    """Wrap spans in an OTLP ``ExportTraceServiceRequest``."""
+    resource = {
+        "service.name": "clawdcut",
+        "service.version": __version__,
+        "session.id": session_id,
+    }
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": key, "value": _otlp_value(value)}
+                        for key, value in resource.items()
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "clawdcut", "version": __version__},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def traces_url(endpoint: str) -> str:
+    """The collector's OTLP/HTTP traces URL for ``endpoint``."""
+    endpoint = endpoint.rstrip("/")
+    return endpoint if endpoint.endswith("/v1/traces") else endpoint + "/v1/traces"
+
+
+class Tracer:
+    """Collects and exports the spans of one session.
+
+    Args:
+        directory: Where the trace file and timeline are written.
+        endpoint: Optional OTLP/HTTP collector, e.g. ``http://localhost:4318``.
+        session_id: Names the output files; generated when omitted.
+        transport: HTTP transport for the collector, mainly for tests.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        endpoint: str = "",
+        session_id: str = "",
+        transport: httpx.BaseTransport | None = None,
+    ) -> None:
+        self.session_id = session_id or (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        )
+        self.trace_id = secrets.token_hex(16)
+        self.path = directory / f"{self.session_id}.otlp.jsonl"
+        self.timeline_path = directory / f"{self.session_id}.timeline.txt"
+        self.endpoint = endpoint
+        self.agents: set[str] = set()
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+        self._pending: list[Span] = []
+        self._open: dict[str, Span] = {}
+        self._exporter = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="clawdcut-otlp")
+            if endpoint
+            else None
+        )
+        self._transport = transport
+        self.session = self.start(
+            "session", "session", None, {"session.id": self.session_id}
+        )
+        self.handler = TracingCallbackHandler(self)
+
+    @classmethod
+    def from_env(cls, workdir: Path) -> "Tracer | None":
+        """Build a tracer for ``workdir``, or ``None`` when tracing is off.
+
+        ``CLAWDCUT_TRACING=1`` writes trace files; ``CLAWDCUT_OTLP_ENDPOINT``
+        also sends spans to a collector and turns tracing on by itself.
+        """
+        enabled = os.environ.get("CLAWDCUT_TRACING", "").lower() in ("1", "true")
+        endpoint = os.environ.get("CLAWDCUT_OTLP_ENDPOINT", "")
+        if not (enabled or endpoint):
+            return None
+        return cls(workdir / TRACES_DIR, endpoint)
+
+    def register_agents(self, names: Iterable[str]) -> None:
+        """Name the subagent graphs whose runs become ``agent`` spans."""
+        self.agents.update(names)
+
+    def start(
+        self,
+        name: str,
+        kind: str,
+        parent: Span | None,
+        attributes: dict[str, Any] | None = None,
+    ) -> Span:
+        """Open a span under ``parent`` (the session when ``None``)."""
+        if parent is None and kind != "session":
+            parent = self.session
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=self.trace_id,
+            parent_id=parent.span_id if parent else "",
+            attributes=attributes or {},
+        )
+        with self._lock:
+            self._open[span.span_id] = span
+        return span
+
+    def end(
+        self,
+        span: Span,
+        error: str = "",
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        """Close ``span``; finishing a turn exports what is pending."""
+        span.end_ns = time.time_ns()
+        span.error = error
+        span.attributes.update(attributes or {})
+        with self._lock:
+            if self._open.pop(span.span_id, None) is None:
+                return
+            self._spans.append(span)
+            self._pending.append(span)
+            flush = span.kind == "turn" or len(self._pending) >= FLUSH_EVERY
+        if flush:
+            self.flush()
+
+    @property
+    def spans(self) -> list[Span]:
+        """Finished spans so far, in the order they ended."""
+        with self._lock:
+            return list(self._spans)
+
+    def flush(self) -> None:
+        """Append pending spans to the trace file and queue them for export."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        request = _otlp_request(pending, self.session_id)
+        with contextlib.suppress(OSError):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(request, ensure_ascii=False) + "\n")
+        if self._exporter is not None:
+            self._exporter.submit(self._post, request)
+
+    def _post(self, request: dict[str, Any]) -> None:
+        """Send one batch to the collector; tracing never fails the session."""
+        with (
+            contextlib.suppress(httpx.HTTPError),
+            httpx.Client(
+                transport=self._transport, timeout=EXPORT_TIMEOUT_SECONDS
+            ) as client,
+        ):
+            client.post(traces_url(self.endpoint), json=request)
+
+    def close(self) -> str:
+        """End the session, export everything and write the timeline.
+
+        Spans still open (an interrupted turn) are closed as errors.
+
+        Returns:
+            The timeline text.
+        """
+        with self._lock:
+            unfinished = [s for s in self._open.values() if s is not self.session]
+        for span in sorted(unfinished, key=lambda s: -s.start_ns):
+            self.end(span, error="unfinished")
+        self.end(self.session)
+        self.flush()
+        if self._exporter is not None:
+            self._exporter.shutdown(wait=True)
+        text = timeline(self.spans)
+        with contextlib.suppress(OSError):
+            self.timeline_path.parent.mkdir(parents=True, exist_ok=True)
+            self.timeline_path.write_text(text + "\n", encoding="utf-8")
+        return text
+
+
+def _short_command(command: str, limit: int = 60) -> str:
+    """First words of a shell command, script paths reduced to file names."""
+    try:
+        words = shlex.split(command)
+    except ValueError:
+        words = command.split()
+    short = " ".join(Path(w).name if "/" in w else w for w in words[:3])
+    return short if len(short) <= limit else short[: limit - 1] + "…"
+
+
+def _tool_metrics(output: Any) -> dict[str, Any]:
+    """Span attributes from a stock tool's ``metrics`` payload, if any."""
+    content = getattr(output, "content", output)
+    if not isinstance(content, str) or '"metrics"' not in content:
+        return {}
+    try:
+        payload = json.loads(content)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(payload, dict) or not isinstance(payload.get("metrics"), dict):
+        return {}
+    metrics = payload["metrics"]
+    return {
+        "clawdcut.provider": payload.get("provider"),
+        "clawdcut.operation": payload.get("operation"),
+        "clawdcut.success": payload.get("success"),
+        "http.response.status_code": metrics.get("http_status"),
+        "clawdcut.http.bytes": metrics.get("bytes"),
+        "clawdcut.http.retries": metrics.get("retries"),
+        "clawdcut.http.backoff_seconds": metrics.get("backoff_seconds"),
+        "clawdcut.cache": metrics.get("cache"),
+    }
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """Turns LangChain run callbacks into :class:`Span` objects.
+
+    Runs that are not worth a span (internal chains) are remembered only as
+    aliases, so their children attach to the nearest traced ancestor.
+    """
+
+    run_inline = True
+    raise_error = False
+
+    def __init__(self, tracer: Tracer) -> None:
+        self.tracer = tracer
+        self._runs: dict[UUID, Span] = {}
+        self._aliases: dict[UUID, UUID | None] = {}
+        self._lock = threading.Lock()
+
+    def _parent(self, parent_run_id: UUID | None) -> Span | None:
+        with self._lock:
+            while parent_run_id is not None and parent_run_id not in self._runs:
+                parent_run_id = self._aliases.get(parent_run_id)
+            return self._runs.get(parent_run_id) if parent_run_id else None
+
+    def _start(
+        self,
+        run_id: UUID,
+        parent_run_id: UUID | None,
+        name: str,
+        kind: str,
+        attributes: dict[str, Any],
+    ) -> None:
+        span = self.tracer.start(name, kind, self._parent(parent_run_id), attributes)
+        with self._lock:
+            self._runs[run_id] = span
+
+    def _end(
+        self,
+        run_id: UUID,
+        error: BaseException | None = None,
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        with self._lock:
+            span = self._runs.pop(run_id, None)
+            self._aliases.pop(run_id, None)
+        if span is not None:
+            message = f"{type(error).__name__}: {error}" if error else ""
+            self.tracer.end(span, message, attributes)
+
+    @staticmethod
+    def _agent(metadata: dict[str, Any] | None) -> str:
+        return (metadata or {}).get("lc_agent_name") or "director"
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or ""
+        if parent_run_id is None:
+            attributes = {"gen_ai.agent.name": "director"}
+            self._start(run_id, None, "turn", "turn", attributes)
+        elif name in self.tracer.agents:
+            attributes = {"gen_ai.agent.name": name}
+            self._start(run_id, parent_run_id, name, "agent", attributes)
+        elif (metadata or {}).get("langgraph_node") == name:
+            attributes = {"gen_ai.agent.name": self._agent(metadata)}
+            self._start(run_id, parent_run_id, name, "phase", attributes)
+        else:
+            with self._lock:
+                self._aliases[run_id] = parent_run_id
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any] | None,
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = (
+            params.get("model")
+            or params.get("model_name")
+            or (metadata or {}).get("ls_model_name")
+            or (serialized or {}).get("name")
+            or "model"
+        )
+        attributes = {
+            "gen_ai.request.model": str(model),
+            "gen_ai.agent.name": self._agent(metadata),
+            "clawdcut.llm.messages": sum(len(batch) for batch in messages),
+        }
+        self._start(run_id, parent_run_id, f"llm {model}", "llm", attributes)
+
+    def on_llm_start(
+        self,
+        serialized: dict[str, Any] | None,
+        prompts: list[str],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.on_chat_model_start(
+            serialized,
+            [prompts],
+            run_id=run_id,
+            parent_run_id=parent_run_id,
+            metadata=metadata,
+            **kwargs,
+        )
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        usage: dict[str, Any] = {}
+        for generations in getattr(response, "generations", []):
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or usage
+        self._end(
+            run_id,
+            attributes={
+                "gen_ai.usage.input_tokens": usage.get("input_tokens"),
+                "gen_ai.usage.output_tokens": usage.get("output_tokens"),
+            },
+        )
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any] | None,
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        inputs: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        tool = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        inputs = inputs or {}
+        attributes: dict[str, Any] = {
+            "gen_ai.tool.name": tool,
+            "gen_ai.agent.name": self._agent(metadata),
+        }
+        if tool == "task":
+            subagent = str(inputs.get("subagent_type", ""))
+            attributes["clawdcut.subagent"] = subagent
+            name, kind = f"task {subagent}".strip(), "delegation"
+        elif tool in SHELL_TOOLS:
+            command = str(inputs.get("command", input_str))
+            attributes["process.command_line"] = command[:1000]
+            name, kind = f"{tool} {_short_command(command)}", "subprocess"
+        else:
+            name, kind = tool, "tool"
+        self._start(run_id, parent_run_id, name, kind, attributes)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        attributes = _tool_metrics(output)
+        content = getattr(output, "content", output)
+        if isinstance(content, str) and (match := _EXIT_CODE.search(content[-200:])):
+            attributes["process.exit.code"] = int(match.group(1))
+        self._end(run_id, attributes=attributes)
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._end(run_id, error)
+
+
+def load_spans(path: Path) -> list[Span]:
+    """Read every span from an OTLP/JSON lines file."""
+    spans: list[Span] = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            with contextlib.suppress(json.JSONDecodeError):
+                request = json.loads(line)
+                for resource in request.get("resourceSpans", []):
+                    for scope in resource.get("scopeSpans", []):
+                        spans.extend(
+                            Span.from_otlp(span) for span in scope.get("spans", [])
+                        )
+    return spans
+
+
+def _union_seconds(intervals: list[tuple[int, int]]) -> float:
+    """Total length covered by possibly overlapping ``intervals``."""
+    covered = 0
+    end = None
+    for start, stop in sorted(intervals):
+        if end is None or start > end:
+            covered += stop - start
+            end = stop
+        elif stop > end:
+            covered += stop - end
+            end = stop
+    return covered / 1e9
+
+
+def self_times(spans: list[Span]) -> dict[str, float]:
+    """Seconds spent in each span kind, not counting time in child spans.
+
+    Session self time is time no turn was running: waiting on the user.
+    """
+    children: dict[str, list[Span]] = {}
+    for span in spans:
+        children.setdefault(span.parent_id, []).append(span)
+    totals: dict[str, float] = {}
+    for span in spans:
+        covered = _union_seconds(
+            [
+                (max(c.start_ns, span.start_ns), min(c.end_ns, span.end_ns))
+                for c in children.get(span.span_id, [])
+                if c.end_ns > span.start_ns and c.start_ns < span.end_ns
+            ]
+        )
+        kind = "idle" if span.kind == "session" else span.kind
+        totals[kind] = totals.get(kind, 0.0) + max(0.0, span.seconds - covered)
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def _bar(span: Span, origin: int, total_ns: int, width: int) -> str:
+    offset = min(width - 1, int((span.start_ns - origin) / total_ns * width))
+    length = max(1, round((span.end_ns - span.start_ns) / total_ns * width))
+    length = min(length, width - offset)
+    return " " * offset + "█" * length + " " * (width - offset - length)
+
+
+def timeline(spans: list[Span], width: int = 48, min_fraction: float = 0.005) -> str:
+    """Render a flame-style timeline of one session.
+
+    The report lists self time per span kind, the operations that took the
+    most time in total, and an indented tree of spans with bars placed on a
+    shared time axis. Spans shorter than ``min_fraction`` of the session are
+    left out of the tree.
+    """
+    finished = [s for s in spans if s.end_ns]
+    if not finished:
+        return "No spans recorded."
+    origin = min(s.start_ns for s in finished)
+    total_ns = max(1, max(s.end_ns for s in finished) - origin)
+    total = total_ns / 1e9
+    ids = {s.span_id for s in finished}
+    children: dict[str, list[Span]] = {}
+    for span in finished:
+        parent = span.parent_id if span.parent_id in ids else ""
+        children.setdefault(parent, []).append(span)
+    session = next((s for s in finished if s.kind == "session"), None)
+    title = (
+        f"Session {session.attributes.get('session.id', '')}" if session else "Trace"
+    )
+
+    lines = [f"{title}: {total:.1f}s, {len(finished)} spans"]
+    lines += ["", "Self time by kind"]
+    for kind, seconds in self_times(finished).items():
+        lines.append(f"  {kind:<12} {seconds:>9.2f}s {seconds / total:>6.1%}")
+
+    operations: dict[tuple[str, str], list[float]] = {}
+    for span in finished:
+        if span.kind not in ("session", "turn", "phase"):
+            operations.setdefault((span.kind, span.name), []).append(span.seconds)
+    if operations:
+        lines += ["", "Top operations by total time"]
+        ranked = sorted(operations.items(), key=lambda item: -sum(item[1]))
+        for (kind, name), durations in ranked[:10]:
+            lines.append(
+                f"  {kind:<11} {name[:40]:<40} {len(durations):>4}x "
+                f"{sum(durations):>9.2f}s  max {max(durations):.2f}s"
+            )
+
+    hidden = 0
+    tree: list[str] = []
+
+    def walk(parent_id: str, depth: int) -> None:
+        nonlocal hidden
+        for span in sorted(children.get(parent_id, []), key=lambda s: s.start_ns):
+            if span.seconds < total * min_fraction and span.kind != "session":
+                hidden += 1 + _count(children, span.span_id)
+                continue
+            mark = " !" if span.error else ""
+            tree.append(
+                f"|{_bar(span, origin, total_ns, width)}| {span.seconds:>9.2f}s "
+                f"{'  ' * depth}{span.name}{mark}"
+            )
+            walk(span.span_id, depth + 1)
+
+    walk("", 0)
+    lines += ["", f"Timeline (one column = {total / width:.2f}s)", *tree]
+    if hidden:
+        lines.append(f"  {hidden} spans under {total * min_fraction:.2f}s not shown")
+    return "\n".join(lines)
+
+
+def _count(children: dict[str, list[Span]], span_id: str) -> int:
+    """Number of descendants of ``span_id``."""
+    return sum(1 + _count(children, c.span_id) for c in children.get(span_id, []))
+
+
+@click.command()
+@click.argument(
+    "trace", required=False, type=click.Path(dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--workdir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path.cwd,
+    help="Project whose latest trace is shown when TRACE is omitted.",
+)
+@click.option("--width", default=48, show_default=True, help="Timeline columns.")
+@click.option(
+    "--min-fraction",
+    default=0.005,
+    show_default=True,
+    help="Hide spans shorter than this share of the session.",
+)
+def main(trace: Path | None, workdir: Path, width: int, min_fraction: float) -> None:
+    """Print the flame-style timeline of a Clawdcut trace file."""
+    if trace is None:
+        candidates = sorted(
+            (workdir / TRACES_DIR).glob("*.otlp.jsonl"),
+            key=lambda path: path.stat().st_mtime,
+        )
+        if not candidates:
+            raise click.ClickException(f"No traces in {workdir / TRACES_DIR}.")
+        trace = candidates[-1]
+    click.echo(timeline(load_spans(trace), width, min_fraction))
+
+
+if __name__ == "__main__":
+    main()
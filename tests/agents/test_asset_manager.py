@@ -1,7 +1,10 @@
 """Tests for Asset Manager SubAgent."""
 
+import asyncio
+import inspect
 from pathlib import Path
 
+import httpx
 import pytest
 
 from clawdcut.agents.asset_manager import create_asset_manager_subagent
@@ -46,7 +49,7 @@ class TestCreateAssetManagerSubagent:
     def test_has_tools(self, subagent: dict) -> None:
         assert "tools" in subagent
         tools = subagent["tools"]
-        assert len(tools) == 6
+        assert len(tools) == 9
 
     def test_tool_names(self, subagent: dict) -> None:
         tool_names = [t.__name__ for t in subagent["tools"]]
@@ -56,22 +59,36 @@ class TestCreateAssetManagerSubagent:
         assert "pixabay_download" in tool_names
         assert "freesound_search" in tool_names
         assert "freesound_download" in tool_names
+        assert "stock_search" in tool_names
+        assert "batch_download" in tool_names
+        assert "asset_lookup" in tool_names
 
     def test_tools_bound_to_workdir(self, subagent: dict, workdir: Path) -> None:
         """Verify download tools save files relative to workdir."""
-        from unittest.mock import patch
+        from unittest.mock import MagicMock, patch
 
         tools = {t.__name__: t for t in subagent["tools"]}
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.return_value.status_code = 200
-            mock_get.return_value.raise_for_status.return_value = None
-            mock_get.return_value.content = b"test-data"
-
-            tools["pexels_download"](
-                "https://example.com/test.jpg",
-                ".clawdcut/assets/images/test.jpg",
+        response = MagicMock()
+        response.status_code = 200
+        response.raise_for_status.return_value = None
+        response.headers = httpx.Headers()
+        response.aiter_bytes.return_value.__aiter__.return_value = [b"test-data"]
+        with patch(
+            "clawdcut.tools.stock_tools.httpx.AsyncClient.stream"
+        ) as mock_stream:
+            mock_stream.return_value.__aenter__.return_value = response
+            asyncio.run(
+                tools["pexels_download"](
+                    "https://example.com/test.jpg",
+                    ".clawdcut/assets/images/test.jpg",
+                )
             )
 
         target = workdir / ".clawdcut/assets/images/test.jpg"
         assert target.exists()
         assert target.read_bytes() == b"test-data"
+
+    def test_tools_are_coroutines(self, subagent: dict) -> None:
+        for tool in subagent["tools"]:
+            assert inspect.iscoroutinefunction(tool)
+            assert tool.__doc__
@@ -11,6 +11,7 @@ from clawdcut.agents.director import (
     _resolve_model,
     create_director_agent,
 )
+from clawdcut.tracing import Tracer
 
 
 @pytest.fixture
@@ -261,3 +262,18 @@ class TestCreateDirectorAgent:
         mock_create.return_value = sentinel
         result = create_director_agent(workdir)
         assert result is sentinel
+
+    @patch("clawdcut.agents.director.create_deep_agent")
+    def test_binds_tracer_callbacks(
+        self, mock_create: MagicMock, workdir: Path
+    ) -> None:
+        agent = MagicMock()
+        mock_create.return_value = agent
+        tracer = Tracer(workdir / "traces", session_id="s")
+
+        result = create_director_agent(workdir, tracer=tracer)
+
+        agent.with_config.assert_called_once_with({"callbacks": [tracer.handler]})
+        assert result is agent.with_config.return_value
+        assert "asset-manager" in tracer.agents
+        tracer.close()
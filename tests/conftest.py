@@ -0,0 +1,21 @@
+"""Shared pytest fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Keep the user-level clawdcut cache out of the real home directory."""
+    cache_dir = tmp_path_factory.mktemp("clawdcut-cache")
+    monkeypatch.setenv("CLAWDCUT_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def no_preview_hashing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep searches from fetching previews unless a test opts in."""
+    monkeypatch.setenv("CLAWDCUT_NEAR_DUPLICATES", "0")
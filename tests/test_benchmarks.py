@@ -0,0 +1,56 @@
+"""Smoke test for the offline stock-tools benchmark suite."""
+
+import importlib.util
+import json
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "benchmarks" / "stock_tools.py"
+
+
+@pytest.fixture
+def bench() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("bench_stock_tools", SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_suite_runs_offline(bench: ModuleType, tmp_path: Path) -> None:
+    config = bench.BenchConfig(
+        latency=0,
+        searches=2,
+        download_sizes=(64 * 1024,),
+        download_repeats=1,
+        rss_size=1024 * 1024,
+        formatter_iterations=2,
+        concurrency=(1, 2),
+        calls_per_level=2,
+    )
+
+    results = json.loads(json.dumps(bench.run_suite(config, tmp_path)))
+
+    assert set(results["search_latency"]["providers"]) == {
+        "pexels",
+        "pixabay",
+        "freesound",
+    }
+    assert results["search_latency"]["providers"]["pexels"]["count"] == 2
+    assert results["download_throughput"][0]["bytes"] == 64 * 1024
+    assert results["formatters"]["format_pexels_videos"]["us_per_call"] > 0
+    assert [level["parallel"] for level in results["concurrency"]] == [1, 2]
+    assert results["concurrency"][0]["speedup"] == 1.0
+    if results["peak_rss"]["supported"]:
+        assert results["peak_rss"]["peak_rss_bytes"] > 0
+
+
+def test_percentiles(bench: ModuleType) -> None:
+    summary = bench.percentiles([0.01 * n for n in range(1, 101)])
+
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == pytest.approx(505, abs=1)
+    assert summary["p99_ms"] == pytest.approx(990.1)
+    assert summary["max_ms"] == 1000
@@ -0,0 +1,250 @@
+"""Tests for session tracing."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from click.testing import CliRunner
+from deepagents import create_deep_agent
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from clawdcut.tracing import (
+    TRACES_DIR,
+    Span,
+    Tracer,
+    load_spans,
+    main,
+    self_times,
+    timeline,
+    traces_url,
+)
+
+
+class ToolCallingFake(GenericFakeChatModel):
+    """Scripted chat model that accepts tool bindings."""
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ToolCallingFake":
+        return self
+
+
+def _call(name: str, call_id: str, **args: Any) -> AIMessage:
+    return AIMessage(
+        content="", tool_calls=[{"name": name, "args": args, "id": call_id}]
+    )
+
+
+def pexels_search(query: str) -> str:
+    """Search stock photos."""
+    return json.dumps(
+        {
+            "success": True,
+            "provider": "pexels",
+            "operation": "search",
+            "metrics": {"http_status": 200, "bytes": 2048, "retries": 1},
+        }
+    )
+
+
+def execute(command: str) -> str:
+    """Run a shell command."""
+    return "scored\n[Command failed with exit code 2]"
+
+
+def _run_session(tracer: Tracer) -> None:
+    """One Director turn delegating to a subagent that uses two tools."""
+    model = ToolCallingFake(
+        messages=iter(
+            [
+                _call("task", "t1", description="find", subagent_type="assets"),
+                _call("pexels_search", "t2", query="sea"),
+                _call("execute", "t3", command="python scripts/score_aesthetics.py"),
+                AIMessage(content="found"),
+                AIMessage(content="done"),
+            ]
+        )
+    )
+    subagent = {
+        "name": "assets",
+        "description": "Finds assets.",
+        "system_prompt": "Find assets.",
+        "tools": [pexels_search, execute],
+        "model": model,
+    }
+    agent = create_deep_agent(model=model, subagents=[subagent])
+    tracer.register_agents(["assets"])
+    agent = agent.with_config({"callbacks": [tracer.handler]})
+    asyncio.run(agent.ainvoke({"messages": [{"role": "user", "content": "go"}]}))
+
+
+def _span(name: str, kind: str, start: float, end: float, parent: str = "") -> Span:
+    return Span(
+        name=name,
+        kind=kind,
+        trace_id="t",
+        span_id=name,
+        parent_id=parent,
+        start_ns=int(start * 1e9),
+        end_ns=int(end * 1e9),
+    )
+
+
+class TestCallbackSpans:
+    def test_nests_turn_delegation_subagent_and_tools(self, tmp_path: Path) -> None:
+        tracer = Tracer(tmp_path, session_id="s1")
+        _run_session(tracer)
+        tracer.close()
+
+        spans = load_spans(tracer.path)
+        by_id = {span.span_id: span for span in spans}
+
+        def chain(span: Span) -> list[str]:
+            names = []
+            while span.parent_id:
+                span = by_id[span.parent_id]
+                names.append(span.kind)
+            return names
+
+        by_name = {span.name: span for span in spans}
+        search = by_name["pexels_search"]
+        assert chain(search) == [
+            "phase",
+            "agent",
+            "delegation",
+            "phase",
+            "turn",
+            "session",
+        ]
+        assert by_name["task assets"].attributes["clawdcut.subagent"] == "assets"
+        assert search.attributes["http.response.status_code"] == 200
+        assert search.attributes["clawdcut.http.bytes"] == 2048
+        assert search.attributes["gen_ai.agent.name"] == "assets"
+        script = by_name["execute python score_aesthetics.py"]
+        assert script.kind == "subprocess"
+        assert script.attributes["process.exit.code"] == 2
+        assert sum(span.kind == "llm" for span in spans) == 5
+        assert all(span.end_ns >= span.start_ns for span in spans)
+        assert "Self time by kind" in tracer.timeline_path.read_text()
+
+    def test_close_ends_unfinished_spans(self, tmp_path: Path) -> None:
+        tracer = Tracer(tmp_path, session_id="s2")
+        turn = tracer.start("turn", "turn", None)
+        tracer.start("llm model", "llm", turn)
+        tracer.close()
+
+        spans = {span.name: span for span in load_spans(tracer.path)}
+        assert spans["llm model"].error == "unfinished"
+        assert spans["turn"].error == "unfinished"
+        assert spans["session"].error == ""
+
+
+class TestExport:
+    def test_otlp_round_trip(self) -> None:
+        span = _span("tool", "tool", 1, 2, parent="p")
+        span.attributes = {"count": 3, "ratio": 0.5, "ok": True, "name": "x"}
+        span.error = "boom"
+
+        encoded = span.to_otlp()
+        assert encoded["parentSpanId"] == "p"
+        assert encoded["status"] == {"code": 2, "message": "boom"}
+        assert Span.from_otlp(encoded) == span
+
+    def test_posts_to_collector(self, tmp_path: Path) -> None:
+        received: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(request)
+            return httpx.Response(200)
+
+        tracer = Tracer(
+            tmp_path,
+            endpoint="http://collector:4318/",
+            transport=httpx.MockTransport(handler),
+        )
+        tracer.end(tracer.start("turn", "turn", None))
+        tracer.close()
+
+        assert [str(r.url) for r in received] == ["http://collector:4318/v1/traces"] * 2
+        body = json.loads(received[0].content)
+        resource = body["resourceSpans"][0]
+        assert {"key": "service.name", "value": {"stringValue": "clawdcut"}} in (
+            resource["resource"]["attributes"]
+        )
+        assert resource["scopeSpans"][0]["spans"][0]["name"] == "turn"
+
+    def test_collector_failures_are_ignored(self, tmp_path: Path) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        tracer = Tracer(
+            tmp_path,
+            endpoint="http://collector",
+            transport=httpx.MockTransport(handler),
+        )
+        tracer.close()
+
+        assert [span.kind for span in load_spans(tracer.path)] == ["session"]
+
+    def test_traces_url(self) -> None:
+        assert traces_url("http://c:4318") == "http://c:4318/v1/traces"
+        assert traces_url("http://c/v1/traces") == "http://c/v1/traces"
+
+    def test_from_env(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("CLAWDCUT_TRACING", raising=False)
+        monkeypatch.delenv("CLAWDCUT_OTLP_ENDPOINT", raising=False)
+        assert Tracer.from_env(tmp_path) is None
+
+        monkeypatch.setenv("CLAWDCUT_TRACING", "1")
+        tracer = Tracer.from_env(tmp_path)
+        assert tracer is not None
+        assert tracer.path.parent == tmp_path / TRACES_DIR
+        tracer.close()
+
+
+class TestTimeline:
+    def _spans(self) -> list[Span]:
+        return [
+            _span("session", "session", 0, 100),
+            _span("turn", "turn", 10, 90, "session"),
+            _span("llm a", "llm", 10, 40, "turn"),
+            # Parallel tool calls overlap; their union counts once.
+            _span("search", "tool", 40, 60, "turn"),
+            _span("download", "tool", 50, 80, "turn"),
+            _span("tiny", "tool", 80, 80.1, "turn"),
+        ]
+
+    def test_self_times_by_kind(self) -> None:
+        times = self_times(self._spans())
+
+        assert times["idle"] == pytest.approx(20)
+        assert times["llm"] == pytest.approx(30)
+        assert times["tool"] == pytest.approx(50.1)
+        assert times["turn"] == pytest.approx(9.9)
+
+    def test_renders_tree_on_shared_axis(self) -> None:
+        text = timeline(self._spans(), width=10, min_fraction=0.01)
+        tree = text.split("Timeline")[1].splitlines()
+
+        assert "|██████████|    100.00s session" in tree
+        assert "| ████████ |     80.00s   turn" in tree
+        assert "| ███      |     30.00s     llm a" in tree
+        assert "1 spans under 1.00s not shown" in text
+        assert "tool        download" in text
+
+    def test_empty(self) -> None:
+        assert timeline([]) == "No spans recorded."
+
+    def test_command_shows_latest_trace(self, tmp_path: Path) -> None:
+        tracer = Tracer(tmp_path / TRACES_DIR, session_id="latest")
+        tracer.end(tracer.start("turn", "turn", None))
+        tracer.close()
+
+        result = CliRunner().invoke(main, ["--workdir", str(tmp_path)])
+        missing = CliRunner().invoke(main, ["--workdir", str(tmp_path / "none")])
+
+        assert result.exit_code == 0
+        assert "Session latest" in result.output
+        assert missing.exit_code != 0
@@ -0,0 +1,128 @@
+"""Tests for the global content-addressed asset store."""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from clawdcut.tools.asset_cache import (
+    AssetStore,
+    asset_key,
+    cache_root,
+    url_key,
+)
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> AssetStore:
+    return AssetStore(tmp_path / "store", max_bytes=1024)
+
+
+def _file(directory: Path, name: str, content: bytes) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_bytes(content)
+    return path
+
+
+class TestCacheRoot:
+    def test_explicit_dir(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_CACHE_DIR", "/tmp/clawdcut-explicit")
+        assert cache_root() == Path("/tmp/clawdcut-explicit")
+
+    def test_xdg_cache_home(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("CLAWDCUT_CACHE_DIR")
+        monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/xdg")
+        assert cache_root() == Path("/tmp/xdg/clawdcut")
+
+    def test_from_env_can_disable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_ASSET_CACHE", "0")
+        assert AssetStore.from_env() is None
+
+    def test_from_env_reads_cap(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_ASSET_CACHE_MAX_BYTES", "2048")
+        store = AssetStore.from_env()
+        assert store is not None
+        assert store.max_bytes == 2048
+
+
+class TestAssetStore:
+    def test_ingest_is_content_addressed(
+        self, store: AssetStore, tmp_path: Path
+    ) -> None:
+        source = _file(tmp_path / "project", "clip.mp4", b"clip-bytes")
+        sha = store.ingest(source, [url_key("https://cdn.test/clip.mp4")])
+
+        assert sha == hashlib.sha256(b"clip-bytes").hexdigest()
+        assert store.blob_path(sha).read_bytes() == b"clip-bytes"
+
+    def test_materialize_by_url(self, store: AssetStore, tmp_path: Path) -> None:
+        source = _file(tmp_path / "a", "clip.mp4", b"clip-bytes")
+        store.ingest(source, [url_key("https://cdn.test/clip.mp4")])
+
+        target = tmp_path / "b" / "copy.mp4"
+        target.parent.mkdir()
+        assert store.materialize([url_key("https://cdn.test/clip.mp4")], target)
+        assert target.read_bytes() == b"clip-bytes"
+
+    def test_materialize_by_asset_key(self, store: AssetStore, tmp_path: Path) -> None:
+        key = asset_key("pexels", "67890", "67890-hd.mp4")
+        source = _file(tmp_path / "a", "clip.mp4", b"clip-bytes")
+        store.ingest(source, [key, url_key("https://signed.test/1?token=a")])
+
+        target = tmp_path / "copy.mp4"
+        keys = [key, url_key("https://signed.test/1?token=b")]
+        assert store.materialize(keys, target)
+        assert target.read_bytes() == b"clip-bytes"
+
+    def test_miss(self, store: AssetStore, tmp_path: Path) -> None:
+        target = tmp_path / "copy.mp4"
+        assert not store.materialize([url_key("https://cdn.test/none")], target)
+        assert not target.exists()
+
+    def test_identical_content_stored_once(
+        self, store: AssetStore, tmp_path: Path
+    ) -> None:
+        first = _file(tmp_path / "a", "one.jpg", b"same")
+        second = _file(tmp_path / "b", "two.jpg", b"same")
+        store.ingest(first, [url_key("https://pexels.test/1")])
+        store.ingest(second, [url_key("https://pixabay.test/1")])
+
+        assert store.total_bytes() == 4
+
+    def test_evicts_least_recently_used(
+        self, store: AssetStore, tmp_path: Path
+    ) -> None:
+        old = _file(tmp_path, "old.bin", b"o" * 600)
+        new = _file(tmp_path, "new.bin", b"n" * 600)
+        old_sha = store.ingest(old, [url_key("https://cdn.test/old")])
+        new_sha = store.ingest(new, [url_key("https://cdn.test/new")])
+
+        assert store.total_bytes() <= 1024
+        assert not store.blob_path(old_sha).exists()
+        assert store.blob_path(new_sha).exists()
+        assert store.lookup([url_key("https://cdn.test/old")]) is None
+
+    def test_lookup_refreshes_recency(self, store: AssetStore, tmp_path: Path) -> None:
+        first = _file(tmp_path, "a.bin", b"a" * 400)
+        second = _file(tmp_path, "b.bin", b"b" * 400)
+        first_sha = store.ingest(first, [url_key("https://cdn.test/a")])
+        store.ingest(second, [url_key("https://cdn.test/b")])
+        assert store.lookup([url_key("https://cdn.test/a")]) is not None
+
+        third = _file(tmp_path, "c.bin", b"c" * 400)
+        store.ingest(third, [url_key("https://cdn.test/c")])
+
+        assert store.blob_path(first_sha).exists()
+        assert store.lookup([url_key("https://cdn.test/b")]) is None
+
+    def test_corrupt_blob_is_forgotten(self, store: AssetStore, tmp_path: Path) -> None:
+        source = _file(tmp_path, "clip.mp4", b"clip-bytes")
+        sha = store.ingest(source, [url_key("https://cdn.test/clip.mp4")])
+        blob = store.blob_path(sha)
+        os.unlink(blob)
+        blob.write_bytes(b"short")
+
+        assert store.lookup([url_key("https://cdn.test/clip.mp4")]) is None
+        assert not blob.exists()
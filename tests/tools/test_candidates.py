@@ -0,0 +1,325 @@
+"""Tests for provider-neutral search candidates."""
+
+from clawdcut.tools.candidates import (
+    Candidate,
+    compact_candidates,
+    estimate_tokens,
+    freesound_candidates,
+    merge_candidates,
+    pexels_photo_candidates,
+    pexels_video_candidates,
+    pixabay_image_candidates,
+    pixabay_rendition,
+    pixabay_video_candidates,
+    style_rank,
+)
+from clawdcut.tools.renditions import RenditionTarget
+from clawdcut.tools.style_brief import StyleMatcher
+
+
+def _candidate(provider: str, cid: str, **kwargs) -> Candidate:
+    fields = {
+        "media_type": "photo",
+        "title": "",
+        "creator": "",
+        "download_url": f"https://{provider}.test/{cid}.jpg",
+    }
+    fields.update(kwargs)
+    return Candidate(provider=provider, id=cid, **fields)
+
+
+class TestNormalizers:
+    def test_pexels_photo(self) -> None:
+        data = {
+            "photos": [
+                {
+                    "id": 1,
+                    "alt": "Sunset",
+                    "photographer": "Ann",
+                    "width": 1920,
+                    "height": 1080,
+                    "src": {"original": "o.jpg", "medium": "m.jpg"},
+                }
+            ]
+        }
+        (c,) = pexels_photo_candidates(data)
+        assert (c.provider, c.id, c.title) == ("pexels", "1", "Sunset")
+        assert c.creator == "Ann"
+        assert (c.download_url, c.preview_url, c.width) == ("o.jpg", "m.jpg", 1920)
+
+    def test_pexels_video_picks_widest_file(self) -> None:
+        data = {
+            "videos": [
+                {
+                    "id": 2,
+                    "duration": 12,
+                    "video_files": [
+                        {"width": 640, "height": 360, "link": "sd.mp4"},
+                        {"width": 1920, "height": 1080, "link": "hd.mp4"},
+                    ],
+                }
+            ]
+        }
+        (c,) = pexels_video_candidates(data)
+        assert (c.download_url, c.width, c.duration) == ("hd.mp4", 1920, 12.0)
+
+    def test_pixabay_splits_tags(self) -> None:
+        data = {"hits": [{"id": 3, "tags": "sky, sun", "largeImageURL": "l.jpg"}]}
+        (c,) = pixabay_image_candidates(data)
+        assert c.tags == ["sky", "sun"]
+
+    def test_pixabay_illustration_is_a_photo_of_its_kind(self) -> None:
+        data = {
+            "hits": [
+                {"id": 5, "type": "illustration", "largeImageURL": "i.png"},
+                {"id": 6, "type": "photo", "largeImageURL": "p.jpg"},
+            ]
+        }
+        illustration, photo = pixabay_image_candidates(data)
+        assert (illustration.media_type, illustration.kind) == (
+            "photo",
+            "illustration",
+        )
+        assert illustration.to_compact()["kind"] == "illustration"
+        assert (photo.media_type, photo.kind) == ("photo", "")
+
+    def test_pixabay_video_uses_large(self) -> None:
+        data = {
+            "hits": [{"id": 4, "duration": 9, "videos": {"large": {"url": "l.mp4"}}}]
+        }
+        (c,) = pixabay_video_candidates(data)
+        assert (c.media_type, c.download_url) == ("video", "l.mp4")
+
+    def test_freesound(self) -> None:
+        data = {
+            "results": [
+                {"id": 5, "name": "Rain", "previews": {"preview-hq-mp3": "r.mp3"}}
+            ]
+        }
+        (c,) = freesound_candidates(data)
+        assert (c.media_type, c.download_url, c.preview_url) == (
+            "audio",
+            "r.mp3",
+            "r.mp3",
+        )
+
+    def test_missing_fields_default(self) -> None:
+        (c,) = pexels_photo_candidates({"photos": [{"id": 6, "width": None}]})
+        assert (c.width, c.download_url) == (0, "")
+
+
+class TestMergeCandidates:
+    def test_interleaves_providers_by_rank(self) -> None:
+        a = [_candidate("pexels", str(i)) for i in range(3)]
+        b = [_candidate("pixabay", str(i)) for i in range(3)]
+        merged = merge_candidates("", [a, b], limit=4)
+        assert [c.provider for c in merged[:2]] != ["pexels", "pexels"]
+        assert len(merged) == 4
+
+    def test_query_overlap_boosts(self) -> None:
+        plain = _candidate("pexels", "1", title="city street")
+        match = _candidate("pixabay", "2", title="golden sunset beach")
+        merged = merge_candidates("sunset beach", [[plain], [match]], limit=2)
+        assert merged[0].id == "2"
+
+    def test_dedupes_same_url(self) -> None:
+        a = _candidate("pexels", "1", download_url="same.jpg")
+        b = _candidate("pexels", "2", download_url="same.jpg")
+        assert len(merge_candidates("", [[a, b]], limit=5)) == 1
+
+    def test_dedupes_cross_provider_uploads(self) -> None:
+        a = _candidate("pexels", "1", creator="Ann Lee", width=1920, height=1080)
+        b = _candidate("pixabay", "9", creator="ann lee", width=1920, height=1080)
+        merged = merge_candidates("", [[a], [b]], limit=5)
+        assert [c.id for c in merged] == ["1"]
+
+    def test_keeps_distinct_without_creator(self) -> None:
+        a = _candidate("pexels", "1", width=1920, height=1080)
+        b = _candidate("pixabay", "9", width=1920, height=1080)
+        assert len(merge_candidates("", [[a], [b]], limit=5)) == 2
+
+
+_BRIEF = StyleMatcher.compile(
+    {
+        "palette": {
+            "keywords": ["warm", "cinematic"],
+            "forbidden": ["neon-purple"],
+        },
+        "camera_language": {"forbidden": ["shaky"]},
+    }
+)
+
+
+class TestStyleRank:
+    def test_palette_keywords_reorder(self) -> None:
+        plain = _candidate("pexels", "1", title="city street")
+        warm = _candidate("pexels", "2", title="Warm cinematic sunset")
+        ranked = style_rank([plain, warm], _BRIEF)
+        assert [c.id for c in ranked] == ["2", "1"]
+        assert ranked[0].style_score == 1.0
+        assert ranked[0].style_matches == ["cinematic", "warm"]
+
+    def test_forbidden_terms_demote_and_flag(self) -> None:
+        bad = _candidate("pixabay", "1", tags=["warm", "neon purple", "club"])
+        neutral = _candidate("pixabay", "2", tags=["warm", "street"])
+        ranked = style_rank([bad, neutral], _BRIEF)
+        assert [c.id for c in ranked] == ["2", "1"]
+        assert bad.style_flags == ["neon purple"]
+        assert bad.style_score == 0.0
+        assert neutral.style_score == 0.5
+
+    def test_resolution_and_duration_fit(self) -> None:
+        small = _candidate(
+            "pexels", "1", media_type="video", width=960, height=540, duration=5
+        )
+        full = _candidate(
+            "pexels", "2", media_type="video", width=1920, height=1080, duration=8
+        )
+        ranked = style_rank(
+            [small, full],
+            StyleMatcher(),
+            RenditionTarget(width=1920, height=1080),
+            min_duration=8,
+        )
+        assert [c.id for c in ranked] == ["2", "1"]
+        assert full.style_score == 1.0
+        assert small.style_score == round((0.25 + 5 / 8) / 2, 3)
+
+    def test_ties_keep_incoming_order_and_blend_score(self) -> None:
+        a = _candidate("pexels", "1", score=0.9)
+        b = _candidate("pexels", "2", score=0.2, title="warm")
+        c = _candidate("pexels", "3", score=0.1)
+        ranked = style_rank([a, b, c], _BRIEF)
+        assert [x.id for x in ranked] == ["1", "2", "3"]
+        assert b.style_score == 0.5
+
+
+class TestCompactCandidates:
+    def test_handle_distinguishes_videos(self) -> None:
+        assert _candidate("pexels", "7").handle == "px:7"
+        assert _candidate("pixabay", "7", media_type="video").handle == "pbv:7"
+        assert _candidate("freesound", "7", media_type="audio").handle == "fs:7"
+
+    def test_compact_omits_empty_and_redundant_fields(self) -> None:
+        item = _candidate(
+            "pixabay",
+            "9",
+            title="sea, waves",
+            tags=["sea", "waves"],
+            width=640,
+            height=480,
+        ).to_compact()
+
+        assert item == {
+            "id": "pb:9",
+            "type": "photo",
+            "size": "640x480",
+            "tags": ["sea", "waves"],
+        }
+
+    def test_no_budget_keeps_everything(self) -> None:
+        candidates = [_candidate("pexels", str(i), title="x" * 80) for i in range(5)]
+        items, truncated = compact_candidates(candidates)
+
+        assert len(items) == 5
+        assert truncated is False
+        assert items[0]["title"] == "x" * 80
+
+    def test_budget_shortens_before_dropping(self) -> None:
+        candidates = [
+            _candidate(
+                "pexels",
+                str(i),
+                title="a long descriptive title " * 4,
+                tags=["one", "two", "three", "four", "five"],
+                creator="Someone",
+            )
+            for i in range(3)
+        ]
+        full, _ = compact_candidates(candidates)
+        short, _ = compact_candidates(candidates, max_tokens=1)
+        budget = estimate_tokens([dict(short[0])] * 3)
+        items, truncated = compact_candidates(candidates, max_tokens=budget)
+
+        assert truncated is True
+        assert len(items) == 3
+        assert len(items[0]["title"]) == 40
+        assert items[0]["tags"] == ["one", "two", "three"]
+        assert "by" not in items[0]
+        assert estimate_tokens(items) < estimate_tokens(full)
+
+    def test_budget_drops_lowest_ranked_but_keeps_one(self) -> None:
+        candidates = [_candidate("pexels", str(i)) for i in range(10)]
+        items, truncated = compact_candidates(candidates, max_tokens=1)
+
+        assert truncated is True
+        assert [item["id"] for item in items] == ["px:0"]
+
+
+PIXABAY_IMAGE_HIT = {
+    "id": 7,
+    "previewURL": "p.jpg",
+    "previewWidth": 150,
+    "previewHeight": 100,
+    "webformatURL": "w.jpg",
+    "webformatWidth": 640,
+    "webformatHeight": 427,
+    "largeImageURL": "l.jpg",
+    "imageWidth": 6000,
+    "imageHeight": 4000,
+}
+PIXABAY_VIDEO_HIT = {
+    "id": 8,
+    "videos": {
+        "large": {"url": "", "width": 0, "height": 0, "size": 0},
+        "medium": {"url": "m.mp4", "width": 1920, "height": 1080, "size": 9000},
+        "small": {"url": "s.mp4", "width": 1280, "height": 720, "size": 4000},
+        "tiny": {"url": "t.mp4", "width": 960, "height": 540, "size": 1000},
+    },
+}
+
+
+class TestPixabayRenditions:
+    def test_default_image_is_large(self) -> None:
+        chosen = pixabay_rendition(PIXABAY_IMAGE_HIT)
+        assert (chosen["link"], chosen["width"], chosen["height"]) == (
+            "l.jpg",
+            1280,
+            853,
+        )
+
+    def test_image_target_picks_smallest_tier(self) -> None:
+        assert (
+            pixabay_rendition(PIXABAY_IMAGE_HIT, RenditionTarget(600, 400))["tier"]
+            == "webformat"
+        )
+        assert (
+            pixabay_rendition(PIXABAY_IMAGE_HIT, RenditionTarget(1280, 720))["tier"]
+            == "large"
+        )
+
+    def test_default_video_skips_missing_large(self) -> None:
+        assert pixabay_rendition(PIXABAY_VIDEO_HIT)["link"] == "m.mp4"
+
+    def test_video_target_and_budget(self) -> None:
+        assert (
+            pixabay_rendition(PIXABAY_VIDEO_HIT, RenditionTarget(1280, 720))["link"]
+            == "s.mp4"
+        )
+        assert (
+            pixabay_rendition(
+                PIXABAY_VIDEO_HIT, RenditionTarget(1920, 1080, max_bytes=5000)
+            )["link"]
+            == "s.mp4"
+        )
+
+    def test_candidates_describe_chosen_tier(self) -> None:
+        (image,) = pixabay_image_candidates(
+            {"hits": [PIXABAY_IMAGE_HIT]}, RenditionTarget(600, 400)
+        )
+        (video,) = pixabay_video_candidates(
+            {"hits": [PIXABAY_VIDEO_HIT]}, RenditionTarget(900, 500)
+        )
+
+        assert (image.download_url, image.width) == ("w.jpg", 640)
+        assert (video.download_url, video.bytes) == ("t.mp4", 1000)
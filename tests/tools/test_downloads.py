@@ -0,0 +1,359 @@
+"""Tests for streaming, atomic download helpers."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from clawdcut.tools.downloads import (
+    DownloadBudget,
+    DownloadRejectedError,
+    astream_to_file,
+    partial_paths,
+    preflight,
+    stream_to_file,
+)
+
+RESUMABLE_HEADERS = {"ETag": '"v1"', "Accept-Ranges": "bytes"}
+
+
+class _ChunkStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Byte stream yielding fixed chunks, optionally failing part-way."""
+
+    def __init__(self, chunks: list[bytes], fail_after: int | None = None) -> None:
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    def __iter__(self) -> Iterator[bytes]:
+        for index, chunk in enumerate(self.chunks):
+            if index == self.fail_after:
+                raise httpx.ReadError("connection dropped")
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self:
+            yield chunk
+
+
+def _client(
+    stream: _ChunkStream,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+) -> httpx.Client:
+    return httpx.Client(
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(status_code, headers=headers, stream=stream)
+        )
+    )
+
+
+def _range_server(
+    body: bytes, etag: str = '"v1"', fail_at: int | None = None
+) -> tuple[httpx.MockTransport, list[httpx.Request]]:
+    """Serve ``body`` honouring Range/If-Range, dropping after ``fail_at``."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        start = 0
+        status = 200
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+        range_header = request.headers.get("Range")
+        if range_header and request.headers.get("If-Range") == etag:
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+        chunk = body[start:]
+        chunks = [chunk[:4], chunk[4:]]
+        fail_after = 1 if fail_at is not None and len(seen) == fail_at else None
+        return httpx.Response(
+            status, headers=headers, stream=_ChunkStream(chunks, fail_after)
+        )
+
+    return httpx.MockTransport(handler), seen
+
+
+def _leftovers(directory: Path) -> list[str]:
+    return sorted(p.name for p in directory.iterdir() if p.name.startswith("."))
+
+
+class TestStreamToFile:
+    def test_writes_all_chunks(self, tmp_path: Path) -> None:
+        chunks = [b"a" * 65536, b"b" * 65536, b"tail"]
+        target = tmp_path / "clip.mp4"
+        with _client(_ChunkStream(chunks)) as client:
+            response = stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert response.status_code == 200
+        assert target.read_bytes() == b"".join(chunks)
+        assert _leftovers(tmp_path) == []
+
+    def test_interrupted_transfer_leaves_no_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        with _client(_ChunkStream([b"a", b"b", b"c"], fail_after=2)) as client:
+            with pytest.raises(httpx.ReadError):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert not target.exists()
+        assert _leftovers(tmp_path) == []
+
+    def test_interrupted_resumable_transfer_keeps_partial(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        stream = _ChunkStream([b"abcd", b"efgh"], fail_after=1)
+        with _client(stream, headers=RESUMABLE_HEADERS) as client:
+            with pytest.raises(httpx.ReadError):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        part, sidecar = partial_paths(target)
+        assert not target.exists()
+        assert part.read_bytes() == b"abcd"
+        state = json.loads(sidecar.read_text())
+        assert state["url"] == "https://cdn.test/clip.mp4"
+        assert state["etag"] == '"v1"'
+        assert state["bytes_received"] == 4
+
+    def test_failed_transfer_keeps_existing_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        target.write_bytes(b"previous")
+        with _client(_ChunkStream([b"a"], fail_after=0)) as client:
+            with pytest.raises(httpx.ReadError):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert target.read_bytes() == b"previous"
+
+    def test_http_status_error_raises(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        with _client(_ChunkStream([b"<html>"]), status_code=404) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert not target.exists()
+        assert _leftovers(tmp_path) == []
+
+
+class TestResume:
+    def test_resumes_with_range_request(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        transport, seen = _range_server(b"0123456789", fail_at=1)
+        with httpx.Client(transport=transport) as client:
+            with pytest.raises(httpx.ReadError):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target)
+            stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert target.read_bytes() == b"0123456789"
+        assert "Range" not in seen[0].headers
+        assert seen[1].headers["Range"] == "bytes=4-"
+        assert seen[1].headers["If-Range"] == '"v1"'
+        assert _leftovers(tmp_path) == []
+
+    def test_changed_resource_restarts_from_zero(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        part, sidecar = partial_paths(target)
+        part.write_bytes(b"stale")
+        sidecar.write_text(
+            json.dumps({"url": "https://cdn.test/clip.mp4", "etag": '"old"'})
+        )
+        transport, seen = _range_server(b"fresh-body", etag='"new"')
+        with httpx.Client(transport=transport) as client:
+            stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert seen[0].headers["If-Range"] == '"old"'
+        assert target.read_bytes() == b"fresh-body"
+
+    def test_partial_for_other_url_is_discarded(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        part, sidecar = partial_paths(target)
+        part.write_bytes(b"0123")
+        sidecar.write_text(
+            json.dumps({"url": "https://cdn.test/other.mp4", "etag": '"v1"'})
+        )
+        transport, seen = _range_server(b"0123456789")
+        with httpx.Client(transport=transport) as client:
+            stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert "Range" not in seen[0].headers
+        assert target.read_bytes() == b"0123456789"
+
+    def test_mismatched_content_range_discards_partial(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        part, sidecar = partial_paths(target)
+        part.write_bytes(b"0123")
+        sidecar.write_text(
+            json.dumps({"url": "https://cdn.test/clip.mp4", "etag": '"v1"'})
+        )
+        headers = {**RESUMABLE_HEADERS, "Content-Range": "bytes 0-9/10"}
+        with _client(_ChunkStream([b"x"]), 206, headers) as client:
+            with pytest.raises(httpx.RemoteProtocolError):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target)
+
+        assert _leftovers(tmp_path) == []
+
+
+class TestAsyncStreamToFile:
+    def test_writes_all_chunks(self, tmp_path: Path) -> None:
+        target = tmp_path / "track.mp3"
+
+        async def run() -> None:
+            transport = httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, stream=_ChunkStream([b"one", b"two"])
+                )
+            )
+            async with httpx.AsyncClient(transport=transport) as client:
+                await astream_to_file(client, "https://cdn.test/t.mp3", target)
+
+        asyncio.run(run())
+        assert target.read_bytes() == b"onetwo"
+        assert _leftovers(tmp_path) == []
+
+    def test_interrupted_transfer_leaves_no_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "track.mp3"
+
+        async def run() -> None:
+            transport = httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, stream=_ChunkStream([b"one", b"two"], fail_after=1)
+                )
+            )
+            async with httpx.AsyncClient(transport=transport) as client:
+                await astream_to_file(client, "https://cdn.test/t.mp3", target)
+
+        with pytest.raises(httpx.ReadError):
+            asyncio.run(run())
+        assert not target.exists()
+        assert _leftovers(tmp_path) == []
+
+    def test_resumes_with_range_request(self, tmp_path: Path) -> None:
+        target = tmp_path / "track.mp3"
+        transport, seen = _range_server(b"0123456789", fail_at=1)
+
+        async def run() -> None:
+            async with httpx.AsyncClient(transport=transport) as client:
+                with pytest.raises(httpx.ReadError):
+                    await astream_to_file(client, "https://cdn.test/t.mp3", target)
+                await astream_to_file(client, "https://cdn.test/t.mp3", target)
+
+        asyncio.run(run())
+        assert target.read_bytes() == b"0123456789"
+        assert seen[1].headers["Range"] == "bytes=4-"
+
+
+class TestDownloadBudget:
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_DOWNLOAD_PREFLIGHT", "head")
+        monkeypatch.setenv("CLAWDCUT_MAX_IMAGE_BYTES", "1024")
+        budget = DownloadBudget.from_env()
+
+        assert budget is not None
+        assert budget.mode == "head"
+        assert budget.limit(Path("a.jpg")) == 1024
+        assert budget.limit(Path("a.mp4")) == 1024**3
+
+        monkeypatch.setenv("CLAWDCUT_DOWNLOAD_PREFLIGHT", "0")
+        assert DownloadBudget.from_env() is None
+
+    def test_rejects_wrong_content_type(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        with _client(_ChunkStream([b"<html>"]), headers=headers) as client:
+            with pytest.raises(DownloadRejectedError, match="text/html"):
+                stream_to_file(
+                    client, "https://cdn.test/clip.mp4", target, DownloadBudget()
+                )
+
+        assert not target.exists()
+        assert _leftovers(tmp_path) == []
+
+    @pytest.mark.parametrize(
+        "content_type", ["video/mp4", "application/octet-stream", ""]
+    )
+    def test_accepts_media_and_generic_types(
+        self, tmp_path: Path, content_type: str
+    ) -> None:
+        target = tmp_path / "clip.mp4"
+        headers = {"Content-Type": content_type} if content_type else {}
+        with _client(_ChunkStream([b"data"]), headers=headers) as client:
+            stream_to_file(
+                client, "https://cdn.test/clip.mp4", target, DownloadBudget()
+            )
+
+        assert target.read_bytes() == b"data"
+
+    def test_rejects_announced_oversize(self, tmp_path: Path) -> None:
+        target = tmp_path / "photo.jpg"
+        budget = DownloadBudget(max_bytes={"image": 4})
+        headers = {"Content-Type": "image/jpeg", "Content-Length": "8"}
+        with _client(_ChunkStream([b"01234567"]), headers=headers) as client:
+            with pytest.raises(DownloadRejectedError, match="budget"):
+                stream_to_file(client, "https://cdn.test/p.jpg", target, budget)
+
+        assert not target.exists()
+
+    def test_rejects_oversized_resumed_total(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        part, sidecar = partial_paths(target)
+        part.write_bytes(b"0123")
+        sidecar.write_text(
+            json.dumps({"url": "https://cdn.test/clip.mp4", "etag": '"v1"'})
+        )
+        headers = {**RESUMABLE_HEADERS, "Content-Range": "bytes 4-99/100"}
+        budget = DownloadBudget(max_bytes={"video": 50})
+        with _client(_ChunkStream([b"x"]), 206, headers) as client:
+            with pytest.raises(DownloadRejectedError):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target, budget)
+
+        assert _leftovers(tmp_path) == []
+
+    def test_stops_body_exceeding_budget(self, tmp_path: Path) -> None:
+        target = tmp_path / "clip.mp4"
+        budget = DownloadBudget(max_bytes={"video": 6})
+        with _client(_ChunkStream([b"abcd", b"efgh"])) as client:
+            with pytest.raises(DownloadRejectedError, match="body exceeds"):
+                stream_to_file(client, "https://cdn.test/clip.mp4", target, budget)
+
+        assert not target.exists()
+        assert _leftovers(tmp_path) == []
+
+    def test_head_preflight(self, tmp_path: Path) -> None:
+        methods: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            methods.append(request.method)
+            return httpx.Response(
+                200, headers={"Content-Type": "text/html", "Content-Length": "0"}
+            )
+
+        target = tmp_path / "photo.jpg"
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            preflight(client, "https://cdn.test/p.jpg", target, DownloadBudget())
+            assert methods == []
+            with pytest.raises(DownloadRejectedError):
+                preflight(
+                    client,
+                    "https://cdn.test/p.jpg",
+                    target,
+                    DownloadBudget(mode="head"),
+                )
+
+        assert methods == ["HEAD"]
+
+    def test_async_rejects_wrong_content_type(self, tmp_path: Path) -> None:
+        target = tmp_path / "track.mp3"
+
+        async def run() -> None:
+            transport = httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, headers={"Content-Type": "image/png"}, content=b"png"
+                )
+            )
+            async with httpx.AsyncClient(transport=transport) as client:
+                await astream_to_file(
+                    client, "https://cdn.test/t.mp3", target, DownloadBudget()
+                )
+
+        with pytest.raises(DownloadRejectedError):
+            asyncio.run(run())
+        assert not target.exists()
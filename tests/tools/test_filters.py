@@ -0,0 +1,116 @@
+"""Tests for provider-native search filters."""
+
+import pytest
+
+from clawdcut.tools.filters import SearchFilters
+
+
+class TestParse:
+    def test_normalizes_aliases(self) -> None:
+        filters = SearchFilters.parse(orientation="Horizontal", color="Grey")
+        assert (filters.orientation, filters.color) == ("landscape", "gray")
+
+    def test_empty_values_are_unset(self) -> None:
+        assert SearchFilters.parse(orientation="", min_width=0) == SearchFilters()
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            {"orientation": "diagonal"},
+            {"size": "huge"},
+            {"color": "sparkly"},
+            {"min_duration": 30, "max_duration": 10},
+        ],
+    )
+    def test_rejects_invalid(self, values: dict) -> None:
+        with pytest.raises(ValueError):
+            SearchFilters.parse(**values)
+
+    def test_accepts_hex_color(self) -> None:
+        assert SearchFilters.parse(color="#FFAA00").color == "#ffaa00"
+
+
+class TestPexels:
+    def test_photo_params(self) -> None:
+        filters = SearchFilters.parse(
+            orientation="portrait", size="large", color="#ffaa00", min_width=800
+        )
+        params, ignored = filters.pexels_params(is_video=False)
+
+        assert params == {"orientation": "portrait", "size": "large", "color": "ffaa00"}
+        assert ignored == ["min_width"]
+
+    def test_video_params(self) -> None:
+        filters = SearchFilters.parse(
+            color="blue", min_width=1920, min_duration=5, max_duration=20
+        )
+        params, ignored = filters.pexels_params(is_video=True)
+
+        assert params == {}
+        assert ignored == ["color"]
+
+    @pytest.mark.parametrize(
+        ("video", "kept"),
+        [
+            ({"width": 1920, "height": 1080, "duration": 10}, True),
+            ({"width": 1280, "height": 720, "duration": 10}, False),
+            ({"width": 1920, "height": 1080, "duration": 2}, False),
+            ({"width": 1920, "height": 1080, "duration": 30}, False),
+            ({"width": 1920, "height": 1080}, False),
+        ],
+    )
+    def test_video_bounds_checked_on_hits(self, video: dict, kept: bool) -> None:
+        filters = SearchFilters.parse(min_width=1920, min_duration=5, max_duration=20)
+
+        assert filters.keeps_pexels_video(video) is kept
+
+
+class TestPixabay:
+    def test_image_params(self) -> None:
+        filters = SearchFilters.parse(
+            orientation="landscape",
+            color="violet",
+            min_width=1920,
+            editors_choice=True,
+        )
+        params, ignored = filters.pixabay_params(is_video=False)
+
+        assert params == {
+            "min_width": 1920,
+            "editors_choice": "true",
+            "orientation": "horizontal",
+            "colors": "lilac",
+        }
+        assert ignored == []
+
+    def test_video_ignores_image_only_filters(self) -> None:
+        filters = SearchFilters.parse(
+            orientation="portrait", color="red", min_height=720, max_duration=30
+        )
+        params, ignored = filters.pixabay_params(is_video=True)
+
+        assert params == {"min_height": 720}
+        assert ignored == ["orientation", "color", "max_duration"]
+
+    def test_square_not_supported(self) -> None:
+        _, ignored = SearchFilters.parse(orientation="square").pixabay_params(False)
+        assert ignored == ["orientation"]
+
+
+class TestFreesound:
+    @pytest.mark.parametrize(
+        ("low", "high", "clause"),
+        [
+            (5, 30, "duration:[5 TO 30]"),
+            (0, 2.5, "duration:[* TO 2.5]"),
+            (60, 0, "duration:[60 TO *]"),
+            (0, 0, ""),
+        ],
+    )
+    def test_duration_range(self, low: float, high: float, clause: str) -> None:
+        filters = SearchFilters.parse(min_duration=low, max_duration=high)
+        assert filters.freesound_filter() == (clause, [])
+
+    def test_visual_filters_ignored(self) -> None:
+        _, ignored = SearchFilters.parse(orientation="portrait").freesound_filter()
+        assert ignored == ["orientation"]
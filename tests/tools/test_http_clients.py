@@ -0,0 +1,102 @@
+"""Tests for pooled provider HTTP clients."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from clawdcut.tools.http_clients import PoolConfig, ProviderClients, endpoint
+
+
+def _ok_transport() -> httpx.MockTransport:
+    return httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+
+class TestPoolConfig:
+    def test_defaults(self) -> None:
+        config = PoolConfig()
+        assert config.max_connections == 10
+        assert config.http2 is False
+
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_HTTP_MAX_CONNECTIONS", "4")
+        monkeypatch.setenv("CLAWDCUT_HTTP_MAX_KEEPALIVE", "2")
+        monkeypatch.setenv("CLAWDCUT_HTTP2", "true")
+        config = PoolConfig.from_env()
+        assert config.max_connections == 4
+        assert config.max_keepalive_connections == 2
+        assert config.http2 is True
+
+    def test_from_env_ignores_invalid_values(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("CLAWDCUT_HTTP_MAX_CONNECTIONS", "many")
+        assert PoolConfig.from_env().max_connections == 10
+
+
+class TestProviderClients:
+    def test_reuses_client_per_provider(self) -> None:
+        clients = ProviderClients(transport=_ok_transport())
+        assert clients.get("pexels") is clients.get("pexels")
+        assert clients.get("pexels") is not clients.get("pixabay")
+        clients.close()
+
+    def test_close_closes_clients(self) -> None:
+        clients = ProviderClients(transport=_ok_transport())
+        client = clients.get("pexels")
+        clients.close()
+        assert client.is_closed
+        clients.close()
+
+    def test_get_after_close_raises(self) -> None:
+        clients = ProviderClients(transport=_ok_transport())
+        clients.close()
+        with pytest.raises(RuntimeError):
+            clients.get("pexels")
+
+    def test_context_manager_closes(self) -> None:
+        with ProviderClients(transport=_ok_transport()) as clients:
+            client = clients.get("freesound")
+        assert client.is_closed
+
+    def test_http2_falls_back_without_h2(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            "clawdcut.tools.http_clients._http2_available", lambda: False
+        )
+        clients = ProviderClients(PoolConfig(http2=True))
+        client = clients.get("pexels")
+        assert not client.is_closed
+        clients.close()
+
+    def test_async_client_reused_and_closed(self) -> None:
+        clients = ProviderClients(async_transport=_ok_transport())
+
+        async def use() -> httpx.AsyncClient:
+            client = clients.get_async("pexels")
+            assert client is clients.get_async("pexels")
+            await clients.aclose()
+            return client
+
+        client = asyncio.run(use())
+        assert client.is_closed
+
+    def test_limiters_per_provider(self) -> None:
+        clients = ProviderClients(quotas={"pixabay": (100, 60.0)})
+        assert clients.limiter("pixabay") is clients.limiter("pixabay")
+        assert clients.limiter("pexels") is None
+
+    def test_limiters_disabled_by_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_RATE_LIMIT", "0")
+        assert ProviderClients().limiter("pexels") is None
+
+
+class TestEndpoint:
+    def test_live_api_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("CLAWDCUT_PIXABAY_BASE_URL", raising=False)
+        assert endpoint("pixabay", "/api/") == "https://pixabay.com/api/"
+
+    def test_base_url_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_PEXELS_BASE_URL", "http://127.0.0.1:8765/pexels/")
+        assert endpoint("pexels", "/v1/search") == (
+            "http://127.0.0.1:8765/pexels/v1/search"
+        )
@@ -0,0 +1,128 @@
+"""Tests for the per-project asset manifest."""
+
+import json
+from pathlib import Path
+
+from clawdcut.tools.manifest import MANIFEST_PATH, AssetManifest, ManifestRecord
+
+
+def _asset(workdir: Path, path: str, content: bytes = b"data") -> str:
+    target = workdir / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(content)
+    return path
+
+
+class TestAssetManifest:
+    def test_upsert_replaces_record_for_same_path(self, tmp_path: Path) -> None:
+        manifest = AssetManifest(tmp_path)
+        path = _asset(tmp_path, ".clawdcut/assets/images/a.jpg")
+        manifest.upsert(ManifestRecord(path=path, provider="pexels", asset_id="1"))
+        manifest.upsert(ManifestRecord(path=path, provider="pexels", asset_id="2"))
+
+        records = manifest.lookup()
+        assert [r.asset_id for r in records] == ["2"]
+
+    def test_reloads_index_from_disk(self, tmp_path: Path) -> None:
+        path = _asset(tmp_path, ".clawdcut/assets/audio/a.mp3")
+        AssetManifest(tmp_path).upsert(
+            ManifestRecord(path=path, provider="freesound", creator="Ana")
+        )
+
+        records = AssetManifest(tmp_path).lookup(query="ana")
+        assert [r.path for r in records] == [path]
+
+    def test_lookup_filters(self, tmp_path: Path) -> None:
+        manifest = AssetManifest(tmp_path)
+        photo = _asset(tmp_path, ".clawdcut/assets/images/sunset.jpg")
+        clip = _asset(tmp_path, ".clawdcut/assets/videos/ocean.mp4")
+        manifest.upsert(
+            ManifestRecord(
+                path=photo, provider="pexels", media_type="photo", title="Sunset"
+            )
+        )
+        manifest.upsert(
+            ManifestRecord(
+                path=clip, provider="pixabay", media_type="video", title="Ocean"
+            )
+        )
+
+        assert [r.path for r in manifest.lookup(provider="pixabay")] == [clip]
+        assert [r.path for r in manifest.lookup(media_type="photo")] == [photo]
+        assert [r.path for r in manifest.lookup(query="sunset")] == [photo]
+        assert [r.path for r in manifest.lookup(path="./.clawdcut/assets/videos")] == [
+            clip
+        ]
+        assert [r.path for r in manifest.lookup()] == [clip, photo]
+
+    def test_skips_deleted_files(self, tmp_path: Path) -> None:
+        manifest = AssetManifest(tmp_path)
+        path = _asset(tmp_path, ".clawdcut/assets/images/a.jpg")
+        manifest.upsert(ManifestRecord(path=path, provider="pexels"))
+        (tmp_path / path).unlink()
+
+        assert manifest.lookup() == []
+
+    def test_ignores_corrupt_lines(self, tmp_path: Path) -> None:
+        path = _asset(tmp_path, ".clawdcut/assets/images/a.jpg")
+        manifest_file = tmp_path / MANIFEST_PATH
+        manifest_file.write_text(
+            'not json\n[]\n"x"\n{}\n'
+            + json.dumps({"path": path, "provider": "pexels", "future": 1})
+            + "\n"
+        )
+
+        records = AssetManifest(tmp_path).lookup()
+        assert [r.provider for r in records] == ["pexels"]
+
+    def test_shared_per_workdir(self, tmp_path: Path) -> None:
+        manifest = AssetManifest.shared(tmp_path)
+
+        assert AssetManifest.shared(tmp_path / ".") is manifest
+        assert AssetManifest.shared(tmp_path / "other") is not manifest
+
+    def test_compacts_superseded_lines(self, tmp_path: Path) -> None:
+        manifest = AssetManifest(tmp_path)
+        path = _asset(tmp_path, ".clawdcut/assets/images/a.jpg")
+        for index in range(50):
+            manifest.upsert(
+                ManifestRecord(path=path, provider="pexels", asset_id=str(index))
+            )
+
+        lines = (tmp_path / MANIFEST_PATH).read_text().splitlines()
+        assert len(lines) < 50
+        assert json.loads(lines[-1])["asset_id"] == "49"
+        assert AssetManifest(tmp_path).lookup()[0].asset_id == "49"
+
+    def test_relative_path(self, tmp_path: Path) -> None:
+        manifest = AssetManifest(tmp_path)
+        target = tmp_path / ".clawdcut/assets/images/a.jpg"
+        assert manifest.relative(target) == ".clawdcut/assets/images/a.jpg"
+
+
+class TestNearLookup:
+    def test_finds_hashed_records_within_radius(self, tmp_path: Path) -> None:
+        manifest = AssetManifest(tmp_path)
+        near = _asset(tmp_path, ".clawdcut/assets/images/a.jpg")
+        far = _asset(tmp_path, ".clawdcut/assets/images/b.jpg")
+        plain = _asset(tmp_path, ".clawdcut/assets/images/c.jpg")
+        manifest.upsert(ManifestRecord(path=near, provider="pexels", dhash="f0"))
+        manifest.upsert(ManifestRecord(path=far, provider="pexels", dhash="ff" * 8))
+        manifest.upsert(ManifestRecord(path=plain, provider="pexels"))
+
+        found = manifest.near(0xF1, 2)
+        assert [(d, r.path) for d, r in found] == [(1, near)]
+
+    def test_skips_deleted_files_and_sees_new_records(self, tmp_path: Path) -> None:
+        manifest = AssetManifest(tmp_path)
+        path = _asset(tmp_path, ".clawdcut/assets/images/a.jpg")
+        manifest.upsert(ManifestRecord(path=path, provider="pexels", dhash="1"))
+        assert manifest.near(1, 0)
+
+        other = _asset(tmp_path, ".clawdcut/assets/images/b.jpg")
+        AssetManifest(tmp_path).upsert(
+            ManifestRecord(path=other, provider="pixabay", dhash="3")
+        )
+        (tmp_path / path).unlink()
+
+        assert [r.path for _, r in manifest.near(1, 1)] == [other]
@@ -0,0 +1,191 @@
+"""Tests for per-tool-call metrics."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from clawdcut.tools.metrics import (
+    METRICS_PATH,
+    MetricsLog,
+    ToolCall,
+    ainstrument,
+    current_call,
+    format_summary,
+    instrument,
+    main,
+    record_error,
+    record_response,
+    summarize,
+)
+
+
+def _record(provider: str, operation: str, wall: float, **extra) -> dict:
+    return {
+        "tool": f"{provider}_{operation}",
+        "provider": provider,
+        "operation": operation,
+        "success": True,
+        "wall_seconds": wall,
+        **extra,
+    }
+
+
+class TestToolCall:
+    def test_totals_retries_and_cache_of_parts(self) -> None:
+        call = ToolCall("stock_search")
+        call.observe(200, 1000)
+        call.observe(429, 50)
+
+        metrics = call.finish(
+            {
+                "success": True,
+                "provider": "multi",
+                "operation": "search",
+                "providers": {
+                    "pexels": {"retry": {"attempts": 3, "wait_seconds": 1.5}},
+                    "pixabay": {
+                        "retry": {"attempts": 1, "wait_seconds": 0.0},
+                        "cache": "miss",
+                    },
+                },
+            }
+        )
+
+        assert metrics["retries"] == 2
+        assert metrics["backoff_seconds"] == 1.5
+        assert metrics["bytes"] == 1050
+        assert metrics["http_status"] == 429
+        assert metrics["cache"] == "miss"
+        assert call.log_record()["tool"] == "stock_search"
+        assert call.log_record()["operation"] == "search"
+
+    def test_mixed_cache_status(self) -> None:
+        metrics = ToolCall("batch_download").finish(
+            {"items": [{"cache": "hit"}, {"cache": "miss"}]}
+        )
+        assert metrics["cache"] == "mixed"
+
+    def test_records_only_inside_a_call(self) -> None:
+        transport = httpx.MockTransport(lambda _: httpx.Response(404, text="missing"))
+        client = httpx.Client(transport=transport)
+        record_response(client.get("https://example.com"))  # No call: ignored.
+
+        def tool() -> str:
+            try:
+                client.get("https://example.com").raise_for_status()
+            except httpx.HTTPStatusError as error:
+                record_error(error)
+            call = current_call()
+            assert call is not None
+            return json.dumps({"bytes": call.bytes, "status": call.http_status})
+
+        assert json.loads(instrument(tool, None)()) == {"bytes": 7, "status": 404}
+        assert current_call() is None
+
+
+class TestMetricsLog:
+    def test_rolls_over_and_reads_both_files(self, tmp_path: Path) -> None:
+        log = MetricsLog(tmp_path / "tools.jsonl", max_bytes=200)
+        for index in range(6):
+            log.append({"index": index, "padding": "x" * 40})
+
+        assert log.rolled_path.exists()
+        assert log.path.stat().st_size <= 200
+        indexes = [r["index"] for r in log.records()]
+        assert indexes == sorted(indexes)
+        assert indexes[-1] == 5
+
+    def test_skips_corrupt_lines(self, tmp_path: Path) -> None:
+        log = MetricsLog(tmp_path / "tools.jsonl")
+        log.append({"index": 1})
+        with log.path.open("a") as handle:
+            handle.write("{truncated\n")
+        log.append({"index": 2})
+
+        assert [r["index"] for r in log.records()] == [1, 2]
+
+    def test_from_env(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_METRICS_MAX_BYTES", "4096")
+        log = MetricsLog.from_env(tmp_path)
+        assert log is not None
+        assert log.path == tmp_path / METRICS_PATH
+        assert log.max_bytes == 4096
+
+        monkeypatch.setenv("CLAWDCUT_METRICS", "0")
+        assert MetricsLog.from_env(tmp_path) is None
+
+
+class TestInstrument:
+    def test_logs_calls_that_raise(self, tmp_path: Path) -> None:
+        log = MetricsLog(tmp_path / "tools.jsonl")
+
+        def broken() -> str:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            instrument(broken, log)()
+
+        (record,) = log.records()
+        assert record["tool"] == "broken"
+        assert record["success"] is False
+
+    def test_async_tools_keep_their_name_and_doc(self, tmp_path: Path) -> None:
+        log = MetricsLog(tmp_path / "tools.jsonl")
+
+        async def lookup(query: str = "") -> str:
+            """Look something up."""
+            call = current_call()
+            assert call is not None
+            return json.dumps({"metrics": call.finish({"success": True})})
+
+        measured = ainstrument(lookup, log)
+        payload = json.loads(asyncio.run(measured(query="sea")))
+
+        assert measured.__name__ == "lookup"
+        assert measured.__doc__ == "Look something up."
+        assert payload["metrics"]["wall_seconds"] >= 0
+        assert log.records()[0]["tool"] == "lookup"
+
+
+class TestSummary:
+    def test_percentiles_per_provider_and_operation(self) -> None:
+        records = [_record("pexels", "search", n / 100) for n in range(1, 101)]
+        records += [
+            _record("pixabay", "download", 2.0, bytes_per_second=4_000_000),
+            _record("pixabay", "download", 1.0, cache="hit", bytes_per_second=1),
+            {**_record("pixabay", "download", 3.0), "success": False},
+        ]
+
+        rows = {(r["provider"], r["operation"]): r for r in summarize(records)}
+
+        search = rows["pexels", "search"]
+        assert search["calls"] == 100
+        assert search["p50_seconds"] == pytest.approx(0.505)
+        assert search["p95_seconds"] == pytest.approx(0.9505)
+        download = rows["pixabay", "download"]
+        assert download["errors"] == 1
+        assert download["cache_hits"] == 1
+        assert download["p50_bytes_per_second"] == 4_000_000
+        assert "pixabay" in format_summary(list(rows.values()))
+
+    def test_empty(self) -> None:
+        assert summarize([]) == []
+        assert format_summary([]) == "No tool calls recorded."
+
+    def test_command(self, tmp_path: Path) -> None:
+        log = MetricsLog(tmp_path / METRICS_PATH)
+        log.append(_record("pexels", "search", 0.2))
+        log.append(_record("pexels", "download", 1.0))
+
+        text = CliRunner().invoke(main, ["--workdir", str(tmp_path)])
+        rows = CliRunner().invoke(
+            main, ["--workdir", str(tmp_path), "--tool", "pexels_search", "--json"]
+        )
+
+        assert text.exit_code == 0
+        assert "download" in text.output
+        assert [r["operation"] for r in json.loads(rows.output)] == ["search"]
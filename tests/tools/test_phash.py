@@ -0,0 +1,127 @@
+"""Tests for perceptual hashing and near-duplicate search."""
+
+import io
+import random
+from pathlib import Path
+
+import pytest
+
+from clawdcut.tools import phash
+from clawdcut.tools.phash import (
+    BKTree,
+    HashCache,
+    NearDuplicates,
+    hamming,
+    to_hex,
+)
+
+
+def _png(seed: int, size: tuple[int, int] = (320, 240)) -> bytes:
+    """Encode a smooth random test image as PNG."""
+    image_module = pytest.importorskip("PIL.Image")
+    rng = random.Random(seed)
+    coarse = image_module.new("L", (6, 5))
+    coarse.putdata([rng.randrange(256) for _ in range(30)])
+    buffer = io.BytesIO()
+    coarse.resize(size, image_module.Resampling.BICUBIC).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestHamming:
+    def test_counts_differing_bits(self) -> None:
+        assert hamming(0b1011, 0b0010) == 2
+        assert hamming(2**64 - 1, 0) == 64
+
+    def test_hex_is_fixed_width(self) -> None:
+        assert to_hex(1) == "0000000000000001"
+        assert int(to_hex(2**64 - 1), 16) == 2**64 - 1
+
+
+class TestBKTree:
+    def test_search_matches_brute_force(self) -> None:
+        rng = random.Random(7)
+        values = [rng.getrandbits(64) for _ in range(500)]
+        # Near copies of a few entries, a couple of bits flipped.
+        values += [v ^ (1 << rng.randrange(64)) ^ 1 for v in values[:20]]
+        tree = BKTree()
+        for index, value in enumerate(values):
+            tree.add(value, str(index))
+
+        for query in values[:25]:
+            expected = sorted(
+                (hamming(query, v), str(i))
+                for i, v in enumerate(values)
+                if hamming(query, v) <= 6
+            )
+            assert tree.search(query, 6) == expected
+        assert len(tree) == len(values)
+
+    def test_equal_hashes_share_a_node(self) -> None:
+        tree = BKTree()
+        tree.add(42, "a")
+        tree.add(42, "b")
+
+        assert tree.search(42, 0) == [(0, "a"), (0, "b")]
+        assert tree.search(43, 0) == []
+
+    def test_empty_tree(self) -> None:
+        assert BKTree().search(0, 64) == []
+
+
+class TestHashCache:
+    def test_round_trips_full_width_hashes(self, tmp_path: Path) -> None:
+        cache = HashCache(tmp_path / "phash.sqlite3")
+        cache.put_many({"https://a/1.jpg": 2**64 - 1, "https://a/2.jpg": 5})
+
+        assert HashCache(tmp_path / "phash.sqlite3").get_many(
+            ["https://a/1.jpg", "https://a/2.jpg", "https://a/3.jpg"]
+        ) == {"https://a/1.jpg": 2**64 - 1, "https://a/2.jpg": 5}
+
+    def test_trims_oldest_entries(self, tmp_path: Path) -> None:
+        cache = HashCache(tmp_path / "phash.sqlite3", max_entries=2)
+        for index in range(3):
+            cache.put_many({f"k{index}": index})
+
+        assert cache.get_many(["k0", "k1", "k2"]) == {"k1": 1, "k2": 2}
+
+
+class TestNearDuplicatesFromEnv:
+    def test_disabled_by_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_NEAR_DUPLICATES", "0")
+        assert NearDuplicates.from_env() is None
+
+    def test_disabled_without_pillow(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_NEAR_DUPLICATES", "1")
+        monkeypatch.setattr(phash, "pillow_available", lambda: False)
+        assert NearDuplicates.from_env() is None
+
+    def test_reads_distance(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_NEAR_DUPLICATES", "1")
+        monkeypatch.setenv("CLAWDCUT_NEAR_DUPLICATE_DISTANCE", "10")
+        monkeypatch.setattr(phash, "pillow_available", lambda: True)
+
+        detector = NearDuplicates.from_env()
+        assert detector is not None
+        assert detector.max_distance == 10
+
+
+class TestDhash:
+    def test_rescaled_copy_is_near(self) -> None:
+        original = phash.dhash(_png(1))
+        smaller = phash.dhash(_png(1, size=(96, 72)))
+
+        assert hamming(original, smaller) <= 2
+
+    def test_different_images_are_far(self) -> None:
+        assert hamming(phash.dhash(_png(1)), phash.dhash(_png(2))) > 20
+
+    def test_hashes_files(self, tmp_path: Path) -> None:
+        path = tmp_path / "a.png"
+        path.write_bytes(_png(2))
+
+        assert phash.dhash(path) == phash.dhash(path.read_bytes())
+
+    def test_rejects_non_images(self) -> None:
+        pytest.importorskip("PIL")
+        with pytest.raises(ValueError):
+            phash.dhash(b"<html>not an image</html>")
@@ -0,0 +1,130 @@
+"""Tests for the provider rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from clawdcut.tools.rate_limit import (
+    DEFAULT_QUOTAS,
+    RateLimitedError,
+    TokenBucket,
+    quotas_from_env,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+class TestTokenBucket:
+    def test_burst_then_paced(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_refills_over_time(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=1.0, capacity=1, clock=clock)
+        bucket.reserve()
+        clock.now += 1.0
+        assert bucket.reserve() == 0
+
+    def test_for_quota_caps_burst(self) -> None:
+        bucket = TokenBucket.for_quota(100, 60.0)
+        assert bucket.capacity == 10
+        assert bucket.rate == pytest.approx(100 / 60)
+
+    def test_remaining_caps_tokens(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=10.0, capacity=10, clock=clock)
+        bucket.observe(200, {"X-Ratelimit-Remaining": "1", "X-Ratelimit-Reset": "60"})
+        assert bucket.reserve() == 0
+        # The last server-side request is gone: spread 1 request over 60s.
+        assert bucket.reserve() == pytest.approx(60.0)
+
+    def test_exhausted_budget_waits_for_reset(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=10.0, capacity=10, clock=clock)
+        bucket.observe(200, {"X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": "30"})
+        assert bucket.reserve() >= 30.0
+
+    def test_epoch_reset(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=10.0, capacity=10, clock=clock)
+        reset = str(int(time.time()) + 20)
+        bucket.observe(200, {"X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": reset})
+        assert 18.0 < bucket.reserve() <= 21.0
+
+    def test_healthy_budget_restores_rate(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=10.0, capacity=10, clock=clock)
+        bucket.observe(200, {"X-Ratelimit-Remaining": "2", "X-Ratelimit-Reset": "60"})
+        assert bucket.rate < 10.0
+        bucket.observe(200, {"X-Ratelimit-Remaining": "300", "X-Ratelimit-Reset": "60"})
+        assert bucket.rate == 10.0
+
+    def test_spare_budget_raises_rate(self, clock: FakeClock) -> None:
+        # Pexels' documented 200/hour paces a search every 18s after a burst.
+        bucket = TokenBucket(rate=200 / 3600, capacity=10, clock=clock)
+        for _ in range(10):
+            bucket.reserve()
+        bucket.observe(
+            200, {"X-Ratelimit-Remaining": "190", "X-Ratelimit-Reset": "600"}
+        )
+        assert bucket.rate == pytest.approx(190 / 600)
+        assert bucket.reserve() == pytest.approx(600 / 190)
+
+    def test_deadline_refuses_long_wait(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=1.0, capacity=1, clock=clock)
+        bucket.reserve()
+        with pytest.raises(RateLimitedError) as raised:
+            bucket.acquire(deadline=clock.now + 0.5)
+        assert raised.value.wait == pytest.approx(1.0)
+        # The refused caller took no token, so the next one waits only 1s.
+        assert bucket.reserve(deadline=clock.now + 1.0) == pytest.approx(1.0)
+
+    def test_429_drains_bucket(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=1.0, capacity=5, clock=clock)
+        bucket.observe(429, {})
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_ignores_missing_headers(self, clock: FakeClock) -> None:
+        bucket = TokenBucket(rate=1.0, capacity=5, clock=clock)
+        bucket.observe(200, {"X-Ratelimit-Remaining": "soon"})
+        assert bucket.reserve() == 0
+
+    def test_async_acquire_sleeps(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        monkeypatch.setattr("clawdcut.tools.rate_limit.asyncio.sleep", fake_sleep)
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        asyncio.run(bucket.aacquire())
+        asyncio.run(bucket.aacquire())
+        assert len(sleeps) == 1
+
+
+class TestQuotasFromEnv:
+    def test_defaults(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("CLAWDCUT_RATE_LIMIT", raising=False)
+        assert quotas_from_env() == DEFAULT_QUOTAS
+
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_RATE_LIMIT", "0")
+        assert quotas_from_env() == {}
+
+    def test_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_RATE_LIMIT_PEXELS", "1000/3600")
+        monkeypatch.setenv("CLAWDCUT_RATE_LIMIT_PIXABAY", "bogus")
+        quotas = quotas_from_env()
+        assert quotas["pexels"] == (1000, 3600.0)
+        assert quotas["pixabay"] == DEFAULT_QUOTAS["pixabay"]
@@ -0,0 +1,77 @@
+"""Tests for rendition selection."""
+
+import pytest
+
+from clawdcut.tools.renditions import RenditionTarget, select_rendition
+
+FILES = [
+    {"link": "4k", "width": 3840, "height": 2160, "fps": 30, "size": 90_000_000},
+    {"link": "1080-60", "width": 1920, "height": 1080, "fps": 60, "size": 30_000},
+    {"link": "1080-25", "width": 1920, "height": 1080, "fps": 25, "size": 20_000},
+    {"link": "720", "width": 1280, "height": 720, "fps": 30, "size": 9_000},
+    {"link": "sd", "width": 640, "height": 360, "fps": 30, "size": 2_000},
+]
+
+
+def _pick(spec: str, max_bytes: int = 0, files=FILES) -> str:
+    target = RenditionTarget.parse(spec, max_bytes)
+    assert target is not None
+    return select_rendition(files, target)["link"]
+
+
+class TestRenditionTarget:
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            ("1080p", (1920, 1080, 0.0)),
+            ("4K", (3840, 2160, 0.0)),
+            ("1920x1080", (1920, 1080, 0.0)),
+            ("1080x1920@60", (1920, 1080, 60.0)),
+            ("720p @ 29.97", (1280, 720, 29.97)),
+        ],
+    )
+    def test_parse(self, spec: str, expected: tuple) -> None:
+        target = RenditionTarget.parse(spec)
+        assert target is not None
+        assert (target.width, target.height, target.fps) == expected
+
+    def test_empty_spec(self) -> None:
+        assert RenditionTarget.parse("") is None
+        assert RenditionTarget.parse("", 5000) == RenditionTarget(max_bytes=5000)
+
+    @pytest.mark.parametrize("spec", ["huge", "1920x", "1080p@fast"])
+    def test_invalid_spec(self, spec: str) -> None:
+        with pytest.raises(ValueError, match="Unrecognised"):
+            RenditionTarget.parse(spec)
+
+
+class TestSelectRendition:
+    def test_smallest_meeting_target(self) -> None:
+        assert _pick("1080p") == "1080-25"
+        assert _pick("720p") == "720"
+
+    def test_portrait_target_matches_landscape_sizes(self) -> None:
+        assert _pick("1080x1920") == "1080-25"
+
+    def test_frame_rate(self) -> None:
+        assert _pick("1080p@60") == "1080-60"
+
+    def test_frame_rate_relaxed_when_unavailable(self) -> None:
+        assert _pick("1080p@120") == "1080-25"
+
+    def test_larger_than_available_uses_largest(self) -> None:
+        assert _pick("8000x6000") == "4k"
+
+    def test_byte_budget(self) -> None:
+        assert _pick("4k", max_bytes=25_000) == "1080-25"
+        assert _pick("", max_bytes=10_000) == "720"
+
+    def test_nothing_affordable_uses_smallest(self) -> None:
+        assert _pick("1080p", max_bytes=100) == "sd"
+
+    def test_unknown_sizes_pass_budget(self) -> None:
+        files = [{"link": "a", "width": 1920, "height": 1080}]
+        assert _pick("1080p", max_bytes=1, files=files) == "a"
+
+    def test_empty(self) -> None:
+        assert select_rendition([], RenditionTarget(1920, 1080)) == {}
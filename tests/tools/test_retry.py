@@ -0,0 +1,185 @@
+"""Tests for the retry policy."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from clawdcut.tools.retry import RetryPolicy, RetryStats, parse_retry_after
+
+
+def _responses(*responses: httpx.Response):
+    """Return a request function replaying ``responses`` in order."""
+    request = httpx.Request("GET", "https://api.test/")
+    queue = list(responses)
+
+    def request_fn(url: str, **kwargs) -> httpx.Response:
+        response = queue.pop(0)
+        response.request = request
+        return response
+
+    return request_fn
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    recorded: list[float] = []
+    monkeypatch.setattr("clawdcut.tools.retry.time.sleep", recorded.append)
+    return recorded
+
+
+class TestParseRetryAfter:
+    def test_seconds(self) -> None:
+        assert parse_retry_after({"Retry-After": "7"}) == 7.0
+
+    def test_http_date(self) -> None:
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        delay = parse_retry_after({"Retry-After": format_datetime(when, usegmt=True)})
+        assert delay is not None and 28.0 < delay <= 30.0
+
+    def test_missing_or_invalid(self) -> None:
+        assert parse_retry_after({}) is None
+        assert parse_retry_after({"Retry-After": "soon"}) is None
+
+
+class TestRetryPolicy:
+    def test_success_without_retry(self, sleeps: list[float]) -> None:
+        stats = RetryStats()
+        RetryPolicy().call(_responses(httpx.Response(200)), "u", stats)
+        assert stats.to_dict() == {"attempts": 1, "wait_seconds": 0.0}
+        assert sleeps == []
+
+    def test_retries_transient_then_succeeds(self, sleeps: list[float]) -> None:
+        stats = RetryStats()
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+        policy.call(
+            _responses(httpx.Response(503), httpx.Response(502), httpx.Response(200)),
+            "u",
+            stats,
+        )
+        assert stats.attempts == 3
+        assert len(sleeps) == 2
+        assert all(0.1 <= s <= 1.0 for s in sleeps)
+        assert stats.wait_seconds == pytest.approx(sum(sleeps))
+
+    def test_jitter_is_decorrelated(self) -> None:
+        policy = RetryPolicy(base_delay=0.1, max_delay=100.0)
+        error = httpx.ConnectError("down")
+        delays = {policy.next_delay(1.0, error) for _ in range(20)}
+        assert len(delays) > 1
+        assert all(0.1 <= d <= 3.0 for d in delays)
+
+    def test_honours_retry_after(self, sleeps: list[float]) -> None:
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.5)
+        policy.call(
+            _responses(
+                httpx.Response(429, headers={"Retry-After": "4"}),
+                httpx.Response(200),
+            ),
+            "u",
+        )
+        assert sleeps == [4.0]
+
+    def test_retry_after_beyond_deadline_gives_up(self, sleeps: list[float]) -> None:
+        stats = RetryStats()
+        policy = RetryPolicy(deadline=2.0)
+        with pytest.raises(httpx.HTTPStatusError):
+            policy.call(
+                _responses(httpx.Response(429, headers={"Retry-After": "30"})),
+                "u",
+                stats,
+            )
+        assert stats.attempts == 1
+        assert sleeps == []
+
+    def test_clamps_attempt_timeouts_to_deadline(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clock = [100.0]
+        monkeypatch.setattr("clawdcut.tools.retry.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr(
+            "clawdcut.tools.retry.time.sleep",
+            lambda delay: clock.__setitem__(0, clock[0] + delay),
+        )
+        monkeypatch.setattr("clawdcut.tools.retry.random.uniform", lambda a, b: 1.0)
+        timeouts: list[float] = []
+        replay = _responses(httpx.Response(503), httpx.Response(503))
+
+        def request_fn(url: str, timeout: float) -> httpx.Response:
+            timeouts.append(timeout)
+            clock[0] += 4.0  # each attempt is slow
+            return replay(url)
+
+        stats = RetryStats()
+        with pytest.raises(httpx.HTTPStatusError):
+            RetryPolicy(deadline=8.0).call(request_fn, "u", stats, timeout=30.0)
+
+        # Attempt 2 starts 5s in, so only 3s of the deadline are left; the
+        # third attempt would start at the deadline and is never made.
+        assert timeouts == [8.0, 3.0]
+        assert stats.attempts == 2
+
+    def test_clamps_every_timeout_phase(self) -> None:
+        seen: list[httpx.Timeout] = []
+        replay = _responses(httpx.Response(200))
+
+        def request_fn(url: str, timeout: httpx.Timeout) -> httpx.Response:
+            seen.append(timeout)
+            return replay(url)
+
+        RetryPolicy(deadline=5.0).call(
+            request_fn, "u", timeout=httpx.Timeout(30.0, connect=2.0)
+        )
+
+        (timeout,) = seen
+        assert timeout.connect == 2.0
+        assert 4.9 < timeout.read <= 5.0
+        assert 4.9 < timeout.pool <= 5.0
+
+    def test_non_retryable_raises_immediately(self, sleeps: list[float]) -> None:
+        with pytest.raises(httpx.HTTPStatusError):
+            RetryPolicy().call(_responses(httpx.Response(404)), "u")
+        assert sleeps == []
+
+    def test_max_attempts(self, sleeps: list[float]) -> None:
+        stats = RetryStats()
+        with pytest.raises(httpx.HTTPStatusError):
+            RetryPolicy(max_attempts=2).call(
+                _responses(httpx.Response(500), httpx.Response(500)), "u", stats
+            )
+        assert stats.attempts == 2
+        assert len(sleeps) == 1
+
+    def test_async_call(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        monkeypatch.setattr("clawdcut.tools.retry.asyncio.sleep", fake_sleep)
+        replay = _responses(
+            httpx.Response(503, headers={"Retry-After": "2"}), httpx.Response(200)
+        )
+
+        async def request_fn(url: str, **kwargs) -> httpx.Response:
+            return replay(url, **kwargs)
+
+        stats = RetryStats()
+        asyncio.run(RetryPolicy().acall(request_fn, "u", stats))
+        assert sleeps == [2.0]
+        assert stats.to_dict() == {"attempts": 2, "wait_seconds": 2.0}
+
+    def test_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("CLAWDCUT_RETRY_MAX_ATTEMPTS", "5")
+        monkeypatch.setenv("CLAWDCUT_RETRY_DEADLINE", "12.5")
+        monkeypatch.setenv("CLAWDCUT_RETRY_BASE_DELAY", "bogus")
+        policy = RetryPolicy.from_env()
+        assert (policy.max_attempts, policy.deadline) == (5, 12.5)
+        assert policy.base_delay == 0.2
+
+    def test_downloads_use_their_own_deadline(self) -> None:
+        policy = RetryPolicy(deadline=5.0, download_deadline=300.0)
+        assert policy.for_downloads().deadline == 300.0
+        assert policy.deadline == 5.0
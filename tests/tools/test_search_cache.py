@@ -0,0 +1,134 @@
+"""Tests for the persistent search-response cache."""
+
+import contextlib
+import json
+import secrets
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from clawdcut.tools.search_cache import (
+    PageCache,
+    SearchCache,
+    cache_key,
+    normalize_params,
+)
+
+URL = "https://pixabay.com/api/"
+
+
+def _stored_size(cache: SearchCache) -> int:
+    with contextlib.closing(sqlite3.connect(cache.path)) as conn:
+        return int(conn.execute("SELECT SUM(size) FROM responses").fetchone()[0])
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SearchCache:
+    return SearchCache(tmp_path / "search.sqlite3")
+
+
+class TestNormalizeParams:
+    def test_drops_credentials(self) -> None:
+        params = normalize_params({"key": "secret", "token": "t", "q": "sunset"})
+        assert params == {"q": "sunset"}
+
+    def test_canonicalizes_queries(self) -> None:
+        assert normalize_params({"query": "  Golden   SUNSET "}) == {
+            "query": "golden sunset"
+        }
+
+    def test_key_ignores_api_key_and_param_order(self) -> None:
+        first = cache_key("pixabay", URL, {"key": "a", "q": "Sunset", "per_page": 5})
+        second = cache_key("pixabay", URL, {"per_page": 5, "q": "sunset", "key": "b"})
+        assert first == second
+
+    def test_key_depends_on_provider_and_endpoint(self) -> None:
+        params = {"q": "sunset"}
+        assert cache_key("pixabay", URL, params) != cache_key(
+            "pixabay", URL + "videos/", params
+        )
+        assert cache_key("pixabay", URL, params) != cache_key("pexels", URL, params)
+
+
+class TestSearchCache:
+    def test_round_trip(self, cache: SearchCache) -> None:
+        cache.put("pixabay", URL, {"q": "sunset"}, {"hits": [{"id": 1}]})
+        cached = cache.get("pixabay", URL, {"q": "sunset"})
+
+        assert cached is not None
+        data, age = cached
+        assert data == {"hits": [{"id": 1}]}
+        assert age >= 0
+
+    def test_miss(self, cache: SearchCache) -> None:
+        assert cache.get("pixabay", URL, {"q": "ocean"}) is None
+
+    def test_expired_entries_are_not_served(self, tmp_path: Path) -> None:
+        cache = SearchCache(tmp_path / "search.sqlite3", ttl_seconds=0)
+        cache.put("pixabay", URL, {"q": "sunset"}, {"hits": []})
+        assert cache.get("pixabay", URL, {"q": "sunset"}) is None
+
+    def test_payloads_are_compressed(self, cache: SearchCache) -> None:
+        data = {"hits": [{"tags": "sunset, nature, sky"}] * 200}
+        cache.put("pixabay", URL, {"q": "sunset"}, data)
+        assert _stored_size(cache) < len(json.dumps(data)) / 10
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        old = {"hits": [secrets.token_hex(100)]}
+        new = {"hits": [secrets.token_hex(100)]}
+        probe = SearchCache(tmp_path / "probe.sqlite3")
+        probe.put("pixabay", URL, {"q": "x"}, old)
+        cache = SearchCache(
+            tmp_path / "search.sqlite3", max_bytes=int(_stored_size(probe) * 1.5)
+        )
+
+        cache.put("pixabay", URL, {"q": "old"}, old)
+        cache.put("pixabay", URL, {"q": "new"}, new)
+
+        assert cache.get("pixabay", URL, {"q": "old"}) is None
+        assert cache.get("pixabay", URL, {"q": "new"}) is not None
+
+    def test_from_env(
+        self, monkeypatch: pytest.MonkeyPatch, isolated_cache_dir: Path
+    ) -> None:
+        monkeypatch.setenv("CLAWDCUT_SEARCH_CACHE_TTL", "60")
+        cache = SearchCache.from_env()
+        assert cache is not None
+        assert cache.ttl_seconds == 60
+        assert cache.path.parent == isolated_cache_dir
+
+        monkeypatch.setenv("CLAWDCUT_SEARCH_CACHE", "0")
+        assert SearchCache.from_env() is None
+
+
+class TestPageCache:
+    def test_lru_eviction(self) -> None:
+        cache = PageCache(max_entries=2)
+        cache.put("a", {"n": 1})
+        cache.put("b", {"n": 2})
+        cache.get("a")
+        cache.put("c", {"n": 3})
+        assert cache.get("b") is None
+        assert cache.get("a") == {"n": 1}
+
+    def test_pending_waits_for_prefetch(self) -> None:
+        import threading
+
+        cache = PageCache()
+        assert cache.begin("k") is True
+        assert cache.begin("k") is False
+        assert cache.is_pending("k")
+
+        def finish() -> None:
+            cache.put("k", {"done": True})
+            cache.end("k")
+
+        threading.Timer(0.05, finish).start()
+        assert cache.get("k", timeout=5.0) == {"done": True}
+        assert not cache.is_pending("k")
+
+    def test_begin_refuses_cached_key(self) -> None:
+        cache = PageCache()
+        cache.put("k", {})
+        assert cache.begin("k") is False
@@ -0,0 +1,189 @@
+"""Tests for the local stand-in provider server."""
+
+import json
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from clawdcut.tools.http_clients import ProviderClients
+from clawdcut.tools.retry import RetryPolicy
+from clawdcut.tools.standin import Faults, Recordings, StandInServer, synthesize
+from clawdcut.tools.stock_tools import create_stock_tools
+
+
+@pytest.fixture
+def workdir(tmp_path: Path) -> Path:
+    """Project directory, separate from the recordings in ``tmp_path``."""
+    return tmp_path / "project"
+
+
+@pytest.fixture
+def standin_env(monkeypatch: pytest.MonkeyPatch):
+    """Point every provider at a running server."""
+
+    def point(server: StandInServer) -> None:
+        for name, value in server.environ().items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
+
+    return point
+
+
+class TestSynthesize:
+    def test_pages_are_deterministic_and_bounded(self) -> None:
+        params = {"query": "ocean", "per_page": "15", "page": "2"}
+        first = synthesize("pexels", "/v1/search", params, total=20)
+        again = synthesize("pexels", "/v1/search", params, total=20)
+
+        assert first == again
+        assert first is not None
+        assert len(first["photos"]) == 5
+        assert first["total_results"] == 20
+
+    def test_unknown_path(self) -> None:
+        assert synthesize("pexels", "/v2/unknown", {}) is None
+
+    def test_pixabay_lookup_by_id(self) -> None:
+        data = synthesize("pixabay", "/api/videos/", {"id": "42"})
+        assert data is not None
+        assert data["hits"][0]["id"] == 42
+        assert set(data["hits"][0]["videos"]) == {"large", "medium", "small", "tiny"}
+
+
+class TestRecordings:
+    def test_key_ignores_credentials_and_param_order(self) -> None:
+        assert Recordings.key("/pixabay/api/", "q=sea&key=secret&page=1") == (
+            Recordings.key("/pixabay/api/", "page=1&q=sea&key=other")
+        )
+        assert Recordings.key("/pixabay/api/", "q=sea") != Recordings.key(
+            "/pixabay/api/", "q=sky"
+        )
+
+
+class TestStandInServer:
+    def test_stock_tools_search_and_download_offline(
+        self, workdir: Path, standin_env
+    ) -> None:
+        with StandInServer(media_bytes=200_000) as server:
+            standin_env(server)
+            tools = {t.__name__: t for t in create_stock_tools(workdir)}
+            search = json.loads(tools["pexels_search"]("sunset", output="compact"))
+            handle = search["candidates"][0]["id"]
+            download = json.loads(
+                tools["pexels_download"](handle, ".clawdcut/assets/images/a.jpeg")
+            )
+            stock = json.loads(tools["stock_search"]("sunset", media_type="video"))
+
+        assert search["success"] is True
+        assert len(search["candidates"]) == 5
+        assert download["success"] is True
+        assert (workdir / ".clawdcut/assets/images/a.jpeg").stat().st_size == 200_000
+        assert {s["status"] for s in stock["providers"].values()} == {"ok"}
+        assert stock["candidates"][0]["download_url"].startswith(server.url)
+        assert server.stats["bytes_sent"] >= 200_000
+
+    def test_replays_recorded_traffic(self, tmp_path: Path) -> None:
+        upstream: list[str] = []
+        recorded = {
+            "photos": [
+                {
+                    "id": 7,
+                    "src": {"original": "https://images.pexels.com/photos/7/a.jpeg"},
+                }
+            ],
+            "total_results": 1,
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            upstream.append(f"{request.url.host}{request.url.path}")
+            if request.url.host == "api.pexels.com":
+                assert request.headers["Authorization"] == "secret"
+                return httpx.Response(200, json=recorded)
+            return httpx.Response(
+                200, headers={"Content-Type": "image/jpeg"}, content=b"jpeg-bytes"
+            )
+
+        transport = httpx.MockTransport(handler)
+        recording = StandInServer(tmp_path, record=True, upstream_transport=transport)
+        with recording:
+            search = httpx.get(
+                f"{recording.url}/pexels/v1/search?query=sea",
+                headers={"Authorization": "secret"},
+            ).json()
+            media = httpx.get(search["photos"][0]["src"]["original"]).content
+            httpx.get(f"{recording.url}/pexels/v1/search?query=sea")
+
+        with StandInServer(tmp_path) as replay:
+            replayed = httpx.get(f"{replay.url}/pexels/v1/search?query=sea").json()
+            original = replayed["photos"][0]["src"]["original"]
+            replayed_media = httpx.get(original).content
+
+        assert media == replayed_media == b"jpeg-bytes"
+        assert original == f"{replay.url}/media/images.pexels.com/photos/7/a.jpeg"
+        assert upstream == [
+            "api.pexels.com/v1/search",
+            "images.pexels.com/photos/7/a.jpeg",
+        ]
+        assert "secret" not in "".join(p.read_text() for p in tmp_path.glob("*.json"))
+
+    def test_injects_429_bursts_and_errors(self) -> None:
+        faults = Faults(burst_every=3, burst_length=1, retry_after=2)
+        with StandInServer(faults=faults) as server:
+            responses = [
+                httpx.get(f"{server.url}/pixabay/api/?q=sea") for _ in range(6)
+            ]
+        with StandInServer(faults=Faults(error_rate=1.0)) as server:
+            failing = httpx.get(f"{server.url}/freesound/apiv2/search/text/?q=x")
+
+        assert [r.status_code for r in responses] == [200, 200, 429] * 2
+        assert responses[2].headers["Retry-After"] == "2"
+        assert failing.status_code == 503
+
+    def test_tools_retry_through_throttling(self, workdir: Path, standin_env) -> None:
+        faults = Faults(burst_every=2, burst_length=1, retry_after=0)
+        with StandInServer(faults=faults) as server:
+            standin_env(server)
+            tools = {
+                t.__name__: t
+                for t in create_stock_tools(
+                    workdir,
+                    ProviderClients(quotas={}),
+                    retry_policy=RetryPolicy(max_attempts=3, base_delay=0),
+                )
+            }
+            first = json.loads(tools["pixabay_search"]("sea", page=1))
+            second = json.loads(tools["pixabay_search"]("sea", page=3))
+
+        # Prefetches of the next page share the throttled request budget.
+        assert first["success"] is True
+        assert second["success"] is True
+        assert server.stats["throttled"] >= 1
+
+    def test_caps_media_throughput_and_serves_ranges(self) -> None:
+        faults = Faults(throughput=64 * 1024)
+        with StandInServer(faults=faults, media_bytes=32 * 1024) as server:
+            url = f"{server.url}/media/cdn.pixabay.com/video/1/tiny.mp4"
+            started = time.monotonic()
+            full = httpx.get(url)
+            elapsed = time.monotonic() - started
+            tail = httpx.get(url, headers={"Range": "bytes=1000-"})
+            past_end = httpx.get(url, headers={"Range": "bytes=32768-"})
+
+        assert len(full.content) == 32 * 1024
+        assert full.headers["Content-Type"] == "video/mp4"
+        assert elapsed >= 0.4
+        assert tail.status_code == 206
+        assert tail.content == full.content[1000:]
+        assert tail.headers["Content-Range"] == f"bytes 1000-{32 * 1024 - 1}/32768"
+        assert past_end.status_code == 416
+        assert past_end.headers["Content-Range"] == "bytes */32768"
+
+    def test_unknown_routes_return_404(self) -> None:
+        with StandInServer() as server:
+            assert httpx.get(f"{server.url}/flickr/search").status_code == 404
+            assert httpx.get(f"{server.url}/pexels/v9/nothing").status_code == 404
+            assert httpx.get(f"{server.url}/media/x.org/page.html").status_code == 404
@@ -1,18 +1,32 @@
 """Tests for stock tools."""
 
+import asyncio
+import inspect
+import io
 import json
+import random
+import sqlite3
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import httpx
 import pytest
 
+from clawdcut.tools.http_clients import ProviderClients
+from clawdcut.tools.metrics import METRICS_PATH
+from clawdcut.tools.phash import HashCache, NearDuplicates
+from clawdcut.tools.retry import RetryPolicy
 from clawdcut.tools.stock_tools import (
+    CircuitBreaker,
+    ProviderUnavailableError,
+    _BoundedDict,
     _format_freesound_audio,
     _format_pexels_photos,
     _format_pexels_videos,
     _format_pixabay_images,
     _format_pixabay_videos,
+    create_async_stock_tools,
     create_stock_tools,
 )
 
@@ -167,6 +181,16 @@ def _mock_response(
     return mock
 
 
+def _mock_stream(content: bytes = b"fake-binary-content") -> MagicMock:
+    """Create a mock ``httpx.Client.stream`` context manager."""
+    response = _mock_response()
+    response.headers = httpx.Headers()
+    response.iter_bytes.return_value = [content]
+    stream = MagicMock()
+    stream.__enter__.return_value = response
+    return stream
+
+
 def _parse_json_result(result: str) -> dict:
     """Parse structured tool output."""
     return json.loads(result)
@@ -250,7 +274,7 @@ class TestFormatFreesoundAudio:
 class TestPexelsSearch:
     def test_search_photos(self, tools: dict, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PEXELS_PHOTO_RESPONSE)
             result = tools["pexels_search"]("sunset")
 
@@ -265,7 +289,7 @@ class TestPexelsSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PEXELS_PHOTO_RESPONSE)
             result = tools["pexels_search"]("sunset")
 
@@ -279,7 +303,7 @@ class TestPexelsSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.side_effect = [
                 httpx.ConnectError("Connection refused"),
                 _mock_response(PEXELS_PHOTO_RESPONSE),
@@ -304,7 +328,7 @@ class TestPexelsSearch:
                 }
             )
         )
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PEXELS_PHOTO_RESPONSE)
             result = tools["pexels_search"](
                 "cinematic sunset",
@@ -316,11 +340,62 @@ class TestPexelsSearch:
         assert "style_match_score" in payload
         assert payload["style_match_score"] > 0
 
+    def test_style_brief_reranks_results(
+        self, tools: dict, monkeypatch: pytest.MonkeyPatch, workdir: Path
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        style_brief = workdir / ".clawdcut" / "style_brief.json"
+        style_brief.parent.mkdir(parents=True, exist_ok=True)
+        style_brief.write_text(
+            json.dumps({"palette": {"keywords": ["warm"], "forbidden": ["neon"]}})
+        )
+        photo = PEXELS_PHOTO_RESPONSE["photos"][0]
+        neon = {**photo, "id": 1, "alt": "Neon club"}
+        warm = {**photo, "id": 2, "alt": "Warm dusk"}
+        plain = {**photo, "id": 3, "alt": "Street"}
+        response = {**PEXELS_PHOTO_RESPONSE, "photos": [neon, warm, plain]}
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(response)
+            payload = _parse_json_result(
+                tools["pexels_search"](
+                    "dusk",
+                    style_brief_path=".clawdcut/style_brief.json",
+                    top_k=2,
+                )
+            )
+
+        assert [r["id"] for r in payload["ranking"]] == ["2", "1"]
+        assert payload["ranking"][0]["matches"] == ["warm"]
+        assert payload["ranking"][1]["avoid"] == ["neon"]
+        assert payload["raw_count"] == 3
+        summary = payload["summary"]
+        assert summary.index("Warm dusk") < summary.index("Neon club")
+        assert "Street" not in summary
+
+    def test_top_k_without_style_brief(
+        self, tools: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        photos = [
+            {**PEXELS_PHOTO_RESPONSE["photos"][0], "id": i, "alt": f"Photo {i}"}
+            for i in range(3)
+        ]
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(
+                {**PEXELS_PHOTO_RESPONSE, "photos": photos}
+            )
+            payload = _parse_json_result(
+                tools["pexels_search"]("photo", output="compact", top_k=1)
+            )
+
+        assert [c["id"] for c in payload["candidates"]] == ["px:0"]
+        assert "ranking" not in payload
+
     def test_search_videos_uses_video_endpoint(
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PEXELS_VIDEO_RESPONSE)
             result = tools["pexels_search"]("sunset", media_type="video")
 
@@ -339,7 +414,7 @@ class TestPexelsSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PEXELS_PHOTO_RESPONSE)
             tools["pexels_search"]("sunset", per_page=50)
 
@@ -350,7 +425,7 @@ class TestPexelsSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.side_effect = httpx.ConnectError("Connection refused")
             result = tools["pexels_search"]("sunset")
 
@@ -368,8 +443,8 @@ class TestPexelsDownload:
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.return_value = _mock_response()
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.return_value = _mock_stream()
             result = tools["pexels_download"](
                 "https://example.com/photo.jpg",
                 ".clawdcut/assets/images/photo.jpg",
@@ -402,8 +477,8 @@ class TestPexelsDownload:
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.return_value = _mock_response()
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.return_value = _mock_stream()
             tools["pexels_download"](
                 "https://example.com/photo.jpg",
                 ".clawdcut/assets/deep/nested/photo.jpg",
@@ -417,8 +492,8 @@ class TestPexelsDownload:
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         monkeypatch.setenv("PEXELS_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.side_effect = httpx.ConnectError("Connection refused")
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.side_effect = httpx.ConnectError("Connection refused")
             result = tools["pexels_download"](
                 "https://example.com/photo.jpg",
                 ".clawdcut/assets/images/photo.jpg",
@@ -426,6 +501,108 @@ class TestPexelsDownload:
 
         assert "Error" in result
 
+    def test_retry_resumes_interrupted_download(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("clawdcut.tools.retry.time.sleep", lambda _: None)
+        body = b"0123456789"
+        ranges: list[str | None] = []
+
+        class FlakyStream(httpx.SyncByteStream):
+            def __iter__(self):
+                yield body[:4]
+                raise httpx.ReadError("connection dropped")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            ranges.append(request.headers.get("Range"))
+            headers = {"ETag": '"v1"', "Accept-Ranges": "bytes"}
+            if request.headers.get("Range") == "bytes=4-":
+                headers["Content-Range"] = "bytes 4-9/10"
+                return httpx.Response(206, headers=headers, content=body[4:])
+            return httpx.Response(200, headers=headers, stream=FlakyStream())
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        payload = _parse_json_result(
+            tools["pexels_download"](
+                "https://videos.pexels.com/1.mp4",
+                ".clawdcut/assets/videos/clip.mp4",
+            )
+        )
+
+        assert payload["success"] is True
+        assert payload["retry"]["attempts"] == 2
+        assert ranges == [None, "bytes=4-"]
+        assert (workdir / ".clawdcut/assets/videos/clip.mp4").read_bytes() == body
+
+    def test_transfer_dropped_after_search_deadline_is_resumed(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clock = [100.0]
+        monkeypatch.setattr("clawdcut.tools.retry.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("clawdcut.tools.retry.time.sleep", lambda _: None)
+        body = b"0123456789"
+        timeouts: list[float | None] = []
+
+        class SlowFlakyStream(httpx.SyncByteStream):
+            def __iter__(self):
+                yield body[:4]
+                clock[0] += 90.0  # well past the 60s search deadline
+                raise httpx.ReadError("connection dropped")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"]["read"])
+            headers = {"ETag": '"v1"', "Accept-Ranges": "bytes"}
+            if request.headers.get("Range") == "bytes=4-":
+                headers["Content-Range"] = "bytes 4-9/10"
+                return httpx.Response(206, headers=headers, content=body[4:])
+            return httpx.Response(200, headers=headers, stream=SlowFlakyStream())
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {
+            t.__name__: t
+            for t in create_stock_tools(
+                workdir, clients, retry_policy=RetryPolicy(deadline=60.0)
+            )
+        }
+        payload = _parse_json_result(
+            tools["pexels_download"](
+                "https://videos.pexels.com/1.mp4",
+                ".clawdcut/assets/videos/clip.mp4",
+            )
+        )
+
+        assert payload["success"] is True
+        assert payload["retry"]["attempts"] == 2
+        assert timeouts == [60.0, 60.0]
+        assert (workdir / ".clawdcut/assets/videos/clip.mp4").read_bytes() == body
+
+    def test_html_error_page_is_rejected_without_retry(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(
+                200, headers={"Content-Type": "text/html"}, content=b"<html>"
+            )
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        payload = _parse_json_result(
+            tools["pexels_download"](
+                "https://images.pexels.com/1.jpg",
+                ".clawdcut/assets/images/photo.jpg",
+            )
+        )
+
+        assert payload["success"] is False
+        assert payload["error_code"] == "download_rejected"
+        assert "text/html" in payload["error"]
+        assert len(seen) == 1
+        assert list((workdir / ".clawdcut/assets/images").iterdir()) == []
+
 
 # --- Pixabay Search Tests ---
 
@@ -435,7 +612,7 @@ class TestPixabaySearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PIXABAY_IMAGE_RESPONSE)
             result = tools["pixabay_search"]("sunset")
 
@@ -449,7 +626,7 @@ class TestPixabaySearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PIXABAY_VIDEO_RESPONSE)
             result = tools["pixabay_search"]("sunset", media_type="video")
 
@@ -468,7 +645,7 @@ class TestPixabaySearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(PIXABAY_IMAGE_RESPONSE)
             tools["pixabay_search"]("sunset", media_type="illustration")
 
@@ -479,7 +656,7 @@ class TestPixabaySearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.side_effect = httpx.ConnectError("Connection refused")
             result = tools["pixabay_search"]("sunset")
 
@@ -491,8 +668,8 @@ class TestPixabaySearch:
 
 class TestPixabayDownload:
     def test_downloads_file(self, tools: dict, workdir: Path) -> None:
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.return_value = _mock_response()
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.return_value = _mock_stream()
             result = tools["pixabay_download"](
                 "https://cdn.pixabay.com/video/sunset.mp4",
                 ".clawdcut/assets/videos/sunset.mp4",
@@ -504,8 +681,8 @@ class TestPixabayDownload:
         assert str(target) in result
 
     def test_creates_parent_directories(self, tools: dict, workdir: Path) -> None:
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.return_value = _mock_response()
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.return_value = _mock_stream()
             tools["pixabay_download"](
                 "https://cdn.pixabay.com/photo/sunset.jpg",
                 ".clawdcut/assets/deep/nested/sunset.jpg",
@@ -526,7 +703,7 @@ class TestPixabayDownload:
 class TestFreesoundSearch:
     def test_search_audio(self, tools: dict, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(FREESOUND_AUDIO_RESPONSE)
             result = tools["freesound_search"]("cinematic")
 
@@ -540,7 +717,7 @@ class TestFreesoundSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(FREESOUND_AUDIO_RESPONSE)
             tools["freesound_search"]("whoosh", category="sfx")
 
@@ -551,7 +728,7 @@ class TestFreesoundSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(FREESOUND_AUDIO_RESPONSE)
             tools["freesound_search"]("cinematic", license_type="cc0")
 
@@ -570,7 +747,7 @@ class TestFreesoundSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.return_value = _mock_response(FREESOUND_AUDIO_RESPONSE)
             tools["freesound_search"]("cinematic", per_page=100)
 
@@ -581,7 +758,7 @@ class TestFreesoundSearch:
         self, tools: dict, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
             mock_get.side_effect = httpx.ConnectError("Connection refused")
             result = tools["freesound_search"]("cinematic")
 
@@ -590,8 +767,8 @@ class TestFreesoundSearch:
 
 class TestFreesoundDownload:
     def test_downloads_file(self, tools: dict, workdir: Path) -> None:
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.return_value = _mock_response()
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.return_value = _mock_stream()
             result = tools["freesound_download"](
                 "https://cdn.freesound.org/previews/33333-hq.mp3",
                 ".clawdcut/assets/audio/music/cinematic.mp3",
@@ -603,8 +780,8 @@ class TestFreesoundDownload:
         assert str(target) in result
 
     def test_http_error_returns_error_message(self, tools: dict) -> None:
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.side_effect = httpx.ConnectError("Connection refused")
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.side_effect = httpx.ConnectError("Connection refused")
             result = tools["freesound_download"](
                 "https://cdn.freesound.org/previews/33333-hq.mp3",
                 ".clawdcut/assets/audio/music/cinematic.mp3",
@@ -613,8 +790,8 @@ class TestFreesoundDownload:
         assert "Error" in result
 
     def test_returns_structured_success(self, tools: dict) -> None:
-        with patch("clawdcut.tools.stock_tools.httpx.get") as mock_get:
-            mock_get.return_value = _mock_response()
+        with patch("clawdcut.tools.stock_tools.httpx.Client.stream") as mock_stream:
+            mock_stream.return_value = _mock_stream()
             result = tools["freesound_download"](
                 "https://cdn.freesound.org/previews/33333-hq.mp3",
                 ".clawdcut/assets/audio/music/cinematic.mp3",
@@ -627,13 +804,355 @@ class TestFreesoundDownload:
         assert "path" in payload
 
 
+class TestAssetManifest:
+    def test_download_is_recorded_with_search_metadata(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+            return httpx.Response(
+                200, headers={"Content-Type": "image/jpeg"}, content=b"jpeg-bytes"
+            )
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset")
+        download = _parse_json_result(
+            tools["pexels_download"](
+                "https://images.pexels.com/photos/12345/original.jpeg",
+                ".clawdcut/assets/images/sunset.jpg",
+            )
+        )
+
+        assert download["sha256"]
+        payload = _parse_json_result(tools["asset_lookup"]("sunset"))
+        assert payload["success"] is True
+        assert payload["count"] == 1
+        record = payload["assets"][0]
+        assert record["path"] == ".clawdcut/assets/images/sunset.jpg"
+        assert record["asset_id"] == "12345"
+        assert record["width"] == 1920
+        assert record["creator"] == "Test Photographer"
+        assert record["license"] == "Pexels License"
+        assert record["bytes"] == len(b"jpeg-bytes")
+        assert record["sha256"] == download["sha256"]
+        assert "sunset.jpg" in payload["summary"]
+
+    def test_lookup_without_downloads(self, tools: dict) -> None:
+        payload = _parse_json_result(tools["asset_lookup"]())
+        assert payload["success"] is True
+        assert payload["count"] == 0
+        assert payload["assets"] == []
+
+    def test_lookup_rejects_unknown_provider(self, tools: dict) -> None:
+        payload = _parse_json_result(tools["asset_lookup"](provider="flickr"))
+        assert payload["success"] is False
+
+    def test_async_download_is_recorded(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        tools, _ = _async_tools(
+            workdir,
+            lambda request: httpx.Response(
+                200, headers={"Content-Type": "audio/mpeg"}, content=b"mp3"
+            ),
+        )
+
+        async def run() -> dict:
+            await tools["freesound_download"](
+                "https://cdn.freesound.org/previews/1-hq.mp3",
+                ".clawdcut/assets/audio/sfx/whoosh.mp3",
+                "1",
+            )
+            return _parse_json_result(await tools["asset_lookup"](media_type="audio"))
+
+        payload = asyncio.run(run())
+        assert payload["assets"][0]["provider"] == "freesound"
+        assert payload["assets"][0]["asset_id"] == "1"
+
+
+def _preview_png(seed: int, size: tuple[int, int] = (160, 120)) -> bytes:
+    """Encode a smooth random preview image as PNG."""
+    image_module = pytest.importorskip("PIL.Image")
+    rng = random.Random(seed)
+    coarse = image_module.new("L", (6, 5))
+    coarse.putdata([rng.randrange(256) for _ in range(30)])
+    buffer = io.BytesIO()
+    coarse.resize(size, image_module.Resampling.BICUBIC).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _pexels_photos(*ids: int) -> dict:
+    """Pexels photo search response whose previews are keyed by id."""
+    return {
+        "photos": [
+            {
+                "id": photo_id,
+                "width": 1920,
+                "height": 1080,
+                "photographer": f"Photographer {photo_id}",
+                "src": {
+                    "original": f"https://images.pexels.com/{photo_id}/original.png",
+                    "medium": f"https://images.pexels.com/{photo_id}/medium.png",
+                },
+            }
+            for photo_id in ids
+        ],
+        "total_results": len(ids),
+    }
+
+
+class TestNearDuplicates:
+    """Photos 1 and 2 show the same image; photo 3 a different one."""
+
+    @pytest.fixture(autouse=True)
+    def _keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.delenv("PIXABAY_API_KEY", raising=False)
+        monkeypatch.delenv("FREESOUND_API_KEY", raising=False)
+
+    @staticmethod
+    def _handler(previews: list[str]):
+        images = {
+            "1": _preview_png(1),
+            "2": _preview_png(1, size=(120, 90)),
+            "3": _preview_png(2),
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(200, json=_pexels_photos(1, 2, 3))
+            photo_id, name = request.url.path.strip("/").split("/")
+            if name.startswith("medium"):
+                previews.append(photo_id)
+            return httpx.Response(
+                200, headers={"Content-Type": "image/png"}, content=images[photo_id]
+            )
+
+        return handler
+
+    @staticmethod
+    def _detector(tmp_path: Path) -> NearDuplicates:
+        return NearDuplicates(HashCache(tmp_path / "phash.sqlite3"))
+
+    def test_flags_duplicate_hits_and_caches_hashes(
+        self, workdir: Path, tmp_path: Path
+    ) -> None:
+        previews: list[str] = []
+        clients = ProviderClients(
+            transport=httpx.MockTransport(self._handler(previews))
+        )
+        tools = {
+            t.__name__: t
+            for t in create_stock_tools(
+                workdir, clients, near_duplicates=self._detector(tmp_path)
+            )
+        }
+        payload = _parse_json_result(
+            tools["pexels_search"]("sunset", output="compact")
+        )
+
+        assert payload["near_duplicates"] == [
+            {"id": "px:2", "duplicate_of": "px:1", "distance": 0}
+        ]
+        assert [c.get("dup") for c in payload["candidates"]] == [None, "px:1", None]
+        assert "px:2 looks like px:1" in payload["summary"]
+        assert sorted(previews) == ["1", "2", "3"]
+
+        tools["pexels_search"]("sunset", page=2, output="compact")
+        assert len(previews) == 3
+
+    def test_flags_hits_matching_downloaded_assets(
+        self, workdir: Path, tmp_path: Path
+    ) -> None:
+        clients = ProviderClients(transport=httpx.MockTransport(self._handler([])))
+        tools = {
+            t.__name__: t
+            for t in create_stock_tools(
+                workdir, clients, near_duplicates=self._detector(tmp_path)
+            )
+        }
+        tools["pexels_search"]("sunset")
+        first = _parse_json_result(
+            tools["pexels_download"](
+                "https://images.pexels.com/1/original.png",
+                ".clawdcut/assets/images/one.png",
+            )
+        )
+        second = _parse_json_result(
+            tools["pexels_download"](
+                "https://images.pexels.com/2/original.png",
+                ".clawdcut/assets/images/two.png",
+            )
+        )
+        lookup = _parse_json_result(tools["asset_lookup"]())
+        payload = _parse_json_result(
+            tools["pexels_search"]("sunset", page=2, output="compact")
+        )
+
+        assert "near_duplicate_of" not in first
+        assert second["near_duplicate_of"] == ".clawdcut/assets/images/one.png"
+        assert all(record["dhash"] for record in lookup["assets"])
+        assert [f["id"] for f in payload["near_duplicates"]] == ["px:1", "px:2"]
+        assert payload["near_duplicates"][0]["duplicate_of"].startswith(
+            ".clawdcut/assets/images/"
+        )
+
+    def test_async_stock_search_flags_duplicates(
+        self, workdir: Path, tmp_path: Path
+    ) -> None:
+        clients = ProviderClients(
+            async_transport=httpx.MockTransport(self._handler([]))
+        )
+        tools = {
+            t.__name__: t
+            for t in create_async_stock_tools(
+                workdir, clients, near_duplicates=self._detector(tmp_path)
+            )
+        }
+
+        async def run() -> dict:
+            try:
+                return _parse_json_result(
+                    await tools["stock_search"]("sunset", output="compact")
+                )
+            finally:
+                await clients.aclose()
+
+        payload = asyncio.run(run())
+        assert payload["near_duplicates"] == [
+            {"id": "px:2", "duplicate_of": "px:1", "distance": 0}
+        ]
+        assert payload["candidates"][1]["dup"] == "px:1"
+
+    def test_stock_search_hashes_only_kept_candidates(
+        self, workdir: Path, tmp_path: Path
+    ) -> None:
+        previews: list[str] = []
+        clients = ProviderClients(
+            transport=httpx.MockTransport(self._handler(previews))
+        )
+        tools = {
+            t.__name__: t
+            for t in create_stock_tools(
+                workdir, clients, near_duplicates=self._detector(tmp_path)
+            )
+        }
+        payload = _parse_json_result(
+            tools["stock_search"]("sunset", limit=2, output="compact")
+        )
+
+        assert len(payload["candidates"]) == 2
+        assert len(previews) == 2
+
+    def test_stock_search_stops_hashing_at_deadline(
+        self, workdir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "clawdcut.tools.stock_tools.STOCK_SEARCH_DEADLINE_SECONDS", 0.3
+        )
+        fast = self._handler([])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host != "api.pexels.com":
+                time.sleep(1.0)
+            return fast(request)
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {
+            t.__name__: t
+            for t in create_stock_tools(
+                workdir, clients, near_duplicates=self._detector(tmp_path)
+            )
+        }
+        started = time.monotonic()
+        payload = _parse_json_result(tools["stock_search"]("sunset", output="compact"))
+
+        assert time.monotonic() - started < 0.9
+        assert payload["success"] is True
+        assert "near_duplicates" not in payload
+
+    def test_text_search_fetches_no_previews(
+        self, workdir: Path, tmp_path: Path
+    ) -> None:
+        previews: list[str] = []
+        clients = ProviderClients(
+            transport=httpx.MockTransport(self._handler(previews))
+        )
+        tools = {
+            t.__name__: t
+            for t in create_stock_tools(
+                workdir, clients, near_duplicates=self._detector(tmp_path)
+            )
+        }
+        tools["pexels_search"]("sunset")
+        tools["stock_search"]("sunset")
+
+        assert previews == []
+
+    def test_compact_search_stops_hashing_at_deadline(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("CLAWDCUT_NEAR_DUPLICATES", "1")
+        monkeypatch.setattr("clawdcut.tools.stock_tools.PREVIEW_TIMEOUT_SECONDS", 0.3)
+        fast = self._handler([])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host != "api.pexels.com":
+                time.sleep(1.0)
+            return fast(request)
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        started = time.monotonic()
+        payload = _parse_json_result(
+            tools["pexels_search"]("sunset", output="compact")
+        )
+
+        assert time.monotonic() - started < 0.9
+        assert payload["success"] is True
+        assert len(payload["candidates"]) == 3
+        assert "near_duplicates" not in payload
+
+    def test_locked_hash_cache_does_not_fail_tools(
+        self, workdir: Path, tmp_path: Path
+    ) -> None:
+        class LockedCache(HashCache):
+            def get_many(self, keys: list[str]) -> dict[str, int]:
+                raise sqlite3.OperationalError("database is locked")
+
+            put_many = get_many  # type: ignore[assignment]
+
+        clients = ProviderClients(transport=httpx.MockTransport(self._handler([])))
+        detector = NearDuplicates(LockedCache(tmp_path / "phash.sqlite3"))
+        tools = {
+            t.__name__: t
+            for t in create_stock_tools(workdir, clients, near_duplicates=detector)
+        }
+        search = _parse_json_result(tools["pexels_search"]("sunset", output="compact"))
+        download = _parse_json_result(
+            tools["pexels_download"](
+                "https://images.pexels.com/1/original.png",
+                ".clawdcut/assets/images/one.png",
+            )
+        )
+
+        assert search["success"] is True
+        assert search["near_duplicates"][0]["duplicate_of"] == "px:1"
+        assert download["success"] is True
+        assert download["sha256"]
+
+
 # --- Factory Tests ---
 
 
 class TestCreateStockTools:
-    def test_returns_six_tools(self, workdir: Path) -> None:
+    def test_returns_nine_tools(self, workdir: Path) -> None:
         tools = create_stock_tools(workdir)
-        assert len(tools) == 6
+        assert len(tools) == 9
 
     def test_tool_names(self, workdir: Path) -> None:
         tools = create_stock_tools(workdir)
@@ -645,6 +1164,9 @@ class TestCreateStockTools:
             "pixabay_download",
             "freesound_search",
             "freesound_download",
+            "stock_search",
+            "batch_download",
+            "asset_lookup",
         ]
 
     def test_tools_have_docstrings(self, workdir: Path) -> None:
@@ -652,3 +1174,1433 @@ class TestCreateStockTools:
         for tool in tools:
             assert tool.__doc__ is not None
             assert len(tool.__doc__) > 0
+
+    def test_tools_share_pooled_client(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        seen: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.host)
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+            return httpx.Response(200, content=b"pooled")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset")
+        tools["pexels_download"](
+            "https://images.pexels.com/photos/1/original.jpeg",
+            ".clawdcut/assets/images/pooled.jpg",
+        )
+        client = clients.get("pexels")
+        clients.close()
+
+        assert seen == ["api.pexels.com", "images.pexels.com"]
+        assert client.is_closed
+        assert (workdir / ".clawdcut/assets/images/pooled.jpg").read_bytes() == (
+            b"pooled"
+        )
+
+
+# --- Search Cache Tests ---
+
+
+class TestSearchCache:
+    @staticmethod
+    def _session(workdir: Path) -> dict:
+        return {t.__name__: t for t in create_stock_tools(workdir)}
+
+    def test_repeat_search_served_from_cache(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(PIXABAY_IMAGE_RESPONSE)
+            first = _parse_json_result(
+                self._session(workdir)["pixabay_search"]("Sunset")
+            )
+            second = _parse_json_result(
+                self._session(workdir)["pixabay_search"](" sunset ")
+            )
+
+        assert mock_get.call_count == 1
+        assert first["cache"] == "miss"
+        assert second["cache"] == "hit"
+        assert "cache_age_seconds" in second
+        assert second["summary"] == first["summary"]
+
+    def test_api_key_not_part_of_cache_key(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(FREESOUND_AUDIO_RESPONSE)
+            monkeypatch.setenv("FREESOUND_API_KEY", "key-one")
+            self._session(workdir)["freesound_search"]("cinematic")
+            monkeypatch.setenv("FREESOUND_API_KEY", "key-two")
+            payload = _parse_json_result(
+                self._session(workdir)["freesound_search"]("cinematic")
+            )
+
+        assert mock_get.call_count == 1
+        assert payload["cache"] == "hit"
+
+    def test_errors_are_not_cached(
+        self, tools: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        request = httpx.Request("GET", "https://api.pexels.com/v1/search")
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.side_effect = [
+                httpx.HTTPStatusError(
+                    "bad request",
+                    request=request,
+                    response=httpx.Response(400, request=request),
+                ),
+                _mock_response(PEXELS_PHOTO_RESPONSE),
+            ]
+            tools["pexels_search"]("sunset")
+            payload = _parse_json_result(tools["pexels_search"]("sunset"))
+
+        assert payload["cache"] == "miss"
+
+    def test_cache_can_be_disabled(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("CLAWDCUT_SEARCH_CACHE", "0")
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(PEXELS_PHOTO_RESPONSE)
+            self._session(workdir)["pexels_search"]("sunset")
+            payload = _parse_json_result(
+                self._session(workdir)["pexels_search"]("sunset")
+            )
+
+        assert mock_get.call_count == 2
+        assert payload["cache"] == "off"
+
+
+# --- Global Asset Cache Tests ---
+
+
+class TestGlobalAssetCache:
+    def test_second_project_served_from_cache(self, tmp_path: Path) -> None:
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, content=b"shared-clip")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        results = []
+        for project in ("project_a", "project_b"):
+            workdir = tmp_path / project
+            tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+            results.append(
+                _parse_json_result(
+                    tools["pexels_download"](
+                        "https://videos.pexels.com/67890-hd.mp4",
+                        ".clawdcut/assets/videos/clip.mp4",
+                        asset_id="67890",
+                    )
+                )
+            )
+            target = workdir / ".clawdcut/assets/videos/clip.mp4"
+            assert target.read_bytes() == b"shared-clip"
+
+        assert [r["cache"] for r in results] == ["miss", "hit"]
+        assert len(requests) == 1
+
+    def test_cache_can_be_disabled(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("CLAWDCUT_ASSET_CACHE", "0")
+        clients = ProviderClients(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, content=b"x")
+            )
+        )
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        payload = _parse_json_result(
+            tools["freesound_download"](
+                "https://cdn.freesound.org/previews/1.mp3",
+                ".clawdcut/assets/audio/music/a.mp3",
+            )
+        )
+
+        assert payload["cache"] == "off"
+
+
+# --- Async Tool Tests ---
+
+
+def _async_tools(workdir: Path, handler) -> tuple[dict, ProviderClients]:
+    """Create async tools whose clients are served by ``handler``."""
+    clients = ProviderClients(async_transport=httpx.MockTransport(handler))
+    tool_list = create_async_stock_tools(workdir, clients)
+    return {fn.__name__: fn for fn in tool_list}, clients
+
+
+class TestAsyncStockTools:
+    def test_names_and_docs_match_sync_tools(self, workdir: Path) -> None:
+        sync_tools = create_stock_tools(workdir)
+        async_tools = create_async_stock_tools(workdir)
+        assert [t.__name__ for t in async_tools] == [t.__name__ for t in sync_tools]
+        for async_tool, sync_tool in zip(async_tools, sync_tools):
+            assert inspect.iscoroutinefunction(async_tool)
+            assert async_tool.__doc__ == sync_tool.__doc__
+            assert inspect.signature(async_tool) == inspect.signature(sync_tool)
+
+    def test_builds_one_session_context(self, workdir: Path) -> None:
+        with (
+            patch("clawdcut.tools.stock_tools.AssetManifest") as manifest,
+            patch("clawdcut.tools.stock_tools.MetricsLog.from_env") as metrics,
+        ):
+            create_async_stock_tools(workdir)
+
+        manifest.shared.assert_called_once_with(workdir)
+        metrics.assert_called_once_with(workdir)
+
+    def test_search(self, workdir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+
+        tools, _ = _async_tools(workdir, handler)
+        payload = _parse_json_result(asyncio.run(tools["pexels_search"]("sunset")))
+
+        assert payload["success"] is True
+        assert "12345" in payload["summary"]
+        assert seen[0].headers["Authorization"] == "test-key"
+        assert seen[0].url.params["query"] == "sunset"
+
+    def test_download(self, workdir: Path) -> None:
+        tools, _ = _async_tools(
+            workdir, lambda request: httpx.Response(200, content=b"async-bytes")
+        )
+        payload = _parse_json_result(
+            asyncio.run(
+                tools["pixabay_download"](
+                    "https://cdn.pixabay.com/video/sunset.mp4",
+                    ".clawdcut/assets/videos/sunset.mp4",
+                )
+            )
+        )
+
+        target = workdir / ".clawdcut/assets/videos/sunset.mp4"
+        assert payload["success"] is True
+        assert target.read_bytes() == b"async-bytes"
+
+    def test_retries_with_async_sleep(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        monkeypatch.setattr("clawdcut.tools.retry.asyncio.sleep", fake_sleep)
+        responses = iter(
+            [httpx.Response(503), httpx.Response(200, json=FREESOUND_AUDIO_RESPONSE)]
+        )
+        tools, _ = _async_tools(workdir, lambda request: next(responses))
+        payload = _parse_json_result(
+            asyncio.run(tools["freesound_search"]("cinematic"))
+        )
+
+        assert payload["success"] is True
+        assert len(sleeps) == 1
+        assert payload["retry"]["attempts"] == 2
+        assert payload["retry"]["wait_seconds"] == pytest.approx(sleeps[0], abs=1e-3)
+
+    def test_http_error_returns_error_payload(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        tools, _ = _async_tools(workdir, lambda request: httpx.Response(404))
+        payload = _parse_json_result(asyncio.run(tools["pixabay_search"]("sunset")))
+
+        assert payload["success"] is False
+        assert "Error searching Pixabay" in payload["error"]
+
+    def test_calls_run_concurrently(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        in_flight = 0
+        peak = 0
+
+        class SlowTransport(httpx.AsyncBaseTransport):
+            async def handle_async_request(
+                self, request: httpx.Request
+            ) -> httpx.Response:
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                body = (
+                    PEXELS_PHOTO_RESPONSE
+                    if request.url.host == "api.pexels.com"
+                    else PIXABAY_IMAGE_RESPONSE
+                )
+                return httpx.Response(200, json=body)
+
+        clients = ProviderClients(async_transport=SlowTransport())
+        tools = {t.__name__: t for t in create_async_stock_tools(workdir, clients)}
+
+        async def run_all() -> list[str]:
+            try:
+                return await asyncio.gather(
+                    tools["pexels_search"]("sunset"),
+                    tools["pixabay_search"]("sunset"),
+                )
+            finally:
+                await clients.aclose()
+
+        results = asyncio.run(run_all())
+        assert all(_parse_json_result(r)["success"] for r in results)
+        assert peak == 2
+
+
+# --- Unified Search Tests ---
+
+
+def _stock_search_handler(pixabay_status: int = 200):
+    """Serve canned Pexels/Pixabay/Freesound responses keyed by host."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.pexels.com":
+            return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+        if request.url.host == "freesound.org":
+            return httpx.Response(200, json=FREESOUND_AUDIO_RESPONSE)
+        return httpx.Response(pixabay_status, json=PIXABAY_IMAGE_RESPONSE)
+
+    return handler
+
+
+class TestStockSearch:
+    @pytest.fixture(autouse=True)
+    def _keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        monkeypatch.delenv("FREESOUND_API_KEY", raising=False)
+
+    def _tools(self, workdir: Path, handler) -> dict:
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        return {t.__name__: t for t in create_stock_tools(workdir, clients)}
+
+    def test_merges_all_configured_providers(self, workdir: Path) -> None:
+        tools = self._tools(workdir, _stock_search_handler())
+        payload = _parse_json_result(tools["stock_search"]("sunset"))
+
+        assert payload["success"] is True
+        assert payload["provider"] == "multi"
+        assert payload["providers"]["pexels"]["status"] == "ok"
+        assert payload["providers"]["pixabay"]["status"] == "ok"
+        assert {c["provider"] for c in payload["candidates"]} == {
+            "pexels",
+            "pixabay",
+        }
+        assert payload["raw_count"] == 2
+        assert "[pexels:12345]" in payload["summary"]
+
+    def test_style_brief_reranks_merged_candidates(self, workdir: Path) -> None:
+        style_brief = workdir / ".clawdcut" / "style_brief.json"
+        style_brief.parent.mkdir(parents=True, exist_ok=True)
+        style_brief.write_text(json.dumps({"palette": {"keywords": ["nature"]}}))
+        tools = self._tools(workdir, _stock_search_handler())
+        payload = _parse_json_result(
+            tools["stock_search"](
+                "sunset", style_brief_path=".clawdcut/style_brief.json", limit=1
+            )
+        )
+
+        [best] = payload["candidates"]
+        assert best["provider"] == "pixabay"
+        assert best["style_score"] == 1.0
+        assert best["style_matches"] == ["nature"]
+
+    def test_skips_providers_without_key(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("PIXABAY_API_KEY")
+        tools = self._tools(workdir, _stock_search_handler())
+        payload = _parse_json_result(tools["stock_search"]("sunset"))
+
+        assert payload["success"] is True
+        assert payload["providers"]["pixabay"]["status"] == "skipped"
+        assert {c["provider"] for c in payload["candidates"]} == {"pexels"}
+
+    def test_provider_error_does_not_fail_search(self, workdir: Path) -> None:
+        tools = self._tools(workdir, _stock_search_handler(pixabay_status=404))
+        payload = _parse_json_result(tools["stock_search"]("sunset"))
+
+        assert payload["success"] is True
+        assert payload["providers"]["pixabay"]["status"] == "error"
+        assert len(payload["candidates"]) == 1
+
+    def test_slow_provider_hits_deadline(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import time
+
+        monkeypatch.setattr(
+            "clawdcut.tools.stock_tools.STOCK_SEARCH_DEADLINE_SECONDS", 0.2
+        )
+        fast = _stock_search_handler()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "pixabay.com":
+                time.sleep(1.0)
+            return fast(request)
+
+        tools = self._tools(workdir, handler)
+        started = time.monotonic()
+        payload = _parse_json_result(tools["stock_search"]("sunset"))
+
+        assert time.monotonic() - started < 0.9
+        assert payload["success"] is True
+        assert payload["providers"]["pixabay"]["status"] == "timeout"
+
+    def test_audio_routes_to_freesound(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
+        tools = self._tools(workdir, _stock_search_handler())
+        payload = _parse_json_result(
+            tools["stock_search"]("cinematic", media_type="music")
+        )
+
+        assert list(payload["providers"]) == ["freesound"]
+        assert payload["candidates"][0]["id"] == "33333"
+
+    def test_no_configured_provider_is_error(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("PEXELS_API_KEY")
+        monkeypatch.delenv("PIXABAY_API_KEY")
+        tools = {t.__name__: t for t in create_stock_tools(workdir)}
+        payload = _parse_json_result(tools["stock_search"]("sunset"))
+
+        assert payload["success"] is False
+        assert payload["providers"]["pexels"]["status"] == "skipped"
+
+    def test_async_deadline(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "clawdcut.tools.stock_tools.STOCK_SEARCH_DEADLINE_SECONDS", 0.05
+        )
+
+        class SlowPixabay(httpx.AsyncBaseTransport):
+            async def handle_async_request(
+                self, request: httpx.Request
+            ) -> httpx.Response:
+                if request.url.host == "pixabay.com":
+                    await asyncio.sleep(1.0)
+                return _stock_search_handler()(request)
+
+        clients = ProviderClients(async_transport=SlowPixabay())
+        tools = {t.__name__: t for t in create_async_stock_tools(workdir, clients)}
+
+        async def run() -> str:
+            try:
+                return await tools["stock_search"]("sunset")
+            finally:
+                await clients.aclose()
+
+        payload = _parse_json_result(asyncio.run(run()))
+        assert payload["providers"]["pixabay"]["status"] == "timeout"
+        assert payload["providers"]["pexels"]["status"] == "ok"
+
+
+class TestRateLimiting:
+    def test_search_learns_from_quota_headers(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        headers = {"X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": "30"}
+        clients = ProviderClients(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, json=PEXELS_PHOTO_RESPONSE, headers=headers
+                )
+            ),
+            quotas={"pexels": (200, 3600.0)},
+        )
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset")
+
+        limiter = clients.limiter("pexels")
+        assert limiter is not None
+        assert limiter.reserve() >= 29.0
+
+    def test_limiter_shared_by_sync_and_async_tools(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        waits: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            waits.append(delay)
+
+        monkeypatch.setattr("clawdcut.tools.rate_limit.asyncio.sleep", fake_sleep)
+        clients = ProviderClients(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=PIXABAY_IMAGE_RESPONSE)
+            ),
+            async_transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json=PIXABAY_IMAGE_RESPONSE)
+            ),
+            quotas={"pixabay": (1, 60.0)},
+        )
+        sync_tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        async_tools = {
+            t.__name__: t for t in create_async_stock_tools(workdir, clients)
+        }
+        sync_tools["pixabay_search"]("sunset")
+        asyncio.run(async_tools["pixabay_search"]("forest"))
+
+        assert waits and waits[0] == pytest.approx(60.0, abs=0.5)
+
+    @pytest.mark.parametrize("factory", [create_stock_tools, create_async_stock_tools])
+    def test_stock_search_skips_provider_paced_past_deadline(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch, factory
+    ) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        hosts: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            hosts.append(request.url.host)
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+            return httpx.Response(200, json=PIXABAY_IMAGE_RESPONSE)
+
+        clients = ProviderClients(
+            transport=httpx.MockTransport(handler),
+            async_transport=httpx.MockTransport(handler),
+            quotas={"pixabay": (1, 60.0)},
+        )
+        limiter = clients.limiter("pixabay")
+        assert limiter is not None
+        limiter.reserve()  # the only token of the minute is spent
+        tools = {t.__name__: t for t in factory(workdir, clients)}
+        started = time.monotonic()
+        result = tools["stock_search"]("sunset")
+        if inspect.iscoroutine(result):
+            result = asyncio.run(result)
+        payload = _parse_json_result(result)
+
+        assert time.monotonic() - started < 2.0
+        assert payload["providers"]["pexels"]["status"] == "ok"
+        assert payload["providers"]["pixabay"]["status"] == "rate_limited"
+        assert payload["providers"]["pixabay"]["retry_in_seconds"] > 50
+        assert hosts == ["api.pexels.com"]
+
+
+class TestBatchDownload:
+    def _tools(self, workdir: Path, handler) -> dict:
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        return {t.__name__: t for t in create_stock_tools(workdir, clients)}
+
+    def test_downloads_all_items(self, workdir: Path) -> None:
+        tools = self._tools(
+            workdir,
+            lambda request: httpx.Response(200, content=request.url.path.encode()),
+        )
+        items = [
+            {
+                "url": f"https://cdn.test/clip{i}.mp4",
+                "save_path": f".clawdcut/assets/videos/clip{i}.mp4",
+                "provider": "pixabay",
+            }
+            for i in range(5)
+        ]
+        payload = _parse_json_result(tools["batch_download"](items))
+
+        assert payload["success"] is True
+        assert payload["operation"] == "batch_download"
+        assert payload["succeeded"] == 5
+        assert [r["index"] for r in payload["items"]] == list(range(5))
+        first = payload["items"][0]
+        assert first["bytes"] == len(b"/clip0.mp4")
+        assert first["seconds"] >= 0
+        assert (workdir / ".clawdcut/assets/videos/clip3.mp4").read_bytes() == (
+            b"/clip3.mp4"
+        )
+        assert payload["total_bytes"] == sum(r["bytes"] for r in payload["items"])
+
+    def test_bounded_concurrency(self, workdir: Path) -> None:
+        import threading
+        import time
+
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return httpx.Response(200, content=b"x")
+
+        tools = self._tools(workdir, handler)
+        items = [
+            {
+                "url": f"https://cdn.test/{i}.jpg",
+                "save_path": f".clawdcut/assets/images/{i}.jpg",
+                "provider": "pexels",
+            }
+            for i in range(8)
+        ]
+        payload = _parse_json_result(tools["batch_download"](items, max_concurrency=3))
+
+        assert payload["succeeded"] == 8
+        assert 1 < peak <= 3
+
+    def test_per_item_errors(self, workdir: Path) -> None:
+        tools = self._tools(workdir, lambda request: httpx.Response(200, content=b"ok"))
+        items = [
+            {
+                "url": "https://cdn.test/a.jpg",
+                "save_path": ".clawdcut/assets/images/a.jpg",
+                "provider": "pexels",
+            },
+            {
+                "url": "https://cdn.test/b.jpg",
+                "save_path": "../../etc/b.jpg",
+                "provider": "pexels",
+            },
+            {"url": "https://cdn.test/c.jpg", "save_path": "x", "provider": "nope"},
+            {
+                "url": "https://cdn.test/d.jpg",
+                "save_path": ".clawdcut/assets/images/a.jpg",
+                "provider": "pexels",
+            },
+        ]
+        payload = _parse_json_result(tools["batch_download"](items))
+
+        assert payload["success"] is False
+        assert (payload["succeeded"], payload["failed"]) == (1, 3)
+        results = payload["items"]
+        assert results[0]["success"] is True
+        assert "invalid save_path" in results[1]["error"]
+        assert "provider must be one of" in results[2]["error"]
+        assert "duplicate save_path" in results[3]["error"]
+
+    def test_async_batch(self, workdir: Path) -> None:
+        tools, clients = _async_tools(
+            workdir, lambda request: httpx.Response(200, content=b"async")
+        )
+        items = [
+            {
+                "url": f"https://cdn.freesound.test/{i}.mp3",
+                "save_path": f".clawdcut/assets/audio/sfx/{i}.mp3",
+                "provider": "freesound",
+                "asset_id": str(i),
+            }
+            for i in range(3)
+        ]
+
+        async def run() -> str:
+            try:
+                return await tools["batch_download"](items, max_concurrency=2)
+            finally:
+                await clients.aclose()
+
+        payload = _parse_json_result(asyncio.run(run()))
+        assert payload["success"] is True
+        assert all(r["bytes"] == 5 for r in payload["items"])
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+        breaker.record(False)
+        assert breaker.state == "closed"
+        breaker.record(False)
+        assert breaker.state == "open"
+        with pytest.raises(ProviderUnavailableError) as info:
+            breaker.before_request("pixabay")
+        assert info.value.retry_in > 9.0
+        assert "Pixabay" in str(info.value)
+
+    def test_success_resets_failures(self) -> None:
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record(False)
+        breaker.record(True)
+        breaker.record(False)
+        assert breaker.state == "closed"
+
+    def test_half_open_single_probe(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=clock)
+        breaker.record(False)
+        clock.now = 5.0
+        breaker.before_request("pexels")
+        assert breaker.state == "half_open"
+        with pytest.raises(ProviderUnavailableError):
+            breaker.before_request("pexels")
+        breaker.record(True)
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self) -> None:
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5.0, clock=clock)
+        for _ in range(3):
+            breaker.record(False)
+        clock.now = 6.0
+        breaker.before_request("pexels")
+        breaker.record(False)
+        assert breaker.state == "open"
+        with pytest.raises(ProviderUnavailableError):
+            breaker.before_request("pexels")
+
+
+class TestCircuitBreakerTools:
+    @pytest.fixture(autouse=True)
+    def _keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        monkeypatch.setattr("clawdcut.tools.retry.time.sleep", lambda _: None)
+
+    def _tools(self, workdir: Path, handler, clock: FakeClock) -> dict:
+        clients = ProviderClients(transport=httpx.MockTransport(handler), quotas={})
+        breakers = {
+            provider: CircuitBreaker(2, reset_timeout=30.0, clock=clock)
+            for provider in ("pexels", "pixabay", "freesound")
+        }
+        tools = create_stock_tools(
+            workdir,
+            clients,
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.0),
+            breakers=breakers,
+        )
+        return {t.__name__: t for t in tools}
+
+    def test_fails_fast_while_open(self, workdir: Path) -> None:
+        calls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.host)
+            return httpx.Response(503)
+
+        tools = self._tools(workdir, handler, FakeClock())
+        first = _parse_json_result(tools["pixabay_search"]("sunset"))
+        assert "Error searching Pixabay" in first["error"]
+        assert len(calls) == 2
+
+        second = _parse_json_result(tools["pixabay_search"]("forest"))
+        assert second["error_code"] == "provider_unavailable"
+        assert second["retry_in_seconds"] == 30.0
+        assert len(calls) == 2
+
+        download = _parse_json_result(
+            tools["pixabay_download"](
+                "https://cdn.pixabay.com/a.jpg", ".clawdcut/assets/images/a.jpg"
+            )
+        )
+        assert download["error_code"] == "provider_unavailable"
+        assert download["operation"] == "download"
+        assert len(calls) == 2
+
+    def test_client_errors_do_not_trip(self, workdir: Path) -> None:
+        tools = self._tools(workdir, lambda request: httpx.Response(404), FakeClock())
+        for _ in range(3):
+            payload = _parse_json_result(tools["pexels_search"]("sunset"))
+            assert "error_code" not in payload
+
+    def test_half_open_probe_recovers(self, workdir: Path) -> None:
+        healthy = False
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if healthy:
+                return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+            return httpx.Response(500)
+
+        clock = FakeClock()
+        tools = self._tools(workdir, handler, clock)
+        tools["pexels_search"]("sunset")
+        assert "error_code" in _parse_json_result(tools["pexels_search"]("sea"))
+
+        clock.now = 31.0
+        healthy = True
+        payload = _parse_json_result(tools["pexels_search"]("sea"))
+        assert payload["success"] is True
+
+    def test_stock_search_reports_unavailable(self, workdir: Path) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "pixabay.com":
+                return httpx.Response(503)
+            return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+
+        tools = self._tools(workdir, handler, FakeClock())
+        tools["stock_search"]("sunset")
+        payload = _parse_json_result(tools["stock_search"]("forest"))
+
+        assert payload["success"] is True
+        assert payload["providers"]["pixabay"]["status"] == "unavailable"
+        assert payload["providers"]["pexels"]["status"] == "ok"
+
+
+def _paged_pexels(total: int = 12):
+    """Handler serving numbered Pexels photo pages and recording page params."""
+    pages: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = request.url.params.get("page")
+        pages.append(page)
+        number = int(page or 1)
+        return httpx.Response(
+            200,
+            json={
+                "photos": [
+                    {
+                        "id": number * 100 + i,
+                        "alt": f"page {number}",
+                        "src": {"original": f"https://img.test/{number}/{i}.jpg"},
+                    }
+                    for i in range(5)
+                ],
+                "total_results": total,
+            },
+        )
+
+    return handler, pages
+
+
+class TestPagination:
+    @pytest.fixture(autouse=True)
+    def _key(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("CLAWDCUT_SEARCH_CACHE", "0")
+
+    def test_page_param_and_next_page(self, workdir: Path) -> None:
+        handler, pages = _paged_pexels()
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+
+        first = _parse_json_result(tools["pexels_search"]("sunset"))
+        assert (first["page"], first["next_page"]) == (1, 2)
+        assert "page=2" in first["summary"]
+        assert pages == [None]
+
+        last = _parse_json_result(tools["pexels_search"]("sunset", page=3))
+        assert last["next_page"] is None
+        assert "page 3" in last["summary"]
+
+    def test_fetched_pages_served_from_memory(self, workdir: Path) -> None:
+        handler, pages = _paged_pexels()
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+
+        tools["pexels_search"]("sunset")
+        again = _parse_json_result(tools["pexels_search"]("sunset"))
+
+        assert again["cache"] == "memory"
+        assert pages == [None]
+
+    def test_first_page_does_not_prefetch(self, workdir: Path) -> None:
+        handler, pages = _paged_pexels()
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset")
+
+        assert pages == [None]
+
+    def test_paging_prefetches_next_page(self, workdir: Path) -> None:
+        handler, pages = _paged_pexels(total=100)
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+
+        tools["pexels_search"]("sunset", page=2)
+        third = _parse_json_result(tools["pexels_search"]("sunset", page=3))
+
+        assert third["cache"] == "memory"
+        assert "page 3" in third["summary"]
+        assert pages.count("3") == 1
+
+    def test_async_paging_prefetches_next_page(self, workdir: Path) -> None:
+        handler, pages = _paged_pexels(total=100)
+        tools, clients = _async_tools(workdir, handler)
+
+        async def run() -> dict:
+            try:
+                await tools["pexels_search"]("sunset", page=2)
+                return _parse_json_result(
+                    await tools["pexels_search"]("sunset", page=3)
+                )
+            finally:
+                await clients.aclose()
+
+        third = asyncio.run(run())
+        assert third["cache"] == "memory"
+        assert pages.count("3") == 1
+
+    def test_freesound_page_param(
+        self, workdir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("FREESOUND_API_KEY", "test-key")
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json=FREESOUND_AUDIO_RESPONSE)
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        payload = _parse_json_result(tools["freesound_search"]("rain", page=2))
+
+        assert seen[0].url.params["page"] == "2"
+        assert payload["next_page"] is None
+
+
+class TestCompactOutput:
+    @pytest.fixture(autouse=True)
+    def _keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        monkeypatch.delenv("FREESOUND_API_KEY", raising=False)
+
+    def test_compact_search_returns_typed_candidates(
+        self, tools: dict
+    ) -> None:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(PEXELS_PHOTO_RESPONSE)
+            text = tools["pexels_search"]("sunset")
+            compact = tools["pexels_search"]("sunset", output="compact")
+        payload = _parse_json_result(compact)
+
+        assert payload["success"] is True
+        assert payload["candidates"][0]["id"] == "px:12345"
+        assert payload["candidates"][0]["size"] == "1920x1080"
+        assert "https://" not in compact
+        assert len(compact) < len(text)
+
+    def test_invalid_output_mode(self, tools: dict) -> None:
+        payload = _parse_json_result(tools["pexels_search"]("x", output="yaml"))
+
+        assert payload["success"] is False
+        assert "compact" in payload["error"]
+
+    def test_download_resolves_handle(self, workdir: Path) -> None:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+            requested.append(str(request.url))
+            return httpx.Response(200, content=b"jpeg")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset", output="compact")
+        payload = _parse_json_result(
+            tools["pexels_download"]("px:12345", ".clawdcut/assets/images/a.jpg")
+        )
+
+        assert payload["success"] is True
+        assert requested == [
+            PEXELS_PHOTO_RESPONSE["photos"][0]["src"]["original"]
+        ]
+
+    def test_handle_as_asset_id_is_reduced_to_provider_id(
+        self, workdir: Path
+    ) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+            return httpx.Response(200, content=b"jpeg")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset", output="compact")
+        tools["pexels_download"](
+            PEXELS_PHOTO_RESPONSE["photos"][0]["src"]["original"],
+            ".clawdcut/assets/images/a.jpg",
+            asset_id="px:12345",
+        )
+        tools["pexels_download"](
+            "px:12345", ".clawdcut/assets/images/b.jpg", asset_id="pexels:12345"
+        )
+        lookup = _parse_json_result(tools["asset_lookup"]())
+
+        assert [r["asset_id"] for r in lookup["assets"]] == ["12345", "12345"]
+
+    def test_unknown_or_foreign_handle_rejected(self, workdir: Path) -> None:
+        handler = _stock_search_handler()
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset", output="compact")
+
+        unknown = _parse_json_result(
+            tools["pexels_download"]("px:999", ".clawdcut/assets/images/a.jpg")
+        )
+        foreign = _parse_json_result(
+            tools["pixabay_download"]("px:12345", ".clawdcut/assets/images/a.jpg")
+        )
+
+        assert "unknown asset handle" in unknown["error"]
+        assert "pexels_download" in foreign["error"]
+
+    def test_stock_search_compact_with_budget(self, workdir: Path) -> None:
+        clients = ProviderClients(
+            transport=httpx.MockTransport(_stock_search_handler())
+        )
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        payload = _parse_json_result(
+            tools["stock_search"]("sunset", output="compact", max_tokens=1)
+        )
+
+        assert payload["success"] is True
+        assert payload["truncated"] is True
+        assert len(payload["candidates"]) == 1
+        assert set(payload["candidates"][0]) >= {"id", "type"}
+
+    def test_async_compact_search(self, workdir: Path) -> None:
+        tools, clients = _async_tools(
+            workdir, lambda request: httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+        )
+
+        async def run() -> dict:
+            try:
+                return _parse_json_result(
+                    await tools["pexels_search"]("sunset", output="compact")
+                )
+            finally:
+                await clients.aclose()
+
+        assert asyncio.run(run())["candidates"][0]["id"] == "px:12345"
+
+
+class TestPexelsRenditions:
+    @pytest.fixture(autouse=True)
+    def _key(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+
+    def test_search_points_at_smallest_matching_rendition(
+        self, tools: dict
+    ) -> None:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(PEXELS_VIDEO_RESPONSE)
+            full = _parse_json_result(tools["pexels_search"]("x", "video"))
+            small = _parse_json_result(
+                tools["pexels_search"](
+                    "x", "video", target_resolution="360p", output="compact"
+                )
+            )
+
+        assert "67890-hd.mp4" in full["summary"]
+        assert small["candidates"][0]["size"] == "640x360"
+
+    def test_invalid_target_resolution(self, tools: dict) -> None:
+        payload = _parse_json_result(
+            tools["pexels_search"]("x", "video", target_resolution="huge")
+        )
+
+        assert payload["success"] is False
+        assert "1080p" in payload["error"]
+
+    def test_download_looks_up_rendition_by_id(self, workdir: Path) -> None:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(
+                    200, json=PEXELS_VIDEO_RESPONSE["videos"][0]
+                )
+            return httpx.Response(200, content=b"mp4")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        payload = _parse_json_result(
+            tools["pexels_download"](
+                "https://videos.pexels.com/67890-hd.mp4",
+                ".clawdcut/assets/videos/a.mp4",
+                asset_id="67890",
+                target_resolution="360p",
+            )
+        )
+
+        assert payload["success"] is True
+        assert payload["rendition"] == {"width": 640, "height": 360}
+        assert requested == [
+            "https://api.pexels.com/videos/videos/67890",
+            "https://videos.pexels.com/67890-sd.mp4",
+        ]
+
+    def test_download_without_target_uses_url(self, workdir: Path) -> None:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            return httpx.Response(200, content=b"jpeg")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_download"](
+            "https://images.pexels.com/photos/1/original.jpeg",
+            ".clawdcut/assets/images/a.jpg",
+            asset_id="1",
+            target_resolution="1080p",
+        )
+
+        assert requested == ["https://images.pexels.com/photos/1/original.jpeg"]
+
+    def test_media_type_comes_from_search_hit_not_host(self, workdir: Path) -> None:
+        photos = _pexels_photos(7)
+        photos["photos"][0]["src"]["original"] = "http://mirror.test/7/original"
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(str(request.url))
+            if request.url.path == "/v1/search":
+                return httpx.Response(200, json=photos)
+            if request.url.path.startswith("/videos/videos/"):
+                return httpx.Response(200, json=PEXELS_VIDEO_RESPONSE["videos"][0])
+            return httpx.Response(200, content=b"media")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        tools["pexels_search"]("sunset")
+        requested.clear()
+        photo = _parse_json_result(
+            tools["pexels_download"](
+                "http://mirror.test/7/original",
+                ".clawdcut/assets/images/a.jpg",
+                asset_id="7",
+                target_resolution="1080p",
+            )
+        )
+        video = _parse_json_result(
+            tools["pexels_download"](
+                "http://mirror.test/67890/clip.mp4",
+                ".clawdcut/assets/videos/b.mp4",
+                asset_id="67890",
+                target_resolution="360p",
+            )
+        )
+
+        assert photo["success"] is True
+        assert "rendition" not in photo
+        assert video["rendition"] == {"width": 640, "height": 360}
+        assert requested == [
+            "http://mirror.test/7/original",
+            "https://api.pexels.com/videos/videos/67890",
+            "https://videos.pexels.com/67890-sd.mp4",
+        ]
+
+    def test_async_download_looks_up_rendition(self, workdir: Path) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "api.pexels.com":
+                return httpx.Response(
+                    200, json=PEXELS_VIDEO_RESPONSE["videos"][0]
+                )
+            return httpx.Response(200, content=b"mp4")
+
+        tools, clients = _async_tools(workdir, handler)
+
+        async def run() -> dict:
+            try:
+                return _parse_json_result(
+                    await tools["pexels_download"](
+                        "https://videos.pexels.com/67890-hd.mp4",
+                        ".clawdcut/assets/videos/a.mp4",
+                        asset_id="67890",
+                        target_resolution="640x360",
+                    )
+                )
+            finally:
+                await clients.aclose()
+
+        assert asyncio.run(run())["rendition"]["width"] == 640
+
+
+class TestPixabayRenditions:
+    @pytest.fixture(autouse=True)
+    def _key(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+
+    def test_search_links_smallest_video_tier(self, tools: dict) -> None:
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(PIXABAY_VIDEO_RESPONSE)
+            payload = _parse_json_result(
+                tools["pixabay_search"]("x", "video", target_resolution="720p")
+            )
+
+        assert "sunset_medium.mp4" in payload["summary"]
+        assert "(medium, 6.5 MiB)" in payload["summary"]
+
+    def test_search_links_webformat_image(self, tools: dict) -> None:
+        response = {
+            **PIXABAY_IMAGE_RESPONSE,
+            "hits": [
+                {
+                    **PIXABAY_IMAGE_RESPONSE["hits"][0],
+                    "webformatWidth": 640,
+                    "webformatHeight": 360,
+                }
+            ],
+        }
+        with patch("clawdcut.tools.stock_tools.httpx.Client.get") as mock_get:
+            mock_get.return_value = _mock_response(response)
+            payload = _parse_json_result(
+                tools["pixabay_search"]("x", target_resolution="640x360")
+            )
+
+        assert "Download URL: https://pixabay.com/get/sunset_640.jpg" in (
+            payload["summary"]
+        )
+        assert "Rendition: webformat 640x360" in payload["summary"]
+
+    def test_download_looks_up_tier_by_id(self, workdir: Path) -> None:
+        requested: list[httpx.URL] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url)
+            if request.url.path == "/api/videos/":
+                return httpx.Response(200, json=PIXABAY_VIDEO_RESPONSE)
+            return httpx.Response(200, content=b"mp4")
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        payload = _parse_json_result(
+            tools["pixabay_download"](
+                "https://cdn.pixabay.com/video/sunset_large.mp4",
+                ".clawdcut/assets/videos/a.mp4",
+                asset_id="22222",
+                max_bytes=7_000_000,
+            )
+        )
+
+        assert payload["success"] is True
+        assert payload["rendition"]["tier"] == "medium"
+        assert requested[0].params["id"] == "22222"
+        assert str(requested[1]) == "https://cdn.pixabay.com/video/sunset_medium.mp4"
+
+
+class TestSearchFilters:
+    @pytest.fixture(autouse=True)
+    def _keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        for env in ("PEXELS_API_KEY", "PIXABAY_API_KEY", "FREESOUND_API_KEY"):
+            monkeypatch.setenv(env, "test-key")
+
+    def _run(self, workdir: Path, tool: str, *args, **kwargs):
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return _stock_search_handler()(request)
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        return _parse_json_result(tools[tool](*args, **kwargs)), seen
+
+    def test_pexels_filters_sent_natively(self, workdir: Path) -> None:
+        payload, seen = self._run(
+            workdir, "pexels_search", "sunset", orientation="portrait", color="blue"
+        )
+
+        assert payload["success"] is True
+        assert seen[0].url.params["orientation"] == "portrait"
+        assert seen[0].url.params["color"] == "blue"
+        assert "ignored_filters" not in payload
+
+    def test_pixabay_filters_sent_natively(self, workdir: Path) -> None:
+        _, seen = self._run(
+            workdir,
+            "pixabay_search",
+            "sunset",
+            orientation="landscape",
+            min_width=1920,
+            editors_choice=True,
+        )
+
+        params = seen[0].url.params
+        assert params["orientation"] == "horizontal"
+        assert params["min_width"] == "1920"
+        assert params["editors_choice"] == "true"
+
+    def test_freesound_duration_filter(self, workdir: Path) -> None:
+        _, seen = self._run(
+            workdir, "freesound_search", "whoosh", "sfx", min_duration=1, max_duration=3
+        )
+
+        assert seen[0].url.params["filter"].endswith("tag:sfx duration:[1 TO 3]")
+
+    @pytest.mark.parametrize(("min_duration", "kept"), [(10, 1), (20, 0)])
+    def test_pexels_video_bounds_drop_hits(
+        self, workdir: Path, min_duration: int, kept: int
+    ) -> None:
+        seen: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200, json=PEXELS_VIDEO_RESPONSE)
+
+        clients = ProviderClients(transport=httpx.MockTransport(handler))
+        tools = {t.__name__: t for t in create_stock_tools(workdir, clients)}
+        compact = _parse_json_result(
+            tools["pexels_search"](
+                "sunset", "video", min_duration=min_duration, output="compact"
+            )
+        )
+        text = _parse_json_result(
+            tools["pexels_search"]("sunset", "video", min_duration=min_duration)
+        )
+
+        assert "min_duration" not in seen[0].url.params
+        assert len(compact["candidates"]) == kept
+        assert "ignored_filters" not in compact
+        assert ("[ID: 67890]" in text["summary"]) is bool(kept)
+
+    def test_unsupported_filters_reported(self, workdir: Path) -> None:
+        payload, _ = self._run(workdir, "pexels_search", "sunset", min_width=800)
+
+        assert payload["ignored_filters"] == ["min_width"]
+        assert "Not supported by Pexels here: min_width" in payload["summary"]
+
+    def test_invalid_filter_rejected_before_request(self, workdir: Path) -> None:
+        payload, seen = self._run(
+            workdir, "pixabay_search", "sunset", orientation="diagonal"
+        )
+
+        assert payload["success"] is False
+        assert "orientation" in payload["error"]
+        assert seen == []
+
+    def test_stock_search_maps_filters_per_provider(self, workdir: Path) -> None:
+        payload, seen = self._run(
+            workdir, "stock_search", "sunset", orientation="square"
+        )
+
+        by_host = {request.url.host: request.url.params for request in seen}
+        assert by_host["api.pexels.com"]["orientation"] == "square"
+        assert "orientation" not in by_host["pixabay.com"]
+        assert payload["providers"]["pixabay"]["ignored_filters"] == ["orientation"]
+
+
+class TestToolMetrics:
+    @pytest.fixture(autouse=True)
+    def _keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PEXELS_API_KEY", "test-key")
+        monkeypatch.setenv("PIXABAY_API_KEY", "test-key")
+        monkeypatch.delenv("FREESOUND_API_KEY", raising=False)
+
+    def _tools(self, workdir: Path, handler) -> dict:
+        clients = ProviderClients(transport=httpx.MockTransport(handler), quotas={})
+        tool_list = create_stock_tools(
+            workdir, clients, retry_policy=RetryPolicy(base_delay=0)
+        )
+        return {t.__name__: t for t in tool_list}
+
+    def _log(self, workdir: Path) -> list[dict]:
+        lines = (workdir / METRICS_PATH).read_text().splitlines()
+        return [json.loads(line) for line in lines]
+
+    def test_search_reports_and_logs_metrics(self, workdir: Path) -> None:
+        attempts: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(1)
+            if len(attempts) == 1:
+                return httpx.Response(503)
+            return httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+
+        tools = self._tools(workdir, handler)
+        payload = _parse_json_result(tools["pexels_search"]("sunset"))
+
+        metrics = payload["metrics"]
+        assert metrics["retries"] == 1
+        assert metrics["http_status"] == 200
+        assert metrics["bytes"] > 0
+        assert metrics["cache"] == "miss"
+        assert metrics["wall_seconds"] > 0
+        (record,) = self._log(workdir)
+        assert record["tool"] == "pexels_search"
+        assert record["provider"] == "pexels"
+        assert record["operation"] == "search"
+        assert record["success"] is True
+        assert record["retries"] == 1
+
+    def test_errors_carry_http_status(self, workdir: Path) -> None:
+        tools = self._tools(workdir, lambda request: httpx.Response(404))
+        payload = _parse_json_result(
+            tools["pixabay_download"](
+                "https://cdn.test/a.mp4", ".clawdcut/assets/videos/a.mp4"
+            )
+        )
+
+        assert payload["success"] is False
+        assert payload["metrics"]["http_status"] == 404
+        assert self._log(workdir)[0]["success"] is False
+
+    def test_stock_search_counts_every_provider(self, workdir: Path) -> None:
+        tools = self._tools(workdir, _stock_search_handler())
+        payload = _parse_json_result(tools["stock_search"]("sunset"))
+
+        sizes = [
+            len(httpx.Response(200, json=data).content)
+            for data in (PEXELS_PHOTO_RESPONSE, PIXABAY_IMAGE_RESPONSE)
+        ]
+        assert payload["metrics"]["bytes"] == sum(sizes)
+        assert payload["metrics"]["cache"] == "miss"
+
+    def test_batch_logs_one_call(self, workdir: Path) -> None:
+        tools = self._tools(
+            workdir, lambda request: httpx.Response(200, content=b"x" * 100)
+        )
+        items = [
+            {
+                "url": f"https://cdn.test/clip{i}.mp4",
+                "save_path": f".clawdcut/assets/videos/clip{i}.mp4",
+                "provider": "pixabay",
+            }
+            for i in range(3)
+        ]
+        payload = _parse_json_result(tools["batch_download"](items))
+
+        assert payload["metrics"]["bytes"] == 300
+        assert all("metrics" not in item for item in payload["items"])
+        assert [r["tool"] for r in self._log(workdir)] == ["batch_download"]
+
+    def test_async_tools_log_metrics(self, workdir: Path) -> None:
+        tools, _ = _async_tools(
+            workdir, lambda request: httpx.Response(200, json=PEXELS_PHOTO_RESPONSE)
+        )
+        payload = _parse_json_result(asyncio.run(tools["pexels_search"]("sunset")))
+
+        assert payload["metrics"]["http_status"] == 200
+        assert self._log(workdir)[0]["tool"] == "pexels_search"
+
+
+class TestBoundedDict:
+    def test_forgets_least_recently_written_keys(self) -> None:
+        seen: _BoundedDict[int] = _BoundedDict(max_entries=2)
+        seen["a"] = 1
+        seen["b"] = 2
+        seen["a"] = 3
+        seen["c"] = 4
+
+        assert dict(seen) == {"a": 3, "c": 4}
@@ -0,0 +1,109 @@
+"""Tests for the cached style brief loader."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from clawdcut.tools.style_brief import StyleBriefCache, StyleMatcher, TermMatcher
+
+
+def _write_brief(path: Path, keywords: list[str], constraints: list[str]) -> None:
+    path.write_text(
+        json.dumps({"palette": {"keywords": keywords}, "hard_constraints": constraints})
+    )
+
+
+class TestStyleMatcher:
+    def test_scores_keyword_share(self) -> None:
+        matcher = StyleMatcher.compile(
+            {"palette": {"keywords": ["Warm", "golden"]}, "hard_constraints": ["dusk"]}
+        )
+        assert matcher.keywords == {"warm", "golden", "dusk"}
+        assert matcher.score("warm golden beach") == pytest.approx(0.667)
+        assert matcher.score("snow") == 0.0
+
+    def test_empty_brief_scores_zero(self) -> None:
+        assert StyleMatcher.compile({"palette": "mono"}).score("anything") == 0.0
+
+
+class TestTermMatcher:
+    def test_matches_whole_words_across_separators(self) -> None:
+        matcher = TermMatcher.of(["Neon-Purple", "warm", ""])
+        assert matcher.terms == {"neon purple", "warm"}
+        assert matcher.find("Neon purple club, warm light") == {
+            "neon purple",
+            "warm",
+        }
+        assert matcher.find("warmth neonpurple") == set()
+
+    def test_empty_matcher_finds_nothing(self) -> None:
+        assert TermMatcher().find("anything") == set()
+
+    def test_compiles_forbidden_from_every_section(self) -> None:
+        matcher = StyleMatcher.compile(
+            {
+                "palette": {"keywords": ["warm"], "forbidden": ["neon"]},
+                "camera_language": {"forbidden": ["shake-heavy"]},
+            }
+        )
+        assert matcher.preferred.terms == {"warm"}
+        assert matcher.forbidden.terms == {"neon", "shake heavy"}
+
+
+class TestStyleBriefCache:
+    def test_parses_once_while_unchanged(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = tmp_path / "style_brief.json"
+        _write_brief(path, ["warm"], [])
+        cache = StyleBriefCache()
+        reads = 0
+        original = Path.read_text
+
+        def counting_read(self: Path, *args, **kwargs) -> str:
+            nonlocal reads
+            reads += 1
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "read_text", counting_read)
+        first = cache.get(path)
+        second = cache.get(path)
+
+        assert reads == 1
+        assert first[1] is second[1]
+        assert second[1].score("warm light") == 1.0
+
+    def test_invalidated_when_file_changes(self, tmp_path: Path) -> None:
+        path = tmp_path / "style_brief.json"
+        _write_brief(path, ["warm"], [])
+        cache = StyleBriefCache()
+        cache.get(path)
+        _write_brief(path, ["cold", "blue"], ["night"])
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        brief, matcher = cache.get(path)
+        assert brief is not None
+        assert matcher.keywords == {"cold", "blue", "night"}
+
+    def test_missing_or_invalid_brief(self, tmp_path: Path) -> None:
+        cache = StyleBriefCache()
+        assert cache.get(tmp_path / "missing.json") == (None, StyleMatcher())
+        invalid = tmp_path / "invalid.json"
+        invalid.write_text("[1, 2]")
+        brief, matcher = cache.get(invalid)
+        assert brief is None
+        assert matcher.score("anything") == 0.0
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = StyleBriefCache(max_entries=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.json"
+            _write_brief(path, [name], [])
+            paths.append(path)
+            cache.get(path)
+
+        assert list(cache._entries) == [p.resolve() for p in paths[1:]]